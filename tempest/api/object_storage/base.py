@@ -78,7 +78,7 @@ class BaseObjectTest(tempest.test.BaseTestCase):
             object_client = cls.object_client
         for cont in containers:
             try:
-                objlist = container_client.list_all_container_objects(cont)
+                objlist = container_client.iter_container_objects(cont)
                 # delete every object in the container
                 for obj in objlist:
                     test_utils.call_and_ignore_notfound_exc(
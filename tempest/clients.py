@@ -13,14 +13,19 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
 import copy
+import os
+import threading
 
+from oslo_concurrency import lockutils
 from oslo_log import log as logging
 
 from tempest.common import negative_rest_client
 from tempest import config
 from tempest import exceptions
 from tempest.lib import auth
+from tempest.lib.common import token_cache
 from tempest.lib import exceptions as lib_exc
 from tempest.lib.services import compute
 from tempest.lib.services import image
@@ -36,6 +41,9 @@ from tempest.services import volume
 CONF = config.CONF
 LOG = logging.getLogger(__name__)
 
+_manager_cache = None
+_manager_cache_lock = threading.Lock()
+
 
 class Manager(service_clients.ServiceClients):
     """Top level manager for OpenStack tempest clients"""
@@ -62,10 +70,21 @@ class Manager(service_clients.ServiceClients):
         super(Manager, self).__init__(
             credentials=credentials, identity_uri=identity_uri, scope=scope,
             region=CONF.identity.region,
-            client_parameters=self._prepare_configuration())
+            client_parameters=self._prepare_configuration(),
+            http_keep_alive=CONF.service_clients.http_keep_alive,
+            http_pool_size=CONF.service_clients.http_pool_size,
+            http_pool_idle_timeout=CONF.service_clients.http_pool_idle_timeout,
+            rate_limit=self.default_params['rate_limit'],
+            rate_limit_burst=self.default_params['rate_limit_burst'],
+            rate_limit_lock_path=self.default_params['rate_limit_lock_path'],
+            token_cache=get_token_cache())
+        if CONF.auth.background_token_refresh:
+            self.auth_provider.start_refresher()
         # TODO(andreaf) When clients are initialised without the right
         # parameters available, the calls below will trigger a KeyError.
         # We should catch that and raise a better error.
+        # NOTE: Clients are only registered here, each one is instantiated
+        # the first time a test uses it.
         self._set_compute_clients()
         self._set_identity_clients()
         self._set_volume_clients()
@@ -73,13 +92,15 @@ class Manager(service_clients.ServiceClients):
         self._set_image_clients()
         self._set_network_clients()
 
-        self.baremetal_client = baremetal.BaremetalClient(
+        self.register_client(
+            'baremetal_client', baremetal.BaremetalClient,
             self.auth_provider,
             CONF.baremetal.catalog_type,
             CONF.identity.region,
             endpoint_type=CONF.baremetal.endpoint_type,
             **self.default_params_with_timeout_values)
-        self.orchestration_client = orchestration.OrchestrationClient(
+        self.register_client(
+            'orchestration_client', orchestration.OrchestrationClient,
             self.auth_provider,
             CONF.orchestration.catalog_type,
             CONF.orchestration.region or CONF.identity.region,
@@ -87,13 +108,15 @@ class Manager(service_clients.ServiceClients):
             build_interval=CONF.orchestration.build_interval,
             build_timeout=CONF.orchestration.build_timeout,
             **self.default_params)
-        self.data_processing_client = data_processing.DataProcessingClient(
+        self.register_client(
+            'data_processing_client', data_processing.DataProcessingClient,
             self.auth_provider,
             CONF.data_processing.catalog_type,
             CONF.identity.region,
             endpoint_type=CONF.data_processing.endpoint_type,
             **self.default_params_with_timeout_values)
-        self.negative_client = negative_rest_client.NegativeRestClient(
+        self.register_client(
+            'negative_client', negative_rest_client.NegativeRestClient,
             self.auth_provider, service, **self.default_params)
 
     def _prepare_configuration(self):
@@ -126,119 +149,88 @@ class Manager(service_clients.ServiceClients):
 
         return configuration
 
+    def _register_clients(self, clients, params):
+        """Register clients which only take the auth provider and params
+
+        :param clients: A list of (attribute name, client class) tuples
+        :param params: The parameters of the clients
+        """
+        for name, client_class in clients:
+            self.register_client(name, client_class, self.auth_provider,
+                                 **params)
+
     def _set_network_clients(self):
-        params = self.parameters['network']
-        self.network_agents_client = network.AgentsClient(
-            self.auth_provider, **params)
-        self.network_extensions_client = network.ExtensionsClient(
-            self.auth_provider, **params)
-        self.networks_client = network.NetworksClient(
-            self.auth_provider, **params)
-        self.subnetpools_client = network.SubnetpoolsClient(
-            self.auth_provider, **params)
-        self.subnets_client = network.SubnetsClient(
-            self.auth_provider, **params)
-        self.ports_client = network.PortsClient(
-            self.auth_provider, **params)
-        self.network_quotas_client = network.QuotasClient(
-            self.auth_provider, **params)
-        self.floating_ips_client = network.FloatingIPsClient(
-            self.auth_provider, **params)
-        self.metering_labels_client = network.MeteringLabelsClient(
-            self.auth_provider, **params)
-        self.metering_label_rules_client = network.MeteringLabelRulesClient(
-            self.auth_provider, **params)
-        self.routers_client = network.RoutersClient(
-            self.auth_provider, **params)
-        self.security_group_rules_client = network.SecurityGroupRulesClient(
-            self.auth_provider, **params)
-        self.security_groups_client = network.SecurityGroupsClient(
-            self.auth_provider, **params)
-        self.network_versions_client = network.NetworkVersionsClient(
-            self.auth_provider, **params)
+        self._register_clients([
+            ('network_agents_client', network.AgentsClient),
+            ('network_extensions_client', network.ExtensionsClient),
+            ('networks_client', network.NetworksClient),
+            ('subnetpools_client', network.SubnetpoolsClient),
+            ('subnets_client', network.SubnetsClient),
+            ('ports_client', network.PortsClient),
+            ('network_quotas_client', network.QuotasClient),
+            ('floating_ips_client', network.FloatingIPsClient),
+            ('metering_labels_client', network.MeteringLabelsClient),
+            ('metering_label_rules_client', network.MeteringLabelRulesClient),
+            ('routers_client', network.RoutersClient),
+            ('security_group_rules_client', network.SecurityGroupRulesClient),
+            ('security_groups_client', network.SecurityGroupsClient),
+            ('network_versions_client', network.NetworkVersionsClient),
+        ], self.parameters['network'])
 
     def _set_image_clients(self):
         if CONF.service_available.glance:
-            params = self.parameters['image']
-            self.image_client = image.v1.ImagesClient(
-                self.auth_provider, **params)
-            self.image_member_client = image.v1.ImageMembersClient(
-                self.auth_provider, **params)
-
-            self.image_client_v2 = image.v2.ImagesClient(
-                self.auth_provider, **params)
-            self.image_member_client_v2 = image.v2.ImageMembersClient(
-                self.auth_provider, **params)
-            self.namespaces_client = image.v2.NamespacesClient(
-                self.auth_provider, **params)
-            self.resource_types_client = image.v2.ResourceTypesClient(
-                self.auth_provider, **params)
-            self.schemas_client = image.v2.SchemasClient(
-                self.auth_provider, **params)
+            self._register_clients([
+                ('image_client', image.v1.ImagesClient),
+                ('image_member_client', image.v1.ImageMembersClient),
+                ('image_client_v2', image.v2.ImagesClient),
+                ('image_member_client_v2', image.v2.ImageMembersClient),
+                ('namespaces_client', image.v2.NamespacesClient),
+                ('resource_types_client', image.v2.ResourceTypesClient),
+                ('schemas_client', image.v2.SchemasClient),
+            ], self.parameters['image'])
 
     def _set_compute_clients(self):
         params = self.parameters['compute']
 
-        self.agents_client = compute.AgentsClient(self.auth_provider, **params)
-        self.compute_networks_client = compute.NetworksClient(
-            self.auth_provider, **params)
-        self.migrations_client = compute.MigrationsClient(self.auth_provider,
-                                                          **params)
-        self.security_group_default_rules_client = (
-            compute.SecurityGroupDefaultRulesClient(self.auth_provider,
-                                                    **params))
-        self.certificates_client = compute.CertificatesClient(
-            self.auth_provider, **params)
-        self.servers_client = compute.ServersClient(
-            self.auth_provider,
-            enable_instance_password=CONF.compute_feature_enabled
-                .enable_instance_password,
-            **params)
-        self.server_groups_client = compute.ServerGroupsClient(
-            self.auth_provider, **params)
-        self.limits_client = compute.LimitsClient(self.auth_provider, **params)
-        self.compute_images_client = compute.ImagesClient(self.auth_provider,
-                                                          **params)
-        self.keypairs_client = compute.KeyPairsClient(self.auth_provider,
-                                                      **params)
-        self.quotas_client = compute.QuotasClient(self.auth_provider, **params)
-        self.quota_classes_client = compute.QuotaClassesClient(
-            self.auth_provider, **params)
-        self.flavors_client = compute.FlavorsClient(self.auth_provider,
-                                                    **params)
-        self.extensions_client = compute.ExtensionsClient(self.auth_provider,
-                                                          **params)
-        self.floating_ip_pools_client = compute.FloatingIPPoolsClient(
-            self.auth_provider, **params)
-        self.floating_ips_bulk_client = compute.FloatingIPsBulkClient(
-            self.auth_provider, **params)
-        self.compute_floating_ips_client = compute.FloatingIPsClient(
-            self.auth_provider, **params)
-        self.compute_security_group_rules_client = (
-            compute.SecurityGroupRulesClient(self.auth_provider, **params))
-        self.compute_security_groups_client = compute.SecurityGroupsClient(
-            self.auth_provider, **params)
-        self.interfaces_client = compute.InterfacesClient(self.auth_provider,
-                                                          **params)
-        self.fixed_ips_client = compute.FixedIPsClient(self.auth_provider,
-                                                       **params)
-        self.availability_zone_client = compute.AvailabilityZoneClient(
-            self.auth_provider, **params)
-        self.aggregates_client = compute.AggregatesClient(self.auth_provider,
-                                                          **params)
-        self.services_client = compute.ServicesClient(self.auth_provider,
-                                                      **params)
-        self.tenant_usages_client = compute.TenantUsagesClient(
-            self.auth_provider, **params)
-        self.hosts_client = compute.HostsClient(self.auth_provider, **params)
-        self.hypervisor_client = compute.HypervisorClient(self.auth_provider,
-                                                          **params)
-        self.instance_usages_audit_log_client = (
-            compute.InstanceUsagesAuditLogClient(self.auth_provider, **params))
-        self.tenant_networks_client = compute.TenantNetworksClient(
-            self.auth_provider, **params)
-        self.baremetal_nodes_client = compute.BaremetalNodesClient(
-            self.auth_provider, **params)
+        self._register_clients([
+            ('agents_client', compute.AgentsClient),
+            ('compute_networks_client', compute.NetworksClient),
+            ('migrations_client', compute.MigrationsClient),
+            ('security_group_default_rules_client',
+             compute.SecurityGroupDefaultRulesClient),
+            ('certificates_client', compute.CertificatesClient),
+            ('server_groups_client', compute.ServerGroupsClient),
+            ('limits_client', compute.LimitsClient),
+            ('compute_images_client', compute.ImagesClient),
+            ('keypairs_client', compute.KeyPairsClient),
+            ('quotas_client', compute.QuotasClient),
+            ('quota_classes_client', compute.QuotaClassesClient),
+            ('flavors_client', compute.FlavorsClient),
+            ('extensions_client', compute.ExtensionsClient),
+            ('floating_ip_pools_client', compute.FloatingIPPoolsClient),
+            ('floating_ips_bulk_client', compute.FloatingIPsBulkClient),
+            ('compute_floating_ips_client', compute.FloatingIPsClient),
+            ('compute_security_group_rules_client',
+             compute.SecurityGroupRulesClient),
+            ('compute_security_groups_client', compute.SecurityGroupsClient),
+            ('interfaces_client', compute.InterfacesClient),
+            ('fixed_ips_client', compute.FixedIPsClient),
+            ('availability_zone_client', compute.AvailabilityZoneClient),
+            ('aggregates_client', compute.AggregatesClient),
+            ('services_client', compute.ServicesClient),
+            ('tenant_usages_client', compute.TenantUsagesClient),
+            ('hosts_client', compute.HostsClient),
+            ('hypervisor_client', compute.HypervisorClient),
+            ('instance_usages_audit_log_client',
+             compute.InstanceUsagesAuditLogClient),
+            ('tenant_networks_client', compute.TenantNetworksClient),
+            ('baremetal_nodes_client', compute.BaremetalNodesClient),
+        ], params)
+        enable_instance_password = (
+            CONF.compute_feature_enabled.enable_instance_password)
+        self.register_client(
+            'servers_client', compute.ServersClient, self.auth_provider,
+            enable_instance_password=enable_instance_password, **params)
 
         # NOTE: The following client needs special timeout values because
         # the API is a proxy for the other component.
@@ -248,12 +240,11 @@ class Manager(service_clients.ServiceClients):
             _value = self.parameters['volume'].get(_key)
             if _value:
                 params_volume[_key] = _value
-        self.volumes_extensions_client = compute.VolumesClient(
-            self.auth_provider, **params_volume)
-        self.compute_versions_client = compute.VersionsClient(
-            self.auth_provider, **params_volume)
-        self.snapshots_extensions_client = compute.SnapshotsClient(
-            self.auth_provider, **params_volume)
+        self._register_clients([
+            ('volumes_extensions_client', compute.VolumesClient),
+            ('compute_versions_client', compute.VersionsClient),
+            ('snapshots_extensions_client', compute.SnapshotsClient),
+        ], params_volume)
 
     def _set_identity_clients(self):
         params = self.parameters['identity']
@@ -261,72 +252,59 @@ class Manager(service_clients.ServiceClients):
         # Clients below use the admin endpoint type of Keystone API v2
         params_v2_admin = copy.copy(params)
         params_v2_admin['endpoint_type'] = CONF.identity.v2_admin_endpoint_type
-        self.endpoints_client = identity.v2.EndpointsClient(self.auth_provider,
-                                                            **params_v2_admin)
-        self.identity_client = identity.v2.IdentityClient(self.auth_provider,
-                                                          **params_v2_admin)
-        self.tenants_client = identity.v2.TenantsClient(self.auth_provider,
-                                                        **params_v2_admin)
-        self.roles_client = identity.v2.RolesClient(self.auth_provider,
-                                                    **params_v2_admin)
-        self.users_client = identity.v2.UsersClient(self.auth_provider,
-                                                    **params_v2_admin)
-        self.identity_services_client = identity.v2.ServicesClient(
-            self.auth_provider, **params_v2_admin)
+        self._register_clients([
+            ('endpoints_client', identity.v2.EndpointsClient),
+            ('identity_client', identity.v2.IdentityClient),
+            ('tenants_client', identity.v2.TenantsClient),
+            ('roles_client', identity.v2.RolesClient),
+            ('users_client', identity.v2.UsersClient),
+            ('identity_services_client', identity.v2.ServicesClient),
+        ], params_v2_admin)
 
         # Clients below use the public endpoint type of Keystone API v2
         params_v2_public = copy.copy(params)
         params_v2_public['endpoint_type'] = (
             CONF.identity.v2_public_endpoint_type)
-        self.identity_public_client = identity.v2.IdentityClient(
-            self.auth_provider, **params_v2_public)
-        self.tenants_public_client = identity.v2.TenantsClient(
-            self.auth_provider, **params_v2_public)
-        self.users_public_client = identity.v2.UsersClient(
-            self.auth_provider, **params_v2_public)
+        self._register_clients([
+            ('identity_public_client', identity.v2.IdentityClient),
+            ('tenants_public_client', identity.v2.TenantsClient),
+            ('users_public_client', identity.v2.UsersClient),
+        ], params_v2_public)
 
         # Clients below use the endpoint type of Keystone API v3, which is set
         # in endpoint_type
         params_v3 = copy.copy(params)
         params_v3['endpoint_type'] = CONF.identity.v3_endpoint_type
-        self.domains_client = identity.v3.DomainsClient(self.auth_provider,
-                                                        **params_v3)
-        self.identity_v3_client = identity.v3.IdentityClient(
-            self.auth_provider, **params_v3)
-        self.trusts_client = identity.v3.TrustsClient(self.auth_provider,
-                                                      **params_v3)
-        self.users_v3_client = identity.v3.UsersClient(self.auth_provider,
-                                                       **params_v3)
-        self.endpoints_v3_client = identity.v3.EndPointsClient(
-            self.auth_provider, **params_v3)
-        self.roles_v3_client = identity.v3.RolesClient(self.auth_provider,
-                                                       **params_v3)
-        self.identity_services_v3_client = identity.v3.ServicesClient(
-            self.auth_provider, **params_v3)
-        self.policies_client = identity.v3.PoliciesClient(self.auth_provider,
-                                                          **params_v3)
-        self.projects_client = identity.v3.ProjectsClient(self.auth_provider,
-                                                          **params_v3)
-        self.regions_client = identity.v3.RegionsClient(self.auth_provider,
-                                                        **params_v3)
-        self.credentials_client = identity.v3.CredentialsClient(
-            self.auth_provider, **params_v3)
-        self.groups_client = identity.v3.GroupsClient(self.auth_provider,
-                                                      **params_v3)
+        self._register_clients([
+            ('domains_client', identity.v3.DomainsClient),
+            ('identity_v3_client', identity.v3.IdentityClient),
+            ('trusts_client', identity.v3.TrustsClient),
+            ('users_v3_client', identity.v3.UsersClient),
+            ('endpoints_v3_client', identity.v3.EndPointsClient),
+            ('roles_v3_client', identity.v3.RolesClient),
+            ('identity_services_v3_client', identity.v3.ServicesClient),
+            ('policies_client', identity.v3.PoliciesClient),
+            ('projects_client', identity.v3.ProjectsClient),
+            ('regions_client', identity.v3.RegionsClient),
+            ('credentials_client', identity.v3.CredentialsClient),
+            ('groups_client', identity.v3.GroupsClient),
+        ], params_v3)
 
         # Token clients do not use the catalog. They only need default_params.
         # They read auth_url, so they should only be set if the corresponding
         # API version is marked as enabled
         if CONF.identity_feature_enabled.api_v2:
             if CONF.identity.uri:
-                self.token_client = identity.v2.TokenClient(
+                self.register_client(
+                    'token_client', identity.v2.TokenClient,
                     CONF.identity.uri, **self.default_params)
             else:
                 msg = 'Identity v2 API enabled, but no identity.uri set'
                 raise exceptions.InvalidConfiguration(msg)
         if CONF.identity_feature_enabled.api_v3:
             if CONF.identity.uri_v3:
-                self.token_v3_client = identity.v3.V3TokenClient(
+                self.register_client(
+                    'token_v3_client', identity.v3.V3TokenClient,
                     CONF.identity.uri_v3, **self.default_params)
             else:
                 msg = 'Identity v3 API enabled, but no identity.uri_v3 set'
@@ -336,61 +314,43 @@ class Manager(service_clients.ServiceClients):
         # Mandatory parameters (always defined)
         params = self.parameters['volume']
 
-        self.volume_qos_client = volume.v1.QosSpecsClient(self.auth_provider,
-                                                          **params)
-        self.volume_qos_v2_client = volume.v2.QosSpecsClient(
-            self.auth_provider, **params)
-        self.volume_services_client = volume.v1.ServicesClient(
-            self.auth_provider, **params)
-        self.volume_services_v2_client = volume.v2.ServicesClient(
-            self.auth_provider, **params)
-        self.backups_client = volume.v1.BackupsClient(self.auth_provider,
-                                                      **params)
-        self.backups_v2_client = volume.v2.BackupsClient(self.auth_provider,
-                                                         **params)
-        self.snapshots_client = volume.v1.SnapshotsClient(self.auth_provider,
-                                                          **params)
-        self.snapshots_v2_client = volume.v2.SnapshotsClient(
-            self.auth_provider, **params)
-        self.volumes_client = volume.v1.VolumesClient(
-            self.auth_provider, default_volume_size=CONF.volume.volume_size,
-            **params)
-        self.volumes_v2_client = volume.v2.VolumesClient(
-            self.auth_provider, default_volume_size=CONF.volume.volume_size,
-            **params)
-        self.volume_messages_client = volume.v3.MessagesClient(
-            self.auth_provider, **params)
-        self.volume_types_client = volume.v1.TypesClient(self.auth_provider,
-                                                         **params)
-        self.volume_types_v2_client = volume.v2.TypesClient(self.auth_provider,
-                                                            **params)
-        self.volume_hosts_client = volume.v1.HostsClient(self.auth_provider,
-                                                         **params)
-        self.volume_hosts_v2_client = volume.v2.HostsClient(self.auth_provider,
-                                                            **params)
-        self.volume_quotas_client = volume.v1.QuotasClient(self.auth_provider,
-                                                           **params)
-        self.volume_quotas_v2_client = volume.v2.QuotasClient(
-            self.auth_provider, **params)
-        self.volumes_extension_client = volume.v1.ExtensionsClient(
-            self.auth_provider, **params)
-        self.volumes_v2_extension_client = volume.v2.ExtensionsClient(
-            self.auth_provider, **params)
-        self.volume_availability_zone_client = \
-            volume.v1.AvailabilityZoneClient(self.auth_provider, **params)
-        self.volume_v2_availability_zone_client = \
-            volume.v2.AvailabilityZoneClient(self.auth_provider, **params)
+        self._register_clients([
+            ('volume_qos_client', volume.v1.QosSpecsClient),
+            ('volume_qos_v2_client', volume.v2.QosSpecsClient),
+            ('volume_services_client', volume.v1.ServicesClient),
+            ('volume_services_v2_client', volume.v2.ServicesClient),
+            ('backups_client', volume.v1.BackupsClient),
+            ('backups_v2_client', volume.v2.BackupsClient),
+            ('snapshots_client', volume.v1.SnapshotsClient),
+            ('snapshots_v2_client', volume.v2.SnapshotsClient),
+            ('volume_messages_client', volume.v3.MessagesClient),
+            ('volume_types_client', volume.v1.TypesClient),
+            ('volume_types_v2_client', volume.v2.TypesClient),
+            ('volume_hosts_client', volume.v1.HostsClient),
+            ('volume_hosts_v2_client', volume.v2.HostsClient),
+            ('volume_quotas_client', volume.v1.QuotasClient),
+            ('volume_quotas_v2_client', volume.v2.QuotasClient),
+            ('volumes_extension_client', volume.v1.ExtensionsClient),
+            ('volumes_v2_extension_client', volume.v2.ExtensionsClient),
+            ('volume_availability_zone_client',
+             volume.v1.AvailabilityZoneClient),
+            ('volume_v2_availability_zone_client',
+             volume.v2.AvailabilityZoneClient),
+        ], params)
+        self.register_client(
+            'volumes_client', volume.v1.VolumesClient, self.auth_provider,
+            default_volume_size=CONF.volume.volume_size, **params)
+        self.register_client(
+            'volumes_v2_client', volume.v2.VolumesClient, self.auth_provider,
+            default_volume_size=CONF.volume.volume_size, **params)
 
     def _set_object_storage_clients(self):
         # Mandatory parameters (always defined)
-        params = self.parameters['object-storage']
-
-        self.account_client = object_storage.AccountClient(self.auth_provider,
-                                                           **params)
-        self.container_client = object_storage.ContainerClient(
-            self.auth_provider, **params)
-        self.object_client = object_storage.ObjectClient(self.auth_provider,
-                                                         **params)
+        self._register_clients([
+            ('account_client', object_storage.AccountClient),
+            ('container_client', object_storage.ContainerClient),
+            ('object_client', object_storage.ObjectClient),
+        ], self.parameters['object-storage'])
 
 
 def get_auth_provider_class(credentials):
@@ -400,6 +360,92 @@ def get_auth_provider_class(credentials):
         return auth.KeystoneV2AuthProvider, CONF.identity.uri
 
 
+def get_token_cache():
+    """Return the token cache shared by the test workers, if enabled"""
+    if not CONF.auth.shared_token_cache:
+        return None
+    return token_cache.TokenCache(
+        os.path.join(lockutils.get_lock_path(CONF), 'token_cache'))
+
+
+class ManagerCache(object):
+    """Least recently used cache of client managers
+
+    Test classes getting the same credentials, as happens with
+    pre-provisioned credentials, reuse the manager, and so the auth provider
+    and the service clients, created for the first one.
+
+    :param size: The maximum number of managers kept
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self._managers = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _credentials_key(credentials):
+        return (credentials.__class__.__name__,
+                tuple(getattr(credentials, attr)
+                      for attr in credentials.ATTRIBUTES))
+
+    def get_manager(self, manager_class, credentials, service=None,
+                    scope='project'):
+        """Return a cached manager, creating it if needed
+
+        :param manager_class: The class of the manager, e.g. `Manager`
+        :param credentials: The credentials of the manager
+        :param service: The service of the manager
+        :param scope: The scope of the tokens of the manager
+        :return: an instance of manager_class
+        """
+        key = (manager_class, self._credentials_key(credentials), service,
+               scope)
+        with self._lock:
+            manager = self._managers.pop(key, None)
+            if manager is not None:
+                self._managers[key] = manager
+                return manager
+        manager = manager_class(credentials=credentials, service=service,
+                                scope=scope)
+        with self._lock:
+            self._managers[key] = manager
+            evicted = []
+            while len(self._managers) > self.size:
+                evicted.append(self._managers.popitem(last=False)[1])
+        for old_manager in evicted:
+            release_manager(old_manager)
+        return manager
+
+    def evict(self, credentials):
+        """Remove the managers of credentials which are no longer valid"""
+        credentials_key = self._credentials_key(credentials)
+        with self._lock:
+            keys = [key for key in self._managers
+                    if key[1] == credentials_key]
+            evicted = [self._managers.pop(key) for key in keys]
+        for manager in evicted:
+            release_manager(manager)
+
+
+def release_manager(manager):
+    """Stop the background work of a manager which is no longer used"""
+    stop_refresher = getattr(manager.auth_provider, 'stop_refresher', None)
+    if stop_refresher is not None:
+        stop_refresher()
+
+
+def get_manager_cache():
+    """Return the client manager cache of the process, if enabled"""
+    global _manager_cache
+    if not CONF.auth.client_manager_cache_size:
+        return None
+    with _manager_cache_lock:
+        if _manager_cache is None:
+            _manager_cache = ManagerCache(CONF.auth.client_manager_cache_size)
+        return _manager_cache
+
+
 def get_auth_provider(credentials, pre_auth=False, scope='project'):
     # kwargs for auth provider match the common ones used by service clients
     default_params = config.service_client_config()
@@ -410,7 +456,10 @@ def get_auth_provider(credentials, pre_auth=False, scope='project'):
         credentials)
     _auth_provider = auth_provider_class(credentials, auth_url,
                                          scope=scope,
+                                         token_cache=get_token_cache(),
                                          **default_params)
     if pre_auth:
         _auth_provider.set_auth()
+    if CONF.auth.background_token_refresh:
+        _auth_provider.start_refresher()
     return _auth_provider
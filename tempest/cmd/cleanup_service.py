@@ -18,6 +18,7 @@ from oslo_log import log as logging
 
 from tempest.common import credentials_factory as credentials
 from tempest.common import identity
+from tempest.common import waiters
 from tempest import config
 from tempest import test
 
@@ -84,15 +85,10 @@ def _get_network_id(net_name, project_name):
     net_cl = am.networks_client
     tn_cl = am.tenants_client
 
-    networks = net_cl.list_networks()
     tenant = identity.get_tenant_by_name(tn_cl, project_name)
-    t_id = tenant['id']
-    n_id = None
-    for net in networks['networks']:
-        if (net['tenant_id'] == t_id and net['name'] == net_name):
-            n_id = net['id']
-            break
-    return n_id
+    networks = net_cl.list_networks(tenant_id=tenant['id'], name=net_name,
+                                    fields=['id'])['networks']
+    return networks[0]['id'] if networks else None
 
 
 class BaseService(object):
@@ -128,6 +124,16 @@ class BaseService(object):
     def save_state(self):
         pass
 
+    def _wait_for_deletions(self, futures):
+        # Deletions are waited for, so that the resources which depend on
+        # the deleted ones can be deleted afterwards
+        for future in futures:
+            try:
+                future.result()
+            except Exception:
+                LOG.exception("Wait for deletion of %s exception.",
+                              future.resource_id)
+
     def run(self):
         if self.is_dry_run:
             self.dry_run()
@@ -171,19 +177,23 @@ class ServerService(BaseService):
 
     def list(self):
         client = self.client
-        servers_body = client.list_servers()
-        servers = servers_body['servers']
+        servers = list(client.iter_servers())
         LOG.debug("List count, %s Servers" % len(servers))
         return servers
 
     def delete(self):
         client = self.client
         servers = self.list()
+        futures = []
         for server in servers:
             try:
                 client.delete_server(server['id'])
             except Exception:
                 LOG.exception("Delete Server exception.")
+            else:
+                futures.append(waiters.submit_server_termination(
+                    client, server['id'], ignore_error=True))
+        self._wait_for_deletions(futures)
 
     def dry_run(self):
         servers = self.list()
@@ -321,18 +331,23 @@ class VolumeService(BaseService):
 
     def list(self):
         client = self.client
-        vols = client.list_volumes()['volumes']
+        vols = list(client.iter_volumes())
         LOG.debug("List count, %s Volumes" % len(vols))
         return vols
 
     def delete(self):
         client = self.client
         vols = self.list()
+        futures = []
         for v in vols:
             try:
                 client.delete_volume(v['id'])
             except Exception:
                 LOG.exception("Delete Volume exception.")
+            else:
+                futures.append(waiters.submit_volume_deletion(client,
+                                                              v['id']))
+        self._wait_for_deletions(futures)
 
     def dry_run(self):
         vols = self.list()
@@ -397,8 +412,8 @@ class NetworkService(BaseService):
 
     def list(self):
         client = self.networks_client
-        networks = client.list_networks(**self.tenant_filter)
-        networks = networks['networks']
+        networks = list(client.iter_networks(fields=['id', 'name'],
+                                             **self.tenant_filter))
         # filter out networks declared in tempest.conf
         if self.is_preserve:
             networks = [network for network in networks
@@ -424,8 +439,7 @@ class NetworkFloatingIpService(NetworkService):
 
     def list(self):
         client = self.floating_ips_client
-        flips = client.list_floatingips(**self.tenant_filter)
-        flips = flips['floatingips']
+        flips = list(client.iter_floatingips(**self.tenant_filter))
         LOG.debug("List count, %s Network Floating IPs" % len(flips))
         return flips
 
@@ -447,8 +461,8 @@ class NetworkRouterService(NetworkService):
 
     def list(self):
         client = self.routers_client
-        routers = client.list_routers(**self.tenant_filter)
-        routers = routers['routers']
+        routers = list(client.iter_routers(fields=['id', 'name'],
+                                           **self.tenant_filter))
         if self.is_preserve:
             routers = [router for router in routers
                        if router['id'] != CONF_PUB_ROUTER]
@@ -464,7 +478,9 @@ class NetworkRouterService(NetworkService):
             try:
                 rid = router['id']
                 ports = [port for port
-                         in ports_client.list_ports(device_id=rid)['ports']
+                         in ports_client.list_ports(
+                             device_id=rid,
+                             fields=['id', 'device_owner'])['ports']
                          if port["device_owner"] == "network:router_interface"]
                 for port in ports:
                     client.remove_router_interface(rid, port_id=port['id'])
@@ -626,7 +642,9 @@ class NetworkPortService(NetworkService):
     def list(self):
         client = self.ports_client
         ports = [port for port in
-                 client.list_ports(**self.tenant_filter)['ports']
+                 client.iter_ports(
+                     fields=['id', 'name', 'device_owner', 'network_id'],
+                     **self.tenant_filter)
                  if port["device_owner"] == "" or
                  port["device_owner"].startswith("compute:")]
 
@@ -656,7 +674,7 @@ class NetworkSecGroupService(NetworkService):
         filter = self.tenant_filter
         # cannot delete default sec group so never show it.
         secgroups = [secgroup for secgroup in
-                     client.list_security_groups(**filter)['security_groups']
+                     client.iter_security_groups(**filter)
                      if secgroup['name'] != 'default']
 
         if self.is_preserve:
@@ -682,8 +700,8 @@ class NetworkSubnetService(NetworkService):
 
     def list(self):
         client = self.subnets_client
-        subnets = client.list_subnets(**self.tenant_filter)
-        subnets = subnets['subnets']
+        subnets = list(client.iter_subnets(
+            fields=['id', 'name', 'network_id'], **self.tenant_filter))
         if self.is_preserve:
             subnets = self._filter_by_conf_networks(subnets)
         LOG.debug("List count, %s Subnets" % len(subnets))
@@ -793,7 +811,7 @@ class UserService(BaseService):
         self.client = manager.users_client
 
     def list(self):
-        users = self.client.list_users()['users']
+        users = list(self.client.iter_users())
 
         if not self.is_save_state:
             users = [user for user in users if user['id']
@@ -876,7 +894,7 @@ class TenantService(BaseService):
         self.client = manager.tenants_client
 
     def list(self):
-        tenants = self.client.list_tenants()['tenants']
+        tenants = list(self.client.iter_tenants())
         if not self.is_save_state:
             tenants = [tenant for tenant in tenants if (tenant['id']
                        not in self.saved_state_json['tenants'].keys()
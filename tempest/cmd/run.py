@@ -78,11 +78,23 @@ By default tempest run's output to STDOUT will be generated using the
 subunit-trace output filter. But, if you would prefer a subunit v2 stream be
 output to STDOUT use the **--subunit** flag
 
+Request Metrics
+===============
+With the **--metrics-report** option each test worker records the latency,
+status, size and retries of the API requests it sends, and at the end of the
+run the metrics of all the workers are merged into a report with the count
+and the p50/p95/p99 latencies of every service, method and URL template. The
+report is written in CSV if the file name ends with ``.csv``, in JSON
+otherwise.
+
 """
 
+import glob
 import io
 import os
+import shutil
 import sys
+import tempfile
 import threading
 
 from cliff import command
@@ -93,6 +105,7 @@ from testrepository.commands import run_argv
 from tempest.cmd import init
 from tempest.cmd import workspace
 from tempest import config
+from tempest.lib.common import metrics
 
 
 CONF = config.CONF
@@ -126,6 +139,10 @@ class TempestRun(command.Command):
 
     def take_action(self, parsed_args):
         returncode = 0
+        metrics_report = None
+        if parsed_args.metrics_report:
+            # The run may change the working directory
+            metrics_report = os.path.abspath(parsed_args.metrics_report)
         if parsed_args.config_file:
             self._set_env(parsed_args.config_file)
         else:
@@ -159,9 +176,22 @@ class TempestRun(command.Command):
             returncode = run_argv(argv, sys.stdin, sys.stdout, sys.stderr)
         else:
             options = self._build_options(parsed_args)
+            if metrics_report:
+                metrics_dir = tempfile.mkdtemp(prefix='tempest-metrics-')
+                os.environ[metrics.METRICS_DIR_ENV] = metrics_dir
             returncode = self._run(regex, options)
+            if metrics_report:
+                self._write_metrics_report(metrics_dir, metrics_report)
         sys.exit(returncode)
 
+    def _write_metrics_report(self, metrics_dir, path):
+        try:
+            stats = metrics.load_stats(
+                glob.glob(os.path.join(metrics_dir, 'worker-*.json')))
+            metrics.write_report(stats, path)
+        finally:
+            shutil.rmtree(metrics_dir, ignore_errors=True)
+
     def get_description(self):
         return 'Run tempest'
 
@@ -218,6 +248,11 @@ class TempestRun(command.Command):
         # output args
         parser.add_argument("--subunit", action='store_true',
                             help='Enable subunit v2 output')
+        parser.add_argument('--metrics-report', default=None,
+                            dest='metrics_report',
+                            help='Path of a JSON or CSV report of the API '
+                                 'request metrics of the run, the format '
+                                 'is CSV if the path ends with .csv')
 
         parser.set_defaults(parallel=True)
         return parser
@@ -0,0 +1,141 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Aggregates the waiter timelines of tempest runs
+
+Every tempest test attaches the state transitions seen by its waiters, such
+as the BUILD and ACTIVE statuses of a server with the time each was first
+seen, to its result as the ``waiter-timeline`` subunit detail. The first
+test of each class also attaches the ones seen by the setUpClass of the
+class, as the ``waiter-timeline-setup-class`` detail. This command reads
+the subunit v2 streams of one or more runs and reports, for each type of
+resource and transition, e.g. server BUILD -> ACTIVE or volume attaching ->
+in-use, the number of transitions seen and the distribution of their
+latency in seconds. Comparing the reports of runs shows where a cloud got
+slower.
+
+**Usage:** ``tempest waiter-timelines [--output <report>] <subunit stream>...``
+
+The streams can be the ones of a testrepository, e.g. ``.testrepository/0``,
+or the output of ``tempest run --subunit``. Without ``--output`` the report
+is printed as a table, else it is written in CSV if the file name ends with
+``.csv``, in JSON otherwise.
+"""
+
+import csv
+import json
+
+from cliff import command
+import prettytable
+import subunit
+import testtools
+
+from tempest.common import timeline
+
+REPORT_FIELDS = ('resource', 'from', 'to', 'count', 'min', 'mean', 'p50',
+                 'p95', 'p99', 'max')
+
+
+class TimelineCollector(testtools.TestResult):
+    """Collect the waiter timelines attached to test results"""
+
+    def __init__(self):
+        super(TimelineCollector, self).__init__()
+        self.timelines = []
+
+    def _collect(self, details):
+        for name in (timeline.CLASS_DETAIL_NAME, timeline.DETAIL_NAME):
+            if details and name in details:
+                data = b''.join(details[name].iter_bytes())
+                self.timelines.append(json.loads(data.decode('utf-8')))
+
+    def addSuccess(self, test, details=None):
+        self._collect(details)
+
+    def addSkip(self, test, reason=None, details=None):
+        self._collect(details)
+
+    def addError(self, test, err=None, details=None):
+        self._collect(details)
+
+    def addFailure(self, test, err=None, details=None):
+        self._collect(details)
+
+
+def load_timelines(paths):
+    """Return the waiter timelines found in subunit v2 streams"""
+    collector = TimelineCollector()
+    result = testtools.StreamToExtendedDecorator(collector)
+    result.startTestRun()
+    for path in paths:
+        with open(path, 'rb') as stream:
+            subunit.ByteStreamToStreamResult(stream).run(result)
+    result.stopTestRun()
+    return collector.timelines
+
+
+def _seconds(value):
+    return None if value is None else round(value, 3)
+
+
+def report_rows(stats):
+    """Return the report rows of transition stats, most frequent first"""
+    rows = []
+    for (resource, from_state, to_state), latency in stats.items():
+        rows.append({
+            'resource': resource, 'from': from_state, 'to': to_state,
+            'count': latency.count,
+            'min': _seconds(latency.min), 'mean': _seconds(latency.mean()),
+            'p50': _seconds(latency.percentile(50)),
+            'p95': _seconds(latency.percentile(95)),
+            'p99': _seconds(latency.percentile(99)),
+            'max': _seconds(latency.max)})
+    rows.sort(key=lambda row: (-row['count'], row['resource'],
+                               row['from'], row['to']))
+    return rows
+
+
+class TempestWaiterTimelines(command.Command):
+
+    def get_parser(self, prog_name):
+        parser = super(TempestWaiterTimelines, self).get_parser(prog_name)
+        parser.add_argument('streams', nargs='+', metavar='<subunit stream>',
+                            help='Subunit v2 streams of tempest runs')
+        parser.add_argument('--output', '-o', default=None,
+                            help='Path of a JSON or CSV report, the format '
+                                 'is CSV if the path ends with .csv')
+        return parser
+
+    def get_description(self):
+        return ('Report the latency of the state transitions seen by the '
+                'waiters of tempest runs')
+
+    def take_action(self, parsed_args):
+        stats = timeline.transition_stats(
+            load_timelines(parsed_args.streams))
+        rows = report_rows(stats)
+        path = parsed_args.output
+        if path is None:
+            output = prettytable.PrettyTable(
+                [field.capitalize() for field in REPORT_FIELDS])
+            for row in rows:
+                output.add_row([row[field] for field in REPORT_FIELDS])
+            print(output)
+        elif path.lower().endswith('.csv'):
+            with open(path, 'w') as f:
+                writer = csv.DictWriter(f, fieldnames=REPORT_FIELDS)
+                writer.writeheader()
+                writer.writerows(rows)
+        else:
+            with open(path, 'w') as f:
+                json.dump(rows, f, indent=2)
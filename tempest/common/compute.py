@@ -143,28 +143,33 @@ def create_test_server(clients, validatable=False, validation_resources=None,
     assoc = clients.compute_floating_ips_client.associate_floating_ip_to_server
 
     if wait_until:
-        for server in servers:
-            try:
+        try:
+            if multiple_create_request:
+                # Poll all the servers with one list call per status check
+                waiters.wait_for_servers_status(
+                    clients.servers_client, [s['id'] for s in servers],
+                    wait_until, name=name)
+            else:
                 waiters.wait_for_server_status(
-                    clients.servers_client, server['id'], wait_until)
-
-                # Multiple validatable servers are not supported for now. Their
-                # creation will fail with the condition above (l.58).
-                if CONF.validation.run_validation and validatable:
-                    if CONF.validation.connect_method == 'floating':
-                        assoc(floating_ip=validation_resources[
-                              'floating_ip']['ip'],
-                              server_id=servers[0]['id'])
-
-            except Exception:
-                with excutils.save_and_reraise_exception():
-                    for server in servers:
-                        try:
-                            clients.servers_client.delete_server(
-                                server['id'])
-                        except Exception:
-                            LOG.exception('Deleting server %s failed'
-                                          % server['id'])
+                    clients.servers_client, servers[0]['id'], wait_until)
+
+            # Multiple validatable servers are not supported for now. Their
+            # creation will fail with the condition above (l.58).
+            if CONF.validation.run_validation and validatable:
+                if CONF.validation.connect_method == 'floating':
+                    assoc(floating_ip=validation_resources[
+                          'floating_ip']['ip'],
+                          server_id=servers[0]['id'])
+
+        except Exception:
+            with excutils.save_and_reraise_exception():
+                for server in servers:
+                    try:
+                        clients.servers_client.delete_server(
+                            server['id'])
+                    except Exception:
+                        LOG.exception('Deleting server %s failed'
+                                      % server['id'])
 
     return body, servers
 
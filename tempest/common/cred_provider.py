@@ -22,6 +22,10 @@ from tempest.lib import exceptions
 
 @six.add_metaclass(abc.ABCMeta)
 class CredentialProvider(object):
+    # True if clear_creds deletes the credentials provided, False if it
+    # only releases them so that they can be provided again
+    deletes_creds = False
+
     def __init__(self, identity_version, name=None, network_resources=None,
                  credentials_domain=None, admin_role=None):
         """A CredentialProvider supplies credentials to test classes.
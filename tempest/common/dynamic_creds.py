@@ -12,6 +12,9 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import atexit
+import threading
+
 import netaddr
 from oslo_log import log as logging
 import six
@@ -27,9 +30,158 @@ from tempest.lib import exceptions as lib_exc
 CONF = config.CONF
 LOG = logging.getLogger(__name__)
 
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(provider, roles=None):
+    """Return the credentials pool of the parameters of a provider
+
+    The pools are shared by all the providers of the process with the same
+    parameters and roles, and created by the first one asking for it,
+    unless the pool is disabled in the configuration.
+
+    :param provider: a DynamicCredentialProvider
+    :param list roles: The roles of the credentials of the pool, None for
+                       primary and alt credentials
+    :returns: a CredentialsPool, or None if the pool is disabled
+    """
+    if not CONF.auth.dynamic_credentials_pool_size:
+        return None
+    key = (provider.get_pool_key(), tuple(sorted(roles or [])))
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            if not _pools:
+                atexit.register(drain_pools)
+            builder = DynamicCredentialProvider(
+                identity_version=provider.identity_version,
+                name='tempest-pool',
+                network_resources=provider.network_resources,
+                credentials_domain=provider.credentials_domain,
+                admin_role=provider.admin_role,
+                admin_creds=provider.default_admin_creds)
+            builder.uses_pool = False
+            pool = _pools[key] = CredentialsPool(
+                builder, CONF.auth.dynamic_credentials_pool_size,
+                CONF.auth.dynamic_credentials_pool_threads, roles=roles)
+        return pool
+
+
+def drain_pools():
+    """Stop all the credentials pools and delete their credentials"""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.drain()
+
+
+class CredentialsPool(object):
+    """Dynamic credentials created in the background ahead of demand
+
+    Threads create primary credentials, or credentials with the given
+    roles, with their isolated network resources if any, until the pool
+    holds `size` of them. Each credentials taken from the pool are owned by
+    the provider taking them, which deletes them as usual; the pool deletes
+    the credentials left once drained.
+
+    :param builder: DynamicCredentialProvider creating the credentials
+    :param size: The number of credentials to keep ready
+    :param threads: The number of threads creating credentials
+    :param roles: The roles assigned to the users, like get_creds_by_roles
+    """
+
+    def __init__(self, builder, size, threads, roles=None):
+        self.builder = builder
+        self.size = size
+        self.roles = roles
+        self._creds = []
+        self._pending = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        self._clear_lock = threading.Lock()
+        self._threads = []
+        for i in range(threads):
+            thread = threading.Thread(target=self._fill,
+                                      name='dynamic-creds-pool-%d' % i)
+            thread.daemon = True
+            thread.start()
+            self._threads.append(thread)
+
+    def get(self):
+        """Take credentials from the pool, None if none are ready yet"""
+        with self._condition:
+            if not self._creds:
+                return None
+            credentials = self._creds.pop(0)
+            self._condition.notify()
+            return credentials
+
+    def drain(self):
+        """Stop creating credentials and delete the ones left"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        for thread in self._threads:
+            thread.join()
+        with self._condition:
+            credentials, self._creds = self._creds, []
+        self._clear(credentials)
+
+    def _fill(self):
+        while True:
+            with self._condition:
+                while (not self._closed and
+                       len(self._creds) + self._pending >= self.size):
+                    self._condition.wait()
+                if self._closed:
+                    return
+                self._pending += 1
+            try:
+                credentials = self._create()
+            except Exception:
+                LOG.exception('Failed to create dynamic credentials for the '
+                              'pool, no more will be created')
+                with self._condition:
+                    self._pending -= 1
+                    self._closed = True
+                    self._condition.notify_all()
+                return
+            with self._condition:
+                self._pending -= 1
+                self._creds.append(credentials)
+
+    def _create(self):
+        builder = self.builder
+        credentials = builder._create_creds(roles=self.roles)
+        if builder._creates_networks():
+            try:
+                network, subnet, router = builder._create_network_resources(
+                    credentials.tenant_id)
+            except Exception:
+                self._clear([credentials])
+                raise
+            credentials.set_resources(network=network, subnet=subnet,
+                                      router=router)
+        LOG.info("Created dynamic creds for the pool:\n credentials: %s"
+                 % credentials)
+        return credentials
+
+    def _clear(self, credentials):
+        # The builder deletes the credentials of its _creds
+        with self._clear_lock:
+            self.builder._creds = dict(
+                (str(i), creds) for i, creds in enumerate(credentials))
+            self.builder.clear_creds()
+
 
 class DynamicCredentialProvider(cred_provider.CredentialProvider):
 
+    deletes_creds = True
+    # Whether to take credentials from the pool of get_pool
+    uses_pool = True
+
     def __init__(self, identity_version, name=None, network_resources=None,
                  credentials_domain=None, admin_role=None, admin_creds=None):
         """Creates credentials dynamically for tests
@@ -277,28 +429,62 @@ class DynamicCredentialProvider(cred_provider.CredentialProvider):
         self.routers_admin_client.add_router_interface(router_id,
                                                        subnet_id=subnet_id)
 
+    def _creates_networks(self):
+        return (CONF.service_available.neutron and
+                not CONF.baremetal.driver_enabled and
+                CONF.auth.create_isolated_networks)
+
+    def get_pool_key(self):
+        """Return the key of the pool shared with the same providers"""
+        admin_creds = self.default_admin_creds
+        return (self.identity_version, self.credentials_domain,
+                self.admin_role,
+                tuple(sorted((self.network_resources or {}).items())),
+                tuple((attr, getattr(admin_creds, attr, None))
+                      for attr in sorted(admin_creds.get_init_attributes())))
+
+    def _get_pooled_creds(self, credential_type):
+        if not self.uses_pool:
+            return None
+        # Credentials with roles come from a pool of their own, so that
+        # they have exactly the roles requested
+        roles = None
+        if credential_type not in ['primary', 'alt']:
+            roles = credential_type
+        pool = get_pool(self, roles=roles)
+        if pool is None:
+            return None
+        credentials = pool.get()
+        if credentials is None:
+            return None
+        self._creds[str(credential_type)] = credentials
+        LOG.info("Acquired pooled dynamic creds:\n credentials: %s"
+                 % credentials)
+        return credentials
+
     def get_credentials(self, credential_type):
         if self._creds.get(str(credential_type)):
-            credentials = self._creds[str(credential_type)]
+            return self._creds[str(credential_type)]
+        if credential_type != 'admin':
+            credentials = self._get_pooled_creds(credential_type)
+            if credentials is not None:
+                return credentials
+        if credential_type in ['primary', 'alt', 'admin']:
+            is_admin = (credential_type == 'admin')
+            credentials = self._create_creds(admin=is_admin)
         else:
-            if credential_type in ['primary', 'alt', 'admin']:
-                is_admin = (credential_type == 'admin')
-                credentials = self._create_creds(admin=is_admin)
-            else:
-                credentials = self._create_creds(roles=credential_type)
-            self._creds[str(credential_type)] = credentials
-            # Maintained until tests are ported
-            LOG.info("Acquired dynamic creds:\n credentials: %s"
-                     % credentials)
-            if (CONF.service_available.neutron and
-                not CONF.baremetal.driver_enabled and
-                CONF.auth.create_isolated_networks):
-                network, subnet, router = self._create_network_resources(
-                    credentials.tenant_id)
-                credentials.set_resources(network=network, subnet=subnet,
-                                          router=router)
-                LOG.info("Created isolated network resources for : \n"
-                         + " credentials: %s" % credentials)
+            credentials = self._create_creds(roles=credential_type)
+        self._creds[str(credential_type)] = credentials
+        # Maintained until tests are ported
+        LOG.info("Acquired dynamic creds:\n credentials: %s"
+                 % credentials)
+        if self._creates_networks():
+            network, subnet, router = self._create_network_resources(
+                credentials.tenant_id)
+            credentials.set_resources(network=network, subnet=subnet,
+                                      router=router)
+            LOG.info("Created isolated network resources for : \n"
+                     + " credentials: %s" % credentials)
         return credentials
 
     def get_primary_creds(self):
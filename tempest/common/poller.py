@@ -0,0 +1,254 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import threading
+import time
+
+from oslo_log import log as logging
+
+from tempest import exceptions
+from tempest.lib.common.utils import test_utils
+from tempest.lib import exceptions as lib_exc
+
+LOG = logging.getLogger(__name__)
+
+_poller = None
+_poller_lock = threading.Lock()
+
+
+def get_poller():
+    """Return the poller shared by all the threads of the process"""
+    global _poller
+    with _poller_lock:
+        if _poller is None:
+            _poller = Poller()
+        return _poller
+
+
+class WaitFuture(object):
+    """Outcome of a wait registered with a Poller"""
+
+    def __init__(self, resource_id):
+        self.resource_id = resource_id
+        self._done = threading.Event()
+        self._result = None
+        self._exception = None
+
+    def done(self):
+        """Whether the wait is over"""
+        return self._done.is_set()
+
+    def result(self, timeout=None):
+        """Wait for the end of the wait and return its outcome
+
+        :param timeout: Seconds to wait at most, forever by default. The
+                        wait itself times out on its own timeout anyway.
+        :returns: The last state of the resource, or None for a deletion.
+        :raises: The exception which ended the wait, e.g. TimeoutException
+                 or an error state of the resource.
+        """
+        if not self._done.wait(timeout):
+            raise exceptions.TimeoutException(
+                'Wait for %s not over after %s s' %
+                (self.resource_id, timeout))
+        if self._exception is not None:
+            raise self._exception
+        return self._result
+
+    def set_result(self, result):
+        self._result = result
+        self._done.set()
+
+    def set_exception(self, exception):
+        self._exception = exception
+        self._done.set()
+
+
+class _Wait(object):
+
+    def __init__(self, future, ready, check, deadline, timeout_message,
+                 caller, recorder):
+        self.future = future
+        self.ready = ready
+        self.check = check
+        self.deadline = deadline
+        self.timeout_message = timeout_message
+        self.caller = caller
+        self.recorder = recorder
+        self.polled = False
+
+    def update(self, state, now):
+        """Resolve the future if the wait is over with this state"""
+        try:
+            if self.recorder is not None:
+                self.recorder.observe(state)
+            if state is None:
+                if self.ready is None:
+                    self.future.set_result(None)
+                else:
+                    self.future.set_exception(lib_exc.NotFound(
+                        '%s disappeared while waited on' %
+                        self.future.resource_id))
+                return
+            if self.polled and self.check is not None:
+                self.check(state)
+            if self.ready is not None and self.ready(state):
+                self.future.set_result(state)
+            elif now >= self.deadline:
+                message = self.timeout_message(state)
+                if self.caller:
+                    message = '(%s) %s' % (self.caller, message)
+                self.future.set_exception(
+                    exceptions.TimeoutException(message))
+        except Exception as exc:
+            self.future.set_exception(exc)
+        finally:
+            self.polled = True
+
+
+class _PollGroup(object):
+
+    def __init__(self, list_states, show):
+        self.list_states = list_states
+        self.show = show
+        self.waits = {}
+        self.intervals = None
+        self.next_poll = 0
+
+
+class Poller(object):
+    """Poll the resources waited on by many threads with shared list calls
+
+    Waits are registered with a key which identifies the type of resource
+    and the client listing them, e.g. a servers client and 'servers'. The
+    resources of all the waits of a key are polled together with one list
+    call per status check, from a single daemon thread, and each wait gets
+    a WaitFuture resolved once its predicate matches, or failed on error or
+    timeout. A failed list call is retried at the next status check. The
+    thread stops when no wait is left.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._groups = {}
+        self._thread = None
+
+    def register(self, key, list_states, show, resource_id, ready, timeout,
+                 timeout_message, intervals, check=None, recorder=None):
+        """Register a wait for a resource
+
+        :param key: Hashable identifying the group of waits polled together.
+        :param list_states: Callable returning the current states of the
+                            resources of the group as a list of dicts with
+                            an 'id' key. The first wait of a key sets it.
+        :param show: Callable returning the state of one resource given its
+                     id, used for the resources missing from the list. It
+                     raises NotFound for the resources which do not exist.
+        :param resource_id: Id of the resource to wait for.
+        :param ready: Predicate called with each state, returning True when
+                      the wait is over. None waits until the resource is
+                      deleted.
+        :param timeout: Seconds after which the wait fails with
+                        TimeoutException.
+        :param timeout_message: Callable returning the message of the
+                                TimeoutException, called with the last
+                                state.
+        :param intervals: Iterator of the intervals between the status
+                          checks of the group, which restart with each new
+                          wait.
+        :param check: Callable called with each state but the first one,
+                      which can raise to fail the wait on error states.
+        :param recorder: timeline.WaitRecorder recording each state.
+        :returns: a WaitFuture
+        """
+        future = WaitFuture(resource_id)
+        wait = _Wait(future, ready, check, int(time.time()) + timeout,
+                     timeout_message, test_utils.get_test_caller(), recorder)
+        with self._lock:
+            group = self._groups.get(key)
+            if group is None:
+                group = self._groups[key] = _PollGroup(list_states, show)
+            group.waits.setdefault(resource_id, []).append(wait)
+            group.intervals = intervals
+            group.next_poll = 0
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run,
+                                                name='waiters-poller')
+                self._thread.daemon = True
+                self._thread.start()
+        self._wakeup.set()
+        return future
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._groups:
+                    self._thread = None
+                    return
+                self._wakeup.clear()
+                now = time.time()
+                due = [group for group in self._groups.values()
+                       if group.next_poll <= now]
+            for group in due:
+                self._poll(group)
+            with self._lock:
+                for key, group in list(self._groups.items()):
+                    if not group.waits:
+                        del self._groups[key]
+                if not self._groups:
+                    continue
+                delay = min(group.next_poll
+                            for group in self._groups.values()) - time.time()
+            if delay > 0:
+                self._wakeup.wait(delay)
+
+    def _poll(self, group):
+        with self._lock:
+            waits = dict((resource_id, list(resource_waits))
+                         for resource_id, resource_waits
+                         in group.waits.items())
+        try:
+            states = dict((state['id'], state)
+                          for state in group.list_states()
+                          if state['id'] in waits)
+        except Exception as exc:
+            # The list call is retried at the next interval, only the waits
+            # which are past their deadline fail, and nothing is updated
+            LOG.exception('Polling %s failed', ', '.join(waits))
+            now = int(time.time())
+            for resource_waits in waits.values():
+                for wait in resource_waits:
+                    if now >= wait.deadline:
+                        wait.future.set_exception(exc)
+            waits = {}
+            states = {}
+        for resource_id in set(waits) - set(states):
+            try:
+                states[resource_id] = group.show(resource_id)
+            except lib_exc.NotFound:
+                states[resource_id] = None
+            except Exception as exc:
+                for wait in waits[resource_id]:
+                    wait.future.set_exception(exc)
+        now = int(time.time())
+        for resource_id, resource_waits in waits.items():
+            for wait in resource_waits:
+                if not wait.future.done():
+                    wait.update(states.get(resource_id), now)
+        with self._lock:
+            for resource_id, resource_waits in list(group.waits.items()):
+                resource_waits[:] = [wait for wait in resource_waits
+                                     if not wait.future.done()]
+                if not resource_waits:
+                    del group.waits[resource_id]
+            group.next_poll = time.time() + next(group.intervals)
@@ -12,10 +12,13 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import errno
+import fcntl
 import hashlib
+import json
 import os
+import tempfile
 
-from oslo_concurrency import lockutils
 from oslo_log import log as logging
 import six
 import yaml
@@ -47,6 +50,8 @@ class PreProvisionedCredentialProvider(cred_provider.CredentialProvider):
     # i.e. only include user*, project*, tenant* and password
     HASH_CRED_FIELDS = (set(auth.KeystoneV2Credentials.ATTRIBUTES) &
                         set(auth.KeystoneV3Credentials.ATTRIBUTES))
+    # Version of the format of the accounts index files
+    INDEX_VERSION = 2
 
     def __init__(self, identity_version, test_accounts_file,
                  accounts_lock_dir, name=None, credentials_domain=None,
@@ -56,9 +61,12 @@ class PreProvisionedCredentialProvider(cred_provider.CredentialProvider):
 
         This credentials provider loads the details of pre-provisioned
         accounts from a YAML file, in the format specified by
-        `etc/accounts.yaml.sample`. It locks accounts while in use, using the
-        external locking mechanism, allowing for multiple python processes
-        to share a single account file, and thus running tests in parallel.
+        `etc/accounts.yaml.sample`. It locks accounts while in use, with an
+        exclusive flock on a lock file per account in accounts_lock_dir,
+        allowing for multiple python processes to share a single account
+        file, and thus running tests in parallel. The locks of a process are
+        released by the kernel when it exits, so the accounts of crashed
+        workers are available again right away.
 
         The accounts_lock_dir must be generated using `lockutils.get_lock_path`
         from the oslo.concurrency library. For instance:
@@ -84,15 +92,17 @@ class PreProvisionedCredentialProvider(cred_provider.CredentialProvider):
             identity_version=identity_version, name=name,
             admin_role=admin_role, credentials_domain=credentials_domain)
         self.test_accounts_file = test_accounts_file
-        if test_accounts_file:
-            accounts = read_accounts_yaml(self.test_accounts_file)
-        else:
+        if not test_accounts_file:
             raise lib_exc.InvalidCredentials("No accounts file specified")
-        self.hash_dict = self.get_hash_dict(
-            accounts, admin_role, object_storage_operator_role,
-            object_storage_reseller_admin_role)
         self.accounts_dir = accounts_lock_dir
+        self._roles = (admin_role, object_storage_operator_role,
+                       object_storage_reseller_admin_role)
+        # Loaded from the accounts file, or its index, when first needed
+        self._hash_dict = None
+        self._index = None
         self._creds = {}
+        # The file descriptors of the account locks held, by hash
+        self._locks = {}
 
     @classmethod
     def _append_role(cls, role, account_hash, hash_dict):
@@ -162,74 +172,220 @@ class PreProvisionedCredentialProvider(cred_provider.CredentialProvider):
                                 % resource)
         return hash_dict
 
+    @classmethod
+    def get_index(cls, hash_dict):
+        """Compile a hash dict into an index of bitsets
+
+        Each account gets as integer id its position in the sorted list of
+        hashes, and each role the bitset of the ids of its accounts, which
+        includes the accounts of the types mapped to the role.
+        """
+        hashes = sorted(hash_dict['creds'])
+        ids = dict((_hash, i) for i, _hash in enumerate(hashes))
+        roles = {}
+        for role, role_hashes in six.iteritems(hash_dict['roles']):
+            bits = 0
+            for _hash in role_hashes:
+                bits |= 1 << ids[_hash]
+            roles[role] = bits
+        return {'hashes': hashes, 'roles': roles}
+
+    def _make_accounts_dir(self):
+        if not os.path.isdir(self.accounts_dir):
+            try:
+                os.makedirs(self.accounts_dir)
+            except OSError as e:
+                if e.errno != errno.EEXIST:
+                    raise
+
+    @property
+    def hash_dict(self):
+        if self._hash_dict is None:
+            self._hash_dict, self._index = self._load_accounts(*self._roles)
+        return self._hash_dict
+
+    @property
+    def index(self):
+        if self._index is None:
+            self._hash_dict, self._index = self._load_accounts(*self._roles)
+        return self._index
+
+    def _get_index_path(self, *roles):
+        if not isinstance(self.test_accounts_file, six.string_types):
+            return None
+        # One index per accounts file and roles, replaced whenever the
+        # accounts file changes
+        key = json.dumps([os.path.abspath(self.test_accounts_file)] +
+                         list(roles))
+        return os.path.join(
+            self.accounts_dir,
+            'index-%s.json' % hashlib.sha1(key.encode('utf-8')).hexdigest())
+
+    def _get_index_version(self):
+        try:
+            stat = os.stat(self.test_accounts_file)
+        except OSError:
+            return None
+        return [self.INDEX_VERSION, repr(stat.st_mtime), stat.st_size]
+
+    @staticmethod
+    def _read_index(path, version, accounts):
+        """Return the hash dict and index of an index file, if up to date"""
+        try:
+            with open(path, 'r') as index_file:
+                data = json.load(index_file)
+            if data['version'] != version:
+                return None
+            index = data['index']
+            hashes = index['hashes']
+            creds = {}
+            for _hash, position in zip(hashes, data['accounts']):
+                creds[_hash] = dict(
+                    (k, v) for (k, v) in six.iteritems(accounts[position])
+                    if k not in ('roles', 'types', 'resources'))
+        except (IOError, ValueError, KeyError, IndexError, TypeError):
+            return None
+        roles = dict((role, [_hash for i, _hash in enumerate(hashes)
+                             if bits & 1 << i])
+                     for role, bits in six.iteritems(index['roles']))
+        hash_dict = {'roles': roles, 'creds': creds,
+                     'networks': data['networks']}
+        return hash_dict, index
+
+    def _write_index(self, path, version, accounts, hash_dict, index):
+        # The index holds the position of the accounts in the accounts file
+        # rather than the accounts themselves, so that no password is
+        # written outside of the accounts file
+        positions = dict((id(account), i) for i, account in
+                         enumerate(accounts))
+        data = {'version': version,
+                'index': index,
+                'accounts': [positions[id(hash_dict['creds'][_hash])]
+                             for _hash in index['hashes']],
+                'networks': hash_dict['networks']}
+        try:
+            self._make_accounts_dir()
+            # The index is renamed in place once complete so that the other
+            # workers never read a partial index
+            fd, temp_path = tempfile.mkstemp(dir=self.accounts_dir)
+            with os.fdopen(fd, 'w') as index_file:
+                json.dump(data, index_file)
+            os.rename(temp_path, path)
+        except (IOError, OSError) as e:
+            LOG.warning('Failed to write the accounts index %s: %s',
+                        path, e)
+
+    def _load_accounts(self, admin_role, object_storage_operator_role,
+                       object_storage_reseller_admin_role):
+        """Return the hash dict and index of the accounts file
+
+        The first worker to load a version of the accounts file writes its
+        index in the accounts lock dir, where the other workers read it
+        rather than hashing the accounts and matching their roles again.
+        """
+        roles = (admin_role, object_storage_operator_role,
+                 object_storage_reseller_admin_role)
+        accounts = read_accounts_yaml(self.test_accounts_file)
+        path = self._get_index_path(*roles)
+        version = self._get_index_version() if path else None
+        if version is not None:
+            loaded = self._read_index(path, version, accounts)
+            if loaded is not None:
+                return loaded
+        hash_dict = self.get_hash_dict(accounts, *roles)
+        index = self.get_index(hash_dict)
+        if version is not None:
+            self._write_index(path, version, accounts, hash_dict, index)
+        return hash_dict, index
+
     def is_multi_user(self):
         return len(self.hash_dict['creds']) > 1
 
     def is_multi_tenant(self):
         return self.is_multi_user()
 
-    def _create_hash_file(self, hash_string):
-        path = os.path.join(os.path.join(self.accounts_dir, hash_string))
-        if not os.path.isfile(path):
-            with open(path, 'w') as fd:
-                fd.write(self.name)
-            return True
-        return False
+    def _lock_hash(self, hash_string):
+        """Try to lock the account of a hash, return whether it was locked
+
+        The lock file is removed, still locked, when the account is
+        released. A process which opened it before may then lock the
+        removed file, so the lock only holds if the file locked is still
+        the one at the path, otherwise the new file is tried.
+        """
+        self._make_accounts_dir()
+        path = os.path.join(self.accounts_dir, hash_string)
+        while True:
+            fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                locked = os.fstat(fd)
+                current = os.stat(path)
+            except (IOError, OSError) as e:
+                os.close(fd)
+                if e.errno in (errno.EAGAIN, errno.EACCES):
+                    return False
+                if e.errno == errno.ENOENT:
+                    continue
+                raise
+            if (locked.st_dev, locked.st_ino) == (current.st_dev,
+                                                   current.st_ino):
+                break
+            os.close(fd)
+        # Record the owner of the account for the error messages
+        os.ftruncate(fd, 0)
+        os.write(fd, self.name.encode('utf-8'))
+        self._locks[hash_string] = fd
+        return True
+
+    def _get_lock_owner(self, hash_string):
+        path = os.path.join(self.accounts_dir, hash_string)
+        try:
+            with open(path, 'r') as fd:
+                return fd.read()
+        except IOError:
+            return ''
 
-    @lockutils.synchronized('test_accounts_io', external=True)
     def _get_free_hash(self, hashes):
-        # Cast as a list because in some edge cases a set will be passed in
-        hashes = list(hashes)
-        if not os.path.isdir(self.accounts_dir):
-            os.mkdir(self.accounts_dir)
-            # Create File from first hash (since none are in use)
-            self._create_hash_file(hashes[0])
-            return hashes[0]
-        names = []
-        for _hash in hashes:
-            res = self._create_hash_file(_hash)
-            if res:
+        # Sort the hashes, in some edge cases a set will be passed in
+        hashes = sorted(hashes)
+        # There is no shared free list of the accounts: updating it would
+        # take a lock shared by all the workers again. Instead each worker
+        # tries the accounts from a different offset, so that concurrent
+        # workers seldom try to lock the same ones and, as long as there
+        # are free accounts, most allocations succeed at the first attempt.
+        start = os.getpid() % len(hashes)
+        for _hash in hashes[start:] + hashes[:start]:
+            if self._lock_hash(_hash):
                 return _hash
-            else:
-                path = os.path.join(os.path.join(self.accounts_dir,
-                                                 _hash))
-                with open(path, 'r') as fd:
-                    names.append(fd.read())
+        names = [self._get_lock_owner(_hash) for _hash in hashes]
         msg = ('Insufficient number of users provided. %s have allocated all '
                'the credentials for this allocation request' % ','.join(names))
         raise lib_exc.InvalidCredentials(msg)
 
     def _get_match_hash_list(self, roles=None):
-        hashes = []
+        role_bits = self.index['roles']
+        hashes = self.index['hashes']
+        bits = (1 << len(hashes)) - 1
         if roles:
-            # Loop over all the creds for each role in the subdict and generate
-            # a list of cred lists for each role
+            # Intersect the bitsets of the accounts of each role to find the
+            # creds which fall under all the specified roles
             for role in roles:
-                temp_hashes = self.hash_dict['roles'].get(role, None)
-                if not temp_hashes:
+                if not role_bits.get(role):
                     raise lib_exc.InvalidCredentials(
                         "No credentials with role: %s specified in the "
                         "accounts ""file" % role)
-                hashes.append(temp_hashes)
-            # Take the list of lists and do a boolean and between each list to
-            # find the creds which fall under all the specified roles
-            temp_list = set(hashes[0])
-            for hash_list in hashes[1:]:
-                temp_list = temp_list & set(hash_list)
-            hashes = temp_list
-        else:
-            hashes = self.hash_dict['creds'].keys()
+                bits &= role_bits[role]
         # NOTE(mtreinish): admin is a special case because of the increased
         # privilege set which could potentially cause issues on tests where
         # that is not expected. So unless the admin role isn't specified do
         # not allocate admin.
-        admin_hashes = self.hash_dict['roles'].get(self.admin_role,
-                                                   None)
-        if ((not roles or self.admin_role not in roles) and
-                admin_hashes):
-            useable_hashes = [x for x in hashes if x not in admin_hashes]
-        else:
-            useable_hashes = hashes
+        if not roles or self.admin_role not in roles:
+            bits &= ~role_bits.get(self.admin_role, 0)
+        useable_hashes = []
+        while bits:
+            lowest = bits & -bits
+            useable_hashes.append(hashes[lowest.bit_length() - 1])
+            bits ^= lowest
         return useable_hashes
 
     def _sanitize_creds(self, creds):
@@ -248,16 +404,22 @@ class PreProvisionedCredentialProvider(cred_provider.CredentialProvider):
         LOG.info('%s allocated creds:\n%s' % (self.name, clean_creds))
         return self._wrap_creds_with_network(free_hash)
 
-    @lockutils.synchronized('test_accounts_io', external=True)
     def remove_hash(self, hash_string):
-        hash_path = os.path.join(self.accounts_dir, hash_string)
-        if not os.path.isfile(hash_path):
-            LOG.warning('Expected an account lock file %s to remove, but '
-                        'one did not exist' % hash_path)
-        else:
-            os.remove(hash_path)
-            if not os.listdir(self.accounts_dir):
-                os.rmdir(self.accounts_dir)
+        fd = self._locks.pop(hash_string, None)
+        if fd is None:
+            LOG.warning('Expected an account lock %s to release, but it is '
+                        'not held' % os.path.join(self.accounts_dir,
+                                                  hash_string))
+            return
+        try:
+            os.unlink(os.path.join(self.accounts_dir, hash_string))
+        except OSError as e:
+            if e.errno != errno.ENOENT:
+                LOG.warning('Failed to remove the account lock %s: %s',
+                            os.path.join(self.accounts_dir, hash_string), e)
+        finally:
+            # Closing the file releases the lock
+            os.close(fd)
 
     def get_hash(self, creds):
         for _hash in self.hash_dict['creds']:
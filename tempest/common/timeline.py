@@ -0,0 +1,164 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""State transition timelines of the resources waited on
+
+The waiters of tempest.common.waiters report the states they poll to a
+WaitRecorder, which records each change of state of the resource in the
+timeline of the running test, if any::
+
+    test_timeline = timeline.start()
+    waiters.wait_for_server_status(client, server_id, 'ACTIVE')
+    timeline.stop()
+    test_timeline.events
+    [{'resource': 'server', 'id': ..., 'wait': 1, 'poll': 1,
+      'time': 1476651234.5, 'state': 'BUILD', 'task_state': 'spawning'},
+     {'resource': 'server', 'id': ..., 'wait': 1, 'poll': 9,
+      'time': 1476651243.1, 'state': 'ACTIVE', 'task_state': None}]
+
+tempest.test.BaseTestCase attaches the timeline of each test to its result
+as the DETAIL_NAME detail, and the timeline of the setUpClass of a test
+class to the result of its first test as the CLASS_DETAIL_NAME detail.
+transition_stats aggregates the timelines of many tests into latency
+histograms per transition, e.g. BUILD -> ACTIVE.
+"""
+
+import collections
+import itertools
+import threading
+import time
+
+from tempest.lib.common import metrics
+
+DETAIL_NAME = 'waiter-timeline'
+CLASS_DETAIL_NAME = 'waiter-timeline-setup-class'
+DELETED = 'DELETED'
+
+_current = threading.local()
+
+
+class Timeline(object):
+    """The state transitions seen by the waiters of a test"""
+
+    def __init__(self):
+        self.events = []
+        self._waits = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def new_wait(self):
+        """Return the number of a new wait, to tell apart its events"""
+        with self._lock:
+            return next(self._waits)
+
+    def record(self, event):
+        with self._lock:
+            self.events.append(event)
+
+
+def start():
+    """Start recording the waits of the current thread in a new timeline"""
+    _current.timeline = Timeline()
+    return _current.timeline
+
+
+def stop():
+    """Stop recording the waits of the current thread"""
+    _current.timeline = None
+
+
+def current():
+    """Return the timeline of the current thread, None if not recording"""
+    return getattr(_current, 'timeline', None)
+
+
+class WaitRecorder(object):
+    """Record the states of a resource polled by a waiter
+
+    The recorder is bound to the timeline of the thread creating it, so
+    waits polled from other threads are recorded in the right timeline.
+
+    :param resource_type: The type of resource, e.g. 'server'
+    :param resource_id: The id of the resource
+    :param state_of: Callable returning a dict of the attributes to record
+                     from the resource polled, including its 'state'. It is
+                     called with None once the resource is deleted.
+    """
+
+    def __init__(self, resource_type, resource_id, state_of):
+        self.resource_type = resource_type
+        self.resource_id = resource_id
+        self.state_of = state_of
+        self.polls = 0
+        self.timeline = current()
+        self.wait = None if self.timeline is None else self.timeline.new_wait()
+        self._last = None
+
+    def observe(self, body):
+        """Record the state of the resource if it changed"""
+        self.polls += 1
+        if self.timeline is None:
+            return
+        state = self.state_of(body)
+        if state == self._last:
+            return
+        self._last = state
+        event = {'resource': self.resource_type, 'id': self.resource_id,
+                 'wait': self.wait, 'poll': self.polls, 'time': time.time()}
+        event.update(state)
+        self.timeline.record(event)
+
+
+def status_of(body):
+    """state_of callable of the resources with a 'status' attribute"""
+    if body is None:
+        return {'state': DELETED}
+    return {'state': body['status']}
+
+
+def transitions(events):
+    """Return the state transitions of the events of a timeline
+
+    Only the changes of 'state' seen within a same wait are transitions,
+    as the time between two waits on a resource is spent by the test.
+
+    :returns: a list of (resource type, from state, to state, seconds)
+    """
+    waits = collections.defaultdict(list)
+    for event in events:
+        waits[(event['resource'], event['id'], event['wait'])].append(event)
+    result = []
+    for (resource_type, _, _), wait_events in sorted(
+            waits.items(), key=lambda item: item[1][0]['time']):
+        wait_events.sort(key=lambda event: event['poll'])
+        since = wait_events[0]
+        for event in wait_events[1:]:
+            if event['state'] == since['state']:
+                continue
+            result.append((resource_type, since['state'], event['state'],
+                           event['time'] - since['time']))
+            since = event
+    return result
+
+
+def transition_stats(timelines):
+    """Aggregate timelines into latency histograms per transition
+
+    :param timelines: An iterable of lists of timeline events
+    :returns: a dict mapping (resource type, from state, to state) tuples to
+              metrics.Histogram of the transition latencies
+    """
+    stats = collections.defaultdict(metrics.Histogram)
+    for events in timelines:
+        for resource_type, from_state, to_state, seconds in transitions(
+                events):
+            stats[(resource_type, from_state, to_state)].add(seconds)
+    return stats
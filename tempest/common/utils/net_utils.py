@@ -27,7 +27,8 @@ def get_unused_ip_addresses(ports_client, subnets_client,
     unused IP addresses on the given subnet using the supplied subnets_client
     """
 
-    ports = ports_client.list_ports(network_id=network_id)['ports']
+    ports = ports_client.list_ports(network_id=network_id,
+                                    fields=['fixed_ips'])['ports']
     subnet = subnets_client.show_subnet(subnet_id)
     ip_net = netaddr.IPNetwork(subnet['subnet']['cidr'])
     subnet_set = netaddr.IPSet(ip_net.iter_hosts())
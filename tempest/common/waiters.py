@@ -11,11 +11,14 @@
 #    under the License.
 
 
+import random
 import time
 
 from oslo_log import log as logging
 
 from tempest.common import image as common_image
+from tempest.common import poller
+from tempest.common import timeline
 from tempest import config
 from tempest import exceptions
 from tempest.lib.common.utils import test_utils
@@ -26,96 +29,380 @@ CONF = config.CONF
 LOG = logging.getLogger(__name__)
 
 
+def backoff_intervals(build_interval):
+    """Return an iterator of the intervals between the checks of a waiter.
+
+    The first interval is the initial_interval of the [waiters] group, then
+    each interval is backoff_factor times the previous one, up to
+    max_interval. Both default to build_interval, which keeps polling at a
+    fixed build_interval. jitter randomly shortens or lengthens each
+    interval by up to this fraction of it, so that concurrent waiters do not
+    poll the API at the same time.
+    """
+    interval = CONF.waiters.initial_interval
+    if interval is None:
+        interval = build_interval
+    max_interval = CONF.waiters.max_interval
+    if max_interval is None:
+        max_interval = max(build_interval, interval)
+    return _backoff_intervals(interval, CONF.waiters.backoff_factor,
+                              max_interval, CONF.waiters.jitter)
+
+
+def _backoff_intervals(interval, factor, max_interval, jitter):
+    while True:
+        if jitter:
+            yield interval * random.uniform(1 - jitter, 1 + jitter)
+        else:
+            yield interval
+        if factor != 1:
+            interval = min(interval * factor, max_interval)
+
+
+def wait_until(show, ready, build_interval, timeout, timeout_message,
+               check=None, recorder=None):
+    """Poll a resource until it is ready.
+
+    :param show: Callable returning the current state of the resource.
+    :param ready: Predicate called with each state, returning True when the
+                  wait is over. It can raise to stop waiting.
+    :param build_interval: Interval between the status checks, adjusted as
+                           configured in the [waiters] group.
+    :param timeout: Seconds after which TimeoutException is raised.
+    :param timeout_message: Callable returning the message of the
+                            TimeoutException, called with the last state.
+    :param check: Callable called with each state but the first one, before
+                  ready, which can raise to stop waiting on error states.
+                  The first state is not checked as it can predate the
+                  action the caller waits for.
+    :param recorder: timeline.WaitRecorder recording each state.
+    :returns: The state which satisfied ready.
+    """
+    start = int(time.time())
+    intervals = backoff_intervals(build_interval)
+    state = show()
+    if recorder is not None:
+        recorder.observe(state)
+    while not ready(state):
+        if int(time.time()) - start >= timeout:
+            message = timeout_message(state)
+            caller = test_utils.get_test_caller()
+            if caller:
+                message = '(%s) %s' % (caller, message)
+            raise exceptions.TimeoutException(message)
+        time.sleep(next(intervals))
+        state = show()
+        if recorder is not None:
+            recorder.observe(state)
+        if check is not None:
+            check(state)
+    return state
+
+
+def wait_until_all(list_states, show, ready, build_interval, timeout,
+                   timeout_message, resource_ids, check=None,
+                   new_recorder=None):
+    """Poll several resources until they are all ready.
+
+    The resources are polled together with one list call per status check,
+    instead of one show call per resource.
+
+    :param list_states: Callable returning the current states of the
+                        resources as a list of dicts with an 'id' key. It
+                        does not have to return only the resources waited
+                        on.
+    :param show: Callable returning the state of one resource given its id,
+                 used for the resources missing from the list, e.g. when it
+                 is paginated.
+    :param ready: Predicate called with each state, returning True when the
+                  resource is ready.
+    :param build_interval: Interval between the status checks, adjusted as
+                           configured in the [waiters] group.
+    :param timeout: Seconds after which the resources which are not ready
+                    fail with TimeoutException.
+    :param timeout_message: Callable returning the message of the
+                            TimeoutException of a resource, called with its
+                            id and last state.
+    :param resource_ids: Ids of the resources to wait for.
+    :param check: Callable called with the id and each state of a resource
+                  but the first one, which can raise to stop waiting on it.
+    :param new_recorder: Callable returning the timeline.WaitRecorder
+                         recording the states of a resource given its id.
+    :returns: A dict of the states which satisfied ready by resource id.
+    :raises ResourcesWaitException: if some resources failed, once the
+                                    others are ready. Its failures
+                                    attribute has the exception of each
+                                    failed resource.
+    """
+    start = int(time.time())
+    intervals = backoff_intervals(build_interval)
+    pending = set(resource_ids)
+    ready_states = {}
+    failures = {}
+    recorders = {}
+    if new_recorder is not None:
+        recorders = dict((resource_id, new_recorder(resource_id))
+                         for resource_id in pending)
+    first = True
+    while True:
+        states = dict((state['id'], state) for state in list_states()
+                      if state['id'] in pending)
+        for resource_id in pending - set(states):
+            try:
+                states[resource_id] = show(resource_id)
+            except lib_exc.NotFound as exc:
+                failures[resource_id] = exc
+                if resource_id in recorders:
+                    recorders[resource_id].observe(None)
+        for resource_id, state in states.items():
+            if resource_id in recorders:
+                recorders[resource_id].observe(state)
+            try:
+                if not first and check is not None:
+                    check(resource_id, state)
+            except lib_exc.TempestException as exc:
+                failures[resource_id] = exc
+                continue
+            if ready(state):
+                ready_states[resource_id] = state
+        pending -= set(ready_states) | set(failures)
+        if not pending:
+            break
+        if int(time.time()) - start >= timeout:
+            for resource_id in pending:
+                failures[resource_id] = exceptions.TimeoutException(
+                    timeout_message(resource_id, states.get(resource_id)))
+            break
+        time.sleep(next(intervals))
+        first = False
+    if failures:
+        raise exceptions.ResourcesWaitException(failures)
+    return ready_states
+
+
+def _get_server_task_state(body):
+    return body.get('OS-EXT-STS:task_state', None)
+
+
+def _server_timeline_state(body):
+    if body is None:
+        return {'state': timeline.DELETED}
+    return {'state': body['status'],
+            'task_state': _get_server_task_state(body)}
+
+
+def _server_recorder(server_id):
+    return timeline.WaitRecorder('server', server_id, _server_timeline_state)
+
+
+def _server_ready(body, status, ready_wait):
+    # NOTE(afazekas): UNKNOWN status possible on ERROR
+    # or in a very early stage.
+    # NOTE(afazekas): Now the BUILD status only reached
+    # between the UNKNOWN->ACTIVE transition.
+    # TODO(afazekas): enumerate and validate the stable status set
+    if status == 'BUILD' and body['status'] != 'UNKNOWN':
+        return True
+    if body['status'] != status:
+        return False
+    if not ready_wait or status == 'BUILD':
+        return True
+    # NOTE(afazekas): The instance is in "ready for action state"
+    # when no task in progress
+    # NOTE(afazekas): Converted to string because of the XML
+    # responses
+    return str(_get_server_task_state(body)) == "None"
+
+
+def _check_server_error(body, server_id):
+    if body['status'] == 'ERROR':
+        if 'fault' in body:
+            raise exceptions.BuildErrorException(body['fault'],
+                                                 server_id=server_id)
+        else:
+            raise exceptions.BuildErrorException(server_id=server_id)
+
+
 # NOTE(afazekas): This function needs to know a token and a subject.
 def wait_for_server_status(client, server_id, status, ready_wait=True,
                            extra_timeout=0, raise_on_error=True):
     """Waits for a server to reach a given status."""
 
-    def _get_task_state(body):
-        return body.get('OS-EXT-STS:task_state', None)
-
-    # NOTE(afazekas): UNKNOWN status possible on ERROR
-    # or in a very early stage.
-    body = client.show_server(server_id)['server']
-    old_status = server_status = body['status']
-    old_task_state = task_state = _get_task_state(body)
     start_time = int(time.time())
     timeout = client.build_timeout + extra_timeout
-    while True:
-        # NOTE(afazekas): Now the BUILD status only reached
-        # between the UNKNOWN->ACTIVE transition.
-        # TODO(afazekas): enumerate and validate the stable status set
-        if status == 'BUILD' and server_status != 'UNKNOWN':
-            return
-        if server_status == status:
-            if ready_wait:
-                if status == 'BUILD':
-                    return
-                # NOTE(afazekas): The instance is in "ready for action state"
-                # when no task in progress
-                # NOTE(afazekas): Converted to string because of the XML
-                # responses
-                if str(task_state) == "None":
-                    # without state api extension 3 sec usually enough
-                    time.sleep(CONF.compute.ready_wait)
-                    return
-            else:
-                return
-
-        time.sleep(client.build_interval)
+    previous = {}
+
+    def _show():
         body = client.show_server(server_id)['server']
         server_status = body['status']
-        task_state = _get_task_state(body)
-        if (server_status != old_status) or (task_state != old_task_state):
+        task_state = _get_server_task_state(body)
+        if previous and ((server_status != previous['status']) or
+                         (task_state != previous['task_state'])):
             LOG.info('State transition "%s" ==> "%s" after %d second wait',
-                     '/'.join((old_status, str(old_task_state))),
+                     '/'.join((previous['status'],
+                               str(previous['task_state']))),
                      '/'.join((server_status, str(task_state))),
                      time.time() - start_time)
-        if (server_status == 'ERROR') and raise_on_error:
-            if 'fault' in body:
-                raise exceptions.BuildErrorException(body['fault'],
-                                                     server_id=server_id)
-            else:
-                raise exceptions.BuildErrorException(server_id=server_id)
-
-        timed_out = int(time.time()) - start_time >= timeout
-
-        if timed_out:
-            expected_task_state = 'None' if ready_wait else 'n/a'
-            message = ('Server %(server_id)s failed to reach %(status)s '
-                       'status and task state "%(expected_task_state)s" '
-                       'within the required time (%(timeout)s s).' %
-                       {'server_id': server_id,
-                        'status': status,
-                        'expected_task_state': expected_task_state,
-                        'timeout': timeout})
-            message += ' Current status: %s.' % server_status
-            message += ' Current task state: %s.' % task_state
-            caller = test_utils.find_test_caller()
-            if caller:
-                message = '(%s) %s' % (caller, message)
-            raise exceptions.TimeoutException(message)
-        old_status = server_status
-        old_task_state = task_state
+        previous.update(status=server_status, task_state=task_state)
+        return body
+
+    def _check(body):
+        if raise_on_error:
+            _check_server_error(body, server_id)
+
+    def _timeout_message(body):
+        expected_task_state = 'None' if ready_wait else 'n/a'
+        message = ('Server %(server_id)s failed to reach %(status)s '
+                   'status and task state "%(expected_task_state)s" '
+                   'within the required time (%(timeout)s s).' %
+                   {'server_id': server_id,
+                    'status': status,
+                    'expected_task_state': expected_task_state,
+                    'timeout': timeout})
+        message += ' Current status: %s.' % body['status']
+        message += (' Current task state: %s.' %
+                    _get_server_task_state(body))
+        return message
+
+    wait_until(_show, lambda body: _server_ready(body, status, ready_wait),
+               client.build_interval, timeout, _timeout_message, check=_check,
+               recorder=_server_recorder(server_id))
+    if ready_wait and status != 'BUILD':
+        # without state api extension 3 sec usually enough
+        time.sleep(CONF.compute.ready_wait)
+
+
+def wait_for_servers_status(client, server_ids, status, ready_wait=True,
+                            extra_timeout=0, raise_on_error=True,
+                            **list_params):
+    """Waits for several servers to reach a given status.
+
+    The servers are polled together with one detailed list_servers call
+    per status check, filtered with list_params, e.g. name.
+
+    :returns: A dict of the servers by id.
+    :raises ResourcesWaitException: if some servers failed, with the
+                                    exception of each of them.
+    """
+    timeout = client.build_timeout + extra_timeout
+
+    def _check(server_id, body):
+        if raise_on_error:
+            _check_server_error(body, server_id)
+
+    def _timeout_message(server_id, body):
+        message = ('Server %s failed to reach %s status within the required '
+                   'time (%s s).' % (server_id, status, timeout))
+        if body is not None:
+            message += ' Current status: %s.' % body['status']
+            message += (' Current task state: %s.' %
+                        _get_server_task_state(body))
+        return message
+
+    servers = wait_until_all(
+        lambda: client.list_servers(detail=True, **list_params)['servers'],
+        lambda server_id: client.show_server(server_id)['server'],
+        lambda body: _server_ready(body, status, ready_wait),
+        client.build_interval, timeout, _timeout_message, server_ids,
+        check=_check, new_recorder=_server_recorder)
+    if ready_wait and status != 'BUILD':
+        # without state api extension 3 sec usually enough
+        time.sleep(CONF.compute.ready_wait)
+    return servers
 
 
 def wait_for_server_termination(client, server_id, ignore_error=False):
     """Waits for server to reach termination."""
-    start_time = int(time.time())
-    while True:
+
+    def _show():
         try:
-            body = client.show_server(server_id)['server']
+            return client.show_server(server_id)['server']
         except lib_exc.NotFound:
-            return
+            return None
 
-        server_status = body['status']
-        if server_status == 'ERROR' and not ignore_error:
+    def _ready(body):
+        if body is None:
+            return True
+        if body['status'] == 'ERROR' and not ignore_error:
+            raise exceptions.BuildErrorException(server_id=server_id)
+        return False
+
+    def _timeout_message(body):
+        return ('Server %s failed to terminate within the required time '
+                '(%s s). Current status: %s.' %
+                (server_id, client.build_timeout, body['status']))
+
+    wait_until(_show, _ready, client.build_interval, client.build_timeout,
+               _timeout_message, recorder=_server_recorder(server_id))
+
+
+def _submit_wait(client, resource, list_states, show, resource_id, ready,
+                 timeout, timeout_message, recorder, check=None):
+    """Register a wait with the poller shared by the process
+
+    The waits of a client for a type of resource are polled together.
+    """
+    return poller.get_poller().register(
+        (client, resource), list_states, show, resource_id, ready, timeout,
+        timeout_message, backoff_intervals(client.build_interval),
+        check=check, recorder=recorder)
+
+
+def submit_server_status(client, server_id, status, ready_wait=True,
+                         extra_timeout=0, raise_on_error=True):
+    """Wait for a server to reach a given status, without blocking
+
+    The servers of a client waited on this way are polled together by the
+    poller of the process, with one detailed list_servers call per status
+    check. Unlike wait_for_server_status, the [compute] ready_wait delay is
+    not applied.
+
+    :returns: a WaitFuture, whose result is the server.
+    """
+    timeout = client.build_timeout + extra_timeout
+
+    def _check(body):
+        if raise_on_error:
+            _check_server_error(body, server_id)
+
+    def _timeout_message(body):
+        return ('Server %s failed to reach %s status within the required '
+                'time (%s s). Current status: %s. Current task state: %s.' %
+                (server_id, status, timeout, body['status'],
+                 _get_server_task_state(body)))
+
+    return _submit_wait(
+        client, 'servers',
+        lambda: client.list_servers(detail=True)['servers'],
+        lambda server_id: client.show_server(server_id)['server'],
+        server_id, lambda body: _server_ready(body, status, ready_wait),
+        timeout, _timeout_message, _server_recorder(server_id), check=_check)
+
+
+def submit_server_termination(client, server_id, ignore_error=False):
+    """Wait for a server to reach termination, without blocking
+
+    The servers of a client waited on this way are polled together by the
+    poller of the process.
+
+    :returns: a WaitFuture
+    """
+
+    def _check(body):
+        if body['status'] == 'ERROR' and not ignore_error:
             raise exceptions.BuildErrorException(server_id=server_id)
 
-        if int(time.time()) - start_time >= client.build_timeout:
-            raise exceptions.TimeoutException
+    def _timeout_message(body):
+        return ('Server %s failed to terminate within the required time '
+                '(%s s). Current status: %s.' %
+                (server_id, client.build_timeout, body['status']))
 
-        time.sleep(client.build_interval)
+    return _submit_wait(
+        client, 'servers',
+        lambda: client.list_servers(detail=True)['servers'],
+        lambda server_id: client.show_server(server_id)['server'],
+        server_id, None, client.build_timeout, _timeout_message,
+        _server_recorder(server_id), check=_check)
 
 
 def wait_for_image_status(client, image_id, status):
@@ -136,80 +423,158 @@ def wait_for_image_status(client, image_id, status):
     else:
         show_image = client.show_image
 
-    current_status = 'An unknown status'
-    start = int(time.time())
-    while int(time.time()) - start < client.build_timeout:
+    def _show():
         image = show_image(image_id)
         # Compute image client returns response wrapped in 'image' element
         # which is not case with Glance image client.
         if 'image' in image:
             image = image['image']
+        return image
 
+    def _ready(image):
         current_status = image['status']
         if current_status == status:
-            return
+            return True
         if current_status.lower() == 'killed':
             raise exceptions.ImageKilledException(image_id=image_id,
                                                   status=status)
         if current_status.lower() == 'error':
             raise exceptions.AddImageException(image_id=image_id)
+        return False
+
+    def _timeout_message(image):
+        return ('Image %(image_id)s failed to reach %(status)s state '
+                '(current state %(current_status)s) within the required '
+                'time (%(timeout)s s).' % {'image_id': image_id,
+                                           'status': status,
+                                           'current_status': image['status'],
+                                           'timeout': client.build_timeout})
+
+    wait_until(_show, _ready, client.build_interval, client.build_timeout,
+               _timeout_message,
+               recorder=timeline.WaitRecorder('image', image_id,
+                                              timeline.status_of))
 
-        time.sleep(client.build_interval)
 
-    message = ('Image %(image_id)s failed to reach %(status)s state '
-               '(current state %(current_status)s) within the required '
-               'time (%(timeout)s s).' % {'image_id': image_id,
-                                          'status': status,
-                                          'current_status': current_status,
-                                          'timeout': client.build_timeout})
-    caller = test_utils.find_test_caller()
-    if caller:
-        message = '(%s) %s' % (caller, message)
-    raise exceptions.TimeoutException(message)
+def _volume_recorder(volume_id):
+    return timeline.WaitRecorder('volume', volume_id, timeline.status_of)
+
+
+def _check_volume_error(body, volume_id):
+    if body['status'] == 'error':
+        raise exceptions.VolumeBuildErrorException(volume_id=volume_id)
+    if body['status'] == 'error_restoring':
+        raise exceptions.VolumeRestoreErrorException(volume_id=volume_id)
 
 
 def wait_for_volume_status(client, volume_id, status):
     """Waits for a Volume to reach a given status."""
-    body = client.show_volume(volume_id)['volume']
-    volume_status = body['status']
-    start = int(time.time())
 
-    while volume_status != status:
-        time.sleep(client.build_interval)
-        body = client.show_volume(volume_id)['volume']
-        volume_status = body['status']
-        if volume_status == 'error':
-            raise exceptions.VolumeBuildErrorException(volume_id=volume_id)
-        if volume_status == 'error_restoring':
-            raise exceptions.VolumeRestoreErrorException(volume_id=volume_id)
-
-        if int(time.time()) - start >= client.build_timeout:
-            message = ('Volume %s failed to reach %s status (current %s) '
-                       'within the required time (%s s).' %
-                       (volume_id, status, volume_status,
-                        client.build_timeout))
-            raise exceptions.TimeoutException(message)
+    def _timeout_message(body):
+        return ('Volume %s failed to reach %s status (current %s) '
+                'within the required time (%s s).' %
+                (volume_id, status, body['status'], client.build_timeout))
+
+    wait_until(lambda: client.show_volume(volume_id)['volume'],
+               lambda body: body['status'] == status,
+               client.build_interval, client.build_timeout,
+               _timeout_message,
+               check=lambda body: _check_volume_error(body, volume_id),
+               recorder=_volume_recorder(volume_id))
+
+
+def wait_for_volumes_status(client, volume_ids, status, **list_params):
+    """Waits for several Volumes to reach a given status.
+
+    The volumes are polled together with one detailed list_volumes call
+    per status check, filtered with list_params.
+
+    :returns: A dict of the volumes by id.
+    :raises ResourcesWaitException: if some volumes failed, with the
+                                    exception of each of them.
+    """
+
+    def _timeout_message(volume_id, body):
+        return ('Volume %s failed to reach %s status (current %s) '
+                'within the required time (%s s).' %
+                (volume_id, status, body and body['status'],
+                 client.build_timeout))
+
+    return wait_until_all(
+        lambda: client.list_volumes(detail=True,
+                                    params=list_params)['volumes'],
+        lambda volume_id: client.show_volume(volume_id)['volume'],
+        lambda body: body['status'] == status,
+        client.build_interval, client.build_timeout, _timeout_message,
+        volume_ids, check=lambda volume_id, body: _check_volume_error(
+            body, volume_id), new_recorder=_volume_recorder)
+
+
+def submit_volume_status(client, volume_id, status):
+    """Wait for a Volume to reach a given status, without blocking
+
+    The volumes of a client waited on this way are polled together by the
+    poller of the process, with one detailed list_volumes call per status
+    check.
+
+    :returns: a WaitFuture, whose result is the volume.
+    """
+
+    def _timeout_message(body):
+        return ('Volume %s failed to reach %s status (current %s) '
+                'within the required time (%s s).' %
+                (volume_id, status, body['status'], client.build_timeout))
+
+    return _submit_wait(
+        client, 'volumes',
+        lambda: client.list_volumes(detail=True)['volumes'],
+        lambda volume_id: client.show_volume(volume_id)['volume'],
+        volume_id, lambda body: body['status'] == status,
+        client.build_timeout, _timeout_message, _volume_recorder(volume_id),
+        check=lambda body: _check_volume_error(body, volume_id))
+
+
+def submit_volume_deletion(client, volume_id):
+    """Wait for a Volume to be deleted, without blocking
+
+    The volumes of a client waited on this way are polled together by the
+    poller of the process.
+
+    :returns: a WaitFuture
+    """
+
+    def _timeout_message(body):
+        return ('Volume %s failed to be deleted within the required time '
+                '(%s s). Current status: %s.' %
+                (volume_id, client.build_timeout, body['status']))
+
+    return _submit_wait(
+        client, 'volumes',
+        lambda: client.list_volumes(detail=True)['volumes'],
+        lambda volume_id: client.show_volume(volume_id)['volume'],
+        volume_id, None, client.build_timeout, _timeout_message,
+        _volume_recorder(volume_id))
 
 
 def wait_for_snapshot_status(client, snapshot_id, status):
     """Waits for a Snapshot to reach a given status."""
-    body = client.show_snapshot(snapshot_id)['snapshot']
-    snapshot_status = body['status']
-    start = int(time.time())
 
-    while snapshot_status != status:
-        time.sleep(client.build_interval)
-        body = client.show_snapshot(snapshot_id)['snapshot']
-        snapshot_status = body['status']
-        if snapshot_status == 'error':
+    def _check(body):
+        if body['status'] == 'error':
             raise exceptions.SnapshotBuildErrorException(
                 snapshot_id=snapshot_id)
-        if int(time.time()) - start >= client.build_timeout:
-            message = ('Snapshot %s failed to reach %s status (current %s) '
-                       'within the required time (%s s).' %
-                       (snapshot_id, status, snapshot_status,
-                        client.build_timeout))
-            raise exceptions.TimeoutException(message)
+
+    def _timeout_message(body):
+        return ('Snapshot %s failed to reach %s status (current %s) '
+                'within the required time (%s s).' %
+                (snapshot_id, status, body['status'], client.build_timeout))
+
+    wait_until(lambda: client.show_snapshot(snapshot_id)['snapshot'],
+               lambda body: body['status'] == status,
+               client.build_interval, client.build_timeout,
+               _timeout_message, check=_check,
+               recorder=timeline.WaitRecorder('snapshot', snapshot_id,
+                                              timeline.status_of))
 
 
 def wait_for_bm_node_status(client, node_id, attr, status):
@@ -217,25 +582,21 @@ def wait_for_bm_node_status(client, node_id, attr, status):
 
     The client should have a show_node(node_uuid) method to get the node.
     """
-    _, node = client.show_node(node_id)
-    start = int(time.time())
 
-    while node[attr] != status:
-        time.sleep(client.build_interval)
-        _, node = client.show_node(node_id)
-        status_curr = node[attr]
-        if status_curr == status:
-            return
-
-        if int(time.time()) - start >= client.build_timeout:
-            message = ('Node %(node_id)s failed to reach %(attr)s=%(status)s '
-                       'within the required time (%(timeout)s s).' %
-                       {'node_id': node_id,
-                        'attr': attr,
-                        'status': status,
-                        'timeout': client.build_timeout})
-            message += ' Current state of %s: %s.' % (attr, status_curr)
-            caller = test_utils.find_test_caller()
-            if caller:
-                message = '(%s) %s' % (caller, message)
-            raise exceptions.TimeoutException(message)
+    def _timeout_message(node):
+        message = ('Node %(node_id)s failed to reach %(attr)s=%(status)s '
+                   'within the required time (%(timeout)s s).' %
+                   {'node_id': node_id,
+                    'attr': attr,
+                    'status': status,
+                    'timeout': client.build_timeout})
+        message += ' Current state of %s: %s.' % (attr, node[attr])
+        return message
+
+    wait_until(lambda: client.show_node(node_id)[1],
+               lambda node: node[attr] == status,
+               client.build_interval, client.build_timeout,
+               _timeout_message,
+               recorder=timeline.WaitRecorder(
+                   'node', node_id, lambda node: {'state': node[attr],
+                                                  'attribute': attr}))
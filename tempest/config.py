@@ -88,6 +88,25 @@ AuthGroup = [
                      "creates. However in some neutron configurations, like "
                      "with VLAN provider networks, this doesn't work. So if "
                      "set to False the isolated networks will not be created"),
+    cfg.IntOpt('dynamic_credentials_pool_size',
+               default=0,
+               min=0,
+               help="If use_dynamic_credentials is set to True, the number "
+                    "of dynamic credentials, with their isolated network "
+                    "resources, which each test process creates in the "
+                    "background ahead of demand. Primary and alt "
+                    "credentials are then taken from this pool rather than "
+                    "created when the tests ask for them. Credentials with "
+                    "roles are taken from a pool of their own per set of "
+                    "roles, started when the roles are first asked for. "
+                    "Admin credentials are always created on demand. The "
+                    "credentials left in the pools are deleted when the "
+                    "test process exits. 0 disables the pools."),
+    cfg.IntOpt('dynamic_credentials_pool_threads',
+               default=2,
+               min=1,
+               help="Number of threads creating the dynamic credentials of "
+                    "the pool of each test process."),
     cfg.StrOpt('admin_username',
                help="Username for an administrative user. This is needed for "
                     "authenticating requests made by project isolation to "
@@ -111,6 +130,29 @@ AuthGroup = [
                help="Admin domain name for authentication (Keystone V3)."
                     "The same domain applies to user and project",
                deprecated_group='identity'),
+    cfg.BoolOpt('shared_token_cache',
+                default=False,
+                help="Share the tokens obtained from Keystone between the "
+                     "test workers authenticating with the same "
+                     "credentials. Tokens are cached in files in the "
+                     "lock_path of oslo_concurrency, readable only by "
+                     "their owner, until they expire or are rejected with "
+                     "a 401."),
+    cfg.BoolOpt('background_token_refresh',
+                default=False,
+                help="Refresh the tokens of the service clients in a "
+                     "background thread before they expire, so that "
+                     "requests, for instance the ones of waiters, never "
+                     "wait for a new token."),
+    cfg.IntOpt('client_manager_cache_size',
+               default=0,
+               help="Number of client managers each test worker keeps "
+                    "for reuse by the test classes getting the same "
+                    "credentials, as happens with pre-provisioned "
+                    "credentials. Reused managers keep their tokens and "
+                    "service clients. Managers of credentials deleted "
+                    "after a test class, like dynamic credentials, are "
+                    "discarded. 0 disables the cache."),
 ]
 
 identity_group = cfg.OptGroup(name='identity',
@@ -1021,6 +1063,96 @@ specify .* as the regex.
 """)
 ]
 
+service_clients_group = cfg.OptGroup(name='service-clients',
+                                     title="Service Clients Options")
+
+ServiceClientsGroup = [
+    cfg.BoolOpt('http_keep_alive',
+                default=False,
+                help="Keep HTTP connections to the cloud open and reuse "
+                     "them across requests, instead of opening a new "
+                     "connection for every request. Connections are pooled "
+                     "per host and shared by all service clients in a test "
+                     "worker."),
+    cfg.IntOpt('http_pool_size',
+               default=10,
+               help="Maximum number of keep-alive connections kept open "
+                    "for each host. Only used if http_keep_alive is True."),
+    cfg.IntOpt('http_pool_idle_timeout',
+               default=60,
+               help="Time in seconds after which the keep-alive "
+                    "connections to a host which is not used any more are "
+                    "closed. Only used if http_keep_alive is True."),
+    cfg.StrOpt('http_cassette',
+               help="File or directory of a cassette in which the requests "
+                    "of the service clients and their responses are "
+                    "recorded, or from which the responses are replayed "
+                    "instead of sending the requests, see "
+                    "http_cassette_mode. With a directory, each test "
+                    "worker records its own cassette in it. Cassettes hold "
+                    "the auth tokens returned by the cloud."),
+    cfg.StrOpt('http_cassette_mode',
+               default='replay',
+               choices=['record', 'replay'],
+               help="Whether the requests are recorded into http_cassette "
+                    "or replayed from it. Only used if http_cassette is "
+                    "set."),
+    cfg.FloatOpt('rate_limit',
+                 default=0,
+                 min=0,
+                 help="Maximum number of requests per second sent to each "
+                      "service by the service clients, 0 for no limit. "
+                      "Requests are spaced evenly, and the rate is lowered "
+                      "when the service answers with 413 or 429 and a "
+                      "retry-after header, then raised back as requests "
+                      "succeed."),
+    cfg.IntOpt('rate_limit_burst',
+               default=10,
+               min=1,
+               help="Number of requests which can be sent to a service at "
+                    "once before rate_limit applies. Only used if "
+                    "rate_limit is set."),
+    cfg.BoolOpt('rate_limit_shared',
+                default=True,
+                help="Share the rate limit of each service among all the "
+                     "test workers through files in the lock_path of "
+                     "oslo_concurrency, instead of applying it to each "
+                     "worker separately. Only used if rate_limit is set."),
+]
+
+waiters_group = cfg.OptGroup(name='waiters',
+                             title="Resource Waiters Options")
+
+WaitersGroup = [
+    cfg.FloatOpt('initial_interval',
+                 min=0,
+                 help="Time in seconds between the first status checks of "
+                      "the waiters of tempest.common.waiters. Defaults to "
+                      "the build_interval of the service being waited on. "
+                      "A short initial interval with a backoff_factor "
+                      "greater than 1 detects quick status transitions "
+                      "early without polling the API as often during long "
+                      "ones."),
+    cfg.FloatOpt('backoff_factor',
+                 default=1.0,
+                 min=1,
+                 help="Factor by which the interval between status checks "
+                      "grows after each check, up to max_interval. The "
+                      "default polls at a fixed interval."),
+    cfg.FloatOpt('max_interval',
+                 min=0,
+                 help="Maximum time in seconds between status checks. "
+                      "Defaults to the build_interval of the service being "
+                      "waited on."),
+    cfg.FloatOpt('jitter',
+                 default=0,
+                 min=0,
+                 max=1,
+                 help="Fraction of each interval between status checks by "
+                      "which it is randomly shortened or lengthened, so that "
+                      "concurrent waiters spread their requests."),
+]
+
 input_scenario_group = cfg.OptGroup(name="input-scenario",
                                     title="Filters and values for"
                                           " input scenarios[DEPRECATED]")
@@ -1136,6 +1268,8 @@ _opts = [
     (scenario_group, ScenarioGroup),
     (service_available_group, ServiceAvailableGroup),
     (debug_group, DebugGroup),
+    (service_clients_group, ServiceClientsGroup),
+    (waiters_group, WaitersGroup),
     (baremetal_group, BaremetalGroup),
     (input_scenario_group, InputScenarioGroup),
     (negative_group, NegativeGroup),
@@ -1203,6 +1337,8 @@ class TempestConfigPrivate(object):
         self.scenario = _CONF.scenario
         self.service_available = _CONF.service_available
         self.debug = _CONF.debug
+        self.service_clients = _CONF['service-clients']
+        self.waiters = _CONF.waiters
         self.baremetal = _CONF.baremetal
         self.input_scenario = _CONF['input-scenario']
         self.negative = _CONF.negative
@@ -1372,6 +1508,12 @@ def service_client_config(service_client_name=None):
         * `disable_ssl_certificate_validation`
         * `ca_certs`
         * `trace_requests`
+        * `http_keep_alive`
+        * `http_pool_size`
+        * `http_pool_idle_timeout`
+        * `rate_limit`
+        * `rate_limit_burst`
+        * `rate_limit_lock_path`
 
     The dict returned by this does not fit a few service clients:
 
@@ -1393,8 +1535,18 @@ def service_client_config(service_client_name=None):
         'disable_ssl_certificate_validation':
             CONF.identity.disable_ssl_certificate_validation,
         'ca_certs': CONF.identity.ca_certificates_file,
-        'trace_requests': CONF.debug.trace_requests
+        'trace_requests': CONF.debug.trace_requests,
+        'http_keep_alive': CONF.service_clients.http_keep_alive,
+        'http_pool_size': CONF.service_clients.http_pool_size,
+        'http_pool_idle_timeout': CONF.service_clients.http_pool_idle_timeout,
+        'rate_limit': CONF.service_clients.rate_limit,
+        'rate_limit_burst': CONF.service_clients.rate_limit_burst,
+        'rate_limit_lock_path': None
     }
+    if (CONF.service_clients.rate_limit and
+            CONF.service_clients.rate_limit_shared):
+        _parameters['rate_limit_lock_path'] = os.path.join(
+            lockutils.get_lock_path(CONF), 'rate_limits')
 
     if service_client_name is None:
         return _parameters
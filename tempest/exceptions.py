@@ -33,6 +33,17 @@ class BuildErrorException(exceptions.TempestException):
     message = "Server %(server_id)s failed to build and is in ERROR status"
 
 
+class ResourcesWaitException(exceptions.TempestException):
+    message = "Waiting failed for %(resource_ids)s"
+
+    def __init__(self, failures):
+        self.failures = failures
+        super(ResourcesWaitException, self).__init__(
+            *['%s: %s' % (resource_id, failures[resource_id])
+              for resource_id in sorted(failures)],
+            resource_ids=', '.join(sorted(failures)))
+
+
 class ImageKilledException(exceptions.TempestException):
     message = "Image %(image_id)s 'killed' while waiting for '%(status)s'"
 
@@ -18,17 +18,25 @@ import abc
 import copy
 import datetime
 import re
+import threading
+import time
+import weakref
 
 from oslo_log import log as logging
 import six
 from six.moves.urllib import parse as urlparse
 
+from tempest.lib.common import http
+from tempest.lib.common import token_cache
 from tempest.lib import exceptions
 from tempest.lib.services.identity.v2 import token_client as json_v2id
 from tempest.lib.services.identity.v3 import token_client as json_v3id
 
 ISO8601_FLOAT_SECONDS = '%Y-%m-%dT%H:%M:%S.%fZ'
 ISO8601_INT_SECONDS = '%Y-%m-%dT%H:%M:%SZ'
+# Time in seconds between two checks of the background token refresher when
+# there is no token to refresh, or after a token refresh failed
+REFRESH_RETRY_INTERVAL = 10
 LOG = logging.getLogger(__name__)
 
 
@@ -100,6 +108,9 @@ class AuthProvider(object):
         self.cache = None
         self.alt_auth_data = None
         self.alt_part = None
+        # Held while a token is requested, so that threads sharing the auth
+        # provider request only one token at a time
+        self._auth_lock = threading.Lock()
 
     def __str__(self):
         return "Creds :{creds}, cached auth data: {cache}".format(
@@ -145,10 +156,23 @@ class AuthProvider(object):
         self.clear_auth()
 
     def get_auth(self):
-        """Returns auth from cache if available, else auth first"""
-        if self.cache is None or self.is_expired(self.cache):
-            self.set_auth()
-        return self.cache
+        """Returns auth from cache if available, else auth first
+
+        Only one thread requests auth at a time, the other threads needing
+        it wait for it and use it.
+        """
+        auth_data = self.cache
+        if auth_data is None or self.is_expired(auth_data):
+            with self._auth_lock:
+                # Auth may have been set while waiting for the lock
+                if self.cache is None or self.is_expired(self.cache):
+                    self._renew_auth()
+                auth_data = self.cache
+        return auth_data
+
+    def _renew_auth(self):
+        """Set auth, when there is none in cache or it expired"""
+        self.set_auth()
 
     def set_auth(self):
         """Forces setting auth.
@@ -168,6 +192,16 @@ class AuthProvider(object):
         self.cache = None
         self.credentials.reset()
 
+    def invalidate_token(self, token):
+        """Handle a token rejected by a service with a 401
+
+        This does nothing by default, auth providers sharing their tokens
+        with others drop the rejected token so that it is not used again.
+
+        :param token: The token which was rejected
+        """
+        pass
+
     @abc.abstractmethod
     def is_expired(self, auth_data):
         return
@@ -260,13 +294,136 @@ class KeystoneAuthProvider(AuthProvider):
 
     def __init__(self, credentials, auth_url,
                  disable_ssl_certificate_validation=None,
-                 ca_certs=None, trace_requests=None, scope='project'):
+                 ca_certs=None, trace_requests=None, scope='project',
+                 http_keep_alive=False, http_pool_size=http.DEFAULT_POOL_SIZE,
+                 http_pool_idle_timeout=http.DEFAULT_POOL_IDLE_TIMEOUT,
+                 rate_limit=None, rate_limit_burst=1,
+                 rate_limit_lock_path=None, token_cache=None):
         super(KeystoneAuthProvider, self).__init__(credentials, scope)
         self.dscv = disable_ssl_certificate_validation
         self.ca_certs = ca_certs
         self.trace_requests = trace_requests
+        self.http_params = dict(
+            http_keep_alive=http_keep_alive, http_pool_size=http_pool_size,
+            http_pool_idle_timeout=http_pool_idle_timeout,
+            rate_limit=rate_limit, rate_limit_burst=rate_limit_burst,
+            rate_limit_lock_path=rate_limit_lock_path)
         self.auth_url = auth_url
         self.auth_client = self._auth_client(auth_url)
+        # Base URLs found in the catalog of the last auth data used, see
+        # _get_endpoint_index
+        self._endpoint_index = None
+        self.token_cache = token_cache
+        self._token_cache_key = None
+        # Last expiry string parsed and its datetime, see _parse_expiry_time
+        self._parsed_expiry = None
+
+    def _get_token_cache_key(self):
+        # NOTE: The key is computed before credentials are filled from the
+        # auth data, so that it does not change once a token is obtained.
+        if self._token_cache_key is None:
+            self._token_cache_key = token_cache.cache_key(
+                self.__class__.__name__, self.auth_url, self.scope,
+                self._auth_params())
+        return self._token_cache_key
+
+    def _renew_auth(self):
+        """Set auth, when there is none in cache or it expired
+
+        With a token cache, a valid token cached by another auth provider
+        with the same credentials, auth URL and scope is used rather than
+        requesting a new one.
+        """
+        if self.token_cache is not None:
+            auth_data = self.token_cache.get(self._get_token_cache_key())
+            if auth_data is not None and not self.is_expired(auth_data):
+                self.cache = auth_data
+                self._fill_credentials(auth_data[1])
+                self._index_auth_data(auth_data)
+                return
+        super(KeystoneAuthProvider, self)._renew_auth()
+
+    def set_auth(self):
+        """Forces setting auth.
+
+        Forces setting auth, ignores cache if it exists.
+        Refills credentials. The new token is stored in the token cache.
+        """
+        if self.token_cache is None:
+            super(KeystoneAuthProvider, self).set_auth()
+        else:
+            key = self._get_token_cache_key()
+            super(KeystoneAuthProvider, self).set_auth()
+            self.token_cache.set(key, self.cache)
+        self._index_auth_data(self.cache)
+
+    def _index_auth_data(self, auth_data):
+        """Prepare what requests need from new auth data
+
+        The expiry time is parsed and the endpoint index reset when the auth
+        data is set, rather than by the first request using it.
+        """
+        self._get_expiry(auth_data)
+        self._get_endpoint_index(auth_data[1])
+
+    def clear_auth(self):
+        super(KeystoneAuthProvider, self).clear_auth()
+        self._token_cache_key = None
+
+    def start_refresher(self, margin=None):
+        """Refresh the token in the background before it expires
+
+        A daemon thread requests a new token when the cached one is about to
+        expire, so that requests do not wait for a new token. The thread is
+        shared by all auth providers of the process. It stops refreshing the
+        token with stop_refresher, or once the auth provider is garbage
+        collected.
+
+        :param margin: how long before token_expiry_threshold the token is
+                       refreshed, as a timedelta, token_expiry_threshold by
+                       default
+        """
+        if margin is None:
+            margin = self.token_expiry_threshold
+        _token_refresher.add(self, margin)
+
+    def stop_refresher(self):
+        """Stop refreshing the token in the background"""
+        _token_refresher.remove(self)
+
+    def _refresh_token(self, margin):
+        """Refresh the token if it expires within margin
+
+        :return: the time in seconds until the token is to be refreshed
+        """
+        auth_data = self.cache
+        if auth_data is None:
+            return REFRESH_RETRY_INTERVAL
+        refresh_at = (self._get_expiry(auth_data) -
+                      self.token_expiry_threshold - margin)
+        delay = (refresh_at - datetime.datetime.utcnow()).total_seconds()
+        if delay > 0:
+            return delay
+        with self._auth_lock:
+            # Skip the refresh if the token was replaced meanwhile
+            if self.cache is auth_data:
+                try:
+                    self.set_auth()
+                except Exception:
+                    LOG.exception('Failed to refresh the token of %s',
+                                  self.credentials)
+                    return REFRESH_RETRY_INTERVAL
+        # NOTE: Check at most every second, in case new tokens already
+        # expire within the margin
+        return 1
+
+    def invalidate_token(self, token):
+        """Drop a token rejected by a service from the token cache"""
+        if self.token_cache is None:
+            return
+        self.token_cache.invalidate(self._get_token_cache_key(), token)
+        if self.cache is not None and self.cache[0] == token:
+            self.cache = None
 
     def _decorate_request(self, filters, method, url, headers=None, body=None,
                           auth_data=None):
@@ -289,6 +446,68 @@ class KeystoneAuthProvider(AuthProvider):
         # no change to method or body
         return str(_url), _headers, body
 
+    def _get_endpoint_index(self, auth_data_body):
+        """Return the index of the endpoints of a catalog
+
+        The index maps (service, name, endpoint_type, region) to the base
+        URL found in the catalog, before URL filters are applied. It is
+        filled as base URLs are looked up, and reset when the auth data
+        changes, i.e. when a new token is used.
+
+        :param auth_data_body: The auth data holding the catalog
+        :return: a dict, empty for new auth data
+        """
+        index = self._endpoint_index
+        # NOTE: The index holds a reference to the auth data, so its id
+        # cannot be reused by other auth data while the index exists.
+        if index is None or index[0] is not auth_data_body:
+            index = self._endpoint_index = (auth_data_body, {})
+        return index[1]
+
+    def base_url(self, filters, auth_data=None):
+        """Base URL from catalog
+
+        :param filters: Used to filter results
+
+        Filters can be:
+
+        - service: service type name such as compute, image, etc.
+        - region: service region name
+        - name: service name, only if service exists
+        - endpoint_type: type of endpoint such as
+            adminURL, publicURL, internalURL
+        - api_version: the version of api used to replace catalog version
+        - skip_path: skips the suffix path of the url and uses base URL
+
+        :rtype: string
+        :return: url with filters applied
+        """
+        if auth_data is None:
+            auth_data = self.get_auth()
+        token, _auth_data = auth_data
+        service = filters.get('service')
+        if service is None:
+            raise exceptions.EndpointNotFound("No service provided")
+        key = (service, filters.get('name'),
+               filters.get('endpoint_type', self.DEFAULT_ENDPOINT_TYPE),
+               filters.get('region'))
+        index = self._get_endpoint_index(_auth_data)
+        _base_url = index.get(key)
+        if _base_url is None:
+            _base_url = self._find_base_url(_auth_data, *key)
+            index[key] = _base_url
+        return apply_url_filters(_base_url, filters)
+
+    @abc.abstractmethod
+    def _find_base_url(self, auth_data_body, service, name, endpoint_type,
+                       region):
+        """Look up a base URL in the catalog
+
+        :raises EndpointNotFound: if no endpoint matches
+        :return: the base URL, without URL filters applied
+        """
+        return
+
     @abc.abstractmethod
     def _auth_client(self):
         return
@@ -312,11 +531,17 @@ class KeystoneAuthProvider(AuthProvider):
         return token, auth_data
 
     def _parse_expiry_time(self, expiry_string):
+        # The expiry of the token in use is checked before every request,
+        # only parse it when it changes
+        parsed = self._parsed_expiry
+        if parsed is not None and parsed[0] == expiry_string:
+            return parsed[1]
         expiry = None
         for date_format in self.EXPIRY_DATE_FORMATS:
             try:
                 expiry = datetime.datetime.strptime(
                     expiry_string, date_format)
+                break
             except ValueError:
                 pass
         if expiry is None:
@@ -324,12 +549,106 @@ class KeystoneAuthProvider(AuthProvider):
                 "time data '{data}' does not match any of the"
                 "expected formats: {formats}".format(
                     data=expiry_string, formats=self.EXPIRY_DATE_FORMATS))
+        self._parsed_expiry = (expiry_string, expiry)
         return expiry
 
+    @abc.abstractmethod
+    def _get_expiry(self, auth_data):
+        """Return the expiry time of a token, as a UTC datetime"""
+        return
+
+    def is_expired(self, auth_data):
+        expiry = self._get_expiry(auth_data)
+        return (expiry - self.token_expiry_threshold <=
+                datetime.datetime.utcnow())
+
     def get_token(self):
         return self.get_auth()[0]
 
 
+class _TokenRefresher(object):
+    """Refresh the tokens of auth providers from a single daemon thread
+
+    The auth providers are held through weak references, so refreshing their
+    tokens does not keep them alive. The thread is started when the first
+    auth provider is added, and exits once there is none left.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        # id of the auth provider -> [weak reference, margin, due time]
+        self._providers = {}
+        self._thread = None
+
+    def add(self, auth_provider, margin):
+        with self._condition:
+            self._providers[id(auth_provider)] = [
+                weakref.ref(auth_provider), margin, 0]
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run,
+                                                name='token-refresher')
+                self._thread.daemon = True
+                self._thread.start()
+            self._condition.notify()
+
+    def remove(self, auth_provider):
+        with self._condition:
+            entry = self._providers.get(id(auth_provider))
+            if entry is not None and entry[0]() is auth_provider:
+                del self._providers[id(auth_provider)]
+
+    def is_refreshing(self, auth_provider):
+        with self._condition:
+            entry = self._providers.get(id(auth_provider))
+            return entry is not None and entry[0]() is auth_provider
+
+    def _next_due(self):
+        """Wait for the next auth provider due for a refresh
+
+        :return: the key and entry of the auth provider, or None once there
+                 is no auth provider left
+        """
+        while True:
+            for key, entry in list(self._providers.items()):
+                if entry[0]() is None:
+                    del self._providers[key]
+            if not self._providers:
+                return None
+            key, entry = min(self._providers.items(),
+                             key=lambda item: item[1][2])
+            delay = entry[2] - time.time()
+            if delay <= 0:
+                return key, entry
+            self._condition.wait(delay)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                due = self._next_due()
+                if due is None:
+                    self._thread = None
+                    return
+            key, entry = due
+            auth_provider = entry[0]()
+            if auth_provider is None:
+                continue
+            try:
+                delay = auth_provider._refresh_token(entry[1])
+            except Exception:
+                LOG.exception('Failed to refresh the token of %s',
+                              auth_provider.credentials)
+                delay = REFRESH_RETRY_INTERVAL
+            # Do not keep the auth provider alive while waiting
+            del auth_provider
+            with self._condition:
+                # The auth provider may have been removed or added again
+                if self._providers.get(key) is entry:
+                    entry[2] = time.time() + delay
+
+
+_token_refresher = _TokenRefresher()
+
+
 class KeystoneV2AuthProvider(KeystoneAuthProvider):
     """Provides authentication based on the Identity V2 API
 
@@ -339,10 +658,13 @@ class KeystoneV2AuthProvider(KeystoneAuthProvider):
 
     SCOPES = set(['project'])
 
+    DEFAULT_ENDPOINT_TYPE = 'publicURL'
+
     def _auth_client(self, auth_url):
         return json_v2id.TokenClient(
             auth_url, disable_ssl_certificate_validation=self.dscv,
-            ca_certs=self.ca_certs, trace_requests=self.trace_requests)
+            ca_certs=self.ca_certs, trace_requests=self.trace_requests,
+            **self.http_params)
 
     def _auth_params(self):
         """Auth parameters to be passed to the token request
@@ -367,37 +689,10 @@ class KeystoneV2AuthProvider(KeystoneAuthProvider):
         if self.credentials.user_id is None:
             self.credentials.user_id = user['id']
 
-    def base_url(self, filters, auth_data=None):
-        """Base URL from catalog
-
-        :param filters: Used to filter results
-
-        Filters can be:
-
-        - service: service type name such as compute, image, etc.
-        - region: service region name
-        - name: service name, only if service exists
-        - endpoint_type: type of endpoint such as
-            adminURL, publicURL, internalURL
-        - api_version: the version of api used to replace catalog version
-        - skip_path: skips the suffix path of the url and uses base URL
-
-        :rtype: string
-        :return: url with filters applied
-        """
-        if auth_data is None:
-            auth_data = self.get_auth()
-        token, _auth_data = auth_data
-        service = filters.get('service')
-        region = filters.get('region')
-        name = filters.get('name')
-        endpoint_type = filters.get('endpoint_type', 'publicURL')
-
-        if service is None:
-            raise exceptions.EndpointNotFound("No service provided")
-
+    def _find_base_url(self, auth_data_body, service, name, endpoint_type,
+                       region):
         _base_url = None
-        for ep in _auth_data['serviceCatalog']:
+        for ep in auth_data_body['serviceCatalog']:
             if ep["type"] == service:
                 if name is not None and ep["name"] != name:
                     continue
@@ -412,13 +707,11 @@ class KeystoneV2AuthProvider(KeystoneAuthProvider):
             raise exceptions.EndpointNotFound(
                 "service: %s, region: %s, endpoint_type: %s, name: %s" %
                 (service, region, endpoint_type, name))
-        return apply_url_filters(_base_url, filters)
+        return _base_url
 
-    def is_expired(self, auth_data):
+    def _get_expiry(self, auth_data):
         _, access = auth_data
-        expiry = self._parse_expiry_time(access['token']['expires'])
-        return (expiry - self.token_expiry_threshold <=
-                datetime.datetime.utcnow())
+        return self._parse_expiry_time(access['token']['expires'])
 
 
 class KeystoneV3AuthProvider(KeystoneAuthProvider):
@@ -426,10 +719,13 @@ class KeystoneV3AuthProvider(KeystoneAuthProvider):
 
     SCOPES = set(['project', 'domain', 'unscoped', None])
 
+    DEFAULT_ENDPOINT_TYPE = 'public'
+
     def _auth_client(self, auth_url):
         return json_v3id.V3TokenClient(
             auth_url, disable_ssl_certificate_validation=self.dscv,
-            ca_certs=self.ca_certs, trace_requests=self.trace_requests)
+            ca_certs=self.ca_certs, trace_requests=self.trace_requests,
+            **self.http_params)
 
     def _auth_params(self):
         """Auth parameters to be passed to the token request
@@ -495,43 +791,18 @@ class KeystoneV3AuthProvider(KeystoneAuthProvider):
         if self.credentials.user_domain_name is None:
             self.credentials.user_domain_name = user['domain']['name']
 
-    def base_url(self, filters, auth_data=None):
-        """Base URL from catalog
+    def _find_base_url(self, auth_data_body, service, name, endpoint_type,
+                       region):
+        """Look up a base URL in the catalog
 
         If scope is not 'project', it may be that there is not catalog in
         the auth_data. In such case, as long as the requested service is
         'identity', we can use the original auth URL to build the base_url.
-
-        :param filters: Used to filter results
-
-        Filters can be:
-
-        - service: service type name such as compute, image, etc.
-        - region: service region name
-        - name: service name, only if service exists
-        - endpoint_type: type of endpoint such as
-            adminURL, publicURL, internalURL
-        - api_version: the version of api used to replace catalog version
-        - skip_path: skips the suffix path of the url and uses base URL
-
-        :rtype: string
-        :return: url with filters applied
         """
-        if auth_data is None:
-            auth_data = self.get_auth()
-        token, _auth_data = auth_data
-        service = filters.get('service')
-        region = filters.get('region')
-        name = filters.get('name')
-        endpoint_type = filters.get('endpoint_type', 'public')
-
-        if service is None:
-            raise exceptions.EndpointNotFound("No service provided")
-
         if 'URL' in endpoint_type:
             endpoint_type = endpoint_type.replace('URL', '')
         _base_url = None
-        catalog = _auth_data.get('catalog', [])
+        catalog = auth_data_body.get('catalog', [])
 
         # Select entries with matching service type
         service_catalog = [ep for ep in catalog if ep['type'] == service]
@@ -553,7 +824,7 @@ class KeystoneV3AuthProvider(KeystoneAuthProvider):
                 msg = ('Got an empty catalog. Scope: %s. '
                        'Falling back to configured URL for %s: %s')
                 LOG.debug(msg, self.scope, service, self.auth_url)
-                return apply_url_filters(self.auth_url, filters)
+                return self.auth_url
             else:
                 # No matching service
                 msg = ('No matching service found in the catalog.\n'
@@ -562,8 +833,8 @@ class KeystoneV3AuthProvider(KeystoneAuthProvider):
                        'Service: %s, Region: %s, endpoint_type: %s\n'
                        'Catalog: %s')
                 raise exceptions.EndpointNotFound(msg % (
-                    self.scope, self.credentials, _auth_data, service, region,
-                    endpoint_type, catalog))
+                    self.scope, self.credentials, auth_data_body, service,
+                    region, endpoint_type, catalog))
         # Filter by endpoint type (interface)
         filtered_catalog = [ep for ep in service_catalog if
                             ep['interface'] == endpoint_type]
@@ -580,13 +851,11 @@ class KeystoneV3AuthProvider(KeystoneAuthProvider):
         _base_url = filtered_catalog[0].get('url', None)
         if _base_url is None:
             raise exceptions.EndpointNotFound(service)
-        return apply_url_filters(_base_url, filters)
+        return _base_url
 
-    def is_expired(self, auth_data):
+    def _get_expiry(self, auth_data):
         _, access = auth_data
-        expiry = self._parse_expiry_time(access['expires_at'])
-        return (expiry - self.token_expiry_threshold <=
-                datetime.datetime.utcnow())
+        return self._parse_expiry_time(access['expires_at'])
 
 
 def is_identity_version_supported(identity_version):
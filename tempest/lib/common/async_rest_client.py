@@ -0,0 +1,202 @@
+# Copyright 2016 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""asyncio counterpart of the RestClient
+
+The clients defined on top of AsyncRestClient need Python 3.4 or later. Their
+methods are generator based coroutines, which can be used with ``yield from``
+or, from Python 3.5, ``await``.
+"""
+
+import asyncio
+from concurrent import futures
+import functools
+import threading
+import time
+
+from tempest.lib.common import rest_client
+from tempest.lib.common.utils import test_utils
+from tempest.lib import exceptions
+
+# Default number of requests in flight at the same time for the async
+# clients sharing an executor
+DEFAULT_MAX_CONCURRENCY = 100
+
+_executors = {}
+_executors_lock = threading.Lock()
+
+
+def get_executor(max_concurrency=DEFAULT_MAX_CONCURRENCY):
+    """Return the executor which sends the requests of async clients
+
+    Async clients created with the same max_concurrency share an executor,
+    and so the limit of requests in flight at the same time.
+
+    :param int max_concurrency: maximum number of requests in flight
+    :return: a concurrent.futures.ThreadPoolExecutor
+    """
+    with _executors_lock:
+        executor = _executors.get(max_concurrency)
+        if executor is None:
+            executor = futures.ThreadPoolExecutor(max_workers=max_concurrency)
+            _executors[max_concurrency] = executor
+        return executor
+
+
+class AsyncRestClient(rest_client.RestClient):
+    """asyncio variant of the RestClient
+
+    The request methods of the RestClient (request, get, post, put, ...) are
+    coroutines, so that one event loop can drive many concurrent calls::
+
+        servers = yield from asyncio.gather(
+            *[client.show_server(id) for id in server_ids])
+
+    Requests are authenticated by the auth provider, and responses checked
+    and validated, in the same way as with the RestClient. Only sending the
+    request and reading the response happens in an executor thread, which
+    is shared with the other async clients using the same max_concurrency.
+    Streaming response bodies is not supported.
+
+    :param int max_concurrency: maximum number of requests in flight at the
+                                same time, it is also the default
+                                http_pool_size
+    :param kwargs: kwargs accepted by rest_client.RestClient
+    """
+
+    def __init__(self, auth_provider, service, region,
+                 max_concurrency=DEFAULT_MAX_CONCURRENCY, **kwargs):
+        kwargs.setdefault('http_pool_size', max_concurrency)
+        super(AsyncRestClient, self).__init__(
+            auth_provider, service, region, **kwargs)
+        self.max_concurrency = max_concurrency
+        self.executor = get_executor(max_concurrency)
+
+    @asyncio.coroutine
+    def _run_in_executor(self, func, *args, **kwargs):
+        loop = asyncio.get_event_loop()
+        result = yield from loop.run_in_executor(
+            self.executor, functools.partial(func, *args, **kwargs))
+        return result
+
+    @asyncio.coroutine
+    def _request(self, method, url, headers=None, body=None,
+                 chunked=False):
+        """A simple HTTP request interface."""
+        # Authenticating may fetch a new token, so it must not block the loop
+        req_url, req_headers, req_body = yield from self._run_in_executor(
+            self.auth_provider.auth_request, method, url, headers, body,
+            self.filters)
+
+        if self.rate_limiter:
+            # Wait for the turn of the request without blocking the loop
+            delay = self.rate_limiter.reserve()
+            if delay:
+                yield from asyncio.sleep(delay)
+
+        # Do the actual request, and time it
+        start = time.time()
+        self._log_request_start(method, req_url)
+        resp, resp_body = yield from self.raw_request(
+            req_url, method, headers=req_headers, body=req_body,
+            chunked=chunked
+        )
+        end = time.time()
+        self._log_request(method, req_url, resp, secs=(end - start),
+                          req_headers=req_headers, req_body=req_body,
+                          resp_body=resp_body)
+        self._update_rate_limiter(resp)
+        self._check_token_rejected(resp, req_headers)
+
+        # Verify HTTP response codes
+        self.response_checker(method, resp, resp_body)
+
+        return resp, resp_body
+
+    @asyncio.coroutine
+    def raw_request(self, url, method, headers=None, body=None,
+                    chunked=False):
+        """Send a raw HTTP request without the keystone catalog or auth
+
+        See `RestClient.raw_request`, this is a coroutine.
+        """
+        if headers is None:
+            headers = self.get_headers()
+        response = yield from self._run_in_executor(
+            self.http_obj.request, url, method, headers=headers, body=body,
+            chunked=chunked)
+        return response
+
+    @asyncio.coroutine
+    def request(self, method, url, extra_headers=False, headers=None,
+                body=None, chunked=False):
+        """Send a HTTP request with keystone auth and using the catalog
+
+        See `RestClient.request`, this is a coroutine and it raises the same
+        exceptions. Rate limited requests are sent again without blocking
+        the event loop.
+        """
+        retry = 0
+        slept = 0
+        headers = self._get_request_headers(headers, extra_headers)
+
+        start = time.time()
+        resp, resp_body = yield from self._request(
+            method, url, headers=headers, body=body, chunked=chunked)
+
+        while self._should_retry(resp, resp_body, retry):
+            retry += 1
+            delay = self._get_retry_after_delay(resp)
+            self.LOG.debug(
+                "Sleeping %s seconds based on retry-after header", delay
+            )
+            yield from asyncio.sleep(delay)
+            slept += delay
+            resp, resp_body = yield from self._request(
+                method, url, headers=headers, body=body)
+        self._record_metrics(method, url, body, resp, resp_body,
+                             time.time() - start - slept, retry)
+        self._error_checker(method, url, headers, body,
+                            resp, resp_body)
+        return resp, resp_body
+
+    @asyncio.coroutine
+    def wait_for_resource_deletion(self, id):
+        """Waits for a resource to be deleted
+
+        See `RestClient.wait_for_resource_deletion`, this is a coroutine and
+        is_resource_deleted must be a coroutine too.
+        """
+        start_time = int(time.time())
+        while True:
+            if (yield from self.is_resource_deleted(id)):
+                return
+            if int(time.time()) - start_time >= self.build_timeout:
+                message = ('Failed to delete %(resource_type)s %(id)s within '
+                           'the required time (%(timeout)s s).' %
+                           {'resource_type': self.resource_type, 'id': id,
+                            'timeout': self.build_timeout})
+                caller = test_utils.get_test_caller()
+                if caller:
+                    message = '(%s) %s' % (caller, message)
+                raise exceptions.TimeoutException(message)
+            yield from asyncio.sleep(self.build_interval)
+
+    @asyncio.coroutine
+    def is_resource_deleted(self, id):
+        """Subclasses override with specific deletion detection."""
+        message = ('"%s" does not implement is_resource_deleted'
+                   % self.__class__.__name__)
+        raise NotImplementedError(message)
@@ -0,0 +1,299 @@
+# Copyright 2016 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Record and replay the HTTP requests of the REST clients
+
+In record mode the requests sent by the REST clients and their responses
+are saved into a cassette. In replay mode the responses are read from the
+cassette instead of being sent to the cloud, so the client stack and the
+test logic can be run, and profiled, offline::
+
+    cassette.use_cassette('/tmp/run.json.gz', cassette.RECORD)
+    ... run the clients against a cloud ...
+    cassette.eject()
+
+    cassette.use_cassette('/tmp/run.json.gz', cassette.REPLAY)
+    ... run the same clients offline ...
+
+The clients created while a cassette is in use send their requests through
+it. Responses are looked up by method, url and a hash of the request body.
+When the same request is sent several times, for instance by a waiter, the
+recorded responses are replayed in order, and the last one is repeated.
+
+A cassette is a JSON file, compressed with gzip if the path ends with
+``.gz``. If the path is a directory, each process records into its own
+cassette-<pid>.json.gz file in it, and all the cassettes in it are replayed.
+Cassettes hold the response bodies and headers, including auth tokens, but
+not the request bodies and headers.
+"""
+
+import atexit
+import base64
+import collections
+import glob
+import gzip
+import hashlib
+import json
+import os
+import threading
+
+import six
+
+from tempest.lib.common import http
+from tempest.lib import exceptions
+
+RECORD = 'record'
+REPLAY = 'replay'
+MODES = (RECORD, REPLAY)
+
+CASSETTE_VERSION = 1
+
+_active = None
+_active_lock = threading.Lock()
+
+
+def body_hash(body):
+    """Return the hash used to index the requests with a body"""
+    if body is None:
+        body = b''
+    elif isinstance(body, six.text_type):
+        body = body.encode('utf-8')
+    elif not isinstance(body, six.binary_type):
+        # Bodies sent in chunks from a file or an iterator cannot be read
+        # twice, they all share one hash
+        return 'chunked'
+    return hashlib.sha1(body).hexdigest()
+
+
+class _RecordedInfo(object):
+    """Stands in for the urllib3 response of a recorded interaction"""
+
+    def __init__(self, interaction, data):
+        self.status = interaction['status']
+        self.reason = interaction['reason']
+        self.version = interaction['version']
+        self._headers = interaction['headers']
+        self._body = six.BytesIO(data)
+
+    def getheaders(self):
+        return self._headers
+
+    def stream(self, amt):
+        while True:
+            chunk = self._body.read(amt)
+            if not chunk:
+                break
+            yield chunk
+
+    def read(self, amt=None):
+        return self._body.read(amt)
+
+    def release_conn(self):
+        pass
+
+
+class Cassette(object):
+    """Recorded requests and responses
+
+    :param str path: The file or the directory of the cassette
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.interactions = []
+        self._index = collections.defaultdict(list)
+        self._played = collections.Counter()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(method, url, body):
+        return method.upper(), url, body_hash(body)
+
+    def _files(self):
+        if os.path.isdir(self.path):
+            return sorted(glob.glob(os.path.join(self.path, 'cassette-*')))
+        return [self.path] if os.path.exists(self.path) else []
+
+    def _record_path(self):
+        if os.path.isdir(self.path):
+            return os.path.join(self.path,
+                                'cassette-%d.json.gz' % os.getpid())
+        return self.path
+
+    @staticmethod
+    def _open(path, mode):
+        if path.endswith('.gz'):
+            return gzip.open(path, mode + 'b')
+        return open(path, mode + 'b')
+
+    def load(self):
+        """Load the interactions recorded in the cassette files"""
+        for path in self._files():
+            with self._open(path, 'r') as f:
+                data = json.loads(f.read().decode('utf-8'))
+            for interaction in data['interactions']:
+                self._add(interaction)
+        return self
+
+    def save(self):
+        """Save the recorded interactions"""
+        with self._lock:
+            data = {'version': CASSETTE_VERSION,
+                    'interactions': list(self.interactions)}
+        content = json.dumps(data, separators=(',', ':'))
+        with self._open(self._record_path(), 'w') as f:
+            f.write(content.encode('utf-8'))
+
+    def _add(self, interaction):
+        key = (interaction['method'], interaction['url'],
+               interaction['body_hash'])
+        with self._lock:
+            self.interactions.append(interaction)
+            self._index[key].append(interaction)
+
+    def record(self, method, url, body, resp, resp_body):
+        """Add a request and its response to the cassette"""
+        method, url, req_hash = self._key(method, url, body)
+        if isinstance(resp_body, six.text_type):
+            resp_body = resp_body.encode('utf-8')
+        try:
+            data, encoding = resp_body.decode('utf-8'), 'utf-8'
+        except UnicodeDecodeError:
+            data = base64.b64encode(resp_body).decode('ascii')
+            encoding = 'base64'
+        headers = dict((k, v) for k, v in resp.items()
+                       if k not in ('status', 'content-location'))
+        self._add({'method': method, 'url': url, 'body_hash': req_hash,
+                   'status': resp.status, 'reason': resp.reason,
+                   'version': resp.version, 'headers': headers,
+                   'body': data, 'encoding': encoding})
+
+    def play(self, method, url, body):
+        """Return the next recorded interaction for a request
+
+        :raises InteractionNotRecorded: if the request was not recorded
+        :return: a tuple with the interaction and its response body
+        """
+        key = self._key(method, url, body)
+        with self._lock:
+            recorded = self._index.get(key)
+            if not recorded:
+                raise exceptions.InteractionNotRecorded(
+                    cassette=self.path, method=key[0], url=url)
+            interaction = recorded[min(self._played[key], len(recorded) - 1)]
+            self._played[key] += 1
+        data = interaction['body']
+        if interaction['encoding'] == 'base64':
+            data = base64.b64decode(data)
+        else:
+            data = data.encode('utf-8')
+        return interaction, data
+
+
+class RecordingHttp(object):
+    """Sends requests with an http object and records them in a cassette"""
+
+    def __init__(self, http_obj, cassette):
+        self.http_obj = http_obj
+        self.cassette = cassette
+
+    def request(self, url, method, headers=None, body=None, **kwargs):
+        stream = kwargs.get('stream', False)
+        resp, resp_body = self.http_obj.request(url, method, headers=headers,
+                                                body=body, **kwargs)
+        if stream:
+            resp_body = resp_body.read()
+        self.cassette.record(method, url, body, resp, resp_body)
+        if stream:
+            info = _RecordedInfo(
+                {'status': resp.status, 'reason': resp.reason,
+                 'version': resp.version, 'headers': {}}, resp_body)
+            return resp, http.ResponseStream(
+                info, chunk_size=kwargs.get('chunk_size',
+                                            http.DEFAULT_CHUNK_SIZE))
+        return resp, resp_body
+
+
+class ReplayHttp(object):
+    """Returns the responses recorded in a cassette, without any network"""
+
+    def __init__(self, cassette):
+        self.cassette = cassette
+
+    def request(self, url, method, headers=None, body=None, **kwargs):
+        interaction, data = self.cassette.play(method, url, body)
+        info = _RecordedInfo(interaction, data)
+        if kwargs.get('stream', False):
+            return http.Response(info, url), http.ResponseStream(
+                info, chunk_size=kwargs.get('chunk_size',
+                                            http.DEFAULT_CHUNK_SIZE))
+        return http.Response(info, url), data
+
+
+def use_cassette(path, mode=REPLAY):
+    """Record or replay the requests of the clients created from now on
+
+    Recorded cassettes are saved by eject, or when the process exits.
+
+    :param str path: The file or the directory of the cassette
+    :param str mode: RECORD or REPLAY
+    :return: the Cassette in use
+    """
+    global _active
+    if mode not in MODES:
+        raise ValueError('Unknown cassette mode %s' % mode)
+    with _active_lock:
+        if _active is not None:
+            if (_active[0].path, _active[1]) == (path, mode):
+                return _active[0]
+            raise ValueError('Cassette %s is already in use' %
+                             _active[0].path)
+        cassette = Cassette(path)
+        if mode == REPLAY:
+            cassette.load()
+        else:
+            atexit.register(_save_at_exit, cassette)
+        _active = (cassette, mode)
+        return cassette
+
+
+def eject():
+    """Stop using the cassette in use, saving it in record mode"""
+    global _active
+    with _active_lock:
+        active, _active = _active, None
+    if active is not None and active[1] == RECORD:
+        active[0].save()
+
+
+def _save_at_exit(cassette):
+    if _active is not None and _active[0] is cassette:
+        eject()
+
+
+def wrap(http_obj):
+    """Return the http object a new client is to use
+
+    :param http_obj: The http object the client would use without cassette
+    :return: a RecordingHttp or a ReplayHttp if a cassette is in use, else
+             http_obj
+    """
+    active = _active
+    if active is None:
+        return http_obj
+    cassette, mode = active
+    if mode == RECORD:
+        return RecordingHttp(http_obj, cassette)
+    return ReplayHttp(cassette)
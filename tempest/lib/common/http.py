@@ -13,14 +13,43 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import hashlib
+import threading
+import time
+
 import urllib3
 
+# Default number of keep-alive connections kept for each host
+DEFAULT_POOL_SIZE = 10
+# Default number of seconds a host pool may stay unused before being closed
+DEFAULT_POOL_IDLE_TIMEOUT = 60
+# Default size in bytes of the chunks a streamed response body is read in
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_pooled_http_objs = {}
+_pooled_http_lock = threading.Lock()
+
+
+class Response(dict):
+    """Headers, status, reason and version of a response
+
+    :param info: the urllib3 response
+    :param str url: the url of the request
+    """
+
+    def __init__(self, info, url):
+        for key, value in info.getheaders().items():
+            self[key.lower()] = value
+        self.status = info.status
+        self['status'] = str(self.status)
+        self.reason = info.reason
+        self.version = info.version
+        self['content-location'] = url
+
 
 class ClosingHttp(urllib3.poolmanager.PoolManager):
     def __init__(self, disable_ssl_certificate_validation=False,
-                 ca_certs=None):
-        kwargs = {}
-
+                 ca_certs=None, **kwargs):
         if disable_ssl_certificate_validation:
             urllib3.disable_warnings()
             kwargs['cert_reqs'] = 'CERT_NONE'
@@ -31,20 +60,23 @@ class ClosingHttp(urllib3.poolmanager.PoolManager):
 
         super(ClosingHttp, self).__init__(**kwargs)
 
+    def _prepare_headers(self, headers):
+        return dict(headers, connection='close')
+
     def request(self, url, method, *args, **kwargs):
+        """Send a request and return the response headers and body
 
-        class Response(dict):
-            def __init__(self, info):
-                for key, value in info.getheaders().items():
-                    self[key.lower()] = value
-                self.status = info.status
-                self['status'] = str(self.status)
-                self.reason = info.reason
-                self.version = info.version
-                self['content-location'] = url
+        With stream=True the body is returned as a `ResponseStream`, which
+        reads it from the connection in chunks of chunk_size bytes while it
+        is consumed, instead of as a string.
+        """
+        stream = kwargs.pop('stream', False)
+        chunk_size = kwargs.pop('chunk_size', DEFAULT_CHUNK_SIZE)
+        if stream:
+            kwargs['preload_content'] = False
 
         original_headers = kwargs.get('headers', {})
-        new_headers = dict(original_headers, connection='close')
+        new_headers = self._prepare_headers(original_headers)
         new_kwargs = dict(kwargs, headers=new_headers)
 
         # Follow up to 5 redirections. Don't raise an exception if
@@ -52,4 +84,170 @@ class ClosingHttp(urllib3.poolmanager.PoolManager):
         retry = urllib3.util.Retry(raise_on_redirect=False, redirect=5)
         r = super(ClosingHttp, self).request(method, url, retries=retry,
                                              *args, **new_kwargs)
-        return Response(r), r.data
+        if stream:
+            return Response(r, url), ResponseStream(r, chunk_size=chunk_size)
+        return Response(r, url), r.data
+
+
+class ResponseStream(object):
+    """Body of a response which is read while it is consumed
+
+    Iterating over the stream yields the body in chunks of `chunk_size`
+    bytes, and `read` can be used as for any file-like object, so the whole
+    body never needs to be held in memory. The connection is released once
+    the body has been consumed, or when the stream is closed. A connection
+    whose body was not read to the end is closed rather than reused.
+
+    Examples:
+
+        >>> resp, body = client.get(url, stream=True)
+        >>> with open(path, 'wb') as f:
+        >>>     body.write_to(f)
+
+        >>> resp, body = client.get(url, stream=True)
+        >>> checksum = body.hexdigest('md5')
+    """
+
+    def __init__(self, response, chunk_size=DEFAULT_CHUNK_SIZE):
+        self._response = response
+        self.chunk_size = chunk_size
+        self._consumed = False
+
+    def __iter__(self):
+        try:
+            for chunk in self._response.stream(self.chunk_size):
+                yield chunk
+            self._consumed = True
+        finally:
+            self.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __str__(self):
+        return "<StreamedData: not read>"
+
+    def read(self, amt=None):
+        """Read up to amt bytes of the body, or all of what is left"""
+        data = self._response.read(amt)
+        if amt is None or not data:
+            self._consumed = True
+            self.close()
+        return data
+
+    def close(self):
+        """Stop reading the body and release the connection"""
+        if not self._consumed:
+            # The next request sent on the connection would read the rest
+            # of the body as its response
+            self._response.close()
+        self._response.release_conn()
+
+    def write_to(self, fileobj):
+        """Write the body to a file-like object, chunk by chunk
+
+        :param fileobj: file-like object opened for writing in binary mode
+        :return: the number of bytes written
+        """
+        size = 0
+        for chunk in self:
+            fileobj.write(chunk)
+            size += len(chunk)
+        return size
+
+    def hexdigest(self, algorithm='md5'):
+        """Compute a checksum of the body, chunk by chunk
+
+        :param str algorithm: name of any algorithm supported by hashlib
+        :return: the hex digest of the body
+        """
+        checksum = hashlib.new(algorithm)
+        for chunk in self:
+            checksum.update(chunk)
+        return checksum.hexdigest()
+
+
+class PooledHttp(ClosingHttp):
+    """Keep-alive variant of ClosingHttp
+
+    Connections are not closed after each request, they are kept in one pool
+    per scheme, host and port and reused by the following requests. A host
+    pool which has not been used for more than `pool_idle_timeout` seconds is
+    closed, together with all its idle connections.
+
+    Pools are thread safe, so the same instance can be used by any number of
+    clients and threads at once, see `get_pooled_http`.
+
+    :param bool disable_ssl_certificate_validation: Set to true to disable ssl
+                                                    certificate validation
+    :param str ca_certs: File containing the CA Bundle to use in verifying a
+                         TLS server cert
+    :param int pool_size: Maximum number of connections kept open per host
+    :param int pool_idle_timeout: Time in seconds after which an unused host
+                                  pool is closed
+    """
+
+    def __init__(self, disable_ssl_certificate_validation=False,
+                 ca_certs=None, pool_size=DEFAULT_POOL_SIZE,
+                 pool_idle_timeout=DEFAULT_POOL_IDLE_TIMEOUT):
+        super(PooledHttp, self).__init__(
+            disable_ssl_certificate_validation=(
+                disable_ssl_certificate_validation),
+            ca_certs=ca_certs, maxsize=pool_size)
+        self.pool_idle_timeout = pool_idle_timeout
+        self._last_used = {}
+        self._last_used_lock = threading.Lock()
+
+    def _prepare_headers(self, headers):
+        return dict(headers)
+
+    def _touch_pool(self, url):
+        """Evict idle host pools and mark the one serving url as in use"""
+        now = time.time()
+        with self._last_used_lock:
+            last_used = {}
+            for key in self.pools.keys():
+                pool = self.pools.get(key)
+                if pool not in self._last_used:
+                    continue
+                if now - self._last_used[pool] > self.pool_idle_timeout:
+                    # Dropping the pool from the manager closes it
+                    self.pools.pop(key, None)
+                else:
+                    last_used[pool] = self._last_used[pool]
+            pool = self.connection_from_url(url)
+            last_used[pool] = now
+            self._last_used = last_used
+
+    def urlopen(self, method, url, *args, **kwargs):
+        # NOTE: the pool is marked as in use before the request as well, so
+        # that no other thread can evict it while the request is running.
+        self._touch_pool(url)
+        try:
+            return super(PooledHttp, self).urlopen(method, url, *args,
+                                                   **kwargs)
+        finally:
+            self._touch_pool(url)
+
+
+def get_pooled_http(disable_ssl_certificate_validation=False, ca_certs=None,
+                    pool_size=DEFAULT_POOL_SIZE,
+                    pool_idle_timeout=DEFAULT_POOL_IDLE_TIMEOUT):
+    """Return a PooledHttp shared by all callers with the same settings
+
+    Sharing the pools between service clients allows every client talking to
+    the same host to reuse the connections opened by the others.
+    """
+    key = (bool(disable_ssl_certificate_validation), ca_certs, pool_size,
+           pool_idle_timeout)
+    with _pooled_http_lock:
+        if key not in _pooled_http_objs:
+            _pooled_http_objs[key] = PooledHttp(
+                disable_ssl_certificate_validation=(
+                    disable_ssl_certificate_validation),
+                ca_certs=ca_certs, pool_size=pool_size,
+                pool_idle_timeout=pool_idle_timeout)
+        return _pooled_http_objs[key]
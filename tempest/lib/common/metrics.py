@@ -0,0 +1,361 @@
+# Copyright 2016 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Request metrics of the REST clients
+
+Every request sent through RestClient.request is reported to the registered
+metrics hooks as a RequestRecord. The MetricsCollector hook aggregates the
+records into a latency histogram and counters per service, method and URL
+template, which can be saved, merged with the ones of other workers and
+written as a JSON or CSV report::
+
+    collector = metrics.MetricsCollector()
+    metrics.register_hook(collector)
+    ...
+    metrics.write_report(collector.stats, 'metrics.json')
+"""
+
+import atexit
+import collections
+import csv
+import json
+import math
+import os
+import re
+import threading
+
+import six
+from six.moves.urllib import parse as urllib
+
+# Environment variable with the directory where the test workers save their
+# metrics, see setup_worker_collector
+METRICS_DIR_ENV = 'TEMPEST_METRICS_DIR'
+
+# Upper bound of the first latency bucket, in seconds
+BUCKET_MIN = 0.001
+# Ratio between the upper bounds of two consecutive latency buckets, the
+# percentiles estimated from the histogram are within 10% of the real ones
+BUCKET_GROWTH = 1.1
+
+REPORT_FIELDS = ('service', 'method', 'url', 'count', 'statuses', 'retries',
+                 'bytes_in', 'bytes_out', 'min', 'mean', 'p50', 'p95', 'p99',
+                 'max')
+
+_hooks = []
+
+_ID_SEGMENT = re.compile(
+    r'^([0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-'
+    r'[0-9a-fA-F]{12}|[0-9a-fA-F]{32}|[0-9a-fA-F]{40}|[0-9]+)$')
+
+_worker_collector = None
+_worker_collector_lock = threading.Lock()
+
+
+class RequestRecord(collections.namedtuple(
+        'RequestRecord', ['service', 'method', 'url', 'status', 'latency',
+                          'bytes_in', 'bytes_out', 'retries'])):
+    """A request sent by a REST client
+
+    :param str service: The service of the client
+    :param str method: The HTTP verb of the request
+    :param str url: The url template of the request, see normalize_url
+    :param int status: The status code of the final response
+    :param float latency: Time in seconds spent on the request, without the
+                          time slept before retrying rate limited requests
+    :param int bytes_in: Size of the response body
+    :param int bytes_out: Size of the request body
+    :param int retries: Number of times the request was rate limited and
+                        sent again
+    """
+    __slots__ = ()
+
+
+def register_hook(hook):
+    """Register a callable called with a RequestRecord for each request"""
+    _hooks.append(hook)
+
+
+def unregister_hook(hook):
+    _hooks.remove(hook)
+
+
+def has_hooks():
+    return bool(_hooks)
+
+
+def notify(record):
+    """Report a RequestRecord to the registered hooks"""
+    for hook in list(_hooks):
+        hook(record)
+
+
+def normalize_url(url):
+    """Return the template of a request url
+
+    The query string is removed and the path segments which are ids, like
+    UUIDs, SHA1 or MD5 hex digests and integers, are replaced by '{id}', so
+    that the requests to the same API are aggregated together.
+
+    :param str url: A relative or absolute url
+    """
+    path = urllib.urlsplit(url).path
+    return '/'.join('{id}' if _ID_SEGMENT.match(segment) else segment
+                    for segment in path.split('/'))
+
+
+def body_size(body):
+    """Return the size of a request or response body, 0 if unknown"""
+    if isinstance(body, (six.binary_type, six.text_type)):
+        return len(body)
+    return 0
+
+
+class Histogram(object):
+    """Latency histogram with exponentially growing buckets
+
+    The bucket i counts the latencies between
+    BUCKET_MIN * BUCKET_GROWTH ** (i - 1) and BUCKET_MIN * BUCKET_GROWTH ** i
+    seconds, so histograms have few buckets, are cheap to update and can be
+    merged.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self.buckets = collections.Counter()
+
+    @staticmethod
+    def bucket(latency):
+        if latency <= BUCKET_MIN:
+            return 0
+        return int(math.ceil(math.log(latency / BUCKET_MIN, BUCKET_GROWTH)))
+
+    def add(self, latency):
+        self.count += 1
+        self.total += latency
+        if self.min is None or latency < self.min:
+            self.min = latency
+        if self.max is None or latency > self.max:
+            self.max = latency
+        self.buckets[self.bucket(latency)] += 1
+
+    def merge(self, other):
+        if not other.count:
+            return
+        self.count += other.count
+        self.total += other.total
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        self.buckets.update(other.buckets)
+
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    def percentile(self, percent):
+        """Estimate a latency percentile from the buckets
+
+        :param float percent: The percentile to estimate, between 0 and 100
+        :return: the upper bound of the bucket holding the percentile, capped
+                 by the maximum latency, or None if the histogram is empty
+        """
+        if not self.count:
+            return None
+        rank = max(1, int(math.ceil(self.count * percent / 100.0)))
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min(BUCKET_MIN * BUCKET_GROWTH ** bucket, self.max)
+        return self.max
+
+    def to_dict(self):
+        return {'count': self.count, 'total': self.total, 'min': self.min,
+                'max': self.max,
+                'buckets': dict((str(k), v) for k, v in self.buckets.items())}
+
+    @classmethod
+    def from_dict(cls, data):
+        histogram = cls()
+        histogram.count = data['count']
+        histogram.total = data['total']
+        histogram.min = data['min']
+        histogram.max = data['max']
+        histogram.buckets.update(
+            dict((int(k), v) for k, v in data['buckets'].items()))
+        return histogram
+
+
+class EndpointStats(object):
+    """Metrics of the requests to one (service, method, url template)"""
+
+    def __init__(self):
+        self.latency = Histogram()
+        self.statuses = collections.Counter()
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.retries = 0
+
+    def add(self, record):
+        self.latency.add(record.latency)
+        self.statuses[record.status] += 1
+        self.bytes_in += record.bytes_in
+        self.bytes_out += record.bytes_out
+        self.retries += record.retries
+
+    def merge(self, other):
+        self.latency.merge(other.latency)
+        self.statuses.update(other.statuses)
+        self.bytes_in += other.bytes_in
+        self.bytes_out += other.bytes_out
+        self.retries += other.retries
+
+    def to_dict(self):
+        return {'latency': self.latency.to_dict(),
+                'statuses': dict((str(k), v)
+                                 for k, v in self.statuses.items()),
+                'bytes_in': self.bytes_in, 'bytes_out': self.bytes_out,
+                'retries': self.retries}
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls()
+        stats.latency = Histogram.from_dict(data['latency'])
+        stats.statuses.update(
+            dict((int(k), v) for k, v in data['statuses'].items()))
+        stats.bytes_in = data['bytes_in']
+        stats.bytes_out = data['bytes_out']
+        stats.retries = data['retries']
+        return stats
+
+
+class MetricsCollector(object):
+    """Metrics hook aggregating the requests per endpoint
+
+    The stats attribute maps (service, method, url template) tuples to
+    EndpointStats.
+    """
+
+    def __init__(self):
+        self.stats = collections.defaultdict(EndpointStats)
+        self._lock = threading.Lock()
+
+    def __call__(self, record):
+        key = (record.service, record.method, record.url)
+        with self._lock:
+            self.stats[key].add(record)
+
+    def save(self, path):
+        """Save the collected metrics in a JSON file, see load_stats"""
+        with self._lock:
+            data = [dict(service=service, method=method, url=url,
+                         **stats.to_dict())
+                    for (service, method, url), stats in self.stats.items()]
+        with open(path, 'w') as f:
+            json.dump(data, f)
+
+
+def load_stats(paths):
+    """Merge the metrics saved by MetricsCollector.save in several files
+
+    :param paths: The paths of the files to merge
+    :return: a dict mapping (service, method, url template) tuples to
+             EndpointStats
+    """
+    merged = collections.defaultdict(EndpointStats)
+    for path in paths:
+        with open(path) as f:
+            for item in json.load(f):
+                key = (item['service'], item['method'], item['url'])
+                merged[key].merge(EndpointStats.from_dict(item))
+    return merged
+
+
+def _ms(seconds):
+    return None if seconds is None else round(seconds * 1000, 3)
+
+
+def report_rows(stats):
+    """Return the report rows of endpoint stats, slowest p99 first
+
+    Latencies are in milliseconds.
+    """
+    rows = []
+    for (service, method, url), endpoint in stats.items():
+        latency = endpoint.latency
+        rows.append({
+            'service': service, 'method': method, 'url': url,
+            'count': latency.count,
+            'statuses': ' '.join('%s:%s' % item for item in
+                                 sorted(endpoint.statuses.items())),
+            'retries': endpoint.retries,
+            'bytes_in': endpoint.bytes_in, 'bytes_out': endpoint.bytes_out,
+            'min': _ms(latency.min), 'mean': _ms(latency.mean()),
+            'p50': _ms(latency.percentile(50)),
+            'p95': _ms(latency.percentile(95)),
+            'p99': _ms(latency.percentile(99)),
+            'max': _ms(latency.max)})
+    rows.sort(key=lambda row: (-(row['p99'] or 0), row['service'] or '',
+                               row['method'], row['url']))
+    return rows
+
+
+def write_report(stats, path, fmt=None):
+    """Write a JSON or CSV report of endpoint stats
+
+    :param stats: A dict mapping (service, method, url template) tuples to
+                  EndpointStats
+    :param str path: The path of the report
+    :param str fmt: 'json' or 'csv', guessed from the path extension if not
+                    given
+    """
+    if fmt is None:
+        fmt = 'csv' if path.lower().endswith('.csv') else 'json'
+    rows = report_rows(stats)
+    if fmt == 'csv':
+        with open(path, 'w') as f:
+            writer = csv.DictWriter(f, fieldnames=REPORT_FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+    elif fmt == 'json':
+        with open(path, 'w') as f:
+            json.dump(rows, f, indent=2)
+    else:
+        raise ValueError('Unknown metrics report format %s' % fmt)
+
+
+def setup_worker_collector(directory=None):
+    """Collect the metrics of this process and save them when it exits
+
+    The metrics are saved in a worker-<pid>.json file in the directory, so
+    that the metrics of all the workers can be merged with load_stats. This
+    does nothing if no directory is given and the TEMPEST_METRICS_DIR
+    environment variable is not set, or if it was already called.
+
+    :param str directory: The directory where the metrics are saved
+    :return: the MetricsCollector of this process, or None
+    """
+    global _worker_collector
+    directory = directory or os.environ.get(METRICS_DIR_ENV)
+    if not directory:
+        return None
+    with _worker_collector_lock:
+        if _worker_collector is None:
+            _worker_collector = MetricsCollector()
+            register_hook(_worker_collector)
+            path = os.path.join(directory, 'worker-%d.json' % os.getpid())
+            atexit.register(_worker_collector.save, path)
+        return _worker_collector
@@ -0,0 +1,180 @@
+# Copyright 2016 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+
+"""Iterate over the items of the paginated lists of the OpenStack APIs
+
+The APIs return long lists one page at a time. The number of items in a
+page is set with the ``limit`` query parameter, and the next page is
+requested with a ``marker``, the id of the last item received. The
+response links to the next page, if any, in one of these ways:
+
+- a ``<resource>_links`` list, with a link whose ``rel`` is ``next``, for
+  compute, network, volume and identity v2
+- a ``next`` URL, for image v2
+- a ``links`` dict with a ``next`` URL, for identity v3
+
+`paginate` follows the links to the next pages, and only requests a page
+once the items of the previous one have been consumed::
+
+    for server in pagination.paginate(servers_client.list_servers,
+                                      'servers', page_size=100):
+        ...
+
+Most list clients also provide an iter_* method wrapping `paginate`, like
+`ServersClient.iter_servers`.
+
+Object storage listings have no links: they are lists of items, and a page
+shorter than the limit is the last one. `paginate_listing` iterates over
+them.
+"""
+
+import sys
+import threading
+
+import six
+from six.moves.urllib import parse as urlparse
+
+# Maximum number of items in a page of an object storage listing
+LISTING_LIMIT = 10000
+
+
+def next_page_params(body, resource_key):
+    """Return the query parameters of the page after the one in body
+
+    :param dict body: The body of a list response
+    :param str resource_key: The key of the list of items in the body, for
+                             instance 'servers'
+    :return: a dict of query parameters, or None if body is the last page
+    """
+    href = None
+    links = body.get('%s_links' % resource_key)
+    if links:
+        for link in links:
+            if link.get('rel') == 'next':
+                href = link.get('href')
+    elif isinstance(body.get('links'), dict):
+        href = body['links'].get('next')
+    elif isinstance(body.get('next'), six.string_types):
+        href = body['next']
+    if not href:
+        return None
+    query = urlparse.parse_qs(urlparse.urlparse(href).query)
+    return dict((key, value[0] if len(value) == 1 else value)
+                for key, value in query.items())
+
+
+def paginate(list_page, resource_key, page_size=None, **params):
+    """Iterate over the items of a list, requesting them page by page
+
+    :param list_page: A callable returning the body of a page of the list,
+                      with the query parameters as keyword arguments, for
+                      instance `ServersClient.list_servers`
+    :param str resource_key: The key of the list of items in the body, for
+                             instance 'servers'
+    :param int page_size: The number of items to request per page. If not
+                          set, the service picks the size of the pages.
+    :param params: The query parameters of the list, e.g. filters
+    :return: a generator of the items of the list
+    """
+    if page_size:
+        params['limit'] = page_size
+    while True:
+        body = list_page(**params)
+        items = body[resource_key]
+        for item in items:
+            yield item
+        next_params = next_page_params(body, resource_key)
+        if not items or next_params is None:
+            return
+        # The links keep the filters of the request, but make sure they
+        # apply to all the pages
+        next_params = dict(params, **next_params)
+        if next_params == params:
+            # Avoid requesting the same page again and again
+            return
+        params = next_params
+
+
+class _Prefetch(object):
+    """Request a page in a thread while the previous one is consumed"""
+
+    def __init__(self, list_page, params):
+        self._result = None
+        self._error = None
+        self._thread = threading.Thread(target=self._fetch,
+                                        args=(list_page, params))
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _fetch(self, list_page, params):
+        try:
+            self._result = list_page(**params)
+        except Exception:
+            self._error = sys.exc_info()
+
+    def result(self):
+        self._thread.join()
+        if self._error is not None:
+            six.reraise(*self._error)
+        return self._result
+
+
+def _listing_marker(item):
+    # Pseudo directories listed with a delimiter only have a subdir
+    return item['name'] if 'name' in item else item['subdir']
+
+
+def paginate_listing(list_page, page_size=LISTING_LIMIT, prefetch=False,
+                     **params):
+    """Iterate over an object storage listing, page by page
+
+    Only one page of the listing is kept in memory at a time, or two with
+    prefetch, so listings of any size can be iterated over.
+
+    :param list_page: A callable returning the list of the items of a page,
+                      decoded from json, with the query parameters as
+                      keyword arguments
+    :param int page_size: The number of items to request per page, at most
+                          LISTING_LIMIT, the larger sizes are lowered to it
+    :param bool prefetch: Request the next page in a thread while the items
+                          of the current one are consumed
+    :param params: The query parameters of the listing, e.g. prefix,
+                   delimiter or the marker to start from
+    :return: a generator of the items of the listing
+    """
+    # Object storage returns at most LISTING_LIMIT items whatever the limit
+    # asked for, a shorter page must mean the last one
+    page_size = min(page_size, LISTING_LIMIT)
+    params['limit'] = page_size
+    params['format'] = 'json'
+    items = list_page(**params)
+    while True:
+        next_page = None
+        last_page = len(items) < page_size
+        if not last_page:
+            params['marker'] = _listing_marker(items[-1])
+            if prefetch:
+                next_page = _Prefetch(list_page, dict(params))
+        for item in items:
+            yield item
+        if last_page:
+            return
+        if next_page is not None:
+            items = next_page.result()
+        else:
+            # Release the page before requesting the next one
+            items = None
+            items = list_page(**params)
@@ -0,0 +1,198 @@
+# Copyright 2016 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Client side rate limiting of the requests to a service
+
+A RateLimiter spaces the requests to a service so that, after an initial
+burst, no more than `rate` requests per second are sent. It is a token
+bucket implemented as a generic cell rate algorithm: its whole state is the
+time at which the bucket would be full again, and a request reserves the
+next free slot. That state can be kept in memory, for the threads of a
+process, or in a file, for all the processes of a test run.
+
+When the service answers that the client is rate limited, the requests are
+paused until the retry-after delay has elapsed and the rate is halved. The
+rate is raised back towards the configured one as requests succeed.
+"""
+
+import json
+import os
+import threading
+import time
+
+from oslo_concurrency import lockutils
+
+# Factor applied to the rate each time a request is rate limited
+RATE_DECREASE = 0.5
+# Fraction of the configured rate added back to the rate for each request
+# which is not rate limited
+RATE_INCREASE = 0.05
+# Lowest rate, as a fraction of the configured rate
+MIN_RATE = 0.1
+
+_rate_limiters = {}
+_rate_limiters_lock = threading.Lock()
+
+
+class LocalState(object):
+    """State of a RateLimiter shared by the threads of a process"""
+
+    def __init__(self):
+        self.tat = 0.0
+        self.rate = None
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        self._lock.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._lock.release()
+
+
+class FileState(object):
+    """State of a RateLimiter shared by all the processes using a file
+
+    :param str name: The name of the rate limiter
+    :param str lock_path: The directory of the state and lock files
+    """
+
+    def __init__(self, name, lock_path):
+        self.name = name
+        self.lock_path = lock_path
+        self.path = os.path.join(lock_path, 'rate-limit-%s.json' % name)
+        self.tat = 0.0
+        self.rate = None
+        # The threads of the process sharing the state take turns, the
+        # external lock then serializes the processes. The attributes are
+        # only used by the thread holding the lock.
+        self._thread_lock = threading.Lock()
+        self._lock = None
+        self._loaded = None
+
+    def __enter__(self):
+        self._thread_lock.acquire()
+        try:
+            lock = lockutils.lock('rate-limit-%s' % self.name,
+                                  external=True, lock_path=self.lock_path)
+            lock.__enter__()
+        except Exception:
+            self._thread_lock.release()
+            raise
+        self._lock = lock
+        try:
+            with open(self.path) as f:
+                state = json.load(f)
+            self.tat, self.rate = state['tat'], state['rate']
+        except (IOError, OSError, ValueError, KeyError):
+            self.tat, self.rate = 0.0, None
+        self._loaded = (self.tat, self.rate)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if (self.tat, self.rate) != self._loaded:
+                with open(self.path, 'w') as f:
+                    json.dump({'tat': self.tat, 'rate': self.rate}, f)
+        finally:
+            lock, self._lock = self._lock, None
+            try:
+                lock.__exit__(exc_type, exc_value, traceback)
+            finally:
+                self._thread_lock.release()
+
+
+class RateLimiter(object):
+    """Token bucket limiting the rate of the requests to a service
+
+    :param float rate: The number of requests per second
+    :param int burst: The number of requests which can be sent at once
+                      before the rate applies
+    :param state: A LocalState or FileState, a new LocalState by default
+    """
+
+    def __init__(self, rate, burst=1, state=None):
+        if rate <= 0:
+            raise ValueError('The rate must be positive, not %s' % rate)
+        self.rate = float(rate)
+        self.burst = max(1, burst)
+        self.state = state or LocalState()
+
+    def reserve(self):
+        """Reserve the next slot for a request
+
+        :return: the time in seconds to wait before sending the request
+        """
+        with self.state as state:
+            now = time.time()
+            interval = 1.0 / (state.rate or self.rate)
+            tat = max(state.tat, now)
+            state.tat = tat + interval
+            return max(0.0, state.tat - self.burst * interval - now)
+
+    def acquire(self):
+        """Wait until a request can be sent
+
+        :return: the time in seconds waited
+        """
+        delay = self.reserve()
+        if delay:
+            time.sleep(delay)
+        return delay
+
+    def throttled(self, retry_after):
+        """Pause the requests after the service rate limited one
+
+        :param float retry_after: The delay in seconds asked by the service
+        """
+        with self.state as state:
+            rate = max(self.rate * MIN_RATE,
+                       (state.rate or self.rate) * RATE_DECREASE)
+            state.rate = rate
+            # The next request is sent once the delay elapsed, the following
+            # ones at the reduced rate
+            resume = time.time() + retry_after
+            state.tat = max(state.tat, resume + (self.burst - 1) / rate)
+
+    def succeeded(self):
+        """Raise the rate back after a request which was not rate limited"""
+        with self.state as state:
+            if state.rate is not None:
+                rate = state.rate + self.rate * RATE_INCREASE
+                state.rate = None if rate >= self.rate else rate
+
+
+def get_rate_limiter(name, rate, burst=1, lock_path=None):
+    """Return the rate limiter of a service
+
+    The same rate limiter is returned for a name to all the clients of a
+    process, so they share the rate. With a lock_path, the state is kept in
+    a file in that directory and the rate is shared with all the processes
+    using it.
+
+    :param str name: The name of the service
+    :param float rate: The number of requests per second
+    :param int burst: The number of requests which can be sent at once
+    :param str lock_path: The directory of the shared state file
+    :return: a RateLimiter
+    """
+    key = (name, rate, burst, lock_path)
+    with _rate_limiters_lock:
+        limiter = _rate_limiters.get(key)
+        if limiter is None:
+            state = FileState(name, lock_path) if lock_path else None
+            limiter = RateLimiter(rate, burst=burst, state=state)
+            _rate_limiters[key] = limiter
+        return limiter
@@ -25,7 +25,10 @@ from oslo_log import log as logging
 from oslo_serialization import jsonutils as json
 import six
 
+from tempest.lib.common import cassette
 from tempest.lib.common import http
+from tempest.lib.common import metrics
+from tempest.lib.common import rate_limiter
 from tempest.lib.common.utils import test_utils
 from tempest.lib import exceptions
 
@@ -42,6 +45,35 @@ HTTP_REDIRECTION = (300, 301, 302, 303, 304, 305, 306, 307)
 JSONSCHEMA_VALIDATOR = jsonschema.Draft4Validator
 FORMAT_CHECKER = jsonschema.draft4_format_checker
 
+# Validators built for response schemas, keyed by schema identity
+_schema_validators = {}
+
+
+def get_schema_validator(schema):
+    """Return the validator for a response body or header schema
+
+    The schema is checked and its validator is built only the first time a
+    schema is used, later calls return the same validator. Schemas are cached
+    by identity, so they must not be modified once they have been used.
+
+    :param dict schema: JSON schema of a response body or header
+    :raises jsonschema.SchemaError: if the schema is not valid
+    :return: a JSONSCHEMA_VALIDATOR instance which uses FORMAT_CHECKER
+    """
+    key = (id(schema), JSONSCHEMA_VALIDATOR, FORMAT_CHECKER)
+    try:
+        # NOTE: The cache holds a reference to the schema, so its id cannot
+        # be reused by another object while the entry exists.
+        _schema, validator = _schema_validators[key]
+        if _schema is schema:
+            return validator
+    except KeyError:
+        pass
+    JSONSCHEMA_VALIDATOR.check_schema(schema)
+    validator = JSONSCHEMA_VALIDATOR(schema, format_checker=FORMAT_CHECKER)
+    _schema_validators[key] = (schema, validator)
+    return validator
+
 
 class RestClient(object):
     """Unified OpenStack RestClient class
@@ -66,6 +98,21 @@ class RestClient(object):
                          TLS server cert
     :param str trace_request: Regex to use for specifying logging the entirety
                               of the request and response payload
+    :param bool http_keep_alive: Set to true to keep connections open and
+                                 reuse them across requests, instead of
+                                 closing them after each request
+    :param int http_pool_size: Maximum number of keep-alive connections kept
+                               open per host
+    :param int http_pool_idle_timeout: Time in seconds after which unused
+                                       keep-alive connections are closed
+    :param float rate_limit: Maximum number of requests per second sent to
+                             the service by all the clients of the process,
+                             not limited if not set
+    :param int rate_limit_burst: Number of requests which can be sent at once
+                                 before rate_limit applies
+    :param str rate_limit_lock_path: Directory where the rate limit of the
+                                     service is shared with the other
+                                     processes, if set
     """
     TYPE = "json"
 
@@ -78,7 +125,11 @@ class RestClient(object):
                  endpoint_type='publicURL',
                  build_interval=1, build_timeout=60,
                  disable_ssl_certificate_validation=False, ca_certs=None,
-                 trace_requests='', name=None):
+                 trace_requests='', name=None, http_keep_alive=False,
+                 http_pool_size=http.DEFAULT_POOL_SIZE,
+                 http_pool_idle_timeout=http.DEFAULT_POOL_IDLE_TIMEOUT,
+                 rate_limit=None, rate_limit_burst=1,
+                 rate_limit_lock_path=None):
         self.auth_provider = auth_provider
         self.service = service
         self.region = region
@@ -98,8 +149,21 @@ class RestClient(object):
                                        'retry-after', 'server',
                                        'vary', 'www-authenticate'))
         dscv = disable_ssl_certificate_validation
-        self.http_obj = http.ClosingHttp(
-            disable_ssl_certificate_validation=dscv, ca_certs=ca_certs)
+        if http_keep_alive:
+            self.http_obj = http.get_pooled_http(
+                disable_ssl_certificate_validation=dscv, ca_certs=ca_certs,
+                pool_size=http_pool_size,
+                pool_idle_timeout=http_pool_idle_timeout)
+        else:
+            self.http_obj = http.ClosingHttp(
+                disable_ssl_certificate_validation=dscv, ca_certs=ca_certs)
+        # Record or replay the requests if a cassette is in use
+        self.http_obj = cassette.wrap(self.http_obj)
+        self.rate_limiter = None
+        if rate_limit:
+            self.rate_limiter = rate_limiter.get_rate_limiter(
+                str(service), rate_limit, burst=rate_limit_burst,
+                lock_path=rate_limit_lock_path)
 
     def _get_type(self):
         return self.TYPE
@@ -269,7 +333,8 @@ class RestClient(object):
         """
         return self.request('POST', url, extra_headers, headers, body, chunked)
 
-    def get(self, url, headers=None, extra_headers=False):
+    def get(self, url, headers=None, extra_headers=False, stream=False,
+            chunk_size=http.DEFAULT_CHUNK_SIZE):
         """Send a HTTP GET request using keystone service catalog and auth
 
         :param str url: the relative url to send the post request to
@@ -278,10 +343,18 @@ class RestClient(object):
                                    returned by the get_headers() method are to
                                    be used but additional headers are needed in
                                    the request pass them in as a dict.
+        :param bool stream: return the body of a successful response as a
+                            `tempest.lib.common.http.ResponseStream`, which is
+                            read while it is consumed
+        :param int chunk_size: size in bytes of the chunks a streamed body is
+                               read in
         :return: a tuple with the first entry containing the response headers
                  and the second the response body
         :rtype: tuple
         """
+        if stream:
+            return self.request('GET', url, extra_headers, headers,
+                                stream=True, chunk_size=chunk_size)
         return self.request('GET', url, extra_headers, headers)
 
     def delete(self, url, headers=None, body=None, extra_headers=False):
@@ -401,8 +474,10 @@ class RestClient(object):
                            req_body=None):
         if req_headers is None:
             req_headers = {}
-        caller_name = test_utils.find_test_caller()
-        if self.trace_requests and re.search(self.trace_requests, caller_name):
+        if not self.trace_requests:
+            return
+        caller_name = test_utils.get_test_caller()
+        if re.search(self.trace_requests, caller_name):
             self.LOG.debug('Starting Request (%s): %s %s' %
                            (caller_name, method, req_url))
 
@@ -440,7 +515,7 @@ class RestClient(object):
         # we're going to just provide work around on who is actually
         # providing timings by gracefully adding no content if they don't.
         # Once we're down to 1 caller, clean this up.
-        caller_name = test_utils.find_test_caller()
+        caller_name = test_utils.get_test_caller()
         if secs:
             secs = " %.3fs" % secs
         self.LOG.info(
@@ -531,30 +606,68 @@ class RestClient(object):
         if method != 'HEAD' and not resp_body and resp.status >= 400:
             self.LOG.warning("status >= 400 response with empty body")
 
-    def _request(self, method, url, headers=None, body=None, chunked=False):
+    def _request(self, method, url, headers=None, body=None, chunked=False,
+                 stream=False, chunk_size=http.DEFAULT_CHUNK_SIZE):
         """A simple HTTP request interface."""
         # Authenticate the request with the auth provider
         req_url, req_headers, req_body = self.auth_provider.auth_request(
             method, url, headers, body, self.filters)
 
+        if self.rate_limiter:
+            self.rate_limiter.acquire()
+
         # Do the actual request, and time it
         start = time.time()
         self._log_request_start(method, req_url)
-        resp, resp_body = self.raw_request(
-            req_url, method, headers=req_headers, body=req_body,
-            chunked=chunked
-        )
+        if stream:
+            resp, resp_body = self.raw_request(
+                req_url, method, headers=req_headers, body=req_body,
+                chunked=chunked, stream=True, chunk_size=chunk_size
+            )
+        else:
+            resp, resp_body = self.raw_request(
+                req_url, method, headers=req_headers, body=req_body,
+                chunked=chunked
+            )
+        if stream and (resp.status not in HTTP_SUCCESS or
+                       resp.status in (204, 205)):
+            # Only bodies with content of successful responses are streamed,
+            # the others are needed in full by the response and error checks
+            resp_body = resp_body.read()
         end = time.time()
         self._log_request(method, req_url, resp, secs=(end - start),
                           req_headers=req_headers, req_body=req_body,
                           resp_body=resp_body)
+        self._update_rate_limiter(resp)
+        self._check_token_rejected(resp, req_headers)
 
         # Verify HTTP response codes
         self.response_checker(method, resp, resp_body)
 
         return resp, resp_body
 
-    def raw_request(self, url, method, headers=None, body=None, chunked=False):
+    def _update_rate_limiter(self, resp):
+        """Adapt the rate limit of the service to a response"""
+        if not self.rate_limiter:
+            return
+        if resp.status in (413, 429) and 'retry-after' in resp:
+            try:
+                delay = self._get_retry_after_delay(resp)
+            except ValueError:
+                delay = 1
+            self.rate_limiter.throttled(delay)
+        elif resp.status < 400:
+            self.rate_limiter.succeeded()
+
+    def _check_token_rejected(self, resp, req_headers):
+        """Tell the auth provider if the token of a request was rejected"""
+        if resp.status == 401 and req_headers:
+            token = req_headers.get('X-Auth-Token')
+            if token:
+                self.auth_provider.invalidate_token(token)
+
+    def raw_request(self, url, method, headers=None, body=None, chunked=False,
+                    stream=False, chunk_size=http.DEFAULT_CHUNK_SIZE):
         """Send a raw HTTP request without the keystone catalog or auth
 
         This method sends a HTTP request in the same manner as the request()
@@ -568,17 +681,27 @@ class RestClient(object):
                             the headers
         :param str body: Body to send with the request
         :param bool chunked: sends the body with chunked encoding
+        :param bool stream: return the response body as a
+                            `tempest.lib.common.http.ResponseStream`, which is
+                            read while it is consumed
+        :param int chunk_size: size in bytes of the chunks a streamed body is
+                               read in
         :rtype: tuple
         :return: a tuple with the first entry containing the response headers
                  and the second the response body
         """
         if headers is None:
             headers = self.get_headers()
+        if stream:
+            return self.http_obj.request(url, method, headers=headers,
+                                         body=body, chunked=chunked,
+                                         stream=True, chunk_size=chunk_size)
         return self.http_obj.request(url, method, headers=headers,
                                      body=body, chunked=chunked)
 
     def request(self, method, url, extra_headers=False, headers=None,
-                body=None, chunked=False):
+                body=None, chunked=False, stream=False,
+                chunk_size=http.DEFAULT_CHUNK_SIZE):
         """Send a HTTP request with keystone auth and using the catalog
 
         This method will send an HTTP request using keystone auth in the
@@ -589,9 +712,10 @@ class RestClient(object):
         response was received. If it was an exception will be raised to enable
         it to be handled quickly.
 
-        This method will also handle rate-limiting, if a 413 response code is
-        received it will retry the request after waiting the 'retry-after'
-        duration from the header.
+        This method will also handle rate-limiting, if a 413 or 429 response
+        code is received it will retry the request after waiting the
+        'retry-after' duration from the header. If the client has a rate
+        limit, the request waits for its turn before being sent.
 
         :param str method: The HTTP verb to use for the request
         :param str url: Relative url to send the request to
@@ -605,6 +729,11 @@ class RestClient(object):
                              explicitly requires no headers use an empty dict.
         :param str body: Body to send with the request
         :param bool chunked: sends the body with chunked encoding
+        :param bool stream: return the body of a successful response as a
+                            `tempest.lib.common.http.ResponseStream`, which is
+                            read while it is consumed
+        :param int chunk_size: size in bytes of the chunks a streamed body is
+                               read in
         :rtype: tuple
         :return: a tuple with the first entry containing the response headers
                  and the second the response body
@@ -619,7 +748,8 @@ class RestClient(object):
         :raises OverLimit: If a 413 response code is received and over_limit is
                           not in the response body
         :raises RateLimitExceeded: If a 413 response code is received and
-                                   over_limit is in the response body
+                                   over_limit is in the response body, or
+                                   if a 429 response code is received
         :raises InvalidContentType: If a 415 response code is received
         :raises UnprocessableEntity: If a 422 response code is received
         :raises InvalidHTTPResponseBody: The response body wasn't valid JSON
@@ -630,40 +760,73 @@ class RestClient(object):
                                         received and it doesn't fall into any
                                         of the handled checks
         """
-        # if extra_headers is True
-        # default headers would be added to headers
         retry = 0
+        slept = 0
+        headers = self._get_request_headers(headers, extra_headers)
 
-        if headers is None:
-            # NOTE(vponomaryov): if some client do not need headers,
-            # it should explicitly pass empty dict
-            headers = self.get_headers()
-        elif extra_headers:
-            try:
-                headers.update(self.get_headers())
-            except (ValueError, TypeError):
-                headers = self.get_headers()
-
+        start = time.time()
         resp, resp_body = self._request(method, url, headers=headers,
-                                        body=body, chunked=chunked)
+                                        body=body, chunked=chunked,
+                                        stream=stream, chunk_size=chunk_size)
 
-        while (resp.status == 413 and
-               'retry-after' in resp and
-                not self.is_absolute_limit(
-                    resp, self._parse_resp(resp_body)) and
-                retry < MAX_RECURSION_DEPTH):
+        while self._should_retry(resp, resp_body, retry):
             retry += 1
             delay = self._get_retry_after_delay(resp)
             self.LOG.debug(
                 "Sleeping %s seconds based on retry-after header", delay
             )
             time.sleep(delay)
+            slept += delay
             resp, resp_body = self._request(method, url,
-                                            headers=headers, body=body)
+                                            headers=headers, body=body,
+                                            stream=stream,
+                                            chunk_size=chunk_size)
+        self._record_metrics(method, url, body, resp, resp_body,
+                             time.time() - start - slept, retry)
         self._error_checker(method, url, headers, body,
                             resp, resp_body)
         return resp, resp_body
 
+    def _record_metrics(self, method, url, body, resp, resp_body, latency,
+                        retries):
+        """Report a request to the metrics hooks, if any is registered"""
+        if not metrics.has_hooks():
+            return
+        bytes_in = metrics.body_size(resp_body)
+        content_length = str(resp.get('content-length', ''))
+        if not bytes_in and content_length.isdigit():
+            # Streamed bodies are not read yet
+            bytes_in = int(content_length)
+        metrics.notify(metrics.RequestRecord(
+            service=self.service, method=method,
+            url=metrics.normalize_url(url), status=resp.status,
+            latency=max(latency, 0), bytes_in=bytes_in,
+            bytes_out=metrics.body_size(body), retries=retries))
+
+    def _get_request_headers(self, headers, extra_headers):
+        # if extra_headers is True
+        # default headers would be added to headers
+        if headers is None:
+            # NOTE(vponomaryov): if some client do not need headers,
+            # it should explicitly pass empty dict
+            headers = self.get_headers()
+        elif extra_headers:
+            try:
+                headers.update(self.get_headers())
+            except (ValueError, TypeError):
+                headers = self.get_headers()
+        return headers
+
+    def _should_retry(self, resp, resp_body, retry):
+        """Whether a rate limited request is to be sent again"""
+        if retry >= MAX_RECURSION_DEPTH or 'retry-after' not in resp:
+            return False
+        if resp.status == 429:
+            return True
+        return (resp.status == 413 and
+                not self.is_absolute_limit(
+                    resp, self._parse_resp(resp_body)))
+
     def _get_retry_after_delay(self, resp):
         """Extract the delay from the retry-after header.
 
@@ -696,7 +859,7 @@ class RestClient(object):
 
         # Retry-after headers do not have sub-second precision. Clients may
         # receive a delay of 0. After sleeping 0 seconds, we would (likely) hit
-        # another 413. To avoid this, always sleep at least 1 second.
+        # another 413 or 429. To avoid this, always sleep at least 1 second.
         return max(1, delay)
 
     def _parse_http_date(self, val):
@@ -784,6 +947,11 @@ class RestClient(object):
             else:
                 raise exceptions.RateLimitExceeded(resp_body, resp=resp)
 
+        if resp.status == 429:
+            if parse_resp:
+                resp_body = self._parse_resp(resp_body)
+            raise exceptions.RateLimitExceeded(resp_body, resp=resp)
+
         if resp.status == 415:
             if parse_resp:
                 resp_body = self._parse_resp(resp_body)
@@ -857,7 +1025,7 @@ class RestClient(object):
                            'the required time (%(timeout)s s).' %
                            {'resource_type': self.resource_type, 'id': id,
                             'timeout': self.build_timeout})
-                caller = test_utils.find_test_caller()
+                caller = test_utils.get_test_caller()
                 if caller:
                     message = '(%s) %s' % (caller, message)
                 raise exceptions.TimeoutException(message)
@@ -888,9 +1056,7 @@ class RestClient(object):
             body_schema = schema.get('response_body')
             if body_schema:
                 try:
-                    jsonschema.validate(body, body_schema,
-                                        cls=JSONSCHEMA_VALIDATOR,
-                                        format_checker=FORMAT_CHECKER)
+                    get_schema_validator(body_schema).validate(body)
                 except jsonschema.ValidationError as ex:
                     msg = ("HTTP response body is invalid (%s)") % ex
                     raise exceptions.InvalidHTTPResponseBody(msg)
@@ -903,9 +1069,7 @@ class RestClient(object):
             header_schema = schema.get('response_header')
             if header_schema:
                 try:
-                    jsonschema.validate(resp, header_schema,
-                                        cls=JSONSCHEMA_VALIDATOR,
-                                        format_checker=FORMAT_CHECKER)
+                    get_schema_validator(header_schema).validate(resp)
                 except jsonschema.ValidationError as ex:
                     msg = ("HTTP response header is invalid (%s)") % ex
                     raise exceptions.InvalidHTTPResponseHeader(msg)
@@ -0,0 +1,112 @@
+# Copyright 2016 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+
+"""Tokens shared by the auth providers of several processes
+
+Auth providers using a TokenCache look for a token there before requesting
+one from Keystone, and store the tokens they get into it, so that test
+workers authenticating with the same credentials share their tokens::
+
+    cache = token_cache.TokenCache('/var/lock/tempest/token_cache')
+    auth_provider = auth.KeystoneV3AuthProvider(creds, auth_url,
+                                                token_cache=cache)
+
+Each token is saved with its auth data in its own file of the cache
+directory, readable only by its owner, since tokens are secrets. Files are
+replaced atomically, so reading them needs no lock.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+
+from oslo_concurrency import lockutils
+from oslo_log import log as logging
+
+LOG = logging.getLogger(__name__)
+
+
+def cache_key(*parts):
+    """Return the key of a token, from what identifies its auth request
+
+    :param parts: JSON serializable values, such as the auth provider type,
+                  the auth URL and the auth parameters with the credentials
+    :return: a hex digest, which does not disclose the credentials
+    """
+    data = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+class TokenCache(object):
+    """Tokens stored in a directory shared by several processes
+
+    :param str path: The directory of the cache, created if needed
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def _file(self, key):
+        return os.path.join(self.path, 'token-%s.json' % key)
+
+    def _lock(self, key):
+        return lockutils.lock('token-%s' % key, external=True,
+                              lock_path=self.path)
+
+    def get(self, key):
+        """Return the auth data cached for a key
+
+        :return: a (token, auth data) tuple, or None
+        """
+        try:
+            with open(self._file(key)) as f:
+                token, auth_data = json.load(f)
+        except (IOError, OSError, ValueError, TypeError):
+            return None
+        return token, auth_data
+
+    def set(self, key, auth_data):
+        """Cache the auth data, a (token, auth data) tuple, for a key"""
+        if not os.path.isdir(self.path):
+            os.makedirs(self.path)
+        with self._lock(key):
+            fd, tmp_path = tempfile.mkstemp(dir=self.path, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(list(auth_data), f)
+                os.rename(tmp_path, self._file(key))
+            except Exception:
+                os.remove(tmp_path)
+                raise
+
+    def invalidate(self, key, token):
+        """Remove the auth data of a key, if its token is the given one
+
+        Tokens rejected by a service are removed, unless another process
+        already replaced them with a new token.
+        """
+        if not os.path.isdir(self.path):
+            return
+        with self._lock(key):
+            cached = self.get(key)
+            if cached is not None and cached[0] == token:
+                LOG.debug('Removing rejected token from the cache %s',
+                          self.path)
+                try:
+                    os.remove(self._file(key))
+                except OSError:
+                    pass
@@ -12,8 +12,10 @@
 #    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 #    License for the specific language governing permissions and limitations
 #    under the License.
+import contextlib
 import inspect
 import re
+import threading
 
 from oslo_log import log as logging
 
@@ -21,6 +23,45 @@ from tempest.lib import exceptions
 
 LOG = logging.getLogger(__name__)
 
+# Name of the test (or class level fixture) running in the current thread, as
+# published by the test framework
+_test_caller = threading.local()
+
+
+def set_test_caller(caller_name):
+    """Publish the name of the test running in the current thread.
+
+    :param caller_name: Name in the same format returned by
+                        `find_test_caller`, i.e. ClassName:method_name.
+                        None clears the name.
+    """
+    _test_caller.name = caller_name
+
+
+@contextlib.contextmanager
+def test_caller(caller_name):
+    """Publish the name of the running test for the duration of a block."""
+    previous = getattr(_test_caller, 'name', None)
+    set_test_caller(caller_name)
+    try:
+        yield
+    finally:
+        set_test_caller(previous)
+
+
+def get_test_caller():
+    """Return the caller class and test name.
+
+    The name published by the test framework via `set_test_caller` is used
+    when available, which is a lot cheaper than looking for it through the
+    call stack. Callers which run outside of a test framework that publishes
+    the test name fall back to `find_test_caller`.
+    """
+    caller_name = getattr(_test_caller, 'name', None)
+    if caller_name is None:
+        caller_name = find_test_caller()
+    return caller_name
+
 
 def find_test_caller():
     """Find the caller class and test name.
@@ -229,3 +229,8 @@ class SSHExecCommandFailed(TempestException):
 
 class UnknownServiceClient(TempestException):
     message = "Service clients named %(services)s are not known"
+
+
+class InteractionNotRecorded(TempestException):
+    message = ("No response for %(method)s %(url)s was recorded in the "
+               "cassette %(cassette)s")
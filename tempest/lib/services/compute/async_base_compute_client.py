@@ -0,0 +1,39 @@
+# Copyright 2016 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import asyncio
+
+from tempest.lib.common import async_rest_client
+from tempest.lib.services.compute import base_compute_client
+
+
+class AsyncBaseComputeClient(async_rest_client.AsyncRestClient,
+                             base_compute_client.BaseComputeClient):
+    """Base class of the async compute service clients
+
+    It adds the requested microversion to the requests, checks it in the
+    responses and selects the response schemas like BaseComputeClient.
+
+    :param kwargs: kwargs accepted by async_rest_client.AsyncRestClient
+    """
+
+    @asyncio.coroutine
+    def request(self, method, url, extra_headers=False, headers=None,
+                body=None, chunked=False):
+        resp, resp_body = yield from super(
+            AsyncBaseComputeClient, self).request(
+                method, url, extra_headers, headers, body, chunked)
+        self._check_microversion_header(resp)
+        return resp, resp_body
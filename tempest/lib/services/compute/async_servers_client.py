@@ -0,0 +1,107 @@
+# Copyright 2016 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import asyncio
+
+from oslo_serialization import jsonutils as json
+from six.moves.urllib import parse as urllib
+
+from tempest.lib.api_schema.response.compute.v2_1 import servers as schema
+from tempest.lib.common import rest_client
+from tempest.lib import exceptions as lib_exc
+from tempest.lib.services.compute import async_base_compute_client
+from tempest.lib.services.compute import servers_client
+
+
+class AsyncServersClient(async_base_compute_client.AsyncBaseComputeClient):
+    """Async counterpart of the ServersClient
+
+    The methods are coroutines which return the same values as the
+    corresponding ServersClient methods.
+    """
+
+    schema_versions_info = servers_client.ServersClient.schema_versions_info
+
+    def __init__(self, auth_provider, service, region,
+                 enable_instance_password=True, **kwargs):
+        super(AsyncServersClient, self).__init__(
+            auth_provider, service, region, **kwargs)
+        self.enable_instance_password = enable_instance_password
+
+    @asyncio.coroutine
+    def create_server(self, **kwargs):
+        """Create server.
+
+        See `ServersClient.create_server`.
+        """
+        resp, body = yield from self.post(
+            'servers', servers_client.create_server_body(**kwargs))
+
+        body = json.loads(body)
+        create_schema = servers_client.create_server_schema(
+            body, self.enable_instance_password)
+        if create_schema is not None:
+            self.validate_response(create_schema, resp, body)
+        return rest_client.ResponseBody(resp, body)
+
+    @asyncio.coroutine
+    def show_server(self, server_id):
+        """Get server details."""
+        resp, body = yield from self.get("servers/%s" % server_id)
+        body = json.loads(body)
+        schema = self.get_schema(self.schema_versions_info)
+        self.validate_response(schema.get_server, resp, body)
+        return rest_client.ResponseBody(resp, body)
+
+    @asyncio.coroutine
+    def delete_server(self, server_id):
+        """Delete server."""
+        resp, body = yield from self.delete("servers/%s" % server_id)
+        self.validate_response(schema.delete_server, resp, body)
+        return rest_client.ResponseBody(resp, body)
+
+    @asyncio.coroutine
+    def list_servers(self, detail=False, **params):
+        """List servers.
+
+        See `ServersClient.list_servers`.
+        """
+        url = 'servers'
+        schema = self.get_schema(self.schema_versions_info)
+        _schema = schema.list_servers
+
+        if detail:
+            url += '/detail'
+            _schema = schema.list_servers_detail
+        if params:
+            url += '?%s' % urllib.urlencode(params)
+
+        resp, body = yield from self.get(url)
+        body = json.loads(body)
+        self.validate_response(_schema, resp, body)
+        return rest_client.ResponseBody(resp, body)
+
+    @asyncio.coroutine
+    def is_resource_deleted(self, id):
+        try:
+            yield from self.show_server(id)
+        except lib_exc.NotFound:
+            return True
+        return False
+
+    @property
+    def resource_type(self):
+        """Returns the primary type of resource this client works with."""
+        return 'server'
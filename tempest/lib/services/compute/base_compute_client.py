@@ -43,16 +43,19 @@ class BaseComputeClient(rest_client.RestClient):
         return headers
 
     def request(self, method, url, extra_headers=False, headers=None,
-                body=None, chunked=False):
+                body=None, chunked=False, **kwargs):
         resp, resp_body = super(BaseComputeClient, self).request(
-            method, url, extra_headers, headers, body, chunked)
+            method, url, extra_headers, headers, body, chunked, **kwargs)
+        self._check_microversion_header(resp)
+        return resp, resp_body
+
+    def _check_microversion_header(self, resp):
         if (COMPUTE_MICROVERSION and
             COMPUTE_MICROVERSION != api_version_utils.LATEST_MICROVERSION):
             api_version_utils.assert_version_header_matches_request(
                 self.api_microversion_header_name,
                 COMPUTE_MICROVERSION,
                 resp)
-        return resp, resp_body
 
     def get_schema(self, schema_versions_info):
         """Get JSON schema
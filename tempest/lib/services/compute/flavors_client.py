@@ -13,6 +13,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import functools
+
 from oslo_serialization import jsonutils as json
 from six.moves.urllib import parse as urllib
 
@@ -21,6 +23,7 @@ from tempest.lib.api_schema.response.compute.v2_1 import flavors_access \
     as schema_access
 from tempest.lib.api_schema.response.compute.v2_1 import flavors_extra_specs \
     as schema_extra_specs
+from tempest.lib.common import pagination
 from tempest.lib.common import rest_client
 from tempest.lib.services.compute import base_compute_client
 
@@ -42,6 +45,15 @@ class FlavorsClient(base_compute_client.BaseComputeClient):
         self.validate_response(_schema, resp, body)
         return rest_client.ResponseBody(resp, body)
 
+    def iter_flavors(self, detail=False, page_size=None, **params):
+        """Iterate over the flavors, requesting them page by page
+
+        Available params: see list_flavors
+        """
+        return pagination.paginate(
+            functools.partial(self.list_flavors, detail), 'flavors',
+            page_size=page_size, **params)
+
     def show_flavor(self, flavor_id):
         resp, body = self.get("flavors/%s" % flavor_id)
         body = json.loads(body)
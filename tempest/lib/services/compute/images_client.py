@@ -13,10 +13,13 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import functools
+
 from oslo_serialization import jsonutils as json
 from six.moves.urllib import parse as urllib
 
 from tempest.lib.api_schema.response.compute.v2_1 import images as schema
+from tempest.lib.common import pagination
 from tempest.lib.common import rest_client
 from tempest.lib import exceptions as lib_exc
 from tempest.lib.services.compute import base_compute_client
@@ -58,6 +61,15 @@ class ImagesClient(base_compute_client.BaseComputeClient):
         self.validate_response(_schema, resp, body)
         return rest_client.ResponseBody(resp, body)
 
+    def iter_images(self, detail=False, page_size=None, **params):
+        """Iterate over the images, requesting them page by page
+
+        Available params: see list_images
+        """
+        return pagination.paginate(
+            functools.partial(self.list_images, detail), 'images',
+            page_size=page_size, **params)
+
     def show_image(self, image_id):
         """Return the details of a single image."""
         resp, body = self.get("images/%s" % image_id)
@@ -15,6 +15,7 @@
 #    under the License.
 
 import copy
+import functools
 
 from oslo_serialization import jsonutils as json
 from six.moves.urllib import parse as urllib
@@ -22,10 +23,43 @@ from six.moves.urllib import parse as urllib
 from tempest.lib.api_schema.response.compute.v2_1 import servers as schema
 from tempest.lib.api_schema.response.compute.v2_19 import servers as schemav219
 from tempest.lib.api_schema.response.compute.v2_9 import servers as schemav29
+from tempest.lib.common import pagination
 from tempest.lib.common import rest_client
 from tempest.lib.services.compute import base_compute_client
 
 
+def create_server_body(**kwargs):
+    """Return the request body of a server creation
+
+    See `ServersClient.create_server` for the renamed parameters.
+    """
+    body = copy.deepcopy(kwargs)
+    if body.get('disk_config'):
+        body['OS-DCF:diskConfig'] = body.pop('disk_config')
+
+    hints = None
+    if body.get('scheduler_hints'):
+        hints = {'os:scheduler_hints': body.pop('scheduler_hints')}
+
+    post_body = {'server': body}
+
+    if hints:
+        post_body.update(hints)
+
+    return json.dumps(post_body)
+
+
+def create_server_schema(body, enable_instance_password):
+    """Return the schema of a server creation response, None if unchecked"""
+    # NOTE(maurosr): this deals with the case of multiple server create
+    # with return reservation id set True
+    if 'reservation_id' in body:
+        return None
+    if enable_instance_password:
+        return schema.create_server_with_admin_pass
+    return schema.create_server
+
+
 class ServersClient(base_compute_client.BaseComputeClient):
     schema_versions_info = [
         {'min': None, 'max': '2.8', 'schema': schema},
@@ -50,32 +84,13 @@ class ServersClient(base_compute_client.BaseComputeClient):
         :param scheduler_hints: The name is changed to os:scheduler_hints and
         the parameter is set in the same level as the parameter 'server'.
         """
-        body = copy.deepcopy(kwargs)
-        if body.get('disk_config'):
-            body['OS-DCF:diskConfig'] = body.pop('disk_config')
-
-        hints = None
-        if body.get('scheduler_hints'):
-            hints = {'os:scheduler_hints': body.pop('scheduler_hints')}
-
-        post_body = {'server': body}
-
-        if hints:
-            post_body.update(hints)
-
-        post_body = json.dumps(post_body)
-        resp, body = self.post('servers', post_body)
+        resp, body = self.post('servers', create_server_body(**kwargs))
 
         body = json.loads(body)
-        # NOTE(maurosr): this deals with the case of multiple server create
-        # with return reservation id set True
-        if 'reservation_id' in body:
-            return rest_client.ResponseBody(resp, body)
-        if self.enable_instance_password:
-            create_schema = schema.create_server_with_admin_pass
-        else:
-            create_schema = schema.create_server
-        self.validate_response(create_schema, resp, body)
+        create_schema = create_server_schema(body,
+                                             self.enable_instance_password)
+        if create_schema is not None:
+            self.validate_response(create_schema, resp, body)
         return rest_client.ResponseBody(resp, body)
 
     def update_server(self, server_id, **kwargs):
@@ -136,6 +151,15 @@ class ServersClient(base_compute_client.BaseComputeClient):
         self.validate_response(_schema, resp, body)
         return rest_client.ResponseBody(resp, body)
 
+    def iter_servers(self, detail=False, page_size=None, **params):
+        """Iterate over the servers, requesting them page by page
+
+        Available params: see list_servers
+        """
+        return pagination.paginate(
+            functools.partial(self.list_servers, detail), 'servers',
+            page_size=page_size, **params)
+
     def list_addresses(self, server_id):
         """Lists all addresses for a server."""
         resp, body = self.get("servers/%s/ips" % server_id)
@@ -15,6 +15,7 @@
 from oslo_serialization import jsonutils as json
 from six.moves.urllib import parse as urllib
 
+from tempest.lib.common import pagination
 from tempest.lib.common import rest_client
 
 
@@ -69,6 +70,14 @@ class TenantsClient(rest_client.RestClient):
         body = json.loads(body)
         return rest_client.ResponseBody(resp, body)
 
+    def iter_tenants(self, page_size=None, **params):
+        """Iterate over the tenants, requesting them page by page
+
+        Available params: see list_tenants
+        """
+        return pagination.paginate(self.list_tenants, 'tenants',
+                                   page_size=page_size, **params)
+
     def update_tenant(self, tenant_id, **kwargs):
         """Updates a tenant.
 
@@ -15,6 +15,8 @@
 from oslo_log import log as logging
 from oslo_serialization import jsonutils as json
 
+from tempest.lib.common import http
+from tempest.lib.common import rate_limiter
 from tempest.lib.common import rest_client
 from tempest.lib import exceptions
 
@@ -22,11 +24,22 @@ from tempest.lib import exceptions
 class TokenClient(rest_client.RestClient):
 
     def __init__(self, auth_url, disable_ssl_certificate_validation=None,
-                 ca_certs=None, trace_requests=None):
+                 ca_certs=None, trace_requests=None, http_keep_alive=False,
+                 http_pool_size=http.DEFAULT_POOL_SIZE,
+                 http_pool_idle_timeout=http.DEFAULT_POOL_IDLE_TIMEOUT,
+                 rate_limit=None, rate_limit_burst=1,
+                 rate_limit_lock_path=None):
         dscv = disable_ssl_certificate_validation
         super(TokenClient, self).__init__(
             None, None, None, disable_ssl_certificate_validation=dscv,
-            ca_certs=ca_certs, trace_requests=trace_requests)
+            ca_certs=ca_certs, trace_requests=trace_requests,
+            http_keep_alive=http_keep_alive, http_pool_size=http_pool_size,
+            http_pool_idle_timeout=http_pool_idle_timeout)
+        # Token requests count in the rate limit of the identity service
+        if rate_limit:
+            self.rate_limiter = rate_limiter.get_rate_limiter(
+                'identity', rate_limit, burst=rate_limit_burst,
+                lock_path=rate_limit_lock_path)
 
         if auth_url is None:
             raise exceptions.IdentityError("Couldn't determine auth_url")
@@ -89,10 +102,13 @@ class TokenClient(rest_client.RestClient):
             except (ValueError, TypeError):
                 headers = self.get_headers(accept_type="json")
 
+        if self.rate_limiter:
+            self.rate_limiter.acquire()
         resp, resp_body = self.raw_request(url, method,
                                            headers=headers, body=body)
         self._log_request(method, url, resp, req_headers=headers,
                           req_body='<omitted>', resp_body=resp_body)
+        self._update_rate_limiter(resp)
 
         if resp.status in [401, 403]:
             resp_body = json.loads(resp_body)
@@ -13,6 +13,7 @@
 from oslo_serialization import jsonutils as json
 from six.moves.urllib import parse as urllib
 
+from tempest.lib.common import pagination
 from tempest.lib.common import rest_client
 
 
@@ -78,6 +79,14 @@ class UsersClient(rest_client.RestClient):
         body = json.loads(body)
         return rest_client.ResponseBody(resp, body)
 
+    def iter_users(self, page_size=None, **params):
+        """Iterate over the users, requesting them page by page
+
+        Available params: see list_users
+        """
+        return pagination.paginate(self.list_users, 'users',
+                                   page_size=page_size, **params)
+
     def update_user_enabled(self, user_id, **kwargs):
         """Enables or disables a user.
 
@@ -18,6 +18,8 @@ import functools
 from oslo_serialization import jsonutils as json
 from six.moves.urllib import parse as urllib
 
+from tempest.lib.common import http
+from tempest.lib.common import pagination
 from tempest.lib.common import rest_client
 from tempest.lib import exceptions as lib_exc
 
@@ -82,6 +84,15 @@ class ImagesClient(rest_client.RestClient):
         body = json.loads(body)
         return rest_client.ResponseBody(resp, body)
 
+    def iter_images(self, page_size=None, **params):
+        """Iterate over the images, requesting them page by page
+
+        Available params: see list_images
+        """
+        return pagination.paginate(
+            lambda **params: self.list_images(params=params), 'images',
+            page_size=page_size, **params)
+
     def show_image(self, image_id):
         url = 'images/%s' % image_id
         resp, body = self.get(url)
@@ -114,14 +125,19 @@ class ImagesClient(rest_client.RestClient):
         self.expected_success(204, resp.status)
         return rest_client.ResponseBody(resp, body)
 
-    def show_image_file(self, image_id):
+    def show_image_file(self, image_id, stream=False,
+                        chunk_size=http.DEFAULT_CHUNK_SIZE):
         """Show an image file.
 
+        With stream=True the data of the returned value is a
+        `tempest.lib.common.http.ResponseStream`, so that large images can
+        be written to disk or checksummed without holding them in memory.
+
         Available params: http://developer.openstack.org/
                           api-ref-image-v2.html#showImageFile-v2
         """
         url = 'images/%s/file' % image_id
-        resp, body = self.get(url)
+        resp, body = self.get(url, stream=stream, chunk_size=chunk_size)
         self.expected_success(200, resp.status)
         return rest_client.ResponseBodyData(resp, body)
 
@@ -0,0 +1,83 @@
+# Copyright 2016 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import asyncio
+
+from tempest.lib import exceptions as lib_exc
+from tempest.lib.services.network import async_base
+
+
+class AsyncPortsClient(async_base.AsyncBaseNetworkClient):
+    """Async counterpart of the PortsClient"""
+
+    @asyncio.coroutine
+    def create_port(self, **kwargs):
+        """Creates a port on a network.
+
+        Available params: see http://developer.openstack.org/
+                              api-ref-networking-v2.html#createPort
+        """
+        uri = '/ports'
+        post_data = {'port': kwargs}
+        return (yield from self.create_resource(uri, post_data))
+
+    @asyncio.coroutine
+    def update_port(self, port_id, **kwargs):
+        """Updates a port.
+
+        Available params: see http://developer.openstack.org/
+                              api-ref-networking-v2.html#updatePort
+        """
+        uri = '/ports/%s' % port_id
+        post_data = {'port': kwargs}
+        return (yield from self.update_resource(uri, post_data))
+
+    @asyncio.coroutine
+    def show_port(self, port_id, **fields):
+        """Shows details for a port.
+
+        Available params: see http://developer.openstack.org/
+                              api-ref-networking-v2.html#showPort
+        """
+        uri = '/ports/%s' % port_id
+        return (yield from self.show_resource(uri, **fields))
+
+    @asyncio.coroutine
+    def delete_port(self, port_id):
+        """Deletes a port.
+
+        Available params: see http://developer.openstack.org/
+                              api-ref-networking-v2.html#removePort
+        """
+        uri = '/ports/%s' % port_id
+        return (yield from self.delete_resource(uri))
+
+    @asyncio.coroutine
+    def list_ports(self, **filters):
+        """Lists ports to which the tenant has access.
+
+        Available params: see http://developer.openstack.org/
+                              api-ref-networking-v2.html#listPorts
+        """
+        uri = '/ports'
+        return (yield from self.list_resources(uri, **filters))
+
+    @asyncio.coroutine
+    def is_resource_deleted(self, id):
+        try:
+            yield from self.show_port(id)
+        except lib_exc.NotFound:
+            return True
+        return False
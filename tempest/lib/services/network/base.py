@@ -10,10 +10,21 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import functools
+from multiprocessing import pool
+import sys
+
 from oslo_serialization import jsonutils as json
+import six
 from six.moves.urllib import parse as urllib
 
+from tempest.lib.common import pagination
 from tempest.lib.common import rest_client
+from tempest.lib import exceptions as lib_exc
+
+# Maximum number of requests sent at once when resources are created or
+# deleted one request per resource
+BULK_WORKERS = 8
 
 
 class BaseNetworkClient(rest_client.RestClient):
@@ -27,8 +38,20 @@ class BaseNetworkClient(rest_client.RestClient):
     version = '2.0'
     uri_prefix = "v2.0"
 
-    def list_resources(self, uri, **filters):
+    def list_resources(self, uri, fields=None, **filters):
+        """List the resources of a type
+
+        :param uri: The uri of the resources, e.g. '/networks'
+        :param fields: The attributes to return for each resource, as a list
+                       like ['id', 'name'], or a single attribute name.
+                       All the attributes are returned by default. Only
+                       asking for the attributes needed makes the response
+                       smaller and faster to decode.
+        :param filters: The filters of the list, as query parameters
+        """
         req_uri = self.uri_prefix + uri
+        if fields:
+            filters['fields'] = fields
         if filters:
             req_uri += '?' + urllib.urlencode(filters, doseq=1)
         resp, body = self.get(req_uri)
@@ -36,6 +59,25 @@ class BaseNetworkClient(rest_client.RestClient):
         self.expected_success(200, resp.status)
         return rest_client.ResponseBody(resp, body)
 
+    def iter_resources(self, uri, resource_key=None, page_size=None,
+                       **filters):
+        """Iterate over the resources of a list, requesting them by page
+
+        :param uri: The uri of the list, as for list_resources
+        :param resource_key: The key of the resources in the response, by
+                             default the last segment of uri, e.g.
+                             'metering_labels' for
+                             '/metering/metering-labels'
+        :param page_size: The number of resources to request per page
+        :param filters: The filters of the list, and the fields to return,
+                        see list_resources
+        """
+        if resource_key is None:
+            resource_key = uri.rstrip('/').split('/')[-1].replace('-', '_')
+        return pagination.paginate(
+            functools.partial(self.list_resources, uri), resource_key,
+            page_size=page_size, **filters)
+
     def delete_resource(self, uri):
         req_uri = self.uri_prefix + uri
         resp, body = self.delete(req_uri)
@@ -62,6 +104,86 @@ class BaseNetworkClient(rest_client.RestClient):
         self.expected_success(201, resp.status)
         return rest_client.ResponseBody(resp, body)
 
+    def create_bulk_resources(self, uri, resource, items, bulk=True):
+        """Create several resources of a type
+
+        With bulk, the resources are created with a single request, which
+        fails, and creates none of them, if any can't be created. If the
+        service does not allow bulk requests for the resource, or without
+        bulk, they are created concurrently with one request each. If any
+        of these fails, the resources created are deleted and the error
+        raised.
+
+        :param uri: The uri of the resources, e.g. '/networks'
+        :param resource: The name of a resource in the request and response
+                         bodies, e.g. 'network'
+        :param items: A list of dicts with the params of each resource
+        :param bulk: Whether to try a bulk request first
+        :return: a ResponseBody with the list of the created resources,
+                 in the order of items, under the plural resource key
+        """
+        plural = uri.rstrip('/').split('/')[-1].replace('-', '_')
+        if bulk:
+            try:
+                return self.create_resource(uri, {plural: items})
+            except lib_exc.BadRequest as e:
+                # Neutron rejects bulk requests to plugins not allowing them
+                if 'Bulk operation' not in six.text_type(e):
+                    raise
+        outcomes = self._map_concurrently(
+            lambda item: self.create_resource(uri, {resource: item}), items)
+        errors = [error for _, error in outcomes if error is not None]
+        if errors:
+            self.delete_bulk_resources(
+                uri, [body[resource]['id'] for body, error in outcomes
+                      if error is None])
+            six.reraise(*errors[0])
+        created = [body for body, _ in outcomes]
+        return rest_client.ResponseBody(
+            created[0].response if created else None,
+            {plural: [body[resource] for body in created]})
+
+    def delete_bulk_resources(self, uri, resource_ids):
+        """Delete several resources of a type, concurrently
+
+        Neutron has no bulk delete, each resource is deleted with its own
+        request. A failure does not prevent the other resources from being
+        deleted.
+
+        :param uri: The uri of the resources, e.g. '/networks'
+        :param resource_ids: The ids of the resources to delete
+        :return: a dict with, for each id, None if the resource was deleted
+                 or else the exception raised deleting it
+        """
+        outcomes = self._map_concurrently(
+            lambda resource_id: self.delete_resource(
+                '%s/%s' % (uri, resource_id)), resource_ids)
+        return dict((resource_id, error[1] if error else None)
+                    for resource_id, (_, error)
+                    in zip(resource_ids, outcomes))
+
+    @staticmethod
+    def _map_concurrently(func, items):
+        """Call func on each item, at most BULK_WORKERS at once
+
+        :return: a list with, for each item, a tuple with the result of func
+                 and None, or None and the exc_info of the exception raised
+        """
+        def call(item):
+            try:
+                return func(item), None
+            except Exception:
+                return None, sys.exc_info()
+
+        if not items:
+            return []
+        workers = pool.ThreadPool(min(len(items), BULK_WORKERS))
+        try:
+            return workers.map(call, items)
+        finally:
+            workers.close()
+            workers.join()
+
     def update_resource(self, uri, post_data):
         req_uri = self.uri_prefix + uri
         req_post_data = json.dumps(post_data)
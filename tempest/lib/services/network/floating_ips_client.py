@@ -36,3 +36,11 @@ class FloatingIPsClient(base.BaseNetworkClient):
     def list_floatingips(self, **filters):
         uri = '/floatingips'
         return self.list_resources(uri, **filters)
+
+    def iter_floatingips(self, page_size=None, **filters):
+        """Iterate over the floating IPs, requesting them page by page
+
+        Available filters: see list_floatingips
+        """
+        return self.iter_resources('/floatingips', page_size=page_size,
+                                   **filters)
@@ -47,14 +47,36 @@ class NetworksClient(base.BaseNetworkClient):
         uri = '/networks'
         return self.list_resources(uri, **filters)
 
-    def create_bulk_networks(self, **kwargs):
+    def iter_networks(self, page_size=None, **filters):
+        """Iterate over the networks, requesting them page by page
+
+        Available filters: see list_networks
+        """
+        return self.iter_resources('/networks', page_size=page_size,
+                                   **filters)
+
+    def create_bulk_networks(self, bulk=True, **kwargs):
         """Create multiple networks in a single request.
 
+        The networks are given as a list of dicts in the 'networks' param.
+        If the service does not allow bulk requests, or if bulk is False,
+        they are created concurrently with one request each, see
+        create_bulk_resources.
+
         Available params: see http://developer.openstack.org/
                               api-ref-networking-v2.html#bulkCreateNetwork
         """
         uri = '/networks'
-        return self.create_resource(uri, kwargs)
+        return self.create_bulk_resources(uri, 'network', kwargs['networks'],
+                                          bulk=bulk)
+
+    def delete_bulk_networks(self, network_ids):
+        """Delete multiple networks concurrently
+
+        :return: a dict with, for each id, None if the network was deleted
+                 or else the exception raised deleting it
+        """
+        return self.delete_bulk_resources('/networks', network_ids)
 
     def list_dhcp_agents_on_hosting_network(self, network_id):
         uri = '/networks/%s/dhcp-agents' % network_id
@@ -63,14 +63,36 @@ class PortsClient(base.BaseNetworkClient):
         uri = '/ports'
         return self.list_resources(uri, **filters)
 
-    def create_bulk_ports(self, **kwargs):
+    def iter_ports(self, page_size=None, **filters):
+        """Iterate over the ports, requesting them page by page
+
+        Available filters: see list_ports
+        """
+        return self.iter_resources('/ports', page_size=page_size,
+                                   **filters)
+
+    def create_bulk_ports(self, bulk=True, **kwargs):
         """Create multiple ports in a single request.
 
+        The ports are given as a list of dicts in the 'ports' param.
+        If the service does not allow bulk requests, or if bulk is False,
+        they are created concurrently with one request each, see
+        create_bulk_resources.
+
         Available params: see http://developer.openstack.org/
                               api-ref-networking-v2.html#bulkCreatePorts
         """
         uri = '/ports'
-        return self.create_resource(uri, kwargs)
+        return self.create_bulk_resources(uri, 'port', kwargs['ports'],
+                                          bulk=bulk)
+
+    def delete_bulk_ports(self, port_ids):
+        """Delete multiple ports concurrently
+
+        :return: a dict with, for each id, None if the port was deleted
+                 or else the exception raised deleting it
+        """
+        return self.delete_bulk_resources('/ports', port_ids)
 
     def is_resource_deleted(self, id):
         try:
@@ -42,6 +42,14 @@ class RoutersClient(base.BaseNetworkClient):
         uri = '/routers'
         return self.list_resources(uri, **filters)
 
+    def iter_routers(self, page_size=None, **filters):
+        """Iterate over the routers, requesting them page by page
+
+        Available filters: see list_routers
+        """
+        return self.iter_resources('/routers', page_size=page_size,
+                                   **filters)
+
     def add_router_interface(self, router_id, **kwargs):
         """Add router interface.
 
@@ -20,6 +20,28 @@ class SecurityGroupRulesClient(base.BaseNetworkClient):
         post_data = {'security_group_rule': kwargs}
         return self.create_resource(uri, post_data)
 
+    def create_bulk_security_group_rules(self, bulk=True, **kwargs):
+        """Create multiple security group rules in a single request.
+
+        The rules are given as a list of dicts in the 'security_group_rules'
+        param. If the service does not allow bulk requests, or if bulk is
+        False, they are created concurrently with one request each, see
+        create_bulk_resources.
+        """
+        uri = '/security-group-rules'
+        return self.create_bulk_resources(uri, 'security_group_rule',
+                                          kwargs['security_group_rules'],
+                                          bulk=bulk)
+
+    def delete_bulk_security_group_rules(self, security_group_rule_ids):
+        """Delete multiple security group rules concurrently
+
+        :return: a dict with, for each id, None if the rule was deleted or
+                 else the exception raised deleting it
+        """
+        return self.delete_bulk_resources('/security-group-rules',
+                                          security_group_rule_ids)
+
     def show_security_group_rule(self, security_group_rule_id, **fields):
         uri = '/security-group-rules/%s' % security_group_rule_id
         return self.show_resource(uri, **fields)
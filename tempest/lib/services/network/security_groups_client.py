@@ -61,3 +61,11 @@ class SecurityGroupsClient(base.BaseNetworkClient):
         """
         uri = '/security-groups'
         return self.list_resources(uri, **filters)
+
+    def iter_security_groups(self, page_size=None, **filters):
+        """Iterate over the security groups, requesting them page by page
+
+        Available filters: see list_security_groups
+        """
+        return self.iter_resources('/security_groups', page_size=page_size,
+                                   **filters)
@@ -47,11 +47,33 @@ class SubnetsClient(base.BaseNetworkClient):
         uri = '/subnets'
         return self.list_resources(uri, **filters)
 
-    def create_bulk_subnets(self, **kwargs):
+    def iter_subnets(self, page_size=None, **filters):
+        """Iterate over the subnets, requesting them page by page
+
+        Available filters: see list_subnets
+        """
+        return self.iter_resources('/subnets', page_size=page_size,
+                                   **filters)
+
+    def create_bulk_subnets(self, bulk=True, **kwargs):
         """Create multiple subnets in a single request.
 
+        The subnets are given as a list of dicts in the 'subnets' param.
+        If the service does not allow bulk requests, or if bulk is False,
+        they are created concurrently with one request each, see
+        create_bulk_resources.
+
         Available params: see http://developer.openstack.org/
                               api-ref-networking-v2.html#bulkCreateSubnet
         """
         uri = '/subnets'
-        return self.create_resource(uri, kwargs)
+        return self.create_bulk_resources(uri, 'subnet', kwargs['subnets'],
+                                          bulk=bulk)
+
+    def delete_bulk_subnets(self, subnet_ids):
+        """Delete multiple subnets concurrently
+
+        :return: a dict with, for each id, None if the subnet was deleted
+                 or else the exception raised deleting it
+        """
+        return self.delete_bulk_resources('/subnets', subnet_ids)
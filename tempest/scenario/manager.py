@@ -135,9 +135,16 @@ class ScenarioTest(tempest.test.BaseTestCase):
         # successful. This is the same basic approach used in the api tests to
         # limit cleanup execution time except here it is multi-resource,
         # because of the nature of the scenario tests.
+        futures = []
         for wait in self.cleanup_waits:
             waiter_callable = wait.pop('waiter_callable')
-            waiter_callable(**wait)
+            if waiter_callable is waiters.wait_for_server_termination:
+                # The servers are polled together by the shared poller
+                futures.append(waiters.submit_server_termination(**wait))
+            else:
+                waiter_callable(**wait)
+        for future in futures:
+            future.result()
 
     # ## Test functions library
     #
@@ -1121,9 +1128,24 @@ class NetworkScenarioTest(ScenarioTest):
             )
         ]
         sec_group_rules_client = security_group_rules_client
-        for ruleset in rulesets:
-            for r_direction in ['ingress', 'egress']:
-                ruleset['direction'] = r_direction
+        if secgroup is None:
+            secgroup = self._default_security_group(
+                client=security_groups_client,
+                tenant_id=security_groups_client.tenant_id)
+        rulesets = [dict(ruleset, direction=r_direction,
+                         security_group_id=secgroup['id'],
+                         tenant_id=secgroup['tenant_id'])
+                    for ruleset in rulesets
+                    for r_direction in ['ingress', 'egress']]
+        try:
+            # Create all the rules with a single request
+            rules = sec_group_rules_client.create_bulk_security_group_rules(
+                security_group_rules=rulesets)['security_group_rules']
+        except lib_exc.Conflict:
+            # Some rules already exist and bulk creation is all or nothing,
+            # create the rules one by one skipping the existing ones
+            rules = []
+            for ruleset in rulesets:
                 try:
                     sg_rule = self._create_security_group_rule(
                         sec_group_rules_client=sec_group_rules_client,
@@ -1136,8 +1158,13 @@ class NetworkScenarioTest(ScenarioTest):
                     if msg not in ex._error_string:
                         raise ex
                 else:
-                    self.assertEqual(r_direction, sg_rule['direction'])
+                    self.assertEqual(ruleset['direction'],
+                                     sg_rule['direction'])
                     rules.append(sg_rule)
+        else:
+            for ruleset, sg_rule in zip(rulesets, rules):
+                self.assertEqual(secgroup['id'], sg_rule['security_group_id'])
+                self.assertEqual(ruleset['direction'], sg_rule['direction'])
 
         return rules
 
@@ -245,7 +245,8 @@ class TestSecurityGroupsBasicOps(manager.NetworkScenarioTest):
 
         myport = (tenant.router['id'], tenant.subnet['id'])
         router_ports = [(i['device_id'], i['fixed_ips'][0]['subnet_id']) for i
-                        in self._list_ports()
+                        in self._list_ports(fields=['device_id', 'fixed_ips',
+                                                    'device_owner'])
                         if self._is_router_port(i)]
 
         self.assertIn(myport, router_ports)
@@ -542,7 +543,8 @@ class TestSecurityGroupsBasicOps(manager.NetworkScenarioTest):
                                      ip=self._get_server_ip(server),
                                      should_succeed=False)
             server_id = server['id']
-            port_id = self._list_ports(device_id=server_id)[0]['id']
+            port_id = self._list_ports(device_id=server_id,
+                                       fields=['id'])[0]['id']
 
             # update port with new security group and check connectivity
             self.ports_client.update_port(port_id, security_groups=[
@@ -603,7 +605,8 @@ class TestSecurityGroupsBasicOps(manager.NetworkScenarioTest):
 
         access_point_ssh = self._connect_to_access_point(new_tenant)
         server_id = server['id']
-        port_id = self._list_ports(device_id=server_id)[0]['id']
+        port_id = self._list_ports(device_id=server_id,
+                                   fields=['id'])[0]['id']
 
         # Flip the port's port security and check connectivity
         try:
@@ -14,7 +14,11 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import functools
+import threading
+
 from tempest.lib import auth
+from tempest.lib.common import http
 from tempest.lib import exceptions
 
 
@@ -50,6 +54,9 @@ class ServiceClients(object):
         >>>                                                  identity_uri)
         >>> johndoe_servers = johndoe_clients.servers_client.list_servers()
 
+    Service clients are registered with `register_client` and only
+    instantiated the first time they are accessed, so that a ServiceClients
+    object only pays for the clients actually used.
     """
     # NOTE(andreaf) This class does not depend on tempest configuration
     # and its meant for direct consumption by external clients such as tempest
@@ -59,7 +66,11 @@ class ServiceClients(object):
 
     def __init__(self, credentials, identity_uri, region=None, scope='project',
                  disable_ssl_certificate_validation=True, ca_certs=None,
-                 trace_requests='', client_parameters=None):
+                 trace_requests='', client_parameters=None,
+                 http_keep_alive=False, http_pool_size=http.DEFAULT_POOL_SIZE,
+                 http_pool_idle_timeout=http.DEFAULT_POOL_IDLE_TIMEOUT,
+                 rate_limit=None, rate_limit_burst=1,
+                 rate_limit_lock_path=None, token_cache=None):
         """Service Clients provider
 
         Instantiate a `ServiceClients` object, from a set of credentials and an
@@ -67,7 +78,9 @@ class ServiceClients(object):
         object. Optionally auth scope can be provided.
 
         A few parameters can be given a value which is applied as default
-        for all service clients: region, dscv, ca_certs, trace_requests.
+        for all service clients: region, dscv, ca_certs, trace_requests,
+        http_keep_alive, http_pool_size, http_pool_idle_timeout, rate_limit,
+        rate_limit_burst, rate_limit_lock_path.
 
         Parameters dscv, ca_certs and trace_requests all apply to the auth
         provider as well as any service clients provided by this manager.
@@ -119,7 +132,25 @@ class ServiceClients(object):
             >>> params_service_y = config.service_client_config('service_y')
             >>> client_parameters['service_y'] = params_service_y
 
+        :param http_keep_alive: Keep HTTP connections open and reuse them
+            across requests. Applies to auth and to all service clients.
+        :param http_pool_size: Maximum number of keep-alive connections kept
+            open per host. Applies to auth and to all service clients.
+        :param http_pool_idle_timeout: Time in seconds after which unused
+            keep-alive connections are closed. Applies to auth and to all
+            service clients.
+        :param rate_limit: Maximum number of requests per second sent to
+            each service. Applies to auth and to all service clients.
+        :param rate_limit_burst: Number of requests which can be sent at
+            once before rate_limit applies.
+        :param rate_limit_lock_path: Directory where the rate limits are
+            shared with other processes, if set.
+        :param token_cache: A `tempest.lib.common.token_cache.TokenCache`
+            where the auth provider looks for tokens, and stores the ones it
+            gets, to share them with other processes.
         """
+        self._client_factories = {}
+        self._client_lock = threading.Lock()
         self.credentials = credentials
         self.identity_uri = identity_uri
         if not identity_uri:
@@ -142,11 +173,17 @@ class ServiceClients(object):
         self.dscv = disable_ssl_certificate_validation
         self.ca_certs = ca_certs
         self.trace_requests = trace_requests
+        self.http_params = dict(
+            http_keep_alive=http_keep_alive, http_pool_size=http_pool_size,
+            http_pool_idle_timeout=http_pool_idle_timeout,
+            rate_limit=rate_limit, rate_limit_burst=rate_limit_burst,
+            rate_limit_lock_path=rate_limit_lock_path)
         # Creates an auth provider for the credentials
         self.auth_provider = auth_provider_class(
             self.credentials, self.identity_uri, scope=scope,
             disable_ssl_certificate_validation=self.dscv,
-            ca_certs=self.ca_certs, trace_requests=self.trace_requests)
+            ca_certs=self.ca_certs, trace_requests=self.trace_requests,
+            token_cache=token_cache, **self.http_params)
         # Setup some defaults for client parameters of registered services
         client_parameters = client_parameters or {}
         self.parameters = {}
@@ -161,6 +198,41 @@ class ServiceClients(object):
             raise exceptions.UnknownServiceClient(
                 services=list(client_parameters.keys()))
 
+    def register_client(self, name, client_class, *args, **kwargs):
+        """Register a service client instantiated on first access
+
+        The client is made available as the `name` attribute. It is created
+        the first time the attribute is read, by calling
+        `client_class(*args, **kwargs)`, and the same instance is returned
+        afterwards.
+
+        :param name: The name of the attribute for the client
+        :param client_class: The class of the client, or any callable
+            returning the client
+        """
+        self._client_factories[name] = functools.partial(
+            client_class, *args, **kwargs)
+        # A client registered again replaces the one created before
+        self.__dict__.pop(name, None)
+
+    @property
+    def registered_clients(self):
+        """The names of the registered service clients"""
+        return set(self._client_factories)
+
+    def __getattr__(self, name):
+        # Only called when the attribute is not set yet. Once instantiated a
+        # client is stored as an instance attribute, so accessing it again
+        # does not go through the registry.
+        factories = self.__dict__.get('_client_factories')
+        if not factories or name not in factories:
+            raise AttributeError("'%s' object has no attribute '%s'" %
+                                 (self.__class__.__name__, name))
+        with self._client_lock:
+            if name not in self.__dict__:
+                self.__dict__[name] = factories[name]()
+            return self.__dict__[name]
+
     def _setup_parameters(self, parameters):
         """Setup default values for client parameters
 
@@ -16,6 +16,7 @@
 from oslo_serialization import jsonutils as json
 from six.moves.urllib import parse as urllib
 
+from tempest.lib.common import pagination
 from tempest.lib.common import rest_client
 
 
@@ -46,6 +47,15 @@ class ProjectsClient(rest_client.RestClient):
         body = json.loads(body)
         return rest_client.ResponseBody(resp, body)
 
+    def iter_projects(self, page_size=None, **params):
+        """Iterate over the projects, requesting them page by page
+
+        Available params: see list_projects
+        """
+        return pagination.paginate(
+            lambda **params: self.list_projects(params=params), 'projects',
+            page_size=page_size, **params)
+
     def update_project(self, project_id, **kwargs):
         """Update a Project.
 
@@ -15,6 +15,7 @@
 from oslo_serialization import jsonutils as json
 from six.moves.urllib import parse as urllib
 
+from tempest.lib.common import pagination
 from tempest.lib.common import rest_client
 
 
@@ -104,6 +105,15 @@ class UsersClient(rest_client.RestClient):
         body = json.loads(body)
         return rest_client.ResponseBody(resp, body)
 
+    def iter_users(self, page_size=None, **params):
+        """Iterate over the users, requesting them page by page
+
+        Available params: see list_users
+        """
+        return pagination.paginate(
+            lambda **params: self.list_users(params=params), 'users',
+            page_size=page_size, **params)
+
     def show_user(self, user_id):
         """GET a user."""
         resp, body = self.get("users/%s" % user_id)
@@ -18,6 +18,7 @@ from xml.etree import ElementTree as etree
 from oslo_serialization import jsonutils as json
 from six.moves.urllib import parse as urllib
 
+from tempest.lib.common import pagination
 from tempest.lib.common import rest_client
 
 
@@ -137,7 +138,8 @@ class AccountClient(rest_client.RestClient):
 
         resp, body = self.get(url, headers={})
         if params and params.get('format') == 'json':
-            body = json.loads(body)
+            # Empty listings may have no body (204)
+            body = json.loads(body) if body else []
         elif params and params.get('format') == 'xml':
             body = etree.fromstring(body)
         else:
@@ -145,6 +147,25 @@ class AccountClient(rest_client.RestClient):
         self.expected_success([200, 204], resp.status)
         return resp, body
 
+    def iter_account_containers(self, page_size=pagination.LISTING_LIMIT,
+                                prefetch=False, **params):
+        """Iterate over the containers of the account, page by page
+
+        Containers are requested in json format, page_size at a time, and
+        the next page is only requested once the containers of the previous
+        one have been consumed.
+
+        :param page_size: The number of containers per page, at most 10,000
+        :param prefetch: Request the next page in a thread while the
+                         containers of the current one are consumed
+        :param params: Listing params, see list_account_containers, e.g.
+                       prefix, delimiter and marker
+        """
+        def list_page(**page_params):
+            return self.list_account_containers(params=page_params)[1]
+        return pagination.paginate_listing(list_page, page_size=page_size,
+                                           prefetch=prefetch, **params)
+
     def list_extensions(self):
         self.skip_path()
         try:
@@ -18,6 +18,7 @@ from xml.etree import ElementTree as etree
 from oslo_serialization import jsonutils as json
 from six.moves.urllib import parse as urllib
 
+from tempest.lib.common import pagination
 from tempest.lib.common import rest_client
 
 
@@ -101,22 +102,38 @@ class ContainerClient(rest_client.RestClient):
 
         even if item count is beyond 10,000 item listing limit.
         Does not require any parameters aside from container name.
+        The listing is requested page by page, the 'limit' param sets the
+        size of the pages and the 'marker' param the name after which the
+        listing starts. To avoid holding large listings in memory use
+        iter_container_objects.
         """
-        # TODO(dwalleck): Rewrite using json format to avoid newlines at end of
-        # obj names. Set limit to API limit - 1 (max returned items = 9999)
-        limit = 9999
-        if params is not None:
-            if 'limit' in params:
-                limit = params['limit']
-
-            if 'marker' in params:
-                limit = params['marker']
-
-        resp, objlist = self.list_container_contents(
-            container,
-            params={'limit': limit, 'format': 'json'})
-        self.expected_success(200, resp.status)
-        return objlist
+        params = dict(params or {})
+        page_size = params.pop('limit', pagination.LISTING_LIMIT)
+        return list(self.iter_container_objects(container,
+                                                page_size=page_size,
+                                                **params))
+
+    def iter_container_objects(self, container,
+                               page_size=pagination.LISTING_LIMIT,
+                               prefetch=False, **params):
+        """Iterate over the objects of a container, page by page
+
+        Objects are requested in json format, page_size at a time, and the
+        next page is only requested once the objects of the previous one
+        have been consumed.
+
+        :param container: The name of the container
+        :param page_size: The number of objects per page, at most 10,000
+        :param prefetch: Request the next page in a thread while the
+                         objects of the current one are consumed
+        :param params: Listing params, see list_container_contents, e.g.
+                       prefix, delimiter and marker
+        """
+        def list_page(**page_params):
+            return self.list_container_contents(container,
+                                                params=page_params)[1]
+        return pagination.paginate_listing(list_page, page_size=page_size,
+                                           prefetch=prefetch, **params)
 
     def list_container_contents(self, container, params=None):
         """List the objects in a container, given the container name
@@ -159,7 +176,8 @@ class ContainerClient(rest_client.RestClient):
 
         resp, body = self.get(url, headers={})
         if params and params.get('format') == 'json':
-            body = json.loads(body)
+            # Empty listings may have no body (204)
+            body = json.loads(body) if body else []
         elif params and params.get('format') == 'xml':
             body = etree.fromstring(body)
         self.expected_success([200, 204], resp.status)
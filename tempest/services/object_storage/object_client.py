@@ -17,6 +17,7 @@ import six
 from six.moves import http_client as httplib
 from six.moves.urllib import parse as urlparse
 
+from tempest.lib.common import http
 from tempest.lib.common import rest_client
 from tempest.lib import exceptions
 
@@ -78,8 +79,14 @@ class ObjectClient(rest_client.RestClient):
         self.expected_success(200, resp.status)
         return resp, body
 
-    def get_object(self, container, object_name, metadata=None):
-        """Retrieve object's data."""
+    def get_object(self, container, object_name, metadata=None,
+                   stream=False, chunk_size=http.DEFAULT_CHUNK_SIZE):
+        """Retrieve object's data.
+
+        With stream=True the returned body is a
+        `tempest.lib.common.http.ResponseStream` which is read while it is
+        consumed.
+        """
 
         headers = {}
         if metadata:
@@ -87,7 +94,8 @@ class ObjectClient(rest_client.RestClient):
                 headers[str(key)] = metadata[key]
 
         url = "{0}/{1}".format(container, object_name)
-        resp, body = self.get(url, headers=headers)
+        resp, body = self.get(url, headers=headers, stream=stream,
+                              chunk_size=chunk_size)
         self.expected_success([200, 206], resp.status)
         return resp, body
 
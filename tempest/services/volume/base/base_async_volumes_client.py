@@ -0,0 +1,107 @@
+# Copyright 2016 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import asyncio
+
+from oslo_serialization import jsonutils as json
+import six
+from six.moves.urllib import parse as urllib
+
+from tempest.lib.common import async_rest_client
+from tempest.lib.common import rest_client
+from tempest.lib import exceptions as lib_exc
+
+
+class AsyncBaseVolumesClient(async_rest_client.AsyncRestClient):
+    """Base async client class to send CRUD Volume API requests"""
+
+    create_resp = 200
+
+    def __init__(self, auth_provider, service, region,
+                 default_volume_size=1, **kwargs):
+        super(AsyncBaseVolumesClient, self).__init__(
+            auth_provider, service, region, **kwargs)
+        self.default_volume_size = default_volume_size
+
+    def _prepare_params(self, params):
+        """Prepares params for use in get methods.
+
+        If params is a string it will be left as it is, but if it's not it will
+        be urlencoded.
+        """
+        if isinstance(params, six.string_types):
+            return params
+        return urllib.urlencode(params)
+
+    @asyncio.coroutine
+    def list_volumes(self, detail=False, params=None):
+        """List all the volumes created.
+
+        Params can be a string (must be urlencoded) or a dictionary.
+        """
+        url = 'volumes'
+        if detail:
+            url += '/detail'
+        if params:
+            url += '?%s' % self._prepare_params(params)
+
+        resp, body = yield from self.get(url)
+        body = json.loads(body)
+        self.expected_success(200, resp.status)
+        return rest_client.ResponseBody(resp, body)
+
+    @asyncio.coroutine
+    def show_volume(self, volume_id):
+        """Returns the details of a single volume."""
+        url = "volumes/%s" % str(volume_id)
+        resp, body = yield from self.get(url)
+        body = json.loads(body)
+        self.expected_success(200, resp.status)
+        return rest_client.ResponseBody(resp, body)
+
+    @asyncio.coroutine
+    def create_volume(self, **kwargs):
+        """Creates a new Volume.
+
+        Available params: see http://developer.openstack.org/
+                              api-ref-blockstorage-v2.html#createVolume
+        """
+        if 'size' not in kwargs:
+            kwargs['size'] = self.default_volume_size
+        post_body = json.dumps({'volume': kwargs})
+        resp, body = yield from self.post('volumes', post_body)
+        body = json.loads(body)
+        self.expected_success(self.create_resp, resp.status)
+        return rest_client.ResponseBody(resp, body)
+
+    @asyncio.coroutine
+    def delete_volume(self, volume_id):
+        """Deletes the Specified Volume."""
+        resp, body = yield from self.delete("volumes/%s" % str(volume_id))
+        self.expected_success(202, resp.status)
+        return rest_client.ResponseBody(resp, body)
+
+    @asyncio.coroutine
+    def is_resource_deleted(self, id):
+        try:
+            yield from self.show_volume(id)
+        except lib_exc.NotFound:
+            return True
+        return False
+
+    @property
+    def resource_type(self):
+        """Returns the primary type of resource this client works with."""
+        return 'volume'
@@ -10,9 +10,12 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import functools
+
 from oslo_serialization import jsonutils as json
 from six.moves.urllib import parse as urllib
 
+from tempest.lib.common import pagination
 from tempest.lib.common import rest_client
 from tempest.lib import exceptions as lib_exc
 
@@ -35,6 +38,15 @@ class BaseSnapshotsClient(rest_client.RestClient):
         self.expected_success(200, resp.status)
         return rest_client.ResponseBody(resp, body)
 
+    def iter_snapshots(self, detail=False, page_size=None, **params):
+        """Iterate over the snapshots, requesting them page by page
+
+        Available params: see list_snapshots
+        """
+        return pagination.paginate(
+            functools.partial(self.list_snapshots, detail), 'snapshots',
+            page_size=page_size, **params)
+
     def show_snapshot(self, snapshot_id):
         """Returns the details of a single snapshot."""
         url = "snapshots/%s" % str(snapshot_id)
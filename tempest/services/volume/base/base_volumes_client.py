@@ -17,6 +17,7 @@ from oslo_serialization import jsonutils as json
 import six
 from six.moves.urllib import parse as urllib
 
+from tempest.lib.common import pagination
 from tempest.lib.common import rest_client
 from tempest.lib import exceptions as lib_exc
 
@@ -62,6 +63,15 @@ class BaseVolumesClient(rest_client.RestClient):
         self.expected_success(200, resp.status)
         return rest_client.ResponseBody(resp, body)
 
+    def iter_volumes(self, detail=False, page_size=None, **params):
+        """Iterate over the volumes, requesting them page by page
+
+        Available params: see list_volumes
+        """
+        return pagination.paginate(
+            lambda **params: self.list_volumes(detail, params=params),
+            'volumes', page_size=page_size, **params)
+
     def show_pools(self, detail=False):
         # List all the volumes pools (hosts)
         url = 'scheduler-stats/get_pools'
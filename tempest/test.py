@@ -28,16 +28,21 @@ import six
 from six.moves import urllib
 import testscenarios
 import testtools
+from testtools import content as test_content
 
 from tempest import clients
 from tempest.common import cred_client
 from tempest.common import credentials_factory as credentials
 from tempest.common import fixed_network
 import tempest.common.generator.valid_generator as valid
+from tempest.common import timeline
 import tempest.common.validation_resources as vresources
 from tempest import config
 from tempest import exceptions
+from tempest.lib.common import cassette
+from tempest.lib.common import metrics
 from tempest.lib.common.utils import data_utils
+from tempest.lib.common.utils import test_utils
 from tempest.lib import decorators
 from tempest.lib import exceptions as lib_exc
 
@@ -245,12 +250,30 @@ class BaseTestCase(testtools.testcase.WithAttributes,
     # A way to adjust slow test classes
     TIMEOUT_SCALING_FACTOR = 1
 
+    # Waiter timeline of the setUpClass of the class, attached to the result
+    # of its first test
+    _class_timeline = None
+
     @classmethod
     def setUpClass(cls):
         # It should never be overridden by descendants
+        cls._class_timeline = timeline.start()
+        try:
+            with test_utils.test_caller('%s:setUpClass' % cls.__name__):
+                cls._setUpClass()
+        finally:
+            timeline.stop()
+
+    @classmethod
+    def _setUpClass(cls):
         if hasattr(super(BaseTestCase, cls), 'setUpClass'):
             super(BaseTestCase, cls).setUpClass()
         cls.setUpClassCalled = True
+        # Collect the request metrics of this worker if `tempest run` asked
+        metrics.setup_worker_collector()
+        if CONF.service_clients.http_cassette:
+            cassette.use_cassette(CONF.service_clients.http_cassette,
+                                  CONF.service_clients.http_cassette_mode)
         # Stack of (name, callable) to be invoked in reverse order at teardown
         cls.teardowns = []
         # All the configuration checks that may generate a skip
@@ -276,6 +299,11 @@ class BaseTestCase(testtools.testcase.WithAttributes,
 
     @classmethod
     def tearDownClass(cls):
+        with test_utils.test_caller('%s:tearDownClass' % cls.__name__):
+            cls._tearDownClass()
+
+    @classmethod
+    def _tearDownClass(cls):
         at_exit_set.discard(cls)
         # It should never be overridden by descendants
         if hasattr(super(BaseTestCase, cls), 'tearDownClass'):
@@ -416,6 +444,17 @@ class BaseTestCase(testtools.testcase.WithAttributes,
                                "setUpClass in the "
                                + self.__class__.__name__)
         at_exit_set.add(self.__class__)
+        # Record the state transitions seen by the waiters of the test and
+        # its cleanups, which run before this one, and attach them to the
+        # test result
+        self.addCleanup(self._attach_waiter_timeline, timeline.start())
+        class_timeline = self.__class__._class_timeline
+        if class_timeline is not None:
+            self.__class__._class_timeline = None
+            if class_timeline.events:
+                self.addDetail(
+                    timeline.CLASS_DETAIL_NAME,
+                    test_content.json_content(class_timeline.events))
         test_timeout = os.environ.get('OS_TEST_TIMEOUT', 0)
         try:
             test_timeout = int(test_timeout) * self.TIMEOUT_SCALING_FACTOR
@@ -438,6 +477,39 @@ class BaseTestCase(testtools.testcase.WithAttributes,
                                                    format=self.log_format,
                                                    level=None))
 
+    def _attach_waiter_timeline(self, test_timeline):
+        timeline.stop()
+        if test_timeline.events:
+            self.addDetail(timeline.DETAIL_NAME,
+                           test_content.json_content(test_timeline.events))
+
+    # NOTE: The name of the running test, or of the setUp, tearDown and
+    # cleanup phase, is published for the whole duration of each phase, so
+    # that service clients can log it without walking the call stack.
+    def run(self, result=None):
+        try:
+            return super(BaseTestCase, self).run(result)
+        finally:
+            test_utils.set_test_caller(None)
+
+    def _run_setup(self, result):
+        test_utils.set_test_caller('%s:setUp' % self.__class__.__name__)
+        return super(BaseTestCase, self)._run_setup(result)
+
+    def _run_test_method(self, result):
+        test_utils.set_test_caller('%s:%s' % (self.__class__.__name__,
+                                              self._testMethodName))
+        return super(BaseTestCase, self)._run_test_method(result)
+
+    def _run_teardown(self, result):
+        test_utils.set_test_caller('%s:tearDown' % self.__class__.__name__)
+        try:
+            return super(BaseTestCase, self)._run_teardown(result)
+        finally:
+            # Cleanups are run right after tearDown
+            test_utils.set_test_caller(
+                '%s:_run_cleanups' % self.__class__.__name__)
+
     @property
     def credentials_provider(self):
         return self._get_credentials_provider()
@@ -536,14 +608,38 @@ class BaseTestCase(testtools.testcase.WithAttributes,
             else:
                 raise lib_exc.InvalidCredentials(
                     "Invalid credentials type %s" % credential_type)
-        return cls.client_manager(credentials=creds.credentials,
-                                  service=cls._service)
+        manager_cache = clients.get_manager_cache()
+        if manager_cache is None:
+            manager = cls.client_manager(credentials=creds.credentials,
+                                         service=cls._service)
+            if '_uncached_managers' not in cls.__dict__:
+                cls._uncached_managers = []
+            cls._uncached_managers.append(manager)
+            return manager
+        if '_cached_managers_creds' not in cls.__dict__:
+            cls._cached_managers_creds = []
+        cls._cached_managers_creds.append(creds.credentials)
+        return manager_cache.get_manager(cls.client_manager,
+                                         creds.credentials,
+                                         service=cls._service)
 
     @classmethod
     def clear_credentials(cls):
         """Clears creds if set"""
         if hasattr(cls, '_creds_provider'):
             cls._creds_provider.clear_creds()
+            # Cached managers of deleted credentials can't be reused
+            cached_creds = cls.__dict__.get('_cached_managers_creds')
+            manager_cache = clients.get_manager_cache()
+            if (cached_creds and manager_cache is not None and
+                    cls._creds_provider.deletes_creds):
+                for creds in cached_creds:
+                    manager_cache.evict(creds)
+            cls._cached_managers_creds = []
+        # Managers which are not cached are not used past the test class
+        for manager in cls.__dict__.get('_uncached_managers', []):
+            clients.release_manager(manager)
+        cls._uncached_managers = []
 
     @classmethod
     def set_validation_resources(cls, keypair=None, floating_ip=None,
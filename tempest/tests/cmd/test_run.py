@@ -13,6 +13,7 @@
 # under the License.
 
 import argparse
+import json
 import os
 import shutil
 import subprocess
@@ -21,6 +22,7 @@ import tempfile
 import mock
 
 from tempest.cmd import run
+from tempest.lib.common import metrics
 from tempest.tests import base
 
 DEVNULL = open(os.devnull, 'wb')
@@ -67,6 +69,23 @@ class TestTempestRun(base.TestCase):
         self.assertEqual('i_am_a_fun_little_regex',
                          self.run_cmd._build_regex(args))
 
+    def test__write_metrics_report(self):
+        metrics_dir = tempfile.mkdtemp(prefix='tempest-unit')
+        report_dir = tempfile.mkdtemp(prefix='tempest-unit')
+        self.addCleanup(shutil.rmtree, report_dir)
+        collector = metrics.MetricsCollector()
+        collector(metrics.RequestRecord('compute', 'GET', 'servers', 200,
+                                        0.1, 10, 0, 0))
+        collector.save(os.path.join(metrics_dir, 'worker-1.json'))
+        collector.save(os.path.join(metrics_dir, 'worker-2.json'))
+        report = os.path.join(report_dir, 'report.json')
+        self.run_cmd._write_metrics_report(metrics_dir, report)
+        self.assertFalse(os.path.exists(metrics_dir))
+        with open(report) as f:
+            rows = json.load(f)
+        self.assertEqual(1, len(rows))
+        self.assertEqual(2, rows[0]['count'])
+
 
 class TestRunReturnCode(base.TestCase):
     def setUp(self):
@@ -0,0 +1,70 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+import os
+import shutil
+import tempfile
+
+import subunit
+
+from tempest.cmd import waiter_timelines
+from tempest.common import timeline
+from tempest.tests import base
+
+
+class TestWaiterTimelines(base.TestCase):
+
+    def setUp(self):
+        super(TestWaiterTimelines, self).setUp()
+        self.directory = tempfile.mkdtemp(prefix='tempest-unit')
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def _write_stream(self, timelines, detail_name=timeline.DETAIL_NAME):
+        path = os.path.join(self.directory, 'stream.subunit')
+        with open(path, 'wb') as f:
+            stream = subunit.StreamResultToBytes(f)
+            for index, events in enumerate(timelines):
+                test_id = 'test_%s' % index
+                stream.status(test_id=test_id, test_status='inprogress')
+                stream.status(test_id=test_id,
+                              file_name=detail_name,
+                              file_bytes=json.dumps(events).encode('utf-8'),
+                              mime_type='application/json', eof=True)
+                stream.status(test_id=test_id, test_status='success')
+        return path
+
+    def test_load_timelines_and_report(self):
+        event = {'resource': 'server', 'id': 's1', 'wait': 1}
+        timelines = [
+            [dict(event, poll=1, time=0.0, state='BUILD'),
+             dict(event, poll=5, time=4.0, state='ACTIVE')],
+            [dict(event, poll=1, time=0.0, state='BUILD'),
+             dict(event, poll=3, time=2.0, state='ACTIVE')]]
+        path = self._write_stream(timelines)
+        loaded = waiter_timelines.load_timelines([path])
+        self.assertEqual(timelines, loaded)
+        rows = waiter_timelines.report_rows(
+            timeline.transition_stats(loaded))
+        self.assertEqual(1, len(rows))
+        self.assertEqual(('server', 'BUILD', 'ACTIVE', 2, 2.0, 3.0, 4.0),
+                         (rows[0]['resource'], rows[0]['from'],
+                          rows[0]['to'], rows[0]['count'], rows[0]['min'],
+                          rows[0]['mean'], rows[0]['max']))
+
+    def test_load_class_timelines(self):
+        event = {'resource': 'volume', 'id': 'v1', 'wait': 1}
+        timelines = [[dict(event, poll=1, time=0.0, state='creating'),
+                      dict(event, poll=2, time=1.0, state='available')]]
+        path = self._write_stream(timelines,
+                                  detail_name=timeline.CLASS_DETAIL_NAME)
+        self.assertEqual(timelines, waiter_timelines.load_timelines([path]))
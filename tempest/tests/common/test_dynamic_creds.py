@@ -12,6 +12,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import time
+
 import mock
 from oslo_config import cfg
 from oslotest import mockpatch
@@ -598,6 +600,49 @@ class TestDynamicCredentialProvider(base.TestCase):
         self.assertRaises(exceptions.InvalidConfiguration,
                           creds.get_primary_creds)
 
+    @mock.patch('tempest.lib.common.rest_client.RestClient')
+    def test_primary_creds_from_pool(self, MockRestClient):
+        creds = dynamic_creds.DynamicCredentialProvider(**self.fixed_params)
+        pool = mock.Mock()
+        self.patchobject(dynamic_creds, 'get_pool',
+                         mock.Mock(return_value=pool))
+        tenant_fix = self._mock_tenant_create('1234', 'fake_prim_tenant')
+        primary_creds = creds.get_primary_creds()
+        self.assertIs(pool.get.return_value, primary_creds)
+        self.assertIs(primary_creds, creds.get_primary_creds())
+        pool.get.assert_called_once_with()
+        tenant_fix.mock.assert_not_called()
+
+    @mock.patch('tempest.lib.common.rest_client.RestClient')
+    def test_role_creds_from_pool(self, MockRestClient):
+        creds = dynamic_creds.DynamicCredentialProvider(**self.fixed_params)
+        creds.creds_client = mock.MagicMock()
+        pool = mock.Mock()
+        get_pool = self.patchobject(dynamic_creds, 'get_pool',
+                                    mock.Mock(return_value=pool))
+        role_creds = creds.get_creds_by_roles(roles=['role1', 'role2'])
+        self.assertIs(pool.get.return_value, role_creds)
+        # The pool of the roles creates users with the roles already
+        get_pool.assert_called_once_with(creds, roles=mock.ANY)
+        self.assertEqual(['role1', 'role2'],
+                         sorted(get_pool.call_args[1]['roles']))
+        creds.creds_client.assign_user_role.assert_not_called()
+
+    @mock.patch('tempest.lib.common.rest_client.RestClient')
+    def test_admin_creds_not_from_pool(self, MockRestClient):
+        cfg.CONF.set_default('neutron', False, 'service_available')
+        creds = dynamic_creds.DynamicCredentialProvider(**self.fixed_params)
+        pool = mock.Mock()
+        self.patchobject(dynamic_creds, 'get_pool',
+                         mock.Mock(return_value=pool))
+        self._mock_list_roles('1234', 'admin')
+        self._mock_user_create('1234', 'fake_admin_user')
+        self._mock_tenant_create('1234', 'fake_admin_tenant')
+        self._mock_assign_user_role()
+        admin_creds = creds.get_admin_creds()
+        self.assertEqual('fake_admin_user', admin_creds.username)
+        pool.get.assert_not_called()
+
 
 class TestDynamicCredentialProviderV3(TestDynamicCredentialProvider):
 
@@ -648,3 +693,59 @@ class TestDynamicCredentialProviderV3(TestDynamicCredentialProvider):
                 "Member role already exists, ignoring conflict.")
         creds.creds_client.assign_user_role.assert_called_once_with(
             mock.ANY, mock.ANY, 'Member')
+
+
+class TestCredentialsPool(base.TestCase):
+
+    def setUp(self):
+        super(TestCredentialsPool, self).setUp()
+        self.builder = mock.Mock()
+        self.builder._creates_networks.return_value = False
+        self.builder._create_creds.side_effect = (
+            lambda roles=None: mock.Mock())
+
+    def _wait_for_pool(self, pool, size):
+        for _ in range(500):
+            with pool._condition:
+                if len(pool._creds) >= size:
+                    return
+            time.sleep(0.01)
+        self.fail('The pool did not fill up')
+
+    def test_get_refills_pool(self):
+        pool = dynamic_creds.CredentialsPool(self.builder, 2, 1)
+        self.addCleanup(pool.drain)
+        self._wait_for_pool(pool, 2)
+        self.assertIsNotNone(pool.get())
+        self._wait_for_pool(pool, 2)
+        self.assertEqual(3, self.builder._create_creds.call_count)
+
+    def test_creds_with_roles(self):
+        pool = dynamic_creds.CredentialsPool(self.builder, 1, 1,
+                                             roles=['role1'])
+        self.addCleanup(pool.drain)
+        self._wait_for_pool(pool, 1)
+        self.builder._create_creds.assert_called_once_with(roles=['role1'])
+
+    def test_drain_clears_left_creds(self):
+        pool = dynamic_creds.CredentialsPool(self.builder, 2, 2)
+        self._wait_for_pool(pool, 2)
+        left = list(pool._creds)
+        pool.drain()
+        self.assertIsNone(pool.get())
+        self.assertEqual(sorted(left, key=id),
+                         sorted(self.builder._creds.values(), key=id))
+        self.builder.clear_creds.assert_called_once_with()
+        for thread in pool._threads:
+            self.assertFalse(thread.is_alive())
+
+    def test_network_failure_clears_creds(self):
+        self.builder._creates_networks.return_value = True
+        self.builder._create_network_resources.side_effect = Exception
+        pool = dynamic_creds.CredentialsPool(self.builder, 2, 1)
+        pool._threads[0].join(5)
+        # The pool stops creating credentials after a failure
+        self.assertTrue(pool._closed)
+        self.assertIsNone(pool.get())
+        self.builder.clear_creds.assert_called_once_with()
+        pool.drain()
@@ -0,0 +1,154 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import itertools
+
+import mock
+
+from tempest.common import poller
+from tempest.common import waiters
+from tempest import config
+from tempest import exceptions
+from tempest.lib import exceptions as lib_exc
+from tempest.tests import base
+from tempest.tests import fake_config
+
+
+class TestPoller(base.TestCase):
+
+    def setUp(self):
+        super(TestPoller, self).setUp()
+        self.poller = poller.Poller()
+        self.show = mock.Mock(side_effect=lib_exc.NotFound)
+
+    def _register(self, list_states, resource_id, ready=None, timeout=10,
+                  check=None):
+        return self.poller.register(
+            'servers', list_states, self.show, resource_id, ready, timeout,
+            lambda state: 'timed out in %s' % state['status'],
+            itertools.repeat(0.01), check=check)
+
+    def test_waits_share_list_calls(self):
+        states = iter([
+            [{'id': 'a', 'status': 'BUILD'}, {'id': 'b', 'status': 'BUILD'}],
+            [{'id': 'a', 'status': 'ACTIVE'}, {'id': 'b', 'status': 'BUILD'}],
+        ])
+        list_states = mock.Mock(side_effect=lambda: next(
+            states, [{'id': 'a', 'status': 'ACTIVE'},
+                     {'id': 'b', 'status': 'ACTIVE'}]))
+        futures = [self._register(list_states, resource_id,
+                                  lambda state: state['status'] == 'ACTIVE')
+                   for resource_id in ('a', 'b')]
+        self.assertEqual('a', futures[0].result(5)['id'])
+        self.assertEqual('b', futures[1].result(5)['id'])
+        # Both servers are found in the shared list calls
+        self.assertFalse(self.show.called)
+
+    def test_wait_for_deletion(self):
+        states = iter([[{'id': 'a', 'status': 'DELETING'}]])
+        list_states = mock.Mock(side_effect=lambda: next(states, []))
+        future = self._register(list_states, 'a')
+        self.assertIsNone(future.result(5))
+        self.show.assert_called_with('a')
+
+    def test_disappeared_resource_fails(self):
+        future = self._register(mock.Mock(return_value=[]), 'a',
+                                lambda state: True)
+        self.assertRaises(lib_exc.NotFound, future.result, 5)
+
+    def test_check_fails_wait(self):
+        def check(state):
+            if state['status'] == 'ERROR':
+                raise exceptions.BuildErrorException(server_id='a')
+
+        states = iter([[{'id': 'a', 'status': 'ERROR'}]])
+        list_states = mock.Mock(side_effect=lambda: next(
+            states, [{'id': 'a', 'status': 'ERROR'}]))
+        future = self._register(list_states, 'a', lambda state: False,
+                                check=check)
+        self.assertRaises(exceptions.BuildErrorException, future.result, 5)
+        # The first state is not checked
+        self.assertTrue(list_states.call_count >= 2)
+
+    def test_timeout(self):
+        future = self._register(
+            mock.Mock(return_value=[{'id': 'a', 'status': 'BUILD'}]), 'a',
+            lambda state: False, timeout=0)
+        exc = self.assertRaises(exceptions.TimeoutException, future.result, 5)
+        self.assertIn('timed out in BUILD', str(exc))
+
+    def test_list_failure_retried(self):
+        states = iter([lib_exc.ServerFault(),
+                       [{'id': 'a', 'status': 'BUILD'},
+                        {'id': 'b', 'status': 'BUILD'}]])
+
+        def list_states():
+            state = next(states, [{'id': 'a', 'status': 'ACTIVE'},
+                                  {'id': 'b', 'status': 'ACTIVE'}])
+            if isinstance(state, Exception):
+                raise state
+            return state
+
+        futures = [self._register(list_states, resource_id,
+                                  lambda state: state['status'] == 'ACTIVE')
+                   for resource_id in ('a', 'b')]
+        self.assertEqual('a', futures[0].result(5)['id'])
+        self.assertEqual('b', futures[1].result(5)['id'])
+        self.assertFalse(self.show.called)
+
+    def test_list_failure_past_deadline(self):
+        future = self._register(mock.Mock(side_effect=lib_exc.ServerFault),
+                                'a', lambda state: False, timeout=0)
+        self.assertRaises(lib_exc.ServerFault, future.result, 5)
+        self.assertFalse(self.show.called)
+
+    def test_thread_stops_without_waits(self):
+        future = self._register(mock.Mock(return_value=[]), 'a')
+        future.result(5)
+        thread = self.poller._thread
+        if thread is not None:
+            thread.join(5)
+        self.assertIsNone(self.poller._thread)
+        self.assertEqual({}, self.poller._groups)
+
+
+class TestSubmitWaiters(base.TestCase):
+
+    def setUp(self):
+        super(TestSubmitWaiters, self).setUp()
+        self.useFixture(fake_config.ConfigFixture())
+        self.patchobject(config, 'TempestConfigPrivate',
+                         fake_config.FakePrivate)
+        self.patchobject(poller, '_poller', poller.Poller())
+        self.client = mock.MagicMock()
+        self.client.build_timeout = 10
+        self.client.build_interval = 0.01
+
+    def test_submit_server_status(self):
+        self.client.list_servers.return_value = {
+            'servers': [{'id': 'a', 'status': 'ACTIVE'}]}
+        future = waiters.submit_server_status(self.client, 'a', 'ACTIVE')
+        self.assertEqual('ACTIVE', future.result(5)['status'])
+        self.client.list_servers.assert_called_with(detail=True)
+
+    def test_submit_server_termination(self):
+        self.client.list_servers.return_value = {'servers': []}
+        self.client.show_server.side_effect = lib_exc.NotFound
+        future = waiters.submit_server_termination(self.client, 'a')
+        self.assertIsNone(future.result(5))
+
+    def test_submit_volume_status_error(self):
+        self.client.list_volumes.return_value = {
+            'volumes': [{'id': 'a', 'status': 'error'}]}
+        future = waiters.submit_volume_status(self.client, 'a', 'available')
+        self.assertRaises(exceptions.VolumeBuildErrorException,
+                          future.result, 5)
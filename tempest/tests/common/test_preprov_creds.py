@@ -16,6 +16,7 @@ import hashlib
 import os
 import testtools
 
+import fixtures
 import mock
 from oslo_concurrency.fixture import lockutils as lockutils_fixtures
 from oslo_config import cfg
@@ -135,120 +136,171 @@ class TestPreProvisionedCredentials(base.TestCase):
             self.assertIn(hash, hash_dict['creds'].keys())
             self.assertIn(hash_dict['creds'][hash], self.test_accounts)
 
-    def test_create_hash_file_previous_file(self):
-        # Emulate the lock existing on the filesystem
-        self.useFixture(mockpatch.Patch('os.path.isfile', return_value=True))
-        with mock.patch('six.moves.builtins.open', mock.mock_open(),
-                        create=True):
-            test_account_class = (
-                preprov_creds.PreProvisionedCredentialProvider(
-                    **self.fixed_params))
-            res = test_account_class._create_hash_file('12345')
-        self.assertFalse(res, "_create_hash_file should return False if the "
-                         "pseudo-lock file already exists")
-
-    def test_create_hash_file_no_previous_file(self):
-        # Emulate the lock not existing on the filesystem
-        self.useFixture(mockpatch.Patch('os.path.isfile', return_value=False))
-        with mock.patch('six.moves.builtins.open', mock.mock_open(),
-                        create=True):
-            test_account_class = (
-                preprov_creds.PreProvisionedCredentialProvider(
-                    **self.fixed_params))
-            res = test_account_class._create_hash_file('12345')
-        self.assertTrue(res, "_create_hash_file should return True if the "
-                        "pseudo-lock doesn't already exist")
-
-    @mock.patch('oslo_concurrency.lockutils.lock')
-    def test_get_free_hash_no_previous_accounts(self, lock_mock):
-        # Emulate no pre-existing lock
-        self.useFixture(mockpatch.Patch('os.path.isdir', return_value=False))
-        hash_list = self._get_hash_list(self.test_accounts)
-        mkdir_mock = self.useFixture(mockpatch.Patch('os.mkdir'))
-        self.useFixture(mockpatch.Patch('os.path.isfile', return_value=False))
+    def test_get_index(self):
         test_account_class = preprov_creds.PreProvisionedCredentialProvider(
             **self.fixed_params)
-        with mock.patch('six.moves.builtins.open', mock.mock_open(),
-                        create=True) as open_mock:
-            test_account_class._get_free_hash(hash_list)
-            lock_path = os.path.join(self.fixed_params['accounts_lock_dir'],
-                                     hash_list[0])
-            open_mock.assert_called_once_with(lock_path, 'w')
-        mkdir_path = os.path.join(self.fixed_params['accounts_lock_dir'])
-        mkdir_mock.mock.assert_called_once_with(mkdir_path)
-
-    @mock.patch('oslo_concurrency.lockutils.lock')
-    def test_get_free_hash_no_free_accounts(self, lock_mock):
-        hash_list = self._get_hash_list(self.test_accounts)
-        # Emulate pre-existing lock dir
-        self.useFixture(mockpatch.Patch('os.path.isdir', return_value=True))
-        # Emulate all lcoks in list are in use
-        self.useFixture(mockpatch.Patch('os.path.isfile', return_value=True))
+        hash_dict = test_account_class.hash_dict
+        index = test_account_class.get_index(hash_dict)
+        self.assertEqual(sorted(hash_dict['creds']), index['hashes'])
+        for role, hashes in hash_dict['roles'].items():
+            ids = [i for i, _hash in enumerate(index['hashes'])
+                   if index['roles'][role] & 1 << i]
+            self.assertEqual(sorted(hashes),
+                             [index['hashes'][i] for i in ids])
+
+    def test_accounts_index_shared(self):
+        params = self._get_lock_dir_params()
+        accounts_file = os.path.join(
+            os.path.dirname(params['accounts_lock_dir']), 'accounts.yaml')
+        open(accounts_file, 'w').close()
+        params['test_accounts_file'] = accounts_file
+        first = preprov_creds.PreProvisionedCredentialProvider(**params)
+        first_hash_dict = first.hash_dict
+        self.accounts_mock.mock.return_value = self._fake_accounts(
+            cfg.CONF.identity.admin_role)
+        second = preprov_creds.PreProvisionedCredentialProvider(**params)
+        # The second provider reads the index written by the first one
+        with mock.patch.object(second, 'get_hash_dict') as get_hash_dict:
+            self.assertEqual(first_hash_dict['creds'],
+                             second.hash_dict['creds'])
+        self.assertFalse(get_hash_dict.called)
+        for role, hashes in first_hash_dict['roles'].items():
+            self.assertEqual(sorted(set(hashes)),
+                             sorted(second.hash_dict['roles'][role]))
+        self.assertEqual(set(first._get_match_hash_list(['role2'])),
+                         set(second._get_match_hash_list(['role2'])))
+
+    def test_accounts_index_without_passwords(self):
+        params = self._get_lock_dir_params()
+        accounts_file = os.path.join(
+            os.path.dirname(params['accounts_lock_dir']), 'accounts.yaml')
+        open(accounts_file, 'w').close()
+        params['test_accounts_file'] = accounts_file
+        for account in self.test_accounts:
+            account['password'] = 'secret-password'
+        test_account_class = preprov_creds.PreProvisionedCredentialProvider(
+            **params)
+        test_account_class.hash_dict
+        index_files = os.listdir(params['accounts_lock_dir'])
+        self.assertEqual(1, len(index_files))
+        with open(os.path.join(params['accounts_lock_dir'],
+                               index_files[0])) as index_file:
+            self.assertNotIn('secret-password', index_file.read())
+
+    def test_accounts_loaded_when_needed(self):
         test_account_class = preprov_creds.PreProvisionedCredentialProvider(
             **self.fixed_params)
-        with mock.patch('six.moves.builtins.open', mock.mock_open(),
-                        create=True):
-            self.assertRaises(lib_exc.InvalidCredentials,
-                              test_account_class._get_free_hash, hash_list)
-
-    @mock.patch('oslo_concurrency.lockutils.lock')
-    def test_get_free_hash_some_in_use_accounts(self, lock_mock):
-        # Emulate no pre-existing lock
-        self.useFixture(mockpatch.Patch('os.path.isdir', return_value=True))
+        self.assertFalse(self.accounts_mock.mock.called)
+        self.assertTrue(test_account_class.is_multi_user())
+        self.accounts_mock.mock.assert_called_once_with('fake_accounts_file')
+
+    def _get_lock_dir_params(self):
+        lock_dir = self.useFixture(fixtures.TempDir()).path
+        return dict(self.fixed_params,
+                    accounts_lock_dir=os.path.join(lock_dir, 'test_accounts'))
+
+    def test_lock_hash_locked_elsewhere(self):
+        params = self._get_lock_dir_params()
+        os.mkdir(params['accounts_lock_dir'])
+        owner = preprov_creds.PreProvisionedCredentialProvider(**params)
+        self.assertTrue(owner._lock_hash('12345'))
+        test_account_class = preprov_creds.PreProvisionedCredentialProvider(
+            **params)
+        self.assertFalse(test_account_class._lock_hash('12345'),
+                         "_lock_hash should return False if the account is "
+                         "locked by another provider")
+
+    def test_lock_hash_previous_file(self):
+        # A lock file left behind by a previous owner is not a lock
+        params = self._get_lock_dir_params()
+        os.mkdir(params['accounts_lock_dir'])
+        with open(os.path.join(params['accounts_lock_dir'], '12345'),
+                  'w') as fd:
+            fd.write('crashed worker')
+        test_account_class = preprov_creds.PreProvisionedCredentialProvider(
+            **params)
+        self.assertTrue(test_account_class._lock_hash('12345'))
+        self.assertEqual(params['name'],
+                         test_account_class._get_lock_owner('12345'))
+
+    def test_lock_hash_removed_file(self):
+        # A lock file removed by its owner, once it released the account,
+        # while another provider was locking it is not a lock
+        params = self._get_lock_dir_params()
+        test_account_class = preprov_creds.PreProvisionedCredentialProvider(
+            **params)
+        test_account_class._make_accounts_dir()
+        path = os.path.join(params['accounts_lock_dir'], '12345')
+        open(path, 'w').close()
+        real_open = os.open
+
+        def open_removed(*args, **kwargs):
+            fd = real_open(*args, **kwargs)
+            # The file opened first is removed before it is locked
+            if open_mock.call_count == 1:
+                os.unlink(path)
+            return fd
+
+        with mock.patch('os.open', side_effect=open_removed) as open_mock:
+            self.assertTrue(test_account_class._lock_hash('12345'))
+        self.assertEqual(2, open_mock.call_count)
+        self.assertTrue(os.path.exists(path))
+
+    def test_get_free_hash_no_previous_accounts(self):
+        params = self._get_lock_dir_params()
         hash_list = self._get_hash_list(self.test_accounts)
         test_account_class = preprov_creds.PreProvisionedCredentialProvider(
-            **self.fixed_params)
+            **params)
+        free_hash = test_account_class._get_free_hash(hash_list)
+        self.assertIn(free_hash, hash_list)
+        self.assertTrue(os.path.isdir(params['accounts_lock_dir']))
+        self.assertEqual([free_hash], os.listdir(params['accounts_lock_dir']))
+
+    def test_get_free_hash_no_free_accounts(self):
+        params = self._get_lock_dir_params()
+        hash_list = self._get_hash_list(self.test_accounts)
+        owner = preprov_creds.PreProvisionedCredentialProvider(
+            **dict(params, name='owner'))
+        for _ in hash_list:
+            owner._get_free_hash(hash_list)
+        test_account_class = preprov_creds.PreProvisionedCredentialProvider(
+            **params)
+        exc = self.assertRaises(lib_exc.InvalidCredentials,
+                                test_account_class._get_free_hash, hash_list)
+        self.assertIn('owner', str(exc))
 
-        def _fake_is_file(path):
-            # Fake isfile() to return that the path exists unless a specific
-            # hash is in the path
-            if hash_list[3] in path:
-                return False
-            return True
-
-        self.patchobject(os.path, 'isfile', _fake_is_file)
-        with mock.patch('six.moves.builtins.open', mock.mock_open(),
-                        create=True) as open_mock:
-            test_account_class._get_free_hash(hash_list)
-            lock_path = os.path.join(self.fixed_params['accounts_lock_dir'],
-                                     hash_list[3])
-            open_mock.assert_has_calls([mock.call(lock_path, 'w')])
-
-    @mock.patch('oslo_concurrency.lockutils.lock')
-    def test_remove_hash_last_account(self, lock_mock):
+    def test_get_free_hash_some_in_use_accounts(self):
+        params = self._get_lock_dir_params()
         hash_list = self._get_hash_list(self.test_accounts)
-        # Pretend the pseudo-lock is there
-        self.useFixture(mockpatch.Patch('os.path.isfile', return_value=True))
-        # Pretend the lock dir is empty
-        self.useFixture(mockpatch.Patch('os.listdir', return_value=[]))
+        owner = preprov_creds.PreProvisionedCredentialProvider(**params)
+        for _hash in hash_list:
+            if _hash != hash_list[3]:
+                owner._lock_hash(_hash)
         test_account_class = preprov_creds.PreProvisionedCredentialProvider(
-            **self.fixed_params)
-        remove_mock = self.useFixture(mockpatch.Patch('os.remove'))
-        rmdir_mock = self.useFixture(mockpatch.Patch('os.rmdir'))
-        test_account_class.remove_hash(hash_list[2])
-        hash_path = os.path.join(self.fixed_params['accounts_lock_dir'],
-                                 hash_list[2])
-        lock_path = self.fixed_params['accounts_lock_dir']
-        remove_mock.mock.assert_called_once_with(hash_path)
-        rmdir_mock.mock.assert_called_once_with(lock_path)
-
-    @mock.patch('oslo_concurrency.lockutils.lock')
-    def test_remove_hash_not_last_account(self, lock_mock):
+            **params)
+        self.assertEqual(hash_list[3],
+                         test_account_class._get_free_hash(hash_list))
+
+    def test_remove_hash(self):
+        params = self._get_lock_dir_params()
+        hash_list = self._get_hash_list(self.test_accounts)
+        test_account_class = preprov_creds.PreProvisionedCredentialProvider(
+            **params)
+        free_hash = test_account_class._get_free_hash([hash_list[2]])
+        test_account_class.remove_hash(free_hash)
+        self.assertEqual({}, test_account_class._locks)
+        self.assertEqual([], os.listdir(params['accounts_lock_dir']))
+        # The account can be locked again once released
+        other = preprov_creds.PreProvisionedCredentialProvider(**params)
+        self.assertTrue(other._lock_hash(hash_list[2]))
+
+    def test_remove_hash_not_held(self):
         hash_list = self._get_hash_list(self.test_accounts)
-        # Pretend the pseudo-lock is there
-        self.useFixture(mockpatch.Patch('os.path.isfile', return_value=True))
-        # Pretend the lock dir is empty
-        self.useFixture(mockpatch.Patch('os.listdir', return_value=[
-            hash_list[1], hash_list[4]]))
         test_account_class = preprov_creds.PreProvisionedCredentialProvider(
             **self.fixed_params)
-        remove_mock = self.useFixture(mockpatch.Patch('os.remove'))
-        rmdir_mock = self.useFixture(mockpatch.Patch('os.rmdir'))
+        close_mock = self.useFixture(mockpatch.Patch('os.close'))
         test_account_class.remove_hash(hash_list[2])
-        hash_path = os.path.join(self.fixed_params['accounts_lock_dir'],
-                                 hash_list[2])
-        remove_mock.mock.assert_called_once_with(hash_path)
-        rmdir_mock.mock.assert_not_called()
+        close_mock.mock.assert_not_called()
 
     def test_is_multi_user(self):
         test_accounts_class = preprov_creds.PreProvisionedCredentialProvider(
@@ -0,0 +1,98 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+
+from tempest.common import timeline
+from tempest.common import waiters
+from tempest import config
+from tempest.tests import base
+from tempest.tests import fake_config
+
+
+def _event(resource_id, wait, poll, time, state):
+    return {'resource': 'volume', 'id': resource_id, 'wait': wait,
+            'poll': poll, 'time': time, 'state': state}
+
+
+class TestWaitRecorder(base.TestCase):
+
+    def setUp(self):
+        super(TestWaitRecorder, self).setUp()
+        self.addCleanup(timeline.stop)
+
+    def test_records_state_changes(self):
+        test_timeline = timeline.start()
+        recorder = timeline.WaitRecorder('volume', 'v1', timeline.status_of)
+        for status in ('creating', 'creating', 'available'):
+            recorder.observe({'status': status})
+        recorder.observe(None)
+        self.assertEqual(['creating', 'available', timeline.DELETED],
+                         [event['state'] for event in test_timeline.events])
+        self.assertEqual([1, 3, 4],
+                         [event['poll'] for event in test_timeline.events])
+        self.assertEqual(4, recorder.polls)
+
+    def test_no_timeline(self):
+        recorder = timeline.WaitRecorder('volume', 'v1', timeline.status_of)
+        recorder.observe({'status': 'creating'})
+        self.assertIsNone(recorder.timeline)
+        self.assertEqual(1, recorder.polls)
+
+    def test_waiter_records_timeline(self):
+        self.useFixture(fake_config.ConfigFixture())
+        self.patchobject(config, 'TempestConfigPrivate',
+                         fake_config.FakePrivate)
+        self.patch('time.sleep')
+        client = mock.Mock(build_interval=1, build_timeout=10)
+        client.show_volume.side_effect = [
+            {'volume': {'status': 'attaching'}},
+            {'volume': {'status': 'attaching'}},
+            {'volume': {'status': 'in-use'}}]
+        test_timeline = timeline.start()
+        waiters.wait_for_volume_status(client, 'v1', 'in-use')
+        self.assertEqual([('volume', 'v1', 'attaching', 1),
+                          ('volume', 'v1', 'in-use', 3)],
+                         [(event['resource'], event['id'], event['state'],
+                           event['poll'])
+                          for event in test_timeline.events])
+
+
+class TestTransitions(base.TestCase):
+
+    def test_transitions(self):
+        events = [_event('v1', 1, 1, 10.0, 'creating'),
+                  _event('v1', 1, 4, 13.5, 'available'),
+                  _event('v2', 2, 1, 11.0, 'creating'),
+                  _event('v2', 2, 2, 12.0, 'error'),
+                  # A later wait on v1 does not make a transition with the
+                  # states of the previous one
+                  _event('v1', 3, 1, 30.0, 'attaching'),
+                  _event('v1', 3, 2, 31.0, 'in-use')]
+        self.assertEqual(
+            [('volume', 'creating', 'available', 3.5),
+             ('volume', 'creating', 'error', 1.0),
+             ('volume', 'attaching', 'in-use', 1.0)],
+            timeline.transitions(events))
+
+    def test_transition_stats(self):
+        timelines = [
+            [_event('v1', 1, 1, 0.0, 'creating'),
+             _event('v1', 1, 2, 2.0, 'available')],
+            [_event('v2', 1, 1, 0.0, 'creating'),
+             _event('v2', 1, 3, 4.0, 'available')]]
+        stats = timeline.transition_stats(timelines)
+        self.assertEqual([('volume', 'creating', 'available')], list(stats))
+        latency = stats[('volume', 'creating', 'available')]
+        self.assertEqual(2, latency.count)
+        self.assertEqual(2.0, latency.min)
+        self.assertEqual(4.0, latency.max)
@@ -15,17 +15,23 @@
 import time
 
 import mock
+from oslo_config import cfg
 
 from tempest.common import waiters
+from tempest import config
 from tempest import exceptions
 from tempest.services.volume.base import base_volumes_client
 from tempest.tests import base
+from tempest.tests import fake_config
 import tempest.tests.utils as utils
 
 
 class TestImageWaiters(base.TestCase):
     def setUp(self):
         super(TestImageWaiters, self).setUp()
+        self.useFixture(fake_config.ConfigFixture())
+        self.patchobject(config, 'TempestConfigPrivate',
+                         fake_config.FakePrivate)
         self.client = mock.MagicMock()
         self.client.build_timeout = 1
         self.client.build_interval = 1
@@ -58,7 +64,7 @@ class TestImageWaiters(base.TestCase):
         # Tests that the wait method raises VolumeRestoreErrorException if
         # the volume status is 'error_restoring'.
         client = mock.Mock(spec=base_volumes_client.BaseVolumesClient,
-                           build_interval=1)
+                           build_interval=1, build_timeout=10)
         volume1 = {'volume': {'status': 'restoring-backup'}}
         volume2 = {'volume': {'status': 'error_restoring'}}
         mock_show = mock.Mock(side_effect=(volume1, volume2))
@@ -70,3 +76,139 @@ class TestImageWaiters(base.TestCase):
         mock_show.assert_has_calls([mock.call(volume_id),
                                     mock.call(volume_id)])
         mock_sleep.assert_called_once_with(1)
+
+    @mock.patch.object(time, 'sleep')
+    def test_wait_for_server_status_error_after_first_poll(self, mock_sleep):
+        # The first status can predate the action waited for, so ERROR is
+        # only raised from the following ones.
+        server1 = {'server': {'status': 'ERROR'}}
+        server2 = {'server': {'status': 'ERROR', 'fault': 'fake_fault'}}
+        self.client.show_server.side_effect = (server1, server2)
+        self.assertRaises(exceptions.BuildErrorException,
+                          waiters.wait_for_server_status,
+                          self.client, 'fake_server_id', 'ACTIVE')
+        self.assertEqual(2, self.client.show_server.call_count)
+        mock_sleep.assert_called_once_with(1)
+
+    @mock.patch.object(time, 'sleep')
+    def test_wait_for_server_status_ready_wait(self, mock_sleep):
+        server1 = {'server': {'status': 'ACTIVE',
+                              'OS-EXT-STS:task_state': 'rebooting'}}
+        server2 = {'server': {'status': 'ACTIVE',
+                              'OS-EXT-STS:task_state': None}}
+        self.client.show_server.side_effect = (server1, server2)
+        waiters.wait_for_server_status(self.client, 'fake_server_id',
+                                       'ACTIVE')
+        self.assertEqual([mock.call(1), mock.call(0)],
+                         mock_sleep.call_args_list)
+
+
+class TestBatchWaiters(base.TestCase):
+    def setUp(self):
+        super(TestBatchWaiters, self).setUp()
+        self.useFixture(fake_config.ConfigFixture())
+        self.patchobject(config, 'TempestConfigPrivate',
+                         fake_config.FakePrivate)
+        self.client = mock.MagicMock()
+        self.client.build_timeout = 10
+        self.client.build_interval = 1
+        self.sleep = self.patch('time.sleep')
+
+    def test_wait_for_servers_status(self):
+        build = {'servers': [{'id': 'a', 'status': 'BUILD'},
+                             {'id': 'b', 'status': 'BUILD'},
+                             {'id': 'other', 'status': 'BUILD'}]}
+        half = {'servers': [{'id': 'a', 'status': 'ACTIVE'},
+                            {'id': 'b', 'status': 'BUILD'}]}
+        active = {'servers': [{'id': 'b', 'status': 'ACTIVE'}]}
+        self.client.list_servers.side_effect = (build, half, active)
+        servers = waiters.wait_for_servers_status(
+            self.client, ['a', 'b'], 'ACTIVE', ready_wait=False,
+            name='fake')
+        self.assertEqual(['a', 'b'], sorted(servers))
+        self.assertEqual(3, self.client.list_servers.call_count)
+        self.client.list_servers.assert_called_with(detail=True, name='fake')
+        self.assertFalse(self.client.show_server.called)
+
+    def test_wait_for_servers_status_shows_unlisted(self):
+        self.client.list_servers.return_value = {
+            'servers': [{'id': 'a', 'status': 'ACTIVE'}]}
+        self.client.show_server.return_value = {
+            'server': {'id': 'b', 'status': 'ACTIVE'}}
+        servers = waiters.wait_for_servers_status(
+            self.client, ['a', 'b'], 'ACTIVE', ready_wait=False)
+        self.assertEqual(['a', 'b'], sorted(servers))
+        self.client.show_server.assert_called_once_with('b')
+
+    def test_wait_for_servers_status_failures(self):
+        time_mock = self.patch('time.time')
+        time_mock.side_effect = [0, 0, 20]
+        build = {'servers': [{'id': 'a', 'status': 'BUILD'},
+                             {'id': 'b', 'status': 'BUILD'},
+                             {'id': 'c', 'status': 'BUILD'}]}
+        error = {'servers': [{'id': 'a', 'status': 'ERROR'},
+                             {'id': 'b', 'status': 'ACTIVE'},
+                             {'id': 'c', 'status': 'BUILD'}]}
+        self.client.list_servers.side_effect = (build, error)
+        exc = self.assertRaises(exceptions.ResourcesWaitException,
+                                waiters.wait_for_servers_status,
+                                self.client, ['a', 'b', 'c'], 'ACTIVE',
+                                ready_wait=False)
+        self.assertEqual(['a', 'c'], sorted(exc.failures))
+        self.assertIsInstance(exc.failures['a'],
+                              exceptions.BuildErrorException)
+        self.assertIsInstance(exc.failures['c'],
+                              exceptions.TimeoutException)
+
+    def test_wait_for_volumes_status(self):
+        creating = {'volumes': [{'id': 'a', 'status': 'creating'},
+                                {'id': 'b', 'status': 'available'}]}
+        available = {'volumes': [{'id': 'a', 'status': 'available'}]}
+        self.client.list_volumes.side_effect = (creating, available)
+        volumes = waiters.wait_for_volumes_status(
+            self.client, ['a', 'b'], 'available')
+        self.assertEqual(['a', 'b'], sorted(volumes))
+        self.client.list_volumes.assert_called_with(detail=True, params={})
+        self.sleep.assert_called_once_with(1)
+
+
+class TestBackoffIntervals(base.TestCase):
+    def setUp(self):
+        super(TestBackoffIntervals, self).setUp()
+        self.useFixture(fake_config.ConfigFixture())
+        self.patchobject(config, 'TempestConfigPrivate',
+                         fake_config.FakePrivate)
+
+    def _intervals(self, build_interval, count=5):
+        intervals = waiters.backoff_intervals(build_interval)
+        return [next(intervals) for _ in range(count)]
+
+    def test_fixed_interval_by_default(self):
+        self.assertEqual([3] * 5, self._intervals(3))
+
+    def test_exponential_backoff_up_to_build_interval(self):
+        cfg.CONF.set_default('initial_interval', 0.5, group='waiters')
+        cfg.CONF.set_default('backoff_factor', 2, group='waiters')
+        self.assertEqual([0.5, 1, 2, 3, 3], self._intervals(3))
+
+    def test_exponential_backoff_up_to_max_interval(self):
+        cfg.CONF.set_default('initial_interval', 1, group='waiters')
+        cfg.CONF.set_default('backoff_factor', 3, group='waiters')
+        cfg.CONF.set_default('max_interval', 20, group='waiters')
+        self.assertEqual([1, 3, 9, 20, 20], self._intervals(2))
+
+    def test_jitter(self):
+        cfg.CONF.set_default('jitter', 0.5, group='waiters')
+        for interval in self._intervals(10, count=20):
+            self.assertTrue(5 <= interval <= 15)
+
+    @mock.patch.object(time, 'sleep')
+    def test_wait_until_sleeps_backoff_intervals(self, mock_sleep):
+        cfg.CONF.set_default('initial_interval', 0.25, group='waiters')
+        cfg.CONF.set_default('backoff_factor', 2, group='waiters')
+        show = mock.Mock(side_effect=['BUILD', 'BUILD', 'BUILD', 'ACTIVE'])
+        state = waiters.wait_until(show, lambda s: s == 'ACTIVE', 1, 60,
+                                   lambda s: 'timed out')
+        self.assertEqual('ACTIVE', state)
+        self.assertEqual([mock.call(0.25), mock.call(0.5), mock.call(1)],
+                         mock_sleep.call_args_list)
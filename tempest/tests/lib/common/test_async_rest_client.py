@@ -0,0 +1,194 @@
+# Copyright 2016 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import threading
+
+import mock
+from oslotest import mockpatch
+import six
+
+from tempest.lib.common import http
+from tempest.lib import exceptions
+from tempest.tests import base
+from tempest.tests.lib import fake_auth_provider
+from tempest.tests.lib import fake_http
+
+if six.PY3:
+    import asyncio
+
+    from tempest.lib.common import async_rest_client
+
+
+class BaseAsyncRestClientTestClass(base.TestCase):
+
+    url = 'fake_endpoint'
+
+    def setUp(self):
+        if six.PY2:
+            self.skipTest('The async clients require Python 3')
+        super(BaseAsyncRestClientTestClass, self).setUp()
+        self.fake_auth_provider = fake_auth_provider.FakeAuthProvider()
+        self.rest_client = async_rest_client.AsyncRestClient(
+            self.fake_auth_provider, None, None, max_concurrency=5)
+        self.patchobject(http.ClosingHttp, 'request', self.fake_http.request)
+        self.useFixture(mockpatch.PatchObject(self.rest_client,
+                                              '_log_request'))
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.addCleanup(asyncio.set_event_loop, None)
+        self.addCleanup(self.loop.close)
+
+    def run_coroutine(self, coroutine):
+        return self.loop.run_until_complete(coroutine)
+
+
+class TestAsyncRestClientHTTPMethods(BaseAsyncRestClientTestClass):
+    def setUp(self):
+        self.fake_http = fake_http.fake_httplib2()
+        super(TestAsyncRestClientHTTPMethods, self).setUp()
+
+    def test_get(self):
+        __, return_dict = self.run_coroutine(self.rest_client.get(self.url))
+        self.assertEqual('GET', return_dict['method'])
+        self.assertEqual(self.rest_client.get_headers(),
+                         return_dict['headers'])
+
+    def test_post(self):
+        __, return_dict = self.run_coroutine(
+            self.rest_client.post(self.url, {}, {}))
+        self.assertEqual('POST', return_dict['method'])
+
+    def test_delete(self):
+        __, return_dict = self.run_coroutine(
+            self.rest_client.delete(self.url))
+        self.assertEqual('DELETE', return_dict['method'])
+
+    def test_auth_request_decorates_request(self):
+        with mock.patch.object(self.fake_auth_provider, 'auth_request',
+                               return_value=('decorated_url', {'a': 'b'},
+                                             None)) as auth_request:
+            __, return_dict = self.run_coroutine(
+                self.rest_client.get(self.url))
+        auth_request.assert_called_once_with(
+            'GET', self.url, self.rest_client.get_headers(), None,
+            self.rest_client.filters)
+        self.assertEqual('decorated_url', return_dict['uri'])
+        self.assertEqual({'a': 'b'}, return_dict['headers'])
+
+    def test_default_http_pool_size(self):
+        self.assertEqual(5, self.rest_client.max_concurrency)
+        self.assertIs(async_rest_client.get_executor(5),
+                      self.rest_client.executor)
+
+
+class TestAsyncRestClientConcurrency(BaseAsyncRestClientTestClass):
+
+    def setUp(self):
+        self.fake_http = fake_http.fake_httplib2()
+        super(TestAsyncRestClientConcurrency, self).setUp()
+        self.barrier = threading.Barrier(5, timeout=10)
+
+    def test_requests_in_flight_together(self):
+        request = self.fake_http.request
+
+        def concurrent_request(http_obj, *args, **kwargs):
+            # Raises BrokenBarrierError unless the 5 requests are in
+            # flight at the same time
+            self.barrier.wait()
+            return request(*args, **kwargs)
+
+        self.patchobject(http.ClosingHttp, 'request', concurrent_request)
+
+        results = self.run_coroutine(asyncio.gather(
+            *[self.rest_client.get('url%d' % i) for i in range(5)]))
+        self.assertEqual(['url%d' % i for i in range(5)],
+                         [body['uri'] for __, body in results])
+
+
+class TestAsyncRestClientErrorChecker(BaseAsyncRestClientTestClass):
+
+    def setUp(self):
+        self.fake_http = fake_http.fake_httplib2()
+        super(TestAsyncRestClientErrorChecker, self).setUp()
+
+    def _set_response(self, *responses):
+        mock_request = self.patchobject(http.ClosingHttp, 'request')
+        mock_request.side_effect = [
+            (fake_http.fake_http_response(
+                dict({'content-type': 'application/json'}, **headers),
+                status=status), body)
+            for status, headers, body in responses]
+        return mock_request
+
+    def test_response_404(self):
+        self._set_response((404, {}, '{"itemNotFound": {}}'))
+        self.assertRaises(exceptions.NotFound, self.run_coroutine,
+                          self.rest_client.get(self.url))
+
+    @mock.patch('asyncio.sleep')
+    def test_response_413_retried(self, mock_sleep):
+        future = asyncio.Future(loop=self.loop)
+        future.set_result(None)
+        mock_sleep.return_value = future
+        self.patchobject(self.rest_client, 'is_absolute_limit')
+        self.rest_client.is_absolute_limit.return_value = False
+        mock_request = self._set_response(
+            (413, {'retry-after': '1'}, '{"overLimit": {}}'),
+            (200, {}, '{}'))
+        resp, body = self.run_coroutine(self.rest_client.get(self.url))
+        self.assertEqual(200, resp.status)
+        self.assertEqual(2, mock_request.call_count)
+        mock_sleep.assert_called_once_with(1)
+
+    @mock.patch('asyncio.sleep')
+    def test_rate_limiter_wait(self, mock_sleep):
+        future = asyncio.Future(loop=self.loop)
+        future.set_result(None)
+        mock_sleep.return_value = future
+        self.rest_client.rate_limiter = mock.Mock()
+        self.rest_client.rate_limiter.reserve.return_value = 0.5
+        self._set_response((200, {}, '{}'))
+        self.run_coroutine(self.rest_client.get(self.url))
+        mock_sleep.assert_called_once_with(0.5)
+        self.rest_client.rate_limiter.succeeded.assert_called_once_with()
+
+
+class TestAsyncRestClientWaitForDeletion(BaseAsyncRestClientTestClass):
+
+    def setUp(self):
+        self.fake_http = fake_http.fake_httplib2()
+        super(TestAsyncRestClientWaitForDeletion, self).setUp()
+        self.rest_client.build_interval = 0
+        self.rest_client.build_timeout = 1
+        self.deleted_after = 2
+        self.checks = 0
+
+        def is_resource_deleted(id):
+            self.checks += 1
+            deleted = asyncio.Future(loop=self.loop)
+            deleted.set_result(self.checks > self.deleted_after)
+            return deleted
+
+        self.rest_client.is_resource_deleted = is_resource_deleted
+
+    def test_wait_for_resource_deletion(self):
+        self.run_coroutine(self.rest_client.wait_for_resource_deletion('id'))
+        self.assertEqual(3, self.checks)
+
+    @mock.patch('time.time')
+    def test_wait_for_resource_deletion_timeout(self, mock_time):
+        mock_time.side_effect = [0, 0, 1]
+        self.assertRaises(exceptions.TimeoutException, self.run_coroutine,
+                          self.rest_client.wait_for_resource_deletion('id'))
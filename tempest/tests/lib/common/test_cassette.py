@@ -0,0 +1,193 @@
+# Copyright 2016 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+import shutil
+import tempfile
+
+import mock
+
+from tempest.lib.common import cassette
+from tempest.lib.common import http
+from tempest.lib.common import rest_client
+from tempest.lib import exceptions
+from tempest.tests import base
+from tempest.tests.lib.common import test_http
+from tempest.tests.lib import fake_auth_provider
+
+
+class FakeUrllib3Response(object):
+
+    reason = 'OK'
+    version = 11
+
+    def __init__(self, status=200, headers=None):
+        self.status = status
+        self.headers = headers or {'Content-Type': 'application/json'}
+
+    def getheaders(self):
+        return self.headers
+
+
+class FakeHttp(object):
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def request(self, url, method, headers=None, body=None, **kwargs):
+        self.requests.append((method, url, body))
+        status, data = self.responses.pop(0)
+        return http.Response(FakeUrllib3Response(status), url), data
+
+
+class TestCassette(base.TestCase):
+
+    def setUp(self):
+        super(TestCassette, self).setUp()
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def _record(self, path, *requests):
+        fake_http = FakeHttp(*[response for __, __, __, response
+                               in requests])
+        recorder = cassette.RecordingHttp(fake_http, cassette.Cassette(path))
+        for method, url, body, __ in requests:
+            recorder.request(url, method, headers={}, body=body)
+        recorder.cassette.save()
+        return cassette.ReplayHttp(cassette.Cassette(path).load())
+
+    def test_replay(self):
+        player = self._record(
+            os.path.join(self.directory, 'cassette.json'),
+            ('GET', 'http://fake/servers', None, (200, b'{"servers": []}')))
+        resp, body = player.request('http://fake/servers', 'GET',
+                                    headers={'X-Auth-Token': 'other'})
+        self.assertEqual(200, resp.status)
+        self.assertEqual('200', resp['status'])
+        self.assertEqual('OK', resp.reason)
+        self.assertEqual('application/json', resp['content-type'])
+        self.assertEqual('http://fake/servers', resp['content-location'])
+        self.assertEqual(b'{"servers": []}', body)
+
+    def test_replay_gzip_binary_body(self):
+        path = os.path.join(self.directory, 'cassette.json.gz')
+        player = self._record(
+            path, ('GET', 'http://fake/file', None, (200, b'\xff\x00\xfe')))
+        self.assertEqual(b'\xff\x00\xfe',
+                         player.request('http://fake/file', 'GET')[1])
+        with open(path, 'rb') as f:
+            self.assertEqual(b'\x1f\x8b', f.read(2))
+
+    def test_replay_in_order_then_repeat_last(self):
+        url = 'http://fake/servers/1'
+        player = self._record(
+            os.path.join(self.directory, 'cassette.json'),
+            ('GET', url, None, (200, b'BUILD')),
+            ('GET', url, None, (200, b'ACTIVE')))
+        self.assertEqual([b'BUILD', b'ACTIVE', b'ACTIVE'],
+                         [player.request(url, 'GET')[1] for _ in range(3)])
+
+    def test_replay_keyed_by_body(self):
+        url = 'http://fake/servers'
+        player = self._record(
+            os.path.join(self.directory, 'cassette.json'),
+            ('POST', url, '{"name": "a"}', (202, b'a')),
+            ('POST', url, '{"name": "b"}', (202, b'b')))
+        self.assertEqual(b'b', player.request(url, 'POST',
+                                              body='{"name": "b"}')[1])
+        self.assertEqual(b'a', player.request(url, 'POST',
+                                              body=b'{"name": "a"}')[1])
+        self.assertRaises(exceptions.InteractionNotRecorded,
+                          player.request, url, 'POST', body='{}')
+        self.assertRaises(exceptions.InteractionNotRecorded,
+                          player.request, url, 'GET')
+
+    def test_replay_stream(self):
+        player = self._record(
+            os.path.join(self.directory, 'cassette.json'),
+            ('GET', 'http://fake/file', None, (200, b'0123456789')))
+        resp, body = player.request('http://fake/file', 'GET', stream=True,
+                                    chunk_size=4)
+        self.assertIsInstance(body, http.ResponseStream)
+        self.assertEqual([b'0123', b'4567', b'89'], list(body))
+
+    def test_record_stream(self):
+        url = 'http://fake/file'
+        fake_http = mock.Mock()
+        fake_http.request.return_value = (
+            http.Response(FakeUrllib3Response(), url),
+            http.ResponseStream(
+                test_http.FakeStreamedResponse(b'0123456789')))
+        recorder = cassette.RecordingHttp(
+            fake_http, cassette.Cassette(os.path.join(self.directory, 'c')))
+        resp, body = recorder.request(url, 'GET', stream=True, chunk_size=4)
+        self.assertEqual([b'0123', b'4567', b'89'], list(body))
+        self.assertEqual(b'0123456789',
+                         recorder.cassette.play('GET', url, None)[1])
+
+    def test_directory(self):
+        self._record(self.directory,
+                     ('GET', 'http://fake/a', None, (200, b'a')))
+        self.assertEqual(['cassette-%d.json.gz' % os.getpid()],
+                         os.listdir(self.directory))
+        player = cassette.ReplayHttp(
+            cassette.Cassette(self.directory).load())
+        self.assertEqual(b'a', player.request('http://fake/a', 'GET')[1])
+
+
+class TestUseCassette(base.TestCase):
+
+    def setUp(self):
+        super(TestUseCassette, self).setUp()
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, 'cassette.json')
+        self.addCleanup(cassette.eject)
+
+    def _get(self):
+        client = rest_client.RestClient(
+            fake_auth_provider.FakeAuthProvider(), None, None)
+        return client.get('http://fake/servers')
+
+    def test_record_and_replay_rest_client(self):
+        fake_http = FakeHttp((200, b'{"servers": []}'))
+        self.patchobject(http.ClosingHttp, 'request', fake_http.request)
+        cassette.use_cassette(self.path, cassette.RECORD)
+        self._get()
+        cassette.eject()
+
+        fake_http.responses = []
+        cassette.use_cassette(self.path, cassette.REPLAY)
+        resp, body = self._get()
+        self.assertEqual(200, resp.status)
+        self.assertEqual(b'{"servers": []}', body)
+        # Only the recorded request went to the http object
+        self.assertEqual(1, len(fake_http.requests))
+
+    def test_no_cassette(self):
+        client = rest_client.RestClient(
+            fake_auth_provider.FakeAuthProvider(), None, None)
+        self.assertIsInstance(client.http_obj, http.ClosingHttp)
+
+    def test_use_cassette_twice(self):
+        used = cassette.use_cassette(self.path, cassette.RECORD)
+        self.assertIs(used, cassette.use_cassette(self.path, cassette.RECORD))
+        self.assertRaises(ValueError, cassette.use_cassette, self.path,
+                          cassette.REPLAY)
+
+    def test_unknown_mode(self):
+        self.assertRaises(ValueError, cassette.use_cassette, self.path,
+                          'rewind')
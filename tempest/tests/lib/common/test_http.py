@@ -0,0 +1,264 @@
+# Copyright 2016 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import hashlib
+import threading
+
+import mock
+import six
+from six.moves import BaseHTTPServer
+from six.moves import socketserver
+import urllib3
+
+from tempest.lib.common import http
+from tempest.lib.common import rest_client
+from tempest.lib import exceptions
+from tempest.tests import base
+from tempest.tests.lib import fake_auth_provider
+
+
+class FakeUrllib3Response(object):
+
+    status = 200
+    reason = 'OK'
+    version = 11
+    data = b'fake_body'
+
+    def getheaders(self):
+        return {'Content-Type': 'application/json'}
+
+
+class FakeStreamedResponse(FakeUrllib3Response):
+
+    def __init__(self, data=b'0123456789', status=200):
+        self._body = six.BytesIO(data)
+        self.status = status
+        self.released = False
+        self.closed = False
+
+    @property
+    def data(self):
+        raise AssertionError('a streamed body must not be preloaded')
+
+    def stream(self, amt):
+        while True:
+            chunk = self._body.read(amt)
+            if not chunk:
+                break
+            yield chunk
+
+    def read(self, amt=None):
+        return self._body.read(amt)
+
+    def release_conn(self):
+        self.released = True
+
+    def close(self):
+        self.closed = True
+
+
+class TestClosingHttp(base.TestCase):
+
+    def setUp(self):
+        super(TestClosingHttp, self).setUp()
+        self.request = self.patchobject(urllib3.poolmanager.PoolManager,
+                                        'request')
+        self.request.return_value = FakeUrllib3Response()
+
+    def test_request_closes_connection(self):
+        http_obj = http.ClosingHttp()
+        resp, body = http_obj.request('http://fake_url', 'GET',
+                                      headers={'X-Fake': 'fake'})
+        headers = self.request.call_args[1]['headers']
+        self.assertEqual('close', headers['connection'])
+        self.assertEqual('fake', headers['X-Fake'])
+        self.assertEqual(200, resp.status)
+        self.assertEqual('application/json', resp['content-type'])
+        self.assertEqual(b'fake_body', body)
+
+    def test_pooled_request_keeps_connection(self):
+        http_obj = http.PooledHttp()
+        http_obj.request('http://fake_url', 'GET',
+                         headers={'X-Fake': 'fake'})
+        headers = self.request.call_args[1]['headers']
+        self.assertNotIn('connection', headers)
+        self.assertEqual('fake', headers['X-Fake'])
+
+    def test_request_stream(self):
+        self.request.return_value = FakeStreamedResponse()
+        http_obj = http.ClosingHttp()
+        resp, body = http_obj.request('http://fake_url', 'GET',
+                                      stream=True, chunk_size=4)
+        self.assertFalse(self.request.call_args[1]['preload_content'])
+        self.assertNotIn('stream', self.request.call_args[1])
+        self.assertEqual(200, resp.status)
+        self.assertIsInstance(body, http.ResponseStream)
+        self.assertEqual([b'0123', b'4567', b'89'], list(body))
+
+
+class TestResponseStream(base.TestCase):
+
+    def setUp(self):
+        super(TestResponseStream, self).setUp()
+        self.response = FakeStreamedResponse()
+        self.stream = http.ResponseStream(self.response, chunk_size=3)
+
+    def test_iter_releases_connection(self):
+        self.assertEqual([b'012', b'345', b'678', b'9'], list(self.stream))
+        self.assertTrue(self.response.released)
+        self.assertFalse(self.response.closed)
+
+    def test_read(self):
+        self.assertEqual(b'0123', self.stream.read(4))
+        self.assertFalse(self.response.released)
+        self.assertEqual(b'456789', self.stream.read())
+        self.assertTrue(self.response.released)
+        self.assertFalse(self.response.closed)
+
+    def test_write_to(self):
+        fileobj = six.BytesIO()
+        self.assertEqual(10, self.stream.write_to(fileobj))
+        self.assertEqual(b'0123456789', fileobj.getvalue())
+        self.assertTrue(self.response.released)
+
+    def test_hexdigest(self):
+        self.assertEqual(hashlib.sha256(b'0123456789').hexdigest(),
+                         self.stream.hexdigest('sha256'))
+
+    def test_context_manager_releases_connection(self):
+        with self.stream as body:
+            body.read(1)
+        self.assertTrue(self.response.released)
+        # The rest of the body was not read, the connection is not reused
+        self.assertTrue(self.response.closed)
+
+    def test_partial_iteration_closes_connection(self):
+        for chunk in self.stream:
+            break
+        self.stream.close()
+        self.assertTrue(self.response.released)
+        self.assertTrue(self.response.closed)
+
+
+class FakeKeepAliveHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+    body = b'x' * 100000
+
+    def do_GET(self):
+        body = self.path.encode('utf-8') + self.body
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class FakeKeepAliveServer(socketserver.ThreadingMixIn,
+                          BaseHTTPServer.HTTPServer):
+
+    daemon_threads = True
+
+
+class TestResponseStreamKeepAlive(base.TestCase):
+
+    def setUp(self):
+        super(TestResponseStreamKeepAlive, self).setUp()
+        server = FakeKeepAliveServer(('127.0.0.1', 0), FakeKeepAliveHandler)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        self.url = 'http://127.0.0.1:%s' % server.server_address[1]
+        self.http_obj = http.PooledHttp(pool_size=1)
+        self.addCleanup(self.http_obj.clear)
+
+    def test_partial_read_then_request(self):
+        resp, body = self.http_obj.request(self.url + '/first', 'GET',
+                                           stream=True, chunk_size=1024)
+        self.assertEqual(b'/first', body.read(6))
+        body.close()
+        resp, body = self.http_obj.request(self.url + '/second', 'GET')
+        self.assertEqual(200, resp.status)
+        self.assertEqual(b'/second' + FakeKeepAliveHandler.body, body)
+
+
+class TestPooledHttp(base.TestCase):
+
+    def test_get_pooled_http_shared(self):
+        http_obj = http.get_pooled_http(pool_size=3)
+        self.assertIsInstance(http_obj, http.PooledHttp)
+        self.assertIs(http_obj, http.get_pooled_http(pool_size=3))
+        self.assertIsNot(http_obj, http.get_pooled_http(pool_size=4))
+        self.assertIsNot(http_obj, http.get_pooled_http(
+            disable_ssl_certificate_validation=True, pool_size=3))
+
+    def test_pool_size(self):
+        http_obj = http.PooledHttp(pool_size=3)
+        pool = http_obj.connection_from_url('http://fake_url')
+        self.assertEqual(3, pool.pool.maxsize)
+
+    @mock.patch('time.time')
+    def test_idle_pools_evicted(self, mock_time):
+        http_obj = http.PooledHttp(pool_idle_timeout=10)
+        mock_time.return_value = 100
+        http_obj._touch_pool('http://fake_url1')
+        pool1 = http_obj.connection_from_url('http://fake_url1')
+        mock_time.return_value = 105
+        http_obj._touch_pool('http://fake_url2')
+        pool2 = http_obj.connection_from_url('http://fake_url2')
+        self.assertIs(pool1, http_obj.connection_from_url('http://fake_url1'))
+        mock_time.return_value = 114
+        http_obj._touch_pool('http://fake_url2')
+        # fake_url1 was unused for longer than the timeout, fake_url2 not
+        self.assertIsNot(pool1,
+                         http_obj.connection_from_url('http://fake_url1'))
+        self.assertIs(pool2, http_obj.connection_from_url('http://fake_url2'))
+
+
+class TestRestClientHttp(base.TestCase):
+
+    def test_default_closing_http(self):
+        client = rest_client.RestClient(
+            fake_auth_provider.FakeAuthProvider(), None, None)
+        self.assertIsInstance(client.http_obj, http.ClosingHttp)
+        self.assertNotIsInstance(client.http_obj, http.PooledHttp)
+
+    def test_keep_alive_shares_pooled_http(self):
+        clients = [rest_client.RestClient(
+            fake_auth_provider.FakeAuthProvider(), None, None,
+            http_keep_alive=True, http_pool_size=5) for _ in range(2)]
+        self.assertIsInstance(clients[0].http_obj, http.PooledHttp)
+        self.assertIs(clients[0].http_obj, clients[1].http_obj)
+
+    def _get_streamed(self, response):
+        request = self.patchobject(urllib3.poolmanager.PoolManager, 'request')
+        request.return_value = response
+        client = rest_client.RestClient(
+            fake_auth_provider.FakeAuthProvider(), None, None)
+        return client.get('fake_url', stream=True, chunk_size=4)
+
+    def test_get_stream(self):
+        resp, body = self._get_streamed(FakeStreamedResponse())
+        self.assertIsInstance(body, http.ResponseStream)
+        self.assertEqual(b'0123456789', b''.join(body))
+
+    def test_get_stream_error_body_read(self):
+        response = FakeStreamedResponse(b'{"itemNotFound": {}}', status=404)
+        self.assertRaises(exceptions.NotFound, self._get_streamed, response)
+        self.assertTrue(response.released)
@@ -0,0 +1,204 @@
+# Copyright 2016 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import csv
+import json
+import os
+import shutil
+import tempfile
+
+import fixtures
+import mock
+
+from tempest.lib.common import http
+from tempest.lib.common import metrics
+from tempest.lib.common import rest_client
+from tempest.lib import exceptions
+from tempest.tests import base
+from tempest.tests.lib import fake_auth_provider
+from tempest.tests.lib import fake_http
+
+
+def _record(latency, service='compute', method='GET', url='servers/{id}',
+            status=200, bytes_in=10, bytes_out=0, retries=0):
+    return metrics.RequestRecord(service, method, url, status, latency,
+                                 bytes_in, bytes_out, retries)
+
+
+class TestNormalizeUrl(base.TestCase):
+
+    def test_ids_replaced(self):
+        self.assertEqual(
+            'servers/{id}/os-volume_attachments/{id}',
+            metrics.normalize_url(
+                'servers/893c7791-f1df-4c3d-8383-3caae9656c62/'
+                'os-volume_attachments/b2a4f3a6c7d84e0f9a1b2c3d4e5f6a7b'))
+
+    def test_query_removed(self):
+        self.assertEqual('v2.0/ports',
+                         metrics.normalize_url('v2.0/ports?fields=id'))
+
+    def test_integers_replaced(self):
+        self.assertEqual('flavors/{id}/os-extra_specs',
+                         metrics.normalize_url('flavors/42/os-extra_specs'))
+
+    def test_names_kept(self):
+        self.assertEqual('container/object',
+                         metrics.normalize_url('container/object'))
+
+
+class TestHistogram(base.TestCase):
+
+    def test_percentiles(self):
+        histogram = metrics.Histogram()
+        for i in range(1, 101):
+            histogram.add(i / 100.0)
+        self.assertEqual(100, histogram.count)
+        self.assertAlmostEqual(0.505, histogram.mean())
+        for percent, expected in ((50, 0.5), (95, 0.95), (99, 0.99)):
+            estimate = histogram.percentile(percent)
+            self.assertTrue(expected <= estimate <= expected *
+                            metrics.BUCKET_GROWTH,
+                            '%s not within 10%% of %s' % (estimate, expected))
+        self.assertEqual(1.0, histogram.percentile(100))
+
+    def test_empty(self):
+        histogram = metrics.Histogram()
+        self.assertIsNone(histogram.percentile(50))
+        self.assertIsNone(histogram.mean())
+
+    def test_merge(self):
+        first = metrics.Histogram()
+        second = metrics.Histogram()
+        first.add(0.1)
+        second.add(0.3)
+        second.add(0.2)
+        first.merge(second)
+        self.assertEqual(3, first.count)
+        self.assertEqual(0.1, first.min)
+        self.assertEqual(0.3, first.max)
+        self.assertEqual(sum(second.buckets.values()) + 1,
+                         sum(first.buckets.values()))
+
+
+class TestMetricsCollector(base.TestCase):
+
+    def setUp(self):
+        super(TestMetricsCollector, self).setUp()
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def _save(self, name, *records):
+        collector = metrics.MetricsCollector()
+        for record in records:
+            collector(record)
+        path = os.path.join(self.directory, name)
+        collector.save(path)
+        return path
+
+    def test_save_and_merge(self):
+        paths = [
+            self._save('worker-1.json', _record(0.1), _record(0.2),
+                       _record(0.5, method='DELETE', status=204)),
+            self._save('worker-2.json', _record(0.3, status=404, retries=1))]
+        stats = metrics.load_stats(paths)
+        self.assertEqual(2, len(stats))
+        show = stats[('compute', 'GET', 'servers/{id}')]
+        self.assertEqual(3, show.latency.count)
+        self.assertEqual({200: 2, 404: 1}, dict(show.statuses))
+        self.assertEqual(30, show.bytes_in)
+        self.assertEqual(1, show.retries)
+
+    def test_write_reports(self):
+        stats = metrics.load_stats([self._save(
+            'worker-1.json', _record(0.1), _record(0.2),
+            _record(0.5, method='DELETE', status=204))])
+        json_path = os.path.join(self.directory, 'report.json')
+        csv_path = os.path.join(self.directory, 'report.csv')
+        metrics.write_report(stats, json_path)
+        metrics.write_report(stats, csv_path)
+        with open(json_path) as f:
+            rows = json.load(f)
+        # The slowest endpoint comes first
+        self.assertEqual(['DELETE', 'GET'], [row['method'] for row in rows])
+        self.assertEqual(2, rows[1]['count'])
+        self.assertEqual('200:2', rows[1]['statuses'])
+        self.assertEqual(200.0, rows[1]['p99'])
+        with open(csv_path) as f:
+            reader = csv.DictReader(f)
+            csv_rows = list(reader)
+        self.assertEqual(list(metrics.REPORT_FIELDS), reader.fieldnames)
+        self.assertEqual('servers/{id}', csv_rows[1]['url'])
+
+    def test_setup_worker_collector(self):
+        self.patchobject(metrics, '_worker_collector', None)
+        self.patchobject(metrics, '_hooks', [])
+        atexit_register = self.patch('atexit.register')
+        self.assertIsNone(metrics.setup_worker_collector())
+        self.useFixture(fixtures.EnvironmentVariable(
+            metrics.METRICS_DIR_ENV, self.directory))
+        collector = metrics.setup_worker_collector()
+        self.assertIs(collector, metrics.setup_worker_collector())
+        self.assertTrue(metrics.has_hooks())
+        atexit_register.assert_called_once_with(
+            collector.save,
+            os.path.join(self.directory, 'worker-%d.json' % os.getpid()))
+
+
+class TestRestClientMetrics(base.TestCase):
+
+    def setUp(self):
+        super(TestRestClientMetrics, self).setUp()
+        self.rest_client = rest_client.RestClient(
+            fake_auth_provider.FakeAuthProvider(), 'compute', None)
+        self.records = []
+        metrics.register_hook(self.records.append)
+        self.addCleanup(metrics.unregister_hook, self.records.append)
+
+    def test_request_recorded(self):
+        self.patchobject(http.ClosingHttp, 'request',
+                         fake_http.fake_httplib2(return_type=200).request)
+        self.rest_client.post(
+            'servers/893c7791-f1df-4c3d-8383-3caae9656c62/action',
+            'fake_request')
+        self.assertEqual(1, len(self.records))
+        record = self.records[0]
+        self.assertEqual(('compute', 'POST', 'servers/{id}/action', 200),
+                         record[:4])
+        self.assertEqual(len('fake_request'), record.bytes_out)
+        self.assertEqual(len('fake_request'), record.bytes_in)
+        self.assertEqual(0, record.retries)
+        self.assertTrue(record.latency >= 0)
+
+    def test_error_recorded(self):
+        self.patchobject(http.ClosingHttp, 'request',
+                         fake_http.fake_httplib2(return_type=404).request)
+        self.assertRaises(exceptions.NotFound, self.rest_client.get,
+                          'servers/1')
+        self.assertEqual(404, self.records[0].status)
+
+    @mock.patch('time.sleep')
+    def test_retries_recorded(self, mock_sleep):
+        self.patchobject(self.rest_client, 'is_absolute_limit')
+        self.rest_client.is_absolute_limit.return_value = False
+        responses = [
+            (fake_http.fake_http_response({'retry-after': '1'}, status=413),
+             '{}'),
+            (fake_http.fake_http_response({}, status=200), '{}')]
+        mock_request = self.patchobject(http.ClosingHttp, 'request')
+        mock_request.side_effect = responses
+        self.rest_client.get('servers')
+        self.assertEqual(1, self.records[0].retries)
+        self.assertEqual(200, self.records[0].status)
@@ -0,0 +1,152 @@
+# Copyright 2016 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+
+import mock
+
+from tempest.lib.common import pagination
+from tempest.tests import base
+
+
+class TestNextPageParams(base.TestCase):
+
+    def test_resource_links(self):
+        body = {'servers': [{'id': '1'}],
+                'servers_links': [
+                    {'rel': 'next',
+                     'href': 'http://nova/v2.1/servers?limit=1&marker=1'}]}
+        self.assertEqual({'limit': '1', 'marker': '1'},
+                         pagination.next_page_params(body, 'servers'))
+
+    def test_resource_links_no_next(self):
+        body = {'servers': [{'id': '1'}],
+                'servers_links': [{'rel': 'self', 'href': 'http://nova/'}]}
+        self.assertIsNone(pagination.next_page_params(body, 'servers'))
+
+    def test_next(self):
+        body = {'images': [{'id': '1'}],
+                'next': '/v2/images?marker=1&limit=1'}
+        self.assertEqual({'limit': '1', 'marker': '1'},
+                         pagination.next_page_params(body, 'images'))
+
+    def test_links_dict(self):
+        body = {'users': [{'id': '1'}],
+                'links': {'self': 'http://keystone/v3/users',
+                          'next': 'http://keystone/v3/users?marker=1'}}
+        self.assertEqual({'marker': '1'},
+                         pagination.next_page_params(body, 'users'))
+
+    def test_links_dict_last_page(self):
+        body = {'users': [{'id': '1'}],
+                'links': {'self': 'http://keystone/v3/users', 'next': None}}
+        self.assertIsNone(pagination.next_page_params(body, 'users'))
+
+    def test_multiple_values(self):
+        body = {'networks': [{'id': '1'}],
+                'networks_links': [
+                    {'rel': 'next',
+                     'href': '/v2.0/networks?fields=id&fields=name&marker=1'}]}
+        self.assertEqual({'fields': ['id', 'name'], 'marker': '1'},
+                         pagination.next_page_params(body, 'networks'))
+
+    def test_no_links(self):
+        self.assertIsNone(pagination.next_page_params({'servers': []},
+                                                      'servers'))
+
+
+class TestPaginate(base.TestCase):
+
+    @staticmethod
+    def _page(ids, next_marker=None):
+        body = {'servers': [{'id': i} for i in ids]}
+        if next_marker:
+            body['servers_links'] = [
+                {'rel': 'next',
+                 'href': '/servers?limit=2&marker=%s' % next_marker}]
+        return body
+
+    def test_paginate(self):
+        list_page = mock.Mock(side_effect=[
+            self._page(['1', '2'], '2'), self._page(['3', '4'], '4'),
+            self._page(['5'])])
+        servers = pagination.paginate(list_page, 'servers', page_size=2,
+                                      name='fake')
+        self.assertEqual(['1', '2', '3', '4', '5'],
+                         [s['id'] for s in servers])
+        list_page.assert_has_calls([
+            mock.call(limit=2, name='fake'),
+            mock.call(limit='2', marker='2', name='fake'),
+            mock.call(limit='2', marker='4', name='fake')])
+
+    def test_paginate_lazy(self):
+        list_page = mock.Mock(side_effect=[
+            self._page(['1', '2'], '2'), self._page(['3'])])
+        servers = pagination.paginate(list_page, 'servers')
+        self.assertFalse(list_page.called)
+        self.assertEqual({'id': '1'}, next(servers))
+        self.assertEqual({'id': '2'}, next(servers))
+        self.assertEqual(1, list_page.call_count)
+        self.assertEqual({'id': '3'}, next(servers))
+        self.assertEqual(2, list_page.call_count)
+        list_page.assert_called_with(limit='2', marker='2')
+
+    def test_paginate_empty_page(self):
+        list_page = mock.Mock(return_value=self._page([], '2'))
+        self.assertEqual([], list(pagination.paginate(list_page, 'servers')))
+        self.assertEqual(1, list_page.call_count)
+
+    def test_paginate_same_page(self):
+        list_page = mock.Mock(return_value=self._page(['1', '2'], '2'))
+        servers = pagination.paginate(list_page, 'servers', limit='2',
+                                      marker='2')
+        self.assertEqual(2, len(list(servers)))
+        self.assertEqual(1, list_page.call_count)
+
+
+class TestPaginateListing(base.TestCase):
+
+    def test_paginate_listing(self):
+        list_page = mock.Mock(side_effect=[
+            [{'name': 'a'}, {'name': 'b'}], [{'name': 'c'}]])
+        items = pagination.paginate_listing(list_page, page_size=2,
+                                            prefix='p')
+        self.assertEqual(['a', 'b', 'c'], [i['name'] for i in items])
+        list_page.assert_has_calls([
+            mock.call(limit=2, format='json', prefix='p'),
+            mock.call(limit=2, format='json', prefix='p', marker='b')])
+
+    def test_paginate_listing_full_last_page(self):
+        list_page = mock.Mock(side_effect=[[{'name': 'a'}], []])
+        items = pagination.paginate_listing(list_page, page_size=1)
+        self.assertEqual([{'name': 'a'}], list(items))
+        self.assertEqual(2, list_page.call_count)
+
+    def test_paginate_listing_page_size_above_limit(self):
+        self.patchobject(pagination, 'LISTING_LIMIT', 2)
+        list_page = mock.Mock(side_effect=[
+            [{'name': 'a'}, {'name': 'b'}], [{'name': 'c'}]])
+        items = pagination.paginate_listing(list_page, page_size=5)
+        self.assertEqual(['a', 'b', 'c'], [i['name'] for i in items])
+        list_page.assert_has_calls([
+            mock.call(limit=2, format='json'),
+            mock.call(limit=2, format='json', marker='b')])
+
+    def test_paginate_listing_prefetch_error(self):
+        list_page = mock.Mock(side_effect=[[{'name': 'a'}],
+                                           ValueError('fake error')])
+        items = pagination.paginate_listing(list_page, page_size=1,
+                                            prefetch=True)
+        self.assertEqual({'name': 'a'}, next(items))
+        self.assertRaises(ValueError, next, items)
@@ -0,0 +1,150 @@
+# Copyright 2016 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+
+import mock
+
+from tempest.lib.common import rate_limiter
+from tempest.tests import base
+
+
+class TestRateLimiter(base.TestCase):
+
+    def setUp(self):
+        super(TestRateLimiter, self).setUp()
+        self.now = 1000.0
+        self.patch('time.time', side_effect=lambda: self.now)
+        self.sleep = self.patch('time.sleep')
+
+    def _reserve(self, limiter, count):
+        return [limiter.reserve() for __ in range(count)]
+
+    def test_invalid_rate(self):
+        self.assertRaises(ValueError, rate_limiter.RateLimiter, 0)
+
+    def test_burst(self):
+        limiter = rate_limiter.RateLimiter(10, burst=3)
+        self.assertEqual([0, 0, 0, 0.1, 0.2],
+                         [round(d, 6) for d in self._reserve(limiter, 5)])
+
+    def test_bucket_refills(self):
+        limiter = rate_limiter.RateLimiter(10, burst=2)
+        self._reserve(limiter, 2)
+        self.now += 1
+        self.assertEqual([0, 0], self._reserve(limiter, 2))
+
+    def test_acquire_sleeps(self):
+        limiter = rate_limiter.RateLimiter(2)
+        self.assertEqual(0, limiter.acquire())
+        self.assertFalse(self.sleep.called)
+        self.assertEqual(0.5, limiter.acquire())
+        self.sleep.assert_called_once_with(0.5)
+
+    def test_throttled(self):
+        limiter = rate_limiter.RateLimiter(10, burst=2)
+        limiter.throttled(3)
+        self.assertEqual(5, limiter.state.rate)
+        # Requests resume once the delay elapsed, at the reduced rate
+        self.assertEqual([3, 3.2, 3.4],
+                         [round(d, 6) for d in self._reserve(limiter, 3)])
+
+    def test_throttled_rate_floor(self):
+        limiter = rate_limiter.RateLimiter(10)
+        for __ in range(10):
+            limiter.throttled(1)
+        self.assertEqual(10 * rate_limiter.MIN_RATE, limiter.state.rate)
+
+    def test_succeeded_restores_rate(self):
+        limiter = rate_limiter.RateLimiter(10)
+        limiter.throttled(1)
+        limiter.succeeded()
+        self.assertEqual(5.5, limiter.state.rate)
+        for __ in range(10):
+            limiter.succeeded()
+        self.assertIsNone(limiter.state.rate)
+
+    def test_file_state_shared(self):
+        lock_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, lock_path)
+        limiter = rate_limiter.RateLimiter(
+            10, state=rate_limiter.FileState('compute', lock_path))
+        other = rate_limiter.RateLimiter(
+            10, state=rate_limiter.FileState('compute', lock_path))
+        self.assertEqual(0, limiter.reserve())
+        self.assertEqual(0.1, round(other.reserve(), 6))
+        other.throttled(2)
+        # The first limiter sees the delay and the rate set by the other one
+        self.assertEqual(2, round(limiter.reserve(), 6))
+        with open(os.path.join(lock_path, 'rate-limit-compute.json')) as f:
+            self.assertEqual(5, json.load(f)['rate'])
+
+    def test_file_state_threads(self):
+        lock_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, lock_path)
+        limiter = rate_limiter.RateLimiter(
+            10, state=rate_limiter.FileState('compute', lock_path))
+        errors = []
+
+        def reserve():
+            try:
+                self._reserve(limiter, 20)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=reserve) for __ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual([], errors)
+        # No reservation is lost: 100 slots of 0.1 s were reserved
+        with open(os.path.join(lock_path, 'rate-limit-compute.json')) as f:
+            self.assertEqual(1010, round(json.load(f)['tat'], 6))
+
+    def test_file_state_written_on_change(self):
+        lock_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, lock_path)
+        limiter = rate_limiter.RateLimiter(
+            10, state=rate_limiter.FileState('compute', lock_path))
+        limiter.reserve()
+        with mock.patch.object(rate_limiter.json, 'dump') as dump:
+            # The rate is not reduced, so there is nothing to raise back
+            limiter.succeeded()
+            self.assertFalse(dump.called)
+            limiter.reserve()
+            self.assertEqual(1, dump.call_count)
+
+    @mock.patch.object(rate_limiter, '_rate_limiters', {})
+    def test_get_rate_limiter(self):
+        limiter = rate_limiter.get_rate_limiter('compute', 10, burst=5)
+        self.assertIs(limiter,
+                      rate_limiter.get_rate_limiter('compute', 10, burst=5))
+        self.assertIsNot(limiter,
+                         rate_limiter.get_rate_limiter('network', 10, burst=5))
+        self.assertIsInstance(limiter.state, rate_limiter.LocalState)
+        self.assertEqual(5, limiter.burst)
+
+    @mock.patch.object(rate_limiter, '_rate_limiters', {})
+    def test_get_rate_limiter_lock_path(self):
+        limiter = rate_limiter.get_rate_limiter('compute', 10,
+                                                lock_path='/fake/path')
+        self.assertIsInstance(limiter.state, rate_limiter.FileState)
+        self.assertEqual('/fake/path', limiter.state.lock_path)
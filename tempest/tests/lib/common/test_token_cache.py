@@ -0,0 +1,75 @@
+# Copyright 2016 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+
+import os
+import shutil
+import stat
+import tempfile
+
+from tempest.lib.common import token_cache
+from tempest.tests import base
+
+
+class TestTokenCache(base.TestCase):
+
+    auth_data = ('token', {'token': {'expires': '2020-01-01T00:00:10Z'}})
+
+    def setUp(self):
+        super(TestTokenCache, self).setUp()
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, 'token_cache')
+        self.cache = token_cache.TokenCache(self.path)
+
+    def test_cache_key(self):
+        key = token_cache.cache_key('V3', 'http://auth', {'password': 'pass'})
+        self.assertEqual(
+            key, token_cache.cache_key('V3', 'http://auth',
+                                       {'password': 'pass'}))
+        self.assertNotEqual(
+            key, token_cache.cache_key('V3', 'http://auth',
+                                       {'password': 'other'}))
+        self.assertNotIn('pass', key)
+
+    def test_get_missing(self):
+        self.assertIsNone(self.cache.get('key'))
+
+    def test_set_get(self):
+        self.cache.set('key', self.auth_data)
+        self.assertEqual(self.auth_data, self.cache.get('key'))
+        # Another cache using the same directory sees the token
+        other = token_cache.TokenCache(self.path)
+        self.assertEqual(self.auth_data, other.get('key'))
+        self.assertIsNone(other.get('other_key'))
+
+    def test_set_private_file(self):
+        self.cache.set('key', self.auth_data)
+        mode = os.stat(os.path.join(self.path, 'token-key.json')).st_mode
+        self.assertEqual(0, mode & (stat.S_IRWXG | stat.S_IRWXO))
+
+    def test_invalidate(self):
+        self.cache.set('key', self.auth_data)
+        self.cache.invalidate('key', 'token')
+        self.assertIsNone(self.cache.get('key'))
+
+    def test_invalidate_replaced_token(self):
+        self.cache.set('key', ('new_token', self.auth_data[1]))
+        self.cache.invalidate('key', 'token')
+        self.assertEqual('new_token', self.cache.get('key')[0])
+
+    def test_invalidate_missing(self):
+        self.cache.invalidate('key', 'token')
+        self.assertFalse(os.path.exists(self.path))
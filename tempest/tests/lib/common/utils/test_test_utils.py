@@ -58,6 +58,28 @@ class TestTestUtils(base.TestCase):
         self.assertEqual('TestTestUtils:tearDownClass',
                          tearDownClass(self.__class__))
 
+    def test_get_test_caller_published(self):
+        with test_utils.test_caller('FakeTest:test_fake'):
+            with mock.patch.object(test_utils,
+                                   'find_test_caller') as mock_find:
+                self.assertEqual('FakeTest:test_fake',
+                                 test_utils.get_test_caller())
+                self.assertFalse(mock_find.called)
+
+    def test_get_test_caller_fallback(self):
+        self.assertEqual('TestTestUtils:test_get_test_caller_fallback',
+                         test_utils.get_test_caller())
+
+    def test_test_caller_restores_previous(self):
+        with test_utils.test_caller('FakeTest:setUpClass'):
+            with test_utils.test_caller('FakeTest:tearDownClass'):
+                self.assertEqual('FakeTest:tearDownClass',
+                                 test_utils.get_test_caller())
+            self.assertEqual('FakeTest:setUpClass',
+                             test_utils.get_test_caller())
+        self.assertEqual('TestTestUtils:test_test_caller_restores_previous',
+                         test_utils.get_test_caller())
+
     def test_call_and_ignore_notfound_exc_when_notfound_raised(self):
         def raise_not_found():
             raise exceptions.NotFound()
@@ -27,6 +27,9 @@ class FakeAuthProvider(object):
     def base_url(self, filters, auth_data=None):
         return self.fake_base_url or "https://example.com"
 
+    def invalidate_token(self, token):
+        pass
+
 
 class FakeCredentials(object):
 
@@ -0,0 +1,50 @@
+# Copyright 2016 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from oslotest import mockpatch
+import six
+
+from tempest.tests.lib.services import base
+
+if six.PY3:
+    import asyncio
+
+
+class BaseAsyncServiceTest(base.BaseServiceTest):
+    """Base class of the tests of async service clients
+
+    The response is returned by the http object, so the request goes
+    through the whole AsyncRestClient.
+    """
+
+    def setUp(self):
+        if six.PY2:
+            self.skipTest('The async clients require Python 3')
+        super(BaseAsyncServiceTest, self).setUp()
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.addCleanup(asyncio.set_event_loop, None)
+        self.addCleanup(self.loop.close)
+
+    def check_async_service_client_function(self, function, body,
+                                            to_utf=False, status=200,
+                                            headers=None, **kwargs):
+        mocked_response = self.create_response(body, to_utf, status, headers)
+        request = self.useFixture(mockpatch.Patch(
+            'tempest.lib.common.http.ClosingHttp.request',
+            return_value=mocked_response)).mock
+        resp = self.loop.run_until_complete(function(**kwargs))
+        self.assertEqual(body, resp)
+        return request
@@ -0,0 +1,106 @@
+# Copyright 2016 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+
+import six
+
+from tempest.lib import exceptions as lib_exc
+from tempest.tests.lib import fake_auth_provider
+from tempest.tests.lib.services import async_base
+from tempest.tests.lib.services.compute import test_servers_client
+
+if six.PY3:
+    from tempest.lib.services.compute import async_servers_client
+
+
+class TestAsyncServersClient(async_base.BaseAsyncServiceTest):
+
+    FAKE_SERVERS = test_servers_client.TestServersClient.FAKE_SERVERS
+    FAKE_SERVER_GET = test_servers_client.TestServersClient.FAKE_SERVER_GET
+    FAKE_SERVER_POST = test_servers_client.TestServersClient.FAKE_SERVER_POST
+    server_id = test_servers_client.TestServersClient.server_id
+
+    def setUp(self):
+        super(TestAsyncServersClient, self).setUp()
+        fake_auth = fake_auth_provider.FakeAuthProvider()
+        self.client = async_servers_client.AsyncServersClient(
+            fake_auth, 'compute', 'regionOne')
+
+    def test_list_servers_with_str_body(self):
+        self._test_list_servers()
+
+    def test_list_servers_with_bytes_body(self):
+        self._test_list_servers(bytes_body=True)
+
+    def _test_list_servers(self, bytes_body=False):
+        request = self.check_async_service_client_function(
+            self.client.list_servers,
+            self.FAKE_SERVERS,
+            bytes_body,
+            name='fake-name')
+        self.assertEqual('servers?name=fake-name', request.call_args[0][0])
+
+    def test_show_server(self):
+        self.check_async_service_client_function(
+            self.client.show_server,
+            self.FAKE_SERVER_GET,
+            server_id=self.server_id)
+
+    def test_delete_server(self):
+        self.check_async_service_client_function(
+            self.client.delete_server,
+            {},
+            status=204,
+            server_id=self.server_id)
+
+    def test_create_server(self):
+        self.check_async_service_client_function(
+            self.client.create_server,
+            self.FAKE_SERVER_POST,
+            status=202,
+            name='fake-name',
+            imageRef='fake-image-ref',
+            flavorRef='fake-flavor-ref')
+
+    def test_create_server_with_hints(self):
+        request = self.check_async_service_client_function(
+            self.client.create_server,
+            self.FAKE_SERVER_POST,
+            status=202,
+            name='fake-name',
+            disk_config='AUTO',
+            scheduler_hints={'group': 'fake-group'})
+        self.assertEqual(
+            {'server': {'name': 'fake-name', 'OS-DCF:diskConfig': 'AUTO'},
+             'os:scheduler_hints': {'group': 'fake-group'}},
+            json.loads(request.call_args[1]['body']))
+
+    def test_is_resource_deleted(self):
+        self.check_async_service_client_function(
+            self.client.show_server,
+            self.FAKE_SERVER_GET,
+            server_id=self.server_id)
+        self.assertFalse(self.loop.run_until_complete(
+            self.client.is_resource_deleted(self.server_id)))
+
+    def test_show_server_not_found(self):
+        self.assertRaises(
+            lib_exc.NotFound,
+            self.check_async_service_client_function,
+            self.client.show_server, {'itemNotFound': {}}, status=404,
+            server_id=self.server_id)
+        self.assertTrue(self.loop.run_until_complete(
+            self.client.is_resource_deleted(self.server_id)))
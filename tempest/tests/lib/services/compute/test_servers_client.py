@@ -14,6 +14,9 @@
 
 import copy
 
+from oslotest import mockpatch
+from six.moves.urllib import parse as urlparse
+
 from tempest.lib.services.compute import servers_client
 from tempest.tests.lib import fake_auth_provider
 from tempest.tests.lib.services import base
@@ -200,6 +203,26 @@ class TestServersClient(base.BaseServiceTest):
             self.FAKE_SERVERS,
             bytes_body)
 
+    def test_iter_servers(self):
+        server = self.FAKE_SERVERS['servers'][0]
+        first_page = {
+            'servers': [server],
+            'servers_links': [{
+                'href': 'http://os.co/v2/servers?limit=1&marker=%s' %
+                        server['id'],
+                'rel': 'next'}]}
+        get = self.useFixture(mockpatch.Patch(
+            'tempest.lib.common.rest_client.RestClient.get',
+            side_effect=[self.create_response(first_page),
+                         self.create_response(self.FAKE_SERVERS)])).mock
+        servers = list(self.client.iter_servers(detail=False, page_size=1))
+        self.assertEqual([server, server], servers)
+        queries = [urlparse.parse_qs(urlparse.urlparse(args[0]).query)
+                   for args, kwargs in get.call_args_list]
+        self.assertEqual([{'limit': ['1']},
+                          {'limit': ['1'], 'marker': [server['id']]}],
+                         queries)
+
     def test_show_server_with_str_body(self):
         self._test_show_server()
 
@@ -12,6 +12,9 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import mock
+
+from tempest.lib.common import http
 from tempest.lib.services.image.v2 import images_client
 from tempest.tests.lib import fake_auth_provider
 from tempest.tests.lib.services import base
@@ -109,3 +112,17 @@ class TestImagesClient(base.BaseServiceTest):
 
     def test_show_image_with_bytes_body(self):
         self._test_show_image(bytes_body=True)
+
+    def test_show_image_file_stream(self):
+        stream = http.ResponseStream(mock.Mock())
+        fake_resp = mock.Mock(status=200)
+        with mock.patch('tempest.lib.common.rest_client.RestClient.get',
+                        return_value=(fake_resp, stream)) as mock_get:
+            resp = self.client.show_image_file(
+                "e485aab9-0907-4973-921c-bb6da8a8fcf8", stream=True,
+                chunk_size=1024)
+        mock_get.assert_called_once_with(
+            'images/e485aab9-0907-4973-921c-bb6da8a8fcf8/file', stream=True,
+            chunk_size=1024)
+        self.assertIs(stream, resp.data)
+        self.assertIs(fake_resp, resp.response)
@@ -0,0 +1,76 @@
+# Copyright 2016 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import six
+
+from tempest.tests.lib import fake_auth_provider
+from tempest.tests.lib.services import async_base
+
+if six.PY3:
+    from tempest.lib.services.network import async_ports_client
+
+
+class TestAsyncPortsClient(async_base.BaseAsyncServiceTest):
+
+    FAKE_PORT_ID = "d9e1e3d5-d8bf-4a3f-85e0-cc3d80a1d457"
+
+    FAKE_PORT = {
+        "port": {
+            "id": FAKE_PORT_ID,
+            "network_id": "4e8e5957-649f-477b-9e5b-f1f75b21c03c",
+            "status": "ACTIVE",
+            "admin_state_up": True
+        }
+    }
+
+    FAKE_PORTS = {"ports": [FAKE_PORT["port"]]}
+
+    def setUp(self):
+        super(TestAsyncPortsClient, self).setUp()
+        fake_auth = fake_auth_provider.FakeAuthProvider()
+        self.client = async_ports_client.AsyncPortsClient(
+            fake_auth, 'network', 'regionOne')
+
+    def test_list_ports(self):
+        request = self.check_async_service_client_function(
+            self.client.list_ports,
+            self.FAKE_PORTS,
+            device_owner='network:dhcp')
+        self.assertEqual('v2.0/ports?device_owner=network%3Adhcp',
+                         request.call_args[0][0])
+
+    def test_show_port_with_fields(self):
+        request = self.check_async_service_client_function(
+            self.client.show_port,
+            self.FAKE_PORT,
+            port_id=self.FAKE_PORT_ID,
+            fields=['id', 'status'])
+        self.assertEqual('v2.0/ports/%s?fields=id&fields=status'
+                         % self.FAKE_PORT_ID, request.call_args[0][0])
+
+    def test_create_port(self):
+        request = self.check_async_service_client_function(
+            self.client.create_port,
+            self.FAKE_PORT,
+            status=201,
+            network_id=self.FAKE_PORT["port"]["network_id"])
+        self.assertEqual('POST', request.call_args[0][1])
+
+    def test_delete_port(self):
+        self.check_async_service_client_function(
+            self.client.delete_port,
+            {},
+            status=204,
+            port_id=self.FAKE_PORT_ID)
@@ -0,0 +1,135 @@
+# Copyright 2016 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+
+import threading
+
+import mock
+from oslo_serialization import jsonutils as json
+
+from tempest.lib import exceptions as lib_exc
+from tempest.lib.services.network import base as network_base
+from tempest.lib.services.network import networks_client
+from tempest.lib.services.network import security_group_rules_client
+from tempest.tests.lib import fake_auth_provider
+from tempest.tests.lib import fake_http
+from tempest.tests.lib.services import base
+
+
+class TestBaseNetworkClientBulk(base.BaseServiceTest):
+
+    def setUp(self):
+        super(TestBaseNetworkClientBulk, self).setUp()
+        fake_auth = fake_auth_provider.FakeAuthProvider()
+        self.client = networks_client.NetworksClient(fake_auth, 'network',
+                                                     'regionOne')
+        self.networks = [{'name': 'net%d' % i} for i in range(3)]
+        self.deleted = []
+        self.lock = threading.Lock()
+
+    def _post(self, bulk_error=None, fail_name=None):
+        def post(uri, body):
+            body = json.loads(body)
+            if 'networks' in body:
+                if bulk_error:
+                    raise bulk_error
+                created = [dict(n, id=n['name'] + '-id')
+                           for n in body['networks']]
+                return self.create_response({'networks': created},
+                                            status=201)
+            network = body['network']
+            if network['name'] == fail_name:
+                raise lib_exc.Conflict()
+            return self.create_response(
+                {'network': dict(network, id=network['name'] + '-id')},
+                status=201)
+        return self.patchobject(self.client, 'post',
+                                mock.Mock(side_effect=post))
+
+    def _delete(self, missing=()):
+        def delete(uri):
+            resource_id = uri.split('/')[-1]
+            if resource_id in missing:
+                raise lib_exc.NotFound()
+            with self.lock:
+                self.deleted.append(resource_id)
+            return fake_http.fake_http_response({}, status=204), ''
+        return self.patchobject(self.client, 'delete',
+                                mock.Mock(side_effect=delete))
+
+    def test_create_bulk(self):
+        post = self._post()
+        body = self.client.create_bulk_networks(networks=self.networks)
+        self.assertEqual(['net0-id', 'net1-id', 'net2-id'],
+                         [n['id'] for n in body['networks']])
+        post.assert_called_once_with(
+            'v2.0/networks', json.dumps({'networks': self.networks}))
+
+    def test_create_bulk_not_allowed(self):
+        post = self._post(bulk_error=lib_exc.BadRequest(
+            'Bulk operation not allowed'))
+        body = self.client.create_bulk_networks(networks=self.networks)
+        self.assertEqual(['net0-id', 'net1-id', 'net2-id'],
+                         [n['id'] for n in body['networks']])
+        self.assertEqual(201, body.response.status)
+        self.assertEqual(4, post.call_count)
+
+    def test_create_bulk_bad_request(self):
+        post = self._post(bulk_error=lib_exc.BadRequest('Invalid input'))
+        self.assertRaises(lib_exc.BadRequest,
+                          self.client.create_bulk_networks,
+                          networks=self.networks)
+        self.assertEqual(1, post.call_count)
+
+    def test_create_without_bulk(self):
+        post = self._post()
+        body = self.client.create_bulk_networks(bulk=False,
+                                                networks=self.networks)
+        self.assertEqual(['net0-id', 'net1-id', 'net2-id'],
+                         [n['id'] for n in body['networks']])
+        self.assertEqual(3, post.call_count)
+        self.assertNotIn('networks', post.call_args[0][1])
+
+    def test_create_without_bulk_failure(self):
+        self._post(fail_name='net1')
+        self._delete()
+        self.assertRaises(lib_exc.Conflict,
+                          self.client.create_bulk_networks, bulk=False,
+                          networks=self.networks)
+        # The networks created are deleted
+        self.assertEqual(['net0-id', 'net2-id'], sorted(self.deleted))
+
+    def test_delete_bulk(self):
+        self._delete(missing=['net1-id'])
+        outcomes = self.client.delete_bulk_networks(
+            ['net0-id', 'net1-id', 'net2-id'])
+        self.assertIsNone(outcomes['net0-id'])
+        self.assertIsInstance(outcomes['net1-id'], lib_exc.NotFound)
+        self.assertIsNone(outcomes['net2-id'])
+        self.assertEqual(['net0-id', 'net2-id'], sorted(self.deleted))
+
+    def test_map_concurrently_empty(self):
+        self.assertEqual(
+            [], network_base.BaseNetworkClient._map_concurrently(len, []))
+
+    def test_create_bulk_security_group_rules(self):
+        client = security_group_rules_client.SecurityGroupRulesClient(
+            fake_auth_provider.FakeAuthProvider(), 'network', 'regionOne')
+        rules = [{'direction': 'ingress'}, {'direction': 'egress'}]
+        self.check_service_client_function(
+            client.create_bulk_security_group_rules,
+            'tempest.lib.common.rest_client.RestClient.post',
+            {'security_group_rules': rules}, status=201,
+            security_group_rules=rules)
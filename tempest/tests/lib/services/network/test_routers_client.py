@@ -12,6 +12,9 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from oslotest import mockpatch
+from six.moves.urllib import parse as urlparse
+
 from tempest.lib.services.network import routers_client
 from tempest.tests.lib import fake_auth_provider
 from tempest.tests.lib.services import base
@@ -90,6 +93,45 @@ class TestRoutersClient(base.BaseServiceTest):
     def test_list_routers_with_bytes_body(self):
         self._test_list_routers(bytes_body=True)
 
+    def test_iter_routers(self):
+        router = self.FAKE_CREATE_ROUTER['router']
+        first_page = {
+            'routers': [router],
+            'routers_links': [{
+                'href': 'http://neutron/v2.0/routers?limit=1&marker=%s' %
+                        router['id'],
+                'rel': 'next'}]}
+        get = self.useFixture(mockpatch.Patch(
+            'tempest.lib.common.rest_client.RestClient.get',
+            side_effect=[self.create_response(first_page),
+                         self.create_response({'routers': []})])).mock
+        routers = self.client.iter_routers(page_size=1, name='router1')
+        self.assertEqual([router], list(routers))
+        queries = [urlparse.parse_qs(urlparse.urlparse(args[0]).query)
+                   for args, kwargs in get.call_args_list]
+        self.assertEqual(
+            [{'limit': ['1'], 'name': ['router1']},
+             {'limit': ['1'], 'marker': [router['id']], 'name': ['router1']}],
+            queries)
+        self.assertTrue(get.call_args[0][0].startswith('v2.0/routers?'))
+
+    def test_list_routers_with_fields(self):
+        get = self.useFixture(mockpatch.Patch(
+            'tempest.lib.common.rest_client.RestClient.get',
+            return_value=self.create_response({'routers': []}))).mock
+        self.client.list_routers(fields=['id', 'name'], tenant_id='t1')
+        query = urlparse.parse_qs(urlparse.urlparse(get.call_args[0][0]).query)
+        self.assertEqual({'fields': ['id', 'name'], 'tenant_id': ['t1']},
+                         query)
+
+    def test_iter_routers_with_fields(self):
+        get = self.useFixture(mockpatch.Patch(
+            'tempest.lib.common.rest_client.RestClient.get',
+            return_value=self.create_response({'routers': []}))).mock
+        self.assertEqual([], list(self.client.iter_routers(fields='id')))
+        query = urlparse.parse_qs(urlparse.urlparse(get.call_args[0][0]).query)
+        self.assertEqual({'fields': ['id']}, query)
+
     def test_create_router_with_str_body(self):
         self._test_create_router()
 
@@ -15,11 +15,15 @@
 
 import copy
 import datetime
-import testtools
+import threading
+import time
 
+import mock
 from oslotest import mockpatch
+import testtools
 
 from tempest.lib import auth
+from tempest.lib.common import token_cache
 from tempest.lib import exceptions
 from tempest.lib.services.identity.v2 import token_client as v2_client
 from tempest.lib.services.identity.v3 import token_client as v3_client
@@ -114,6 +118,7 @@ class TestBaseAuthProvider(BaseAuthTestsSetUp):
 
 class TestKeystoneV2AuthProvider(BaseAuthTestsSetUp):
     _endpoints = fake_identity.IDENTITY_V2_RESPONSE['access']['serviceCatalog']
+    _catalog_key = 'serviceCatalog'
     _auth_provider_class = auth.KeystoneV2AuthProvider
     credentials = fake_credentials.FakeKeystoneV2Credentials()
 
@@ -458,6 +463,204 @@ class TestKeystoneV2AuthProvider(BaseAuthTestsSetUp):
         expected = 'http://fake_url/v2.0'
         self._test_base_url_helper(expected, filters, ('token', auth_data))
 
+    def test_base_url_endpoint_index_reused(self):
+        self.filters = {
+            'service': 'compute',
+            'endpoint_type': 'publicURL',
+            'region': 'FakeRegion'
+        }
+        auth_data = self.auth_provider.auth_data
+        find_base_url = self.auth_provider._find_base_url
+        with mock.patch.object(self.auth_provider, '_find_base_url',
+                               side_effect=find_base_url) as mock_find:
+            url = self.auth_provider.base_url(self.filters, auth_data)
+            self.assertEqual(url, self.auth_provider.base_url(self.filters,
+                                                              auth_data))
+            # URL filters are applied to the indexed base URL
+            self.filters['skip_path'] = True
+            self.assertEqual('http://fake_url/',
+                             self.auth_provider.base_url(self.filters,
+                                                         auth_data))
+        self.assertEqual(1, mock_find.call_count)
+
+    def test_base_url_endpoint_index_reset_with_auth_data(self):
+        self.filters = {
+            'service': 'compute',
+            'endpoint_type': 'publicURL',
+            'region': 'FakeRegion'
+        }
+        token, auth_data = self.auth_provider.auth_data
+        self.auth_provider.base_url(self.filters, (token, auth_data))
+        # New auth data without compute in the catalog
+        new_auth_data = copy.deepcopy(auth_data)
+        new_auth_data[self._catalog_key] = [
+            ep for ep in new_auth_data[self._catalog_key]
+            if ep['type'] != 'compute']
+        self.assertRaises(exceptions.EndpointNotFound,
+                          self.auth_provider.base_url, self.filters,
+                          auth_data=(token, new_auth_data))
+
+    def _auth_provider_with_token_cache(self):
+        cache = mock.Mock(spec=token_cache.TokenCache)
+        cache.get.return_value = None
+        is_expired = self.patchobject(self._auth_provider_class,
+                                      'is_expired')
+        is_expired.return_value = False
+        return self._auth(self.credentials, fake_identity.FAKE_AUTH_URL,
+                          token_cache=cache)
+
+    def test_token_cache_miss(self):
+        auth_provider = self._auth_provider_with_token_cache()
+        auth_data = auth_provider.get_auth()
+        self.assertEqual(self._get_token_from_fake_identity(), auth_data[0])
+        key = auth_provider._get_token_cache_key()
+        auth_provider.token_cache.get.assert_called_once_with(key)
+        auth_provider.token_cache.set.assert_called_once_with(key, auth_data)
+        # The token is kept until it expires
+        auth_provider.get_auth()
+        self.assertEqual(1, auth_provider.token_cache.get.call_count)
+
+    def test_token_cache_hit(self):
+        auth_provider = self._auth_provider_with_token_cache()
+        cached = ('cached_token', copy.deepcopy(self._get_fake_identity()))
+        auth_provider.token_cache.get.return_value = cached
+        with mock.patch.object(auth_provider, '_get_auth') as mock_get_auth:
+            self.assertEqual(cached, auth_provider.get_auth())
+        self.assertFalse(mock_get_auth.called)
+        self.assertFalse(auth_provider.token_cache.set.called)
+
+    def test_token_cache_key(self):
+        auth_provider = self._auth_provider_with_token_cache()
+        other = self._auth(self.credentials, fake_identity.FAKE_AUTH_URL)
+        key = auth_provider._get_token_cache_key()
+        self.assertEqual(key, other._get_token_cache_key())
+        auth_provider.get_auth()
+        # Filling the credentials from the auth data keeps the key
+        self.assertEqual(key, auth_provider._get_token_cache_key())
+        other.auth_url = 'http://other_auth_url'
+        other.clear_auth()
+        self.assertNotEqual(key, other._get_token_cache_key())
+
+    def test_invalidate_token(self):
+        auth_provider = self._auth_provider_with_token_cache()
+        token = auth_provider.get_auth()[0]
+        auth_provider.invalidate_token(token)
+        auth_provider.token_cache.invalidate.assert_called_once_with(
+            auth_provider._get_token_cache_key(), token)
+        self.assertIsNone(auth_provider.cache)
+
+    def test_invalidate_other_token(self):
+        auth_provider = self._auth_provider_with_token_cache()
+        auth_data = auth_provider.get_auth()
+        auth_provider.invalidate_token('other_token')
+        self.assertEqual(auth_data, auth_provider.cache)
+
+    def test_invalidate_token_without_token_cache(self):
+        auth_data = self.auth_provider.get_auth()
+        self.auth_provider.invalidate_token(auth_data[0])
+        self.assertEqual(auth_data, self.auth_provider.cache)
+
+    def _auth_data_expiring_in(self, seconds):
+        expiry = (datetime.datetime.utcnow() +
+                  datetime.timedelta(seconds=seconds))
+        return self._auth_data_with_expiry(
+            expiry.strftime(self.auth_provider.EXPIRY_DATE_FORMATS[0]))
+
+    def test_get_auth_single_flight(self):
+        is_expired = self.patchobject(self._auth_provider_class, 'is_expired')
+        is_expired.return_value = False
+        auth_data = ('token', copy.deepcopy(self._get_fake_identity()))
+        requested = []
+
+        def get_auth():
+            requested.append(auth_data)
+            time.sleep(0.1)
+            return auth_data
+
+        self.patchobject(self.auth_provider, '_get_auth', get_auth)
+        threads = [threading.Thread(target=self.auth_provider.get_auth)
+                   for __ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(1, len(requested))
+        self.assertIs(auth_data, self.auth_provider.cache)
+
+    def test_refresh_token_not_due(self):
+        self._auth_data_expiring_in(3600)
+        with mock.patch.object(self.auth_provider, 'set_auth') as set_auth:
+            delay = self.auth_provider._refresh_token(
+                datetime.timedelta(seconds=60))
+        self.assertGreater(delay, 3400)
+        self.assertFalse(set_auth.called)
+
+    def test_refresh_token_due(self):
+        # Expires within the default threshold and the margin
+        self._auth_data_expiring_in(100)
+        with mock.patch.object(self.auth_provider, 'set_auth') as set_auth:
+            delay = self.auth_provider._refresh_token(
+                datetime.timedelta(seconds=60))
+        self.assertEqual(1, delay)
+        set_auth.assert_called_once_with()
+
+    def test_refresh_token_failure(self):
+        self._auth_data_expiring_in(100)
+        with mock.patch.object(self.auth_provider, 'set_auth',
+                               side_effect=exceptions.IdentityError):
+            delay = self.auth_provider._refresh_token(
+                datetime.timedelta(seconds=60))
+        self.assertEqual(auth.REFRESH_RETRY_INTERVAL, delay)
+
+    def test_refresh_token_without_token(self):
+        self.assertIsNone(self.auth_provider.cache)
+        self.assertEqual(auth.REFRESH_RETRY_INTERVAL,
+                         self.auth_provider._refresh_token(
+                             datetime.timedelta(seconds=60)))
+
+    def test_start_stop_refresher(self):
+        refreshed = threading.Event()
+
+        def refresh_token(margin):
+            self.assertEqual(self.auth_provider.token_expiry_threshold,
+                             margin)
+            refreshed.set()
+            return 60
+
+        self.patchobject(self.auth_provider, '_refresh_token', refresh_token)
+        self.auth_provider.start_refresher()
+        self.addCleanup(self.auth_provider.stop_refresher)
+        self.assertTrue(refreshed.wait(5))
+        self.assertTrue(auth._token_refresher.is_refreshing(
+            self.auth_provider))
+        self.auth_provider.stop_refresher()
+        self.assertFalse(auth._token_refresher.is_refreshing(
+            self.auth_provider))
+
+    def test_refresher_thread_shared(self):
+        refreshed = []
+        both_refreshed = threading.Event()
+
+        def refresh_token(auth_provider):
+            def _refresh_token(margin):
+                refreshed.append(auth_provider)
+                if len(set(refreshed)) == 2:
+                    both_refreshed.set()
+                return 60
+            return _refresh_token
+
+        other_provider = self._auth(self.credentials,
+                                    fake_identity.FAKE_AUTH_URL)
+        for auth_provider in (self.auth_provider, other_provider):
+            self.patchobject(auth_provider, '_refresh_token',
+                             refresh_token(auth_provider))
+            auth_provider.start_refresher()
+            self.addCleanup(auth_provider.stop_refresher)
+        self.assertTrue(both_refreshed.wait(5))
+        threads = [thread for thread in threading.enumerate()
+                   if thread.name == 'token-refresher']
+        self.assertEqual(1, len(threads))
+
     def test_token_not_expired(self):
         expiry_data = datetime.datetime.utcnow() + datetime.timedelta(days=1)
         self._verify_expiry(expiry_data=expiry_data, should_be_expired=False)
@@ -478,6 +681,22 @@ class TestKeystoneV2AuthProvider(BaseAuthTestsSetUp):
             self.assertEqual(self.auth_provider.is_expired(auth_data),
                              should_be_expired)
 
+    def test_expiry_parsed_once(self):
+        expiry_data = datetime.datetime.utcnow() + datetime.timedelta(days=1)
+        auth_data = self._auth_data_with_expiry(
+            expiry_data.strftime(self.auth_provider.EXPIRY_DATE_FORMATS[0]))
+        with mock.patch.object(auth, 'datetime', wraps=datetime) as dt:
+            for __ in range(3):
+                self.assertFalse(self.auth_provider.is_expired(auth_data))
+        self.assertEqual(1, dt.datetime.strptime.call_count)
+
+    def test_set_auth_parses_expiry(self):
+        self.auth_provider.set_auth()
+        expires = self.auth_provider._get_expiry(self.auth_provider.cache)
+        self.assertEqual(expires, self.auth_provider._parsed_expiry[1])
+        self.assertIs(self.auth_provider.cache[1],
+                      self.auth_provider._endpoint_index[0])
+
     def test_set_scope_all_valid(self):
         for scope in self.auth_provider.SCOPES:
             self.auth_provider.scope = scope
@@ -491,6 +710,7 @@ class TestKeystoneV2AuthProvider(BaseAuthTestsSetUp):
 
 class TestKeystoneV3AuthProvider(TestKeystoneV2AuthProvider):
     _endpoints = fake_identity.IDENTITY_V3_RESPONSE['token']['catalog']
+    _catalog_key = 'catalog'
     _auth_provider_class = auth.KeystoneV3AuthProvider
     credentials = fake_credentials.FakeKeystoneV3Credentials()
 
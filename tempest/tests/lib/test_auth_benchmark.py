@@ -0,0 +1,137 @@
+# Copyright 2016 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+
+"""Tests of the overhead of authenticating a request
+
+auth_request runs before every request sent by the REST clients. These
+tests check, with a valid token and a catalog the size of a large
+multi-region cloud, that it neither parses the token expiry nor searches the
+catalog on every call. tools/bench_auth_request.py measures its overhead.
+"""
+
+import copy
+import datetime
+
+import mock
+from oslo_serialization import jsonutils as json
+
+from tempest.lib import auth
+from tempest.lib.services.identity.v2 import token_client as v2_client
+from tempest.lib.services.identity.v3 import token_client as v3_client
+from tempest.tests import base
+from tempest.tests.lib import fake_credentials
+from tempest.tests.lib import fake_http
+from tempest.tests.lib import fake_identity
+
+SERVICES = 40
+REGIONS = 10
+
+
+def _expiry(date_format):
+    expiry = datetime.datetime.utcnow() + datetime.timedelta(days=1)
+    return expiry.strftime(date_format)
+
+
+def _catalog_v2():
+    return [{'type': 'service%d' % s, 'name': 'service%d' % s,
+             'endpoints': [
+                 dict(region='region%d' % r,
+                      **dict(('%sURL' % i, 'http://s%d.r%d/%s/v2' % (s, r, i))
+                             for i in ('public', 'internal', 'admin')))
+                 for r in range(REGIONS)]}
+            for s in range(SERVICES)]
+
+
+def _catalog_v3():
+    return [{'type': 'service%d' % s, 'name': 'service%d' % s,
+             'endpoints': [
+                 {'region': 'region%d' % r, 'interface': i,
+                  'url': 'http://s%d.r%d/%s/v3' % (s, r, i)}
+                 for r in range(REGIONS)
+                 for i in ('public', 'internal', 'admin')]}
+            for s in range(SERVICES)]
+
+
+class AuthRequestBenchmarkMixin(object):
+
+    _auth_provider_class = None
+    credentials = None
+    # The last service and region of the catalog are the slowest to find
+    filters = {'service': 'service%d' % (SERVICES - 1),
+               'region': 'region%d' % (REGIONS - 1),
+               'endpoint_type': 'internalURL'}
+
+    def setUp(self):
+        super(AuthRequestBenchmarkMixin, self).setUp()
+        self.auth_provider = self._auth_provider_class(
+            self.credentials, fake_identity.FAKE_AUTH_URL)
+        self.auth_provider.set_auth()
+
+    def _auth_request(self):
+        return self.auth_provider.auth_request(
+            'GET', 'resources/id', headers={}, filters=self.filters)
+
+    def test_auth_request_reuses_auth_data(self):
+        url, headers, body = self._auth_request()
+        self.assertIn('s%d.r%d/internal' % (SERVICES - 1, REGIONS - 1), url)
+        with mock.patch.object(auth, 'datetime', wraps=datetime) as dt, \
+                mock.patch.object(self.auth_provider, '_find_base_url',
+                                  wraps=self.auth_provider._find_base_url
+                                  ) as find_base_url:
+            for __ in range(10):
+                self._auth_request()
+        self.assertFalse(dt.datetime.strptime.called)
+        self.assertFalse(find_base_url.called)
+
+
+class TestKeystoneV2AuthRequestBenchmark(AuthRequestBenchmarkMixin,
+                                         base.TestCase):
+
+    _auth_provider_class = auth.KeystoneV2AuthProvider
+    credentials = fake_credentials.FakeKeystoneV2Credentials()
+
+    def setUp(self):
+        response = copy.deepcopy(fake_identity.IDENTITY_V2_RESPONSE)
+        response['access']['token']['expires'] = _expiry(
+            auth.ISO8601_INT_SECONDS)
+        response['access']['serviceCatalog'] = _catalog_v2()
+
+        def raw_request(*args, **kwargs):
+            return (fake_http.fake_http_response({}, status=200),
+                    json.dumps(response))
+
+        self.patchobject(v2_client.TokenClient, 'raw_request', raw_request)
+        super(TestKeystoneV2AuthRequestBenchmark, self).setUp()
+
+
+class TestKeystoneV3AuthRequestBenchmark(AuthRequestBenchmarkMixin,
+                                         base.TestCase):
+
+    _auth_provider_class = auth.KeystoneV3AuthProvider
+    credentials = fake_credentials.FakeKeystoneV3Credentials()
+
+    def setUp(self):
+        response = copy.deepcopy(fake_identity.IDENTITY_V3_RESPONSE)
+        response['token']['expires_at'] = _expiry(auth.ISO8601_FLOAT_SECONDS)
+        response['token']['catalog'] = _catalog_v3()
+
+        def raw_request(*args, **kwargs):
+            return (fake_http.fake_http_response(
+                {'x-subject-token': fake_identity.TOKEN}, status=201),
+                json.dumps(response))
+
+        self.patchobject(v3_client.V3TokenClient, 'raw_request', raw_request)
+        super(TestKeystoneV3AuthRequestBenchmark, self).setUp()
@@ -13,13 +13,18 @@
 #    under the License.
 
 import copy
+import importlib
 import json
+import os
+import pkgutil
 
 import jsonschema
 from oslotest import mockpatch
 import six
 
+from tempest.lib.api_schema import response
 from tempest.lib.common import http
+from tempest.lib.common import rate_limiter
 from tempest.lib.common import rest_client
 from tempest.lib import exceptions
 from tempest.tests import base
@@ -90,6 +95,24 @@ class TestRestClientNotFoundHandling(BaseRestClientTestClass):
                           self.url, {}, {})
 
 
+class TestRestClientUnauthorizedHandling(BaseRestClientTestClass):
+    def setUp(self):
+        self.fake_http = fake_http.fake_httplib2(401)
+        super(TestRestClientUnauthorizedHandling, self).setUp()
+        self.invalidate_token = self.patchobject(self.fake_auth_provider,
+                                                 'invalidate_token')
+
+    def test_rejected_token_invalidated(self):
+        self.assertRaises(exceptions.Unauthorized, self.rest_client.get,
+                          self.url, headers={'X-Auth-Token': 'token'})
+        self.invalidate_token.assert_called_once_with('token')
+
+    def test_request_without_token(self):
+        self.assertRaises(exceptions.Unauthorized, self.rest_client.get,
+                          self.url, headers={})
+        self.assertFalse(self.invalidate_token.called)
+
+
 class TestRestClientHeadersJSON(TestRestClientHTTPMethods):
     TYPE = "json"
 
@@ -348,6 +371,10 @@ class TestRestClientErrorCheckerJSON(base.TestCase):
         self._test_error_checker(exceptions.RateLimitExceeded,
                                  self.set_data("413", absolute_limit=False))
 
+    def test_response_429(self):
+        self._test_error_checker(exceptions.RateLimitExceeded,
+                                 self.set_data("429"))
+
     def test_response_415(self):
         self._test_error_checker(exceptions.InvalidContentType,
                                  self.set_data("415"))
@@ -606,6 +633,82 @@ class TestRateLimiting(BaseRestClientTestClass):
         self.assertFalse(self.rest_client.is_absolute_limit(resp, resp_body))
 
 
+class TestRestClientRateLimiter(base.TestCase):
+
+    def setUp(self):
+        super(TestRestClientRateLimiter, self).setUp()
+        self.patchobject(rate_limiter, '_rate_limiters', {})
+        self.sleep = self.patch('time.sleep')
+        self.rest_client = rest_client.RestClient(
+            fake_auth_provider.FakeAuthProvider(), 'compute', None,
+            rate_limit=10, rate_limit_burst=2)
+        self.useFixture(mockpatch.PatchObject(self.rest_client,
+                                              '_log_request'))
+
+    def _set_response(self, *responses):
+        mock_request = self.patchobject(http.ClosingHttp, 'request')
+        mock_request.side_effect = [
+            (fake_http.fake_http_response(
+                dict({'content-type': 'application/json'}, **headers),
+                status=status), body)
+            for status, headers, body in responses]
+        return mock_request
+
+    def test_no_rate_limit(self):
+        client = rest_client.RestClient(
+            fake_auth_provider.FakeAuthProvider(), 'compute', None)
+        self.assertIsNone(client.rate_limiter)
+
+    def test_rate_limiter_shared_per_service(self):
+        same = rest_client.RestClient(
+            fake_auth_provider.FakeAuthProvider(), 'compute', None,
+            rate_limit=10, rate_limit_burst=2)
+        other = rest_client.RestClient(
+            fake_auth_provider.FakeAuthProvider(), 'network', None,
+            rate_limit=10, rate_limit_burst=2)
+        self.assertIs(self.rest_client.rate_limiter, same.rate_limiter)
+        self.assertIsNot(self.rest_client.rate_limiter, other.rate_limiter)
+
+    def test_request_acquires_rate_limiter(self):
+        self._set_response((200, {}, '{}'))
+        acquire = self.patchobject(self.rest_client.rate_limiter, 'acquire')
+        self.rest_client.get('url')
+        acquire.assert_called_once_with()
+
+    def test_response_429_retried(self):
+        mock_request = self._set_response(
+            (429, {'retry-after': '3'}, '{}'), (200, {}, '{}'))
+        throttled = self.patchobject(self.rest_client.rate_limiter,
+                                     'throttled')
+        resp, __ = self.rest_client.get('url')
+        self.assertEqual(200, resp.status)
+        self.assertEqual(2, mock_request.call_count)
+        self.sleep.assert_called_once_with(3)
+        throttled.assert_called_once_with(3)
+
+    def test_response_429_without_retry_after(self):
+        mock_request = self._set_response((429, {}, '{}'))
+        self.assertRaises(exceptions.RateLimitExceeded,
+                          self.rest_client.get, 'url')
+        self.assertEqual(1, mock_request.call_count)
+
+    def test_response_429_retries_exhausted(self):
+        mock_request = self._set_response(
+            *[(429, {'retry-after': '1'}, '{}')] *
+            (rest_client.MAX_RECURSION_DEPTH + 1))
+        self.assertRaises(exceptions.RateLimitExceeded,
+                          self.rest_client.get, 'url')
+        self.assertEqual(rest_client.MAX_RECURSION_DEPTH + 1,
+                         mock_request.call_count)
+
+    def test_success_raises_rate(self):
+        self._set_response((200, {}, '{}'))
+        succeeded = self.patchobject(self.rest_client.rate_limiter,
+                                     'succeeded')
+        self.rest_client.get('url')
+        succeeded.assert_called_once_with()
+
+
 class TestProperties(BaseRestClientTestClass):
 
     def setUp(self):
@@ -1135,6 +1238,58 @@ class TestRestClientJSONSchemaFormatValidation(TestJSONSchemaValidationBase):
         self._test_validate_pass(schema, body)
 
 
+class TestRestClientSchemaValidatorCache(TestJSONSchemaValidationBase):
+
+    def _get_schema(self):
+        return {
+            'status_code': [200],
+            'response_body': {
+                'type': 'object',
+                'properties': {
+                    'foo': {'type': 'string'}
+                }
+            }
+        }
+
+    def test_validator_built_once(self):
+        schema = self._get_schema()
+        with mockpatch.PatchObject(jsonschema.Draft4Validator,
+                                   "check_schema") as chk_schema:
+            self._test_validate_pass(schema, {'foo': 'test'})
+            self._test_validate_pass(schema, {'foo': 'test2'})
+            self._test_validate_fail(schema, {'foo': 1})
+            chk_schema.mock.assert_called_once_with(schema['response_body'])
+        self.assertIs(
+            rest_client.get_schema_validator(schema['response_body']),
+            rest_client.get_schema_validator(schema['response_body']))
+
+    def test_validator_per_schema(self):
+        body_schema = self._get_schema()['response_body']
+        other_body_schema = self._get_schema()['response_body']
+        self.assertIsNot(rest_client.get_schema_validator(body_schema),
+                         rest_client.get_schema_validator(other_body_schema))
+
+    def test_invalid_schema(self):
+        body_schema = {'type': 'object', 'required': 'foo'}
+        self.assertRaises(jsonschema.SchemaError,
+                          rest_client.get_schema_validator, body_schema)
+
+    def test_api_schemas_valid(self):
+        # All the in-tree response schemas can be compiled into validators
+        path = os.path.dirname(response.__file__)
+        prefix = response.__name__ + '.'
+        for _, name, is_pkg in pkgutil.walk_packages([path], prefix):
+            if is_pkg:
+                continue
+            module = importlib.import_module(name)
+            for value in vars(module).values():
+                if not isinstance(value, dict) or 'status_code' not in value:
+                    continue
+                for part in ('response_body', 'response_header'):
+                    if value.get(part):
+                        rest_client.get_schema_validator(value[part])
+
+
 class TestRestClientJSONSchemaValidatorVersion(TestJSONSchemaValidationBase):
 
     schema = {
@@ -0,0 +1,109 @@
+# Copyright 2016 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+
+import mock
+from oslo_serialization import jsonutils as json
+from six.moves.urllib import parse as urlparse
+
+from tempest.services.object_storage import account_client
+from tempest.services.object_storage import container_client
+from tempest.tests import base
+from tempest.tests import fake_auth_provider
+from tempest.tests.lib import fake_http
+
+
+class BaseListingTest(base.TestCase):
+
+    def _mock_get(self, client, pages):
+        responses = [(fake_http.fake_http_response({}, status=200),
+                      json.dumps(page)) for page in pages]
+        return self.patchobject(client, 'get',
+                                mock.Mock(side_effect=responses))
+
+    @staticmethod
+    def _queries(get):
+        return [dict(urlparse.parse_qsl(urlparse.urlparse(args[0]).query))
+                for args, kwargs in get.call_args_list]
+
+
+class TestContainerClient(BaseListingTest):
+
+    def setUp(self):
+        super(TestContainerClient, self).setUp()
+        self.client = container_client.ContainerClient(
+            fake_auth_provider.FakeAuthProvider(), 'swift', 'region1')
+
+    def test_list_all_container_objects(self):
+        get = self._mock_get(self.client, [
+            [{'name': 'a'}, {'name': 'b'}], [{'name': 'c'}, {'name': 'd'}],
+            []])
+        objects = self.client.list_all_container_objects(
+            'fake_container', params={'limit': 2, 'marker': '0'})
+        self.assertEqual(['a', 'b', 'c', 'd'], [o['name'] for o in objects])
+        self.assertEqual(
+            [{'format': 'json', 'limit': '2', 'marker': '0'},
+             {'format': 'json', 'limit': '2', 'marker': 'b'},
+             {'format': 'json', 'limit': '2', 'marker': 'd'}],
+            self._queries(get))
+        self.assertTrue(get.call_args[0][0].startswith('fake_container?'))
+
+    def test_iter_container_objects_delimiter(self):
+        get = self._mock_get(self.client, [
+            [{'subdir': 'a/'}, {'name': 'b'}], [{'subdir': 'c/'}]])
+        objects = self.client.iter_container_objects(
+            'fake_container', page_size=2, prefix='p', delimiter='/')
+        self.assertEqual([{'subdir': 'a/'}, {'name': 'b'}, {'subdir': 'c/'}],
+                         list(objects))
+        self.assertEqual(
+            [{'format': 'json', 'limit': '2', 'prefix': 'p',
+              'delimiter': '/'},
+             {'format': 'json', 'limit': '2', 'prefix': 'p',
+              'delimiter': '/', 'marker': 'b'}],
+            self._queries(get))
+
+    def test_iter_container_objects_prefetch(self):
+        get = self._mock_get(self.client, [
+            [{'name': 'a'}], [{'name': 'b'}], []])
+        objects = self.client.iter_container_objects(
+            'fake_container', page_size=1, prefetch=True)
+        self.assertEqual({'name': 'a'}, next(objects))
+        self.assertEqual(['b'], [o['name'] for o in objects])
+        self.assertEqual(3, get.call_count)
+
+    def test_iter_container_objects_empty(self):
+        self.patchobject(self.client, 'get', mock.Mock(return_value=(
+            fake_http.fake_http_response({}, status=204), '')))
+        self.assertEqual(
+            [], list(self.client.iter_container_objects('fake_container')))
+
+
+class TestAccountClient(BaseListingTest):
+
+    def setUp(self):
+        super(TestAccountClient, self).setUp()
+        self.client = account_client.AccountClient(
+            fake_auth_provider.FakeAuthProvider(), 'swift', 'region1')
+
+    def test_iter_account_containers(self):
+        get = self._mock_get(self.client, [
+            [{'name': 'a'}, {'name': 'b'}], [{'name': 'c'}]])
+        containers = self.client.iter_account_containers(page_size=2,
+                                                         prefix='p')
+        self.assertEqual(['a', 'b', 'c'], [c['name'] for c in containers])
+        self.assertEqual(
+            [{'format': 'json', 'limit': '2', 'prefix': 'p'},
+             {'format': 'json', 'limit': '2', 'prefix': 'p', 'marker': 'b'}],
+            self._queries(get))
@@ -0,0 +1,127 @@
+# Copyright 2016 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+
+import six
+
+from tempest.lib import exceptions as lib_exc
+from tempest.tests.lib import fake_auth_provider
+from tempest.tests.lib.services import async_base
+
+if six.PY3:
+    from tempest.services.volume.v1.json import async_volumes_client as v1
+    from tempest.services.volume.v2.json import async_volumes_client as v2
+
+
+class TestAsyncVolumesV1Client(async_base.BaseAsyncServiceTest):
+
+    FAKE_VOLUME_ID = "c6b0d4f8-9a3e-4c27-8f1d-2e5a7b9c1d3f"
+
+    FAKE_VOLUME = {
+        "volume": {
+            "id": FAKE_VOLUME_ID,
+            "name": "fake-volume",
+            "size": 1,
+            "status": "available"
+        }
+    }
+
+    FAKE_VOLUMES = {"volumes": [FAKE_VOLUME["volume"]]}
+
+    create_status = 200
+
+    def _get_client(self, auth_provider):
+        return v1.AsyncVolumesClient(auth_provider, 'volume', 'regionOne')
+
+    def setUp(self):
+        super(TestAsyncVolumesV1Client, self).setUp()
+        fake_auth = fake_auth_provider.FakeAuthProvider()
+        self.client = self._get_client(fake_auth)
+
+    def test_list_volumes(self):
+        request = self.check_async_service_client_function(
+            self.client.list_volumes,
+            self.FAKE_VOLUMES,
+            detail=True,
+            params={'status': 'available'})
+        self.assertEqual('volumes/detail?status=available',
+                         request.call_args[0][0])
+
+    def test_list_volumes_with_str_params(self):
+        request = self.check_async_service_client_function(
+            self.client.list_volumes,
+            self.FAKE_VOLUMES,
+            params='name=fake-volume')
+        self.assertEqual('volumes?name=fake-volume', request.call_args[0][0])
+
+    def test_show_volume(self):
+        self.check_async_service_client_function(
+            self.client.show_volume,
+            self.FAKE_VOLUME,
+            volume_id=self.FAKE_VOLUME_ID)
+
+    def test_create_volume(self):
+        request = self.check_async_service_client_function(
+            self.client.create_volume,
+            self.FAKE_VOLUME,
+            status=self.create_status,
+            name='fake-volume')
+        self.assertEqual('POST', request.call_args[0][1])
+        body = json.loads(request.call_args[1]['body'])
+        self.assertEqual({'volume': {'name': 'fake-volume', 'size': 1}},
+                         body)
+
+    def test_create_volume_unexpected_status(self):
+        self.assertRaises(
+            lib_exc.InvalidHttpSuccessCode,
+            self.check_async_service_client_function,
+            self.client.create_volume, self.FAKE_VOLUME,
+            status=self.create_status + 1, name='fake-volume')
+
+    def test_delete_volume(self):
+        self.check_async_service_client_function(
+            self.client.delete_volume,
+            {},
+            status=202,
+            volume_id=self.FAKE_VOLUME_ID)
+
+    def test_is_resource_deleted(self):
+        self.check_async_service_client_function(
+            self.client.show_volume,
+            self.FAKE_VOLUME,
+            volume_id=self.FAKE_VOLUME_ID)
+        self.assertFalse(self.loop.run_until_complete(
+            self.client.is_resource_deleted(self.FAKE_VOLUME_ID)))
+
+    def test_show_volume_not_found(self):
+        self.assertRaises(
+            lib_exc.NotFound,
+            self.check_async_service_client_function,
+            self.client.show_volume, {'itemNotFound': {}}, status=404,
+            volume_id=self.FAKE_VOLUME_ID)
+        self.assertTrue(self.loop.run_until_complete(
+            self.client.is_resource_deleted(self.FAKE_VOLUME_ID)))
+
+
+class TestAsyncVolumesV2Client(TestAsyncVolumesV1Client):
+
+    create_status = 202
+
+    def _get_client(self, auth_provider):
+        return v2.AsyncVolumesClient(auth_provider, 'volume', 'regionOne')
+
+    def test_api_version(self):
+        self.assertEqual('v2', self.client.api_version)
@@ -12,12 +12,18 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import json
+
 import mock
+import testtools
 
 from tempest import clients
 from tempest.common import credentials_factory as credentials
 from tempest.common import fixed_network
+from tempest.common import timeline
 from tempest import config
+from tempest.lib import auth
+from tempest.lib.common.utils import test_utils
 from tempest import test
 from tempest.tests import base
 from tempest.tests import fake_config
@@ -108,3 +114,159 @@ class TestBaseTestCase(base.TestCase):
         mock_gprov.assert_called_once_with()
         mock_gtn.assert_called_once_with(mock_prov, net_client,
                                          self.fixed_network_name)
+
+
+class TestBaseTestCaseManagerCache(base.TestCase):
+    def setUp(self):
+        super(TestBaseTestCaseManagerCache, self).setUp()
+        self.useFixture(fake_config.ConfigFixture())
+        config.CONF.set_default('client_manager_cache_size', 2, group='auth')
+        self.patchobject(clients, '_manager_cache', None)
+        self.provider = mock.Mock(deletes_creds=False)
+        self.provider.get_primary_creds.return_value = mock.Mock(
+            credentials=auth.KeystoneV2Credentials(
+                username='fake_user', password='fake_password',
+                tenant_name='fake_tenant'))
+        provider = self.provider
+
+        class FakeTest(test.BaseTestCase):
+            client_manager = mock.Mock(
+                side_effect=lambda **kwargs: mock.Mock())
+            _creds_provider = provider
+
+            @classmethod
+            def _get_credentials_provider(cls):
+                return provider
+
+        class OtherFakeTest(FakeTest):
+            pass
+
+        self.test_classes = FakeTest, OtherFakeTest
+
+    def test_get_client_manager_cached(self):
+        first, second = self.test_classes
+        manager = first.get_client_manager()
+        first.clear_credentials()
+        self.assertIs(manager, second.get_client_manager())
+        self.assertEqual(1, first.client_manager.call_count)
+
+    def test_get_client_manager_deleted_creds(self):
+        self.provider.deletes_creds = True
+        first, second = self.test_classes
+        manager = first.get_client_manager()
+        first.clear_credentials()
+        self.assertIsNot(manager, second.get_client_manager())
+        self.assertEqual(2, first.client_manager.call_count)
+
+    def test_get_client_manager_cache_disabled(self):
+        config.CONF.set_default('client_manager_cache_size', 0, group='auth')
+        first, second = self.test_classes
+        manager = first.get_client_manager()
+        self.assertIsNot(manager, second.get_client_manager())
+
+    def test_clear_credentials_stops_refresher(self):
+        config.CONF.set_default('client_manager_cache_size', 0, group='auth')
+        first, _ = self.test_classes
+        manager = first.get_client_manager()
+        first.clear_credentials()
+        manager.auth_provider.stop_refresher.assert_called_once_with()
+
+    def test_clear_credentials_cached_refresher(self):
+        first, _ = self.test_classes
+        manager = first.get_client_manager()
+        first.clear_credentials()
+        manager.auth_provider.stop_refresher.assert_not_called()
+
+
+class TestBaseTestCaseCaller(base.TestCase):
+    def setUp(self):
+        super(TestBaseTestCaseCaller, self).setUp()
+        self.useFixture(fake_config.ConfigFixture())
+        self.patchobject(config, 'TempestConfigPrivate',
+                         fake_config.FakePrivate)
+
+    def test_test_caller_published(self):
+        callers = []
+
+        class FakeTest(test.BaseTestCase):
+            @classmethod
+            def resource_setup(cls):
+                callers.append(test_utils.get_test_caller())
+
+            @classmethod
+            def resource_cleanup(cls):
+                callers.append(test_utils.get_test_caller())
+
+            def setUp(self):
+                super(FakeTest, self).setUp()
+                callers.append(test_utils.get_test_caller())
+                self.addCleanup(
+                    lambda: callers.append(test_utils.get_test_caller()))
+
+            def tearDown(self):
+                callers.append(test_utils.get_test_caller())
+                super(FakeTest, self).tearDown()
+
+            def test_fake(self):
+                callers.append(test_utils.get_test_caller())
+
+        with mock.patch.object(test_utils, 'find_test_caller') as mock_find:
+            result = testtools.TestResult()
+            FakeTest.setUpClass()
+            FakeTest('test_fake').run(result)
+            FakeTest.tearDownClass()
+            self.assertEqual(['FakeTest:setUpClass', 'FakeTest:setUp',
+                              'FakeTest:test_fake', 'FakeTest:tearDown',
+                              'FakeTest:_run_cleanups',
+                              'FakeTest:tearDownClass'], callers)
+            self.assertTrue(result.wasSuccessful())
+            self.assertFalse(mock_find.called)
+        # Outside of a test the stack is inspected again
+        self.assertEqual(
+            'TestBaseTestCaseCaller:test_test_caller_published',
+            test_utils.get_test_caller())
+
+
+class TestBaseTestCaseTimeline(base.TestCase):
+    def setUp(self):
+        super(TestBaseTestCaseTimeline, self).setUp()
+        self.useFixture(fake_config.ConfigFixture())
+        self.patchobject(config, 'TempestConfigPrivate',
+                         fake_config.FakePrivate)
+
+    def test_class_timeline_attached_to_first_test(self):
+        class FakeTest(test.BaseTestCase):
+            @classmethod
+            def resource_setup(cls):
+                recorder = timeline.WaitRecorder('volume', 'v1',
+                                                 timeline.status_of)
+                recorder.observe({'status': 'available'})
+
+            def test_first(self):
+                pass
+
+            def test_second(self):
+                pass
+
+        class DetailsResult(testtools.TestResult):
+            def __init__(self):
+                super(DetailsResult, self).__init__()
+                self.details = []
+
+            def addSuccess(self, test, details=None):
+                self.details.append(details or {})
+
+        result = DetailsResult()
+        FakeTest.setUpClass()
+        FakeTest('test_first').run(result)
+        FakeTest('test_second').run(result)
+        FakeTest.tearDownClass()
+        self.assertIsNone(timeline.current())
+        self.assertEqual(2, len(result.details))
+        first, second = result.details
+        events = json.loads(b''.join(
+            first[timeline.CLASS_DETAIL_NAME].iter_bytes()).decode('utf-8'))
+        self.assertEqual([('volume', 'v1', 'available')],
+                         [(event['resource'], event['id'], event['state'])
+                          for event in events])
+        self.assertNotIn(timeline.CLASS_DETAIL_NAME, second)
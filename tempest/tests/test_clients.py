@@ -0,0 +1,83 @@
+# Copyright 2016 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+
+import mock
+
+from tempest import clients
+from tempest.lib import auth
+from tempest.tests import base
+
+
+class TestManagerCache(base.TestCase):
+
+    def setUp(self):
+        super(TestManagerCache, self).setUp()
+        self.manager_class = mock.Mock(side_effect=lambda **kw: mock.Mock())
+        self.cache = clients.ManagerCache(2)
+
+    def _credentials(self, username):
+        return auth.KeystoneV2Credentials(username=username,
+                                          password='fake_password',
+                                          tenant_name='fake_tenant')
+
+    def test_get_manager_reused(self):
+        manager = self.cache.get_manager(self.manager_class,
+                                         self._credentials('user1'))
+        self.manager_class.assert_called_once_with(
+            credentials=self._credentials('user1'), service=None,
+            scope='project')
+        # Equal credentials, not only the same object, get the manager
+        self.assertIs(manager, self.cache.get_manager(
+            self.manager_class, self._credentials('user1')))
+        self.assertEqual(1, self.manager_class.call_count)
+
+    def test_get_manager_key(self):
+        creds = self._credentials('user1')
+        managers = [
+            self.cache.get_manager(self.manager_class, creds),
+            self.cache.get_manager(self.manager_class, creds,
+                                   service='compute'),
+            self.cache.get_manager(self.manager_class, creds,
+                                   scope='domain'),
+            self.cache.get_manager(mock.Mock(), creds)]
+        self.assertEqual(4, len(set(managers)))
+
+    def test_get_manager_lru(self):
+        first = self.cache.get_manager(self.manager_class,
+                                       self._credentials('user1'))
+        second = self.cache.get_manager(self.manager_class,
+                                        self._credentials('user2'))
+        # user1 is used again, user2 is the least recently used
+        self.cache.get_manager(self.manager_class, self._credentials('user1'))
+        self.cache.get_manager(self.manager_class, self._credentials('user3'))
+        second.auth_provider.stop_refresher.assert_called_once_with()
+        self.assertIs(first, self.cache.get_manager(
+            self.manager_class, self._credentials('user1')))
+        self.assertIsNot(second, self.cache.get_manager(
+            self.manager_class, self._credentials('user2')))
+        self.assertFalse(first.auth_provider.stop_refresher.called)
+
+    def test_evict(self):
+        creds = self._credentials('user1')
+        manager = self.cache.get_manager(self.manager_class, creds)
+        other = self.cache.get_manager(self.manager_class,
+                                       self._credentials('user2'))
+        self.cache.evict(creds)
+        manager.auth_provider.stop_refresher.assert_called_once_with()
+        self.assertIsNot(manager,
+                         self.cache.get_manager(self.manager_class, creds))
+        self.assertIs(other, self.cache.get_manager(
+            self.manager_class, self._credentials('user2')))
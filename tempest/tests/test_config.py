@@ -23,7 +23,10 @@ from tempest.tests import fake_config
 class TestServiceClientConfig(base.TestCase):
 
     expected_common_params = set(['disable_ssl_certificate_validation',
-                                  'ca_certs', 'trace_requests'])
+                                  'ca_certs', 'trace_requests',
+                                  'http_keep_alive', 'http_pool_size',
+                                  'http_pool_idle_timeout', 'rate_limit',
+                                  'rate_limit_burst', 'rate_limit_lock_path'])
     expected_extra_params = set(['service', 'endpoint_type', 'region',
                                  'build_timeout', 'build_interval'])
 
@@ -47,6 +50,17 @@ class TestServiceClientConfig(base.TestCase):
                          params['ca_certs'])
         self.assertEqual(self.CONF.debug.trace_requests,
                          params['trace_requests'])
+        self.assertEqual(self.CONF.service_clients.http_keep_alive,
+                         params['http_keep_alive'])
+        self.assertEqual(self.CONF.service_clients.http_pool_size,
+                         params['http_pool_size'])
+        self.assertEqual(self.CONF.service_clients.http_pool_idle_timeout,
+                         params['http_pool_idle_timeout'])
+        self.assertEqual(self.CONF.service_clients.rate_limit,
+                         params['rate_limit'])
+        self.assertEqual(self.CONF.service_clients.rate_limit_burst,
+                         params['rate_limit_burst'])
+        self.assertIsNone(params['rate_limit_lock_path'])
 
     def test_service_client_config_service_all(self):
         params = config.service_client_config(
@@ -13,6 +13,7 @@
 # the License.
 
 import fixtures
+import mock
 import testtools
 
 from tempest.lib import auth
@@ -124,3 +125,41 @@ class TestServiceClients(base.TestCase):
         for _key in _params.keys():
             self.assertEqual(expected_params[_key],
                              _params[_key])
+
+    def test_register_client_lazy(self):
+        _manager = self._get_manager()
+        client_class = mock.Mock()
+        _manager.register_client('fake_client', client_class,
+                                 _manager.auth_provider, 'fake_service',
+                                 region='fake_region')
+        self.assertIn('fake_client', _manager.registered_clients)
+        self.assertFalse(client_class.called)
+        client = _manager.fake_client
+        self.assertIs(client_class.return_value, client)
+        client_class.assert_called_once_with(
+            _manager.auth_provider, 'fake_service', region='fake_region')
+        # The client is only instantiated once
+        self.assertIs(client, _manager.fake_client)
+        self.assertEqual(1, client_class.call_count)
+
+    def test_register_client_again(self):
+        _manager = self._get_manager()
+        first_class = mock.Mock()
+        second_class = mock.Mock()
+        _manager.register_client('fake_client', first_class)
+        self.assertIs(first_class.return_value, _manager.fake_client)
+        _manager.register_client('fake_client', second_class)
+        self.assertIs(second_class.return_value, _manager.fake_client)
+
+    def test_register_client_set_attribute(self):
+        _manager = self._get_manager()
+        client_class = mock.Mock()
+        _manager.register_client('fake_client', client_class)
+        _manager.fake_client = 'fake_value'
+        self.assertEqual('fake_value', _manager.fake_client)
+        self.assertFalse(client_class.called)
+
+    def test_unknown_client(self):
+        _manager = self._get_manager()
+        self.assertRaises(AttributeError, getattr, _manager, 'fake_client')
+        self.assertFalse(hasattr(_manager, 'fake_client'))
@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+
+# Copyright 2016 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Measure the overhead of authenticating a request.
+
+auth_request runs before every request sent by the REST clients. It is
+timed with a valid token and a catalog the size of a large multi-region
+cloud, looking up the last service and region of the catalog, which are the
+slowest to find.
+
+Usage::
+
+    python tools/bench_auth_request.py --services 40 --regions 10
+"""
+
+import argparse
+import datetime
+import time
+
+from tempest.lib import auth
+
+AUTH_URL = 'http://fake_uri.com/auth'
+TOKEN = 'fake_token'
+
+
+def expiry(date_format):
+    expires = datetime.datetime.utcnow() + datetime.timedelta(days=1)
+    return expires.strftime(date_format)
+
+
+def auth_data_v2(services, regions):
+    catalog = [{'type': 'service%d' % s, 'name': 'service%d' % s,
+                'endpoints': [
+                    dict(region='region%d' % r,
+                         **dict(('%sURL' % i,
+                                 'http://s%d.r%d/%s/v2' % (s, r, i))
+                                for i in ('public', 'internal', 'admin')))
+                    for r in range(regions)]}
+               for s in range(services)]
+    return {'token': {'expires': expiry(auth.ISO8601_INT_SECONDS),
+                      'id': TOKEN,
+                      'tenant': {'id': 'fake_tenant_id'}},
+            'user': {'id': 'fake_user_id'},
+            'serviceCatalog': catalog}
+
+
+def auth_data_v3(services, regions):
+    catalog = [{'type': 'service%d' % s, 'name': 'service%d' % s,
+                'endpoints': [
+                    {'region': 'region%d' % r, 'interface': i,
+                     'url': 'http://s%d.r%d/%s/v3' % (s, r, i)}
+                    for r in range(regions)
+                    for i in ('public', 'internal', 'admin')]}
+               for s in range(services)]
+    return {'expires_at': expiry(auth.ISO8601_FLOAT_SECONDS),
+            'project': {'domain': {'id': 'fake_domain_id', 'name': 'fake'},
+                        'id': 'project_id', 'name': 'project_name'},
+            'user': {'domain': {'id': 'fake_domain_id', 'name': 'fake'},
+                     'id': 'fake_user_id', 'name': 'username'},
+            'catalog': catalog}
+
+
+class KeystoneV2AuthProvider(auth.KeystoneV2AuthProvider):
+    """Auth provider getting the auth data without any request"""
+
+    fake_auth_data = None
+
+    def _get_auth(self):
+        return TOKEN, self.fake_auth_data
+
+
+class KeystoneV3AuthProvider(auth.KeystoneV3AuthProvider):
+    """Auth provider getting the auth data without any request"""
+
+    fake_auth_data = None
+
+    def _get_auth(self):
+        return TOKEN, self.fake_auth_data
+
+
+def run(name, auth_provider, filters, iterations):
+    auth_provider.set_auth()
+    start = time.time()
+    for _ in range(iterations):
+        auth_provider.auth_request('GET', 'resources/id', headers={},
+                                   filters=filters)
+    elapsed = time.time() - start
+    print('%-3s %6d requests in %6.3fs  %7.1f microseconds/request' % (
+        name, iterations, elapsed, elapsed / iterations * 1e6))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--services', type=int, default=40,
+                        help='Number of services in the catalog')
+    parser.add_argument('--regions', type=int, default=10,
+                        help='Number of regions of each service')
+    parser.add_argument('--iterations', type=int, default=2000)
+    args = parser.parse_args()
+
+    filters = {'service': 'service%d' % (args.services - 1),
+               'region': 'region%d' % (args.regions - 1),
+               'endpoint_type': 'internalURL'}
+
+    v2_provider = KeystoneV2AuthProvider(
+        auth.KeystoneV2Credentials(username='fake_username',
+                                   password='fake_password',
+                                   tenant_name='fake_tenant_name'),
+        AUTH_URL)
+    v2_provider.fake_auth_data = auth_data_v2(args.services, args.regions)
+    run('v2', v2_provider, filters, args.iterations)
+
+    v3_provider = KeystoneV3AuthProvider(
+        auth.KeystoneV3Credentials(username='fake_username',
+                                   password='fake_password',
+                                   user_domain_name='fake_domain_name',
+                                   project_name='fake_tenant_name',
+                                   project_domain_name='fake_domain_name'),
+        AUTH_URL)
+    v3_provider.fake_auth_data = auth_data_v3(args.services, args.regions)
+    run('v3', v3_provider, filters, args.iterations)
+
+
+if __name__ == '__main__':
+    main()
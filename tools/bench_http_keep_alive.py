@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+
+# Copyright 2016 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Compare request latency of ClosingHttp and keep-alive PooledHttp.
+
+A local HTTP/1.1 server stands in for an OpenStack API, and the same number
+of GET requests is sent through both http objects, from one or more threads.
+
+Usage::
+
+    python tools/bench_http_keep_alive.py --requests 2000 --threads 4
+"""
+
+import argparse
+import threading
+import time
+
+from six.moves import BaseHTTPServer
+from six.moves import socketserver
+
+from tempest.lib.common import http
+
+BODY = b'{"servers": []}'
+
+
+class StandInHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Avoid Nagle delays on the small header and body writes of a
+    # keep-alive connection
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+class StandInServer(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+
+def run(http_obj, url, requests, threads):
+    per_thread = requests // threads
+    latencies = []
+    lock = threading.Lock()
+
+    def worker():
+        local = []
+        for _ in range(per_thread):
+            start = time.time()
+            http_obj.request(url, 'GET', headers={})
+            local.append(time.time() - start)
+        with lock:
+            latencies.extend(local)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    start = time.time()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    return time.time() - start, sorted(latencies)
+
+
+def report(name, elapsed, latencies):
+    count = len(latencies)
+    print('%-12s %6d requests in %6.3fs  %8.1f req/s  '
+          'p50 %.3fms  p99 %.3fms' % (
+              name, count, elapsed, count / elapsed,
+              latencies[count // 2] * 1000,
+              latencies[int(count * 0.99)] * 1000))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--threads', type=int, default=1)
+    parser.add_argument('--pool-size', type=int,
+                        default=http.DEFAULT_POOL_SIZE)
+    args = parser.parse_args()
+
+    server = StandInServer(('127.0.0.1', 0), StandInHandler)
+    server_thread = threading.Thread(target=server.serve_forever)
+    server_thread.daemon = True
+    server_thread.start()
+    url = 'http://127.0.0.1:%d/v2.1/servers' % server.server_address[1]
+
+    try:
+        report('closing', *run(http.ClosingHttp(), url, args.requests,
+                               args.threads))
+        report('keep-alive', *run(http.PooledHttp(pool_size=args.pool_size),
+                                  url, args.requests, args.threads))
+    finally:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+
+# Copyright 2016 OpenStack Foundation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Measure validation throughput of list_servers detail responses.
+
+Validation through RestClient.validate_response, which uses cached
+validators, is compared with calling jsonschema.validate for every response,
+which checks the schema and builds a new validator each time.
+
+Usage::
+
+    python tools/bench_validate_response.py --servers 20 --iterations 500
+"""
+
+import argparse
+import copy
+import time
+
+import jsonschema
+
+from tempest.lib.api_schema.response.compute.v2_1 import servers as schema
+from tempest.lib.common import rest_client
+
+SERVER = {
+    "accessIPv4": "",
+    "accessIPv6": "",
+    "addresses": {
+        "private": [{"addr": "192.168.0.3", "version": 4}]
+    },
+    "created": "2012-08-20T21:11:09Z",
+    "flavor": {
+        "id": "1",
+        "links": [{"href": "http://os.com/openstack/flavors/1",
+                   "rel": "bookmark"}]
+    },
+    "hostId": "65201c14a29663e06d0748e561207d998b343e1d164bfa0aafa9c45d",
+    "id": "893c7791-f1df-4c3d-8383-3caae9656c62",
+    "image": {
+        "id": "70a599e0-31e7-49b7-b260-868f441e862b",
+        "links": [{"href": "http://imgs/70a599e0-31e7-49b7-b260-868f441e862b",
+                   "rel": "bookmark"}]
+    },
+    "links": [
+        {"href": "http://v2/srvs/893c7791-f1df-4c3d-8383-3caae9656c62",
+         "rel": "self"},
+        {"href": "http://srvs/893c7791-f1df-4c3d-8383-3caae9656c62",
+         "rel": "bookmark"}
+    ],
+    "metadata": {},
+    "name": "server",
+    "progress": 0,
+    "status": "ACTIVE",
+    "tenant_id": "openstack",
+    "updated": "2012-08-20T21:11:09Z",
+    "user_id": "fake"
+}
+
+
+class Response(dict):
+    status = 200
+
+
+def validate_uncached(resp, body):
+    """validate_response as it was before validators were cached"""
+    schema_ = schema.list_servers_detail
+    rest_client.RestClient.expected_success(schema_['status_code'],
+                                            resp.status)
+    jsonschema.validate(body, schema_['response_body'],
+                        cls=rest_client.JSONSCHEMA_VALIDATOR,
+                        format_checker=rest_client.FORMAT_CHECKER)
+
+
+def validate_cached(resp, body):
+    rest_client.RestClient.validate_response(schema.list_servers_detail,
+                                             resp, body)
+
+
+def run(name, func, resp, body, iterations):
+    start = time.time()
+    for _ in range(iterations):
+        func(resp, body)
+    elapsed = time.time() - start
+    print('%-9s %6d validations in %6.3fs  %9.1f validations/s' % (
+        name, iterations, elapsed, iterations / elapsed))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--servers', type=int, default=20,
+                        help='Number of servers in each response body')
+    parser.add_argument('--iterations', type=int, default=500)
+    args = parser.parse_args()
+
+    body = {'servers': [copy.deepcopy(SERVER) for _ in range(args.servers)]}
+    resp = Response()
+    run('uncached', validate_uncached, resp, body, args.iterations)
+    run('cached', validate_cached, resp, body, args.iterations)
+
+
+if __name__ == '__main__':
+    main()